@@ -80,6 +80,11 @@ class AgentContext(MutableMapping[str, Any]):
             if overwrite or key not in self._data:
                 self._data[key] = value
 
+    def page_unchanged(self) -> bool:
+        """Whether the fetched page is known to match its previous fetch (HTTP cache)."""
+
+        return bool(self.metadata.get("response", {}).get("not_modified"))
+
     def copy(self) -> "AgentContext":
         return AgentContext(dict(self._data), metadata=dict(self.metadata))
 
@@ -20,6 +20,8 @@ class DbExportAgent(BaseAgent):
 
     def _resolve_records(self, context: AgentContext) -> Iterable[Mapping[str, object]]:
         records = context.get("normalized_records") or context.get("records")
+        if records is None and context.page_unchanged():
+            return []  # nothing was parsed from an unchanged page
         if records is None:
             raise ValueError("DbExportAgent requires 'normalized_records' or 'records' in context")
         return records  # type: ignore[return-value]
@@ -19,6 +19,12 @@ class HtmlParseAgent(BaseAgent):
         super().__init__(config=config)
 
     def run(self, context: AgentContext) -> AgentContext:
+        if context.page_unchanged():
+            # A 304 or an identical body: the page was parsed on an earlier fetch.
+            log.info("Page unchanged since the last fetch, skipping parse")
+            context.metadata.setdefault("page", {})["skipped"] = "not_modified"
+            return context
+
         html = context.get("raw_html")
         if not html:
             raise ValueError("HtmlParseAgent requires 'raw_html' in context")
@@ -5,6 +5,7 @@ from typing import Any, Mapping, Optional
 
 from src.common.logging_utils import get_logger
 from src.engines import build_rate_limiter_from_config, get_http_engine
+from src.engines.http_cache import get_http_cache
 
 from .base import AgentConfig, AgentContext, BaseAgent
 
@@ -34,6 +35,8 @@ class HttpFetchAgent(BaseAgent):
         url = self._resolve_url(context)
         runtime_settings: Mapping[str, Any] = context.metadata.get("settings", {})
         rate_limiter = build_rate_limiter_from_config(runtime_settings) if runtime_settings else None
+        source = context.metadata.get("source_config", {}).get("source")
+        cache = get_http_cache(source) if source else None
 
         request_config = HttpRequestConfig(
             url=url,
@@ -45,7 +48,7 @@ class HttpFetchAgent(BaseAgent):
         )
 
         log.info("Fetching %s", url)
-        result = send_request(request_config, rate_limiter=rate_limiter)
+        result = send_request(request_config, rate_limiter=rate_limiter, cache=cache)
 
         context["raw_html"] = result.text
         context.metadata.setdefault("response", {})
@@ -55,6 +58,7 @@ class HttpFetchAgent(BaseAgent):
                 "url": result.url,
                 "headers": result.headers,
                 "elapsed_seconds": result.elapsed_seconds,
+                "not_modified": result.not_modified,
             }
         )
         return context
@@ -1,23 +1,197 @@
+import asyncio
+import heapq
+import inspect
+import math
+import os
+import threading
 from collections import defaultdict
-from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
-from typing import Any, Dict, List, Optional, Set
+from functools import partial
+from concurrent.futures import (
+    FIRST_COMPLETED,
+    Executor,
+    Future,
+    ProcessPoolExecutor,
+    ThreadPoolExecutor,
+    wait,
+)
+from importlib import import_module
+from typing import Any, Callable, Dict, List, Mapping, Optional, Sequence, Set, Tuple
 
 from src.common.logging_utils import get_logger
-from src.core_kernel.pipeline_compiler import CompiledPipeline
+from src.core_kernel.pipeline_compiler import CompiledPipeline, CompiledStep
 from src.core_kernel.registry import ComponentRegistry
 
 log = get_logger("execution-engine")
 
+EXECUTOR_KINDS = ("thread", "process", "asyncio")
+PARALLEL_MODES = ("process", "thread")
+
+
+def _call_component(module: str, callable_name: str, params: Dict[str, Any]) -> Any:
+    """Import and invoke a registry component by reference.
+
+    Only the module path, callable name and params cross the process
+    boundary, so components run in a process pool without pickling the
+    registry or the callable itself.
+    """
+
+    func = getattr(import_module(module), callable_name)
+    return func(**params) if params else func()
+
+
+def _call_component_chunk(
+    module: str,
+    callable_name: str,
+    input_param: str,
+    apply: str,
+    params: Dict[str, Any],
+    chunk: List[Any],
+) -> Any:
+    """Run a component over one shard of a ``parallel`` step's input.
+
+    ``apply="chunk"`` passes the whole shard as ``input_param``;
+    ``apply="each"`` calls the component once per item (item as the first
+    positional argument) and returns the list of results.
+    """
+
+    func = getattr(import_module(module), callable_name)
+    if apply == "each":
+        return [func(item, **params) for item in chunk]
+    return func(**{**params, input_param: chunk})
+
+
+def _concat_chunks(step_id: str, parts: Sequence[Any]) -> Any:
+    """Concatenate per-chunk results in input order.
+
+    Lists are joined; tuples of lists (e.g. ``run_qc_batch``'s
+    ``(passed, failed, results)``) are joined element-wise.
+    """
+
+    if not parts:
+        return []
+    first = parts[0]
+    if isinstance(first, list):
+        return [item for part in parts for item in part]
+    if isinstance(first, tuple) and all(isinstance(element, list) for element in first):
+        return tuple([item for part in parts for item in part[idx]] for idx in range(len(first)))
+    raise TypeError(
+        f"Parallel step '{step_id}' returned {type(first).__name__}; "
+        "chunk results must be lists or tuples of lists to be concatenated"
+    )
+
+
+class _AsyncioRunner:
+    """Background event loop that runs ``executor: asyncio`` steps."""
+
+    def __init__(self) -> None:
+        self.loop = asyncio.new_event_loop()
+        self._thread = threading.Thread(
+            target=self.loop.run_forever, name="execution-engine-asyncio", daemon=True
+        )
+        self._thread.start()
+
+    def submit(self, func: Callable[..., Any], params: Dict[str, Any]) -> "Future[Any]":
+        async def _invoke() -> Any:
+            result = func(**params) if params else func()
+            if inspect.isawaitable(result):
+                result = await result
+            return result
+
+        return asyncio.run_coroutine_threadsafe(_invoke(), self.loop)
+
+    def shutdown(self) -> None:
+        self.loop.call_soon_threadsafe(self.loop.stop)
+        self._thread.join()
+        self.loop.close()
+
 
 class ExecutionEngine:
-    """Simple execution engine that runs compiled pipelines."""
+    """Execution engine that runs compiled pipelines as a parallel DAG.
 
-    def __init__(self, registry: ComponentRegistry, max_workers: Optional[int] = None):
+    Every step whose dependencies are satisfied is dispatched immediately to
+    the executor named by its ``executor`` hint:
+
+    - ``thread`` (default): a shared thread pool, for I/O-bound steps.
+    - ``process``: a process pool, for CPU-bound steps. Components are
+      re-imported in the worker via :func:`_call_component`.
+    - ``asyncio``: a background event loop; coroutine functions default here.
+
+    Ordering is only imposed by ``depends_on``: side-effecting (``qc`` /
+    ``export``) steps on independent branches run concurrently, so anything
+    that must happen in sequence has to be declared as a dependency. Ready
+    steps are kept in a heap keyed by declaration order.
+
+    A step with ``parallel: {mode, chunk_size, workers, input, apply}`` is a
+    data-parallel map: the list passed as the ``input`` param (default
+    ``records``) is sharded into ``chunk_size`` chunks, the component is
+    mapped over them in a pool of ``workers``, and the chunk results are
+    concatenated in order (see :func:`_concat_chunks`).
+    """
+
+    def __init__(
+        self,
+        registry: ComponentRegistry,
+        max_workers: Optional[int] = None,
+        process_workers: Optional[int] = None,
+    ):
         self.registry = registry
         self.max_workers = max_workers
+        self.process_workers = process_workers
+
+    def _executor_kind(self, step: CompiledStep, func: Callable[..., Any]) -> str:
+        kind = (getattr(step, "executor", None) or "").lower()
+        if not kind:
+            return "asyncio" if inspect.iscoroutinefunction(func) else "thread"
+        if kind not in EXECUTOR_KINDS:
+            raise ValueError(
+                f"Step '{step.id}' has unknown executor '{kind}'; expected one of {EXECUTOR_KINDS}"
+            )
+        return kind
+
+    def _run_parallel(self, step: CompiledStep, params: Dict[str, Any]) -> Any:
+        options: Mapping[str, Any] = getattr(step, "parallel", None) or {}
+        mode = str(options.get("mode", "process")).lower()
+        if mode not in PARALLEL_MODES:
+            raise ValueError(
+                f"Step '{step.id}' has unknown parallel mode '{mode}'; "
+                f"expected one of {PARALLEL_MODES}"
+            )
+        input_param = options.get("input", "records")
+        apply = options.get("apply", "chunk")
+        if input_param not in params:
+            raise ValueError(f"Parallel step '{step.id}' requires its input param '{input_param}'")
+
+        params = dict(params)
+        items = list(params.pop(input_param) or [])
+        workers = int(options.get("workers") or os.cpu_count() or 1)
+        chunk_size = int(options.get("chunk_size") or max(math.ceil(len(items) / (workers * 4)), 1))
+        chunks = [items[start : start + chunk_size] for start in range(0, len(items), chunk_size)]
+        if not chunks:
+            return _concat_chunks(step.id, [])
+
+        log.info(
+            "Sharding step %s into %d chunks of %d over %d %s workers",
+            step.id,
+            len(chunks),
+            chunk_size,
+            workers,
+            mode,
+        )
+        pool_cls = ProcessPoolExecutor if mode == "process" else ThreadPoolExecutor
+        with pool_cls(max_workers=min(workers, len(chunks))) as pool:
+            shard = partial(
+                _call_component_chunk,
+                step.component.module,
+                step.component.callable,
+                input_param,
+                apply,
+                params,
+            )
+            parts = list(pool.map(shard, chunks))
+        return _concat_chunks(step.id, parts)
 
     def execute(self, pipeline: CompiledPipeline, runtime_params: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
-        """Run a compiled pipeline sequentially.
+        """Run a compiled pipeline, parallelising independent steps.
 
         Args:
             pipeline: Compiled pipeline with resolved components.
@@ -25,6 +199,11 @@ class ExecutionEngine:
 
         Returns:
             Dictionary mapping step IDs to their results.
+
+        Raises:
+            ValueError: If a step depends on an unknown step or names an
+                unknown executor.
+            RuntimeError: If the dependency graph contains a cycle.
         """
 
         results: Dict[str, Any] = {}
@@ -35,13 +214,6 @@ class ExecutionEngine:
         remaining_deps: Dict[str, Set[str]] = {
             step.id: set(step.depends_on) for step in pipeline.steps
         }
-        side_effect_order: List[str] = [
-            step.id
-            for step in pipeline.steps
-            if (step.step_type or "").lower() in {"qc", "export"}
-            or (step.component.type or "").lower() in {"qc", "export"}
-        ]
-        next_side_effect_idx = 0
         dependents: Dict[str, List[str]] = defaultdict(list)
 
         for step in pipeline.steps:
@@ -50,120 +222,86 @@ class ExecutionEngine:
                     raise ValueError(f"Step '{step.id}' depends on unknown step '{dep}'")
                 dependents[dep].append(step.id)
 
-        ready: List[str] = [sid for sid, deps in remaining_deps.items() if not deps]
-        ready.sort(key=lambda sid: order_index[sid])
-
-        scheduled: Set[str] = set()
+        ready: List[Tuple[int, str]] = [
+            (order_index[sid], sid) for sid, deps in remaining_deps.items() if not deps
+        ]
+        heapq.heapify(ready)
 
-        def add_ready(step_id: str) -> None:
-            if step_id in scheduled or step_id in ready:
-                return
-            ready.append(step_id)
-            ready.sort(key=lambda sid: order_index[sid])
+        executors: Dict[str, Any] = {}
 
-        def mark_complete(step_id: str, result: Any) -> None:
-            results[step_id] = result
-            scheduled.add(step_id)
-            for child in dependents.get(step_id, []):
-                remaining_deps[child].discard(step_id)
-                if not remaining_deps[child]:
-                    add_ready(child)
+        def get_executor(kind: str) -> Any:
+            if kind not in executors:
+                if kind == "thread":
+                    executors[kind] = ThreadPoolExecutor(
+                        max_workers=self.max_workers or min(32, (os.cpu_count() or 1) + 4),
+                        thread_name_prefix="execution-engine",
+                    )
+                elif kind == "process":
+                    executors[kind] = ProcessPoolExecutor(max_workers=self.process_workers)
+                else:
+                    executors[kind] = _AsyncioRunner()
+            return executors[kind]
 
-        def run_step(step_id: str) -> Any:
+        def submit(step_id: str) -> "Future[Any]":
             step = step_lookup[step_id]
             params = {**step.params}
             params.update(runtime_params)
 
             func = self.registry.resolve_callable(step.component.name)
+            if getattr(step, "parallel", None):
+                log.info(
+                    "Executing step %s using component %s (parallel)", step.id, step.component.name
+                )
+                return get_executor("thread").submit(self._run_parallel, step, params)
+            kind = self._executor_kind(step, func)
             log.info(
-                "Executing step %s using component %s (type=%s)",
+                "Executing step %s using component %s (type=%s, executor=%s)",
                 step.id,
                 step.component.name,
                 step.component.type,
+                kind,
             )
-            return func(**params) if params else func()
+            if kind == "process":
+                pool: Executor = get_executor(kind)
+                return pool.submit(
+                    _call_component, step.component.module, step.component.callable, params
+                )
+            if kind == "asyncio":
+                return get_executor(kind).submit(func, params)
+            return get_executor(kind).submit(lambda: func(**params) if params else func())
 
-        def is_side_effecting(step_id: str) -> bool:
-            step = step_lookup[step_id]
-            step_type = (step.step_type or "").lower()
-            component_type = (step.component.type or "").lower()
-            return step_type in {"qc", "export"} or component_type in {"qc", "export"}
+        futures: Dict["Future[Any]", str] = {}
+        failed = False
+        try:
+            while len(results) < len(pipeline.steps):
+                while ready:
+                    _, step_id = heapq.heappop(ready)
+                    futures[submit(step_id)] = step_id
 
-        with ThreadPoolExecutor(max_workers=self.max_workers or len(pipeline.steps)) as executor:
-            futures: Dict[Any, str] = {}
+                if not futures:
+                    unresolved = [sid for sid, deps in remaining_deps.items() if deps]
+                    raise RuntimeError(
+                        f"Pipeline {pipeline.name} is stuck; unresolved dependencies: {unresolved}"
+                    )
 
-            while len(results) < len(pipeline.steps):
-                progress_made = False
-
-                # Schedule all ready steps that are not side-effecting
-                normal_ready: List[str] = []
-                side_effect_ready: List[str] = []
-                blocked_side_effects: List[str] = []
-
-                for step_id in list(ready):
-                    ready.remove(step_id)
-                    if is_side_effecting(step_id):
-                        if (
-                            next_side_effect_idx < len(side_effect_order)
-                            and side_effect_order[next_side_effect_idx] == step_id
-                        ):
-                            side_effect_ready.append(step_id)
-                        else:
-                            # Keep later side-effect steps pending until their turn
-                            blocked_side_effects.append(step_id)
-                    else:
-                        normal_ready.append(step_id)
-
-                for step_id in normal_ready:
-                    if step_id in scheduled:
-                        continue
-                    scheduled.add(step_id)
-                    futures[executor.submit(run_step, step_id)] = step_id
-                    progress_made = True
-
-                side_effect_ready.sort(key=lambda sid: order_index[sid])
-                while side_effect_ready:
-                    step_id = side_effect_ready.pop(0)
-                    if step_id in scheduled:
-                        continue
-                    scheduled.add(step_id)
-                    result = run_step(step_id)
-                    mark_complete(step_id, result)
-                    next_side_effect_idx += 1
-                    progress_made = True
-
-                    if next_side_effect_idx < len(side_effect_order):
-                        next_id = side_effect_order[next_side_effect_idx]
-                        if next_id in ready:
-                            ready.remove(next_id)
-                            side_effect_ready.append(next_id)
-
-                for step_id in blocked_side_effects:
-                    add_ready(step_id)
-
-                if futures:
-                    done, _ = wait(futures.keys(), return_when=FIRST_COMPLETED)
-                    for future in done:
-                        step_id = futures.pop(future)
-                        result = future.result()
-                        mark_complete(step_id, result)
-                        progress_made = True
-
-                if not progress_made:
-                    if blocked_side_effects and not futures:
-                        expected = (
-                            side_effect_order[next_side_effect_idx]
-                            if next_side_effect_idx < len(side_effect_order)
-                            else None
-                        )
-                        raise RuntimeError(
-                            "Pipeline %s is stuck; waiting on side-effect '%s' but only later side-effects are ready"
-                            % (pipeline.name, expected)
-                        )
-                    if not ready and len(results) < len(pipeline.steps):
-                        unresolved = [sid for sid, deps in remaining_deps.items() if deps]
-                        raise RuntimeError(
-                            f"Pipeline {pipeline.name} is stuck; unresolved dependencies: {unresolved}"
-                        )
+                done, _ = wait(futures.keys(), return_when=FIRST_COMPLETED)
+                for future in sorted(done, key=lambda fut: order_index[futures[fut]]):
+                    step_id = futures.pop(future)
+                    results[step_id] = future.result()
+                    for child in dependents.get(step_id, []):
+                        remaining_deps[child].discard(step_id)
+                        if not remaining_deps[child]:
+                            heapq.heappush(ready, (order_index[child], child))
+        except BaseException:
+            failed = True
+            for future in futures:
+                future.cancel()
+            raise
+        finally:
+            for kind, executor in executors.items():
+                if kind == "asyncio":
+                    executor.shutdown()
+                else:
+                    executor.shutdown(wait=True, cancel_futures=failed)
 
         return results
@@ -3,7 +3,7 @@ from __future__ import annotations
 import json
 from dataclasses import dataclass, field
 from pathlib import Path
-from typing import Any, Dict, List
+from typing import Any, Dict, List, Optional
 
 import jsonschema
 import yaml
@@ -26,6 +26,8 @@ class CompiledStep:
     params: Dict[str, Any]
     depends_on: List[str]
     step_type: str
+    executor: Optional[str] = None
+    parallel: Optional[Dict[str, Any]] = None
 
 
 @dataclass
@@ -144,6 +146,8 @@ class PipelineCompiler:
                 params=step.get("params") or {},
                 depends_on=list(depends_on),
                 step_type=step.get("type") or component.type,
+                executor=step.get("executor"),
+                parallel=step.get("parallel"),
             )
             steps.append(compiled_step)
             log.debug("Compiled step %s using component %s", compiled_step.id, component_name)
@@ -11,15 +11,17 @@ from __future__ import annotations
 import importlib
 from typing import Any, Mapping, Literal, TYPE_CHECKING, Callable
 
+from .async_http_engine import AsyncHttpEngine
 from .base_engine import BaseEngine, EngineConfig, EngineError, EngineResult, RateLimitError
 from .engine_factory import create_engine
+from .playwright_engine import PlaywrightEngine
 from .rate_limiter import SimpleRateLimiter
 
 if TYPE_CHECKING:
     from .http_client import HttpRequestConfig
 
 
-EngineType = Literal["selenium", "http", "playwright", "groq_browser"]
+EngineType = Literal["selenium", "http", "async_http", "playwright", "groq_browser"]
 
 
 def _normalize_engine_type(raw: str | None) -> EngineType:
@@ -28,6 +30,8 @@ def _normalize_engine_type(raw: str | None) -> EngineType:
     raw = raw.strip().lower()
     if raw in ("http", "requests", "rest"):
         return "http"
+    if raw in ("async_http", "async-http", "httpx"):
+        return "async_http"
     if raw in ("playwright", "pw"):
         return "playwright"
     if raw in ("groq", "groq_browser", "groq-browser", "browserbase"):
@@ -43,7 +47,7 @@ def get_engine_type_for_source(source_config: Mapping[str, Any]) -> EngineType:
     Expects config structure like:
 
         engine:
-          type: selenium | http | playwright
+          type: selenium | http | async_http | playwright
     """
     engine_cfg = source_config.get("engine") or {}
     return _normalize_engine_type(engine_cfg.get("type"))
@@ -119,10 +123,12 @@ def get_groq_browser_engine():
 
 
 __all__ = [
+    "AsyncHttpEngine",
     "BaseEngine",
     "EngineConfig",
     "EngineError",
     "EngineResult",
+    "PlaywrightEngine",
     "RateLimitError",
     "create_engine",
     "get_engine_type_for_source",
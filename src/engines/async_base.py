@@ -0,0 +1,304 @@
+"""
+Shared plumbing for engines with an async API.
+
+:class:`AsyncEngine` implements everything that does not depend on how a page
+is fetched: per-source pacing, proxy selection and feedback, adaptive
+concurrency feedback (when the source enables it), the retry rules
+of :meth:`BaseEngine.fetch_with_retry` with ``asyncio.sleep``, the windowed
+``fetch_many`` stream, and a private event loop behind the synchronous
+``fetch``/``fetch_with_retry``/``fetch_all`` entry points. Subclasses provide
+``afetch`` and ``aclose`` and keep their loop-bound resources in
+``self._states`` (keyed by event loop).
+"""
+
+from __future__ import annotations
+
+import asyncio
+import threading
+import time
+from urllib.parse import urlsplit
+from typing import (
+    Any,
+    AsyncIterator,
+    Awaitable,
+    Dict,
+    Iterable,
+    List,
+    Optional,
+    Tuple,
+    TypeVar,
+    Union,
+)
+
+from src.common.logging_utils import get_logger, safe_log
+from src.engines.base_engine import (
+    BaseEngine,
+    EngineConfig,
+    EngineError,
+    EngineResult,
+    RateLimitError,
+)
+from src.resource_manager.adaptive_concurrency import get_concurrency_controller
+
+log = get_logger("async-engine")
+
+T = TypeVar("T")
+
+FetchOutcome = Union[EngineResult, EngineError]
+
+
+class _LoopThread:
+    """Background event loop used by the synchronous entry points."""
+
+    def __init__(self, name: str) -> None:
+        self.loop = asyncio.new_event_loop()
+        self._thread = threading.Thread(target=self.loop.run_forever, name=name, daemon=True)
+        self._thread.start()
+
+    def run(self, coro: Awaitable[T]) -> T:
+        return asyncio.run_coroutine_threadsafe(coro, self.loop).result()  # type: ignore[arg-type]
+
+    def shutdown(self) -> None:
+        self.loop.call_soon_threadsafe(self.loop.stop)
+        self._thread.join()
+        self.loop.close()
+
+
+class AsyncEngine(BaseEngine):
+    """Base class for engines whose native API is ``async``."""
+
+    #: Exceptions (as ``__cause__`` of an :class:`EngineError`) worth retrying.
+    transient_errors: Tuple[type, ...] = (asyncio.TimeoutError,)
+
+    def __init__(
+        self,
+        config: EngineConfig,
+        *,
+        source: Optional[str] = None,
+        limiter: Optional[Any] = None,
+        proxy_pool: Optional[Any] = None,
+    ):
+        super().__init__(config)
+        self.source = source
+        self.limiter = limiter
+        self.proxy_pool = proxy_pool
+        self.concurrency = get_concurrency_controller(source) if source else None
+        self._states: Dict[asyncio.AbstractEventLoop, Any] = {}
+        self._runner: Optional[_LoopThread] = None
+        self._runner_lock = threading.Lock()
+
+    # ------------------------------------------------------------ subclass API
+    async def afetch(self, url: str, **kwargs: Any) -> EngineResult:
+        raise NotImplementedError
+
+    async def aclose(self) -> None:
+        """Release the resources bound to the running event loop."""
+        raise NotImplementedError
+
+    def _default_window(self) -> int:
+        """Default number of URLs ``fetch_many`` keeps in flight."""
+        return 10
+
+    # --------------------------------------------------------------- proxies
+    def _choose_proxy(self, url: Optional[str] = None) -> Optional[str]:
+        """The fixed proxy, or the pool's pick for ``url``'s host (latency-aware)."""
+        if self.config.proxy:
+            return self.config.proxy
+        if self.proxy_pool is not None and self.source:
+            site = urlsplit(url).hostname if url else None
+            return self.proxy_pool.choose_proxy(self.source, site=site)
+        return None
+
+    def _report_proxy(
+        self,
+        proxy: Optional[str],
+        ok: bool,
+        latency: Optional[float] = None,
+        url: Optional[str] = None,
+    ) -> None:
+        if (
+            proxy is None
+            or self.proxy_pool is None
+            or not self.source
+            or proxy == self.config.proxy
+        ):
+            return
+        if ok:
+            site = urlsplit(url).hostname if url else None
+            self.proxy_pool.mark_success(self.source, proxy, latency=latency, site=site)
+        else:
+            self.proxy_pool.mark_failure(self.source, proxy)
+
+    async def _pace(self) -> None:
+        """Wait on the configured limiters before an attempt without blocking the loop."""
+        if self.config.rate_limiter:
+            await asyncio.to_thread(self.config.rate_limiter.wait)
+        if self.limiter is not None and float(getattr(self.limiter, "max_qps", 0) or 0) > 0:
+            if asyncio.iscoroutinefunction(getattr(self.limiter, "acquire", None)):
+                await self.limiter.acquire()
+            else:
+                await asyncio.to_thread(self.limiter.wait)
+
+    # ----------------------------------------------------------------- async
+    def _should_retry(self, attempt: int, error: Exception) -> bool:
+        """Base rules, plus wrapped transport errors (timeouts, refused/reset connections)."""
+        if super()._should_retry(attempt, error):
+            return True
+        transient = isinstance(error.__cause__, self.transient_errors)
+        return attempt < self.config.max_retries and transient
+
+    async def afetch_with_retry(self, url: str, **kwargs: Any) -> EngineResult:
+        """Async counterpart of :meth:`BaseEngine.fetch_with_retry`."""
+        attempt = 0
+        last_error: Optional[Exception] = None
+
+        while attempt <= self.config.max_retries:
+            await self._pace()
+
+            started = time.perf_counter()
+            try:
+                result = await self.afetch(url, **kwargs)
+                if self.concurrency is not None:
+                    self.concurrency.observe(
+                        time.perf_counter() - started, status_code=result.status_code
+                    )
+                return result
+            except RateLimitError as exc:
+                last_error = exc
+                if self.concurrency is not None:
+                    self.concurrency.observe(rate_limited=True)
+                safe_log(
+                    log, "warning", "Rate limit detected", extra={"url": url, "attempt": attempt}
+                )
+                if attempt < self.config.max_retries:
+                    await asyncio.sleep(self._calculate_backoff(attempt) * 2)
+            except Exception as exc:
+                last_error = exc
+                if self.concurrency is not None:
+                    status_code = getattr(exc, "status_code", None)
+                    self.concurrency.observe(status_code=status_code, error=True)
+                if not self._should_retry(attempt, exc):
+                    break
+
+                safe_log(
+                    log,
+                    "warning",
+                    "Fetch failed, retrying",
+                    extra={"url": url, "attempt": attempt, "error": type(exc).__name__},
+                )
+
+            attempt += 1
+            if attempt <= self.config.max_retries:
+                await asyncio.sleep(self._calculate_backoff(attempt))
+
+        raise EngineError(
+            f"Failed to fetch {url} after {self.config.max_retries} retries",
+            url=url,
+            retries_exhausted=True,
+        ) from last_error
+
+    async def _fetch_indexed(
+        self,
+        urls: Iterable[str],
+        concurrency: Optional[int],
+        kwargs: Dict[str, Any],
+    ) -> AsyncIterator[Tuple[int, FetchOutcome]]:
+        window = max(int(concurrency or self._default_window()), 1)
+
+        async def _one(index: int, url: str) -> Tuple[int, FetchOutcome]:
+            try:
+                return index, await self.afetch_with_retry(url, **kwargs)
+            except EngineError as exc:
+                return index, exc
+
+        pending: set = set()
+        queued = enumerate(urls)
+        try:
+            while True:
+                # An adaptive controller can narrow the window between completions.
+                limit = window
+                if self.concurrency is not None:
+                    limit = min(window, self.concurrency.concurrency)
+                while len(pending) < limit:
+                    item = next(queued, None)
+                    if item is None:
+                        break
+                    pending.add(asyncio.ensure_future(_one(*item)))
+                if not pending:
+                    return
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    yield task.result()
+        finally:
+            for task in pending:
+                task.cancel()
+
+    async def fetch_many(
+        self,
+        urls: Iterable[str],
+        *,
+        concurrency: Optional[int] = None,
+        **kwargs: Any,
+    ) -> AsyncIterator[FetchOutcome]:
+        """
+        Fetch ``urls`` concurrently, yielding results as they complete.
+
+        At most ``concurrency`` (default: the engine's pool size) fetches are
+        in flight, and ``urls`` is consumed lazily, so it may be a generator.
+        Each URL goes through :meth:`afetch_with_retry`; a URL that still
+        fails is yielded as its :class:`EngineError` (``exc.url`` names it)
+        rather than aborting the stream.
+        """
+        async for _index, outcome in self._fetch_indexed(urls, concurrency, kwargs):
+            yield outcome
+
+    async def __aenter__(self) -> "AsyncEngine":
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb) -> bool:
+        await self.aclose()
+        return False
+
+    # ------------------------------------------------------------------ sync
+    def _run(self, coro: Awaitable[T]) -> T:
+        with self._runner_lock:
+            if self._runner is None:
+                self._runner = _LoopThread(type(self).__name__)
+        return self._runner.run(coro)
+
+    def fetch(self, url: str, **kwargs: Any) -> EngineResult:
+        """Blocking single fetch on the engine's private event loop."""
+        return self._run(self.afetch(url, **kwargs))
+
+    def fetch_with_retry(self, url: str, **kwargs: Any) -> EngineResult:
+        return self._run(self.afetch_with_retry(url, **kwargs))
+
+    def fetch_all(
+        self, urls: Iterable[str], *, concurrency: Optional[int] = None, **kwargs: Any
+    ) -> List[FetchOutcome]:
+        """Blocking ``fetch_many`` that returns outcomes in input order."""
+
+        async def _collect() -> List[FetchOutcome]:
+            collected: Dict[int, FetchOutcome] = {}
+            async for index, outcome in self._fetch_indexed(urls, concurrency, kwargs):
+                collected[index] = outcome
+            return [collected[index] for index in range(len(collected))]
+
+        return self._run(_collect())
+
+    def cleanup(self) -> None:
+        """Release resources on the private loop and stop it.
+
+        Resources opened on a caller's event loop are released by
+        ``aclose()`` (or ``async with``); any left behind are dropped here.
+        """
+        if self._runner is not None:
+            if self._runner.loop in self._states:
+                self._runner.run(self.aclose())
+            self._runner.shutdown()
+            self._runner = None
+        self._states.clear()
+        self._mark_closed()
+
+
+__all__ = ["AsyncEngine", "FetchOutcome"]
@@ -0,0 +1,298 @@
+"""
+Async HTTP engine with a shared keep-alive pool.
+
+``HttpEngine`` fetches one page per blocking call, so a crawl is only as fast
+as its thread count. :class:`AsyncHttpEngine` keeps the :class:`BaseEngine`
+contract for existing callers and adds an async API that multiplexes many
+requests over one connection pool per event loop:
+
+- ``aiohttp`` backend (default): a single ``ClientSession`` whose
+  ``TCPConnector`` enforces the pool-wide and per-host connection limits;
+  proxies are applied per request, so rotation shares the pool.
+- ``httpx`` backend: used for HTTP/2 (needs the optional ``h2`` package), for
+  custom transports such as ``httpx.MockTransport``, or when aiohttp is not
+  installed. httpx binds proxies per client, so there is one client per proxy
+  and per-host limits are enforced with semaphores.
+
+Both honour the per-source :class:`~src.resource_manager.rate_limiter.RateLimiter`
+(QPS, and ``max_concurrent`` as an in-flight cap), optional
+:class:`~src.resource_manager.proxy_pool.ProxyPool` rotation with
+success/failure feedback, and the retry/backoff rules of
+:meth:`BaseEngine.fetch_with_retry` with ``asyncio.sleep`` instead of blocking
+sleeps.
+
+``fetch_many`` streams results in completion order; synchronous callers use
+``fetch``/``fetch_with_retry``/``fetch_all``, which run on a private event
+loop owned by the engine (see :class:`~src.engines.async_base.AsyncEngine`).
+"""
+
+from __future__ import annotations
+
+import asyncio
+import importlib.util
+import time
+from dataclasses import dataclass, field
+from typing import Any, Dict, Optional, Tuple
+
+import httpx
+
+from src.common.logging_utils import get_logger, safe_log
+from src.engines.async_base import AsyncEngine
+from src.engines.base_engine import EngineConfig, EngineError, EngineResult, RateLimitError
+
+try:
+    import aiohttp
+except ImportError:  # pragma: no cover - optional dependency
+    aiohttp = None  # type: ignore[assignment]
+
+log = get_logger("async-http-engine")
+
+BACKENDS = ("aiohttp", "httpx")
+
+_TRANSIENT_ERRORS: Tuple[type, ...] = (httpx.TransportError, asyncio.TimeoutError)
+if aiohttp is not None:
+    _TRANSIENT_ERRORS += (aiohttp.ClientConnectionError,)
+
+
+@dataclass
+class _Response:
+    status_code: int
+    text: str
+    headers: Dict[str, str]
+    url: str
+    http_version: str
+
+
+@dataclass
+class _LoopState:
+    """Connection pools and semaphores bound to one event loop."""
+
+    session: Any = None  # aiohttp.ClientSession
+    clients: Dict[Optional[str], httpx.AsyncClient] = field(default_factory=dict)
+    host_slots: Dict[str, asyncio.Semaphore] = field(default_factory=dict)
+    in_flight: Optional[asyncio.Semaphore] = None
+
+
+def _http2_available() -> bool:
+    return importlib.util.find_spec("h2") is not None
+
+
+class AsyncHttpEngine(AsyncEngine):
+    """HTTP engine with an async, connection-pooled ``fetch_many``."""
+
+    transient_errors = _TRANSIENT_ERRORS
+
+    def __init__(
+        self,
+        config: EngineConfig,
+        *,
+        source: Optional[str] = None,
+        max_connections: int = 100,
+        max_connections_per_host: int = 10,
+        http2: bool = False,
+        backend: Optional[str] = None,
+        limiter: Optional[Any] = None,
+        proxy_pool: Optional[Any] = None,
+        transport: Optional[httpx.AsyncBaseTransport] = None,
+    ):
+        """
+        Args:
+            config: Shared engine configuration. ``config.proxy`` pins every
+                request to one proxy; otherwise ``proxy_pool`` is consulted.
+            source: Source key used for proxy rotation and logging.
+            max_connections: Pool-wide connection cap, also the default
+                ``fetch_many`` window.
+            max_connections_per_host: Connections allowed per host.
+            http2: Negotiate HTTP/2 via httpx when the optional ``h2`` package
+                is installed; falls back to HTTP/1.1 otherwise.
+            backend: ``"aiohttp"`` or ``"httpx"``; chosen automatically when
+                omitted (see module docstring).
+            limiter: Per-source ``RateLimiter``; its ``max_qps`` paces request
+                starts and ``max_concurrent`` caps in-flight requests.
+            proxy_pool: ``ProxyPool`` used to pick a proxy per request.
+            transport: Custom httpx transport (e.g. ``httpx.MockTransport``);
+                it replaces the network layer, so proxies are not applied.
+        """
+        super().__init__(config, source=source, limiter=limiter, proxy_pool=proxy_pool)
+        self.max_connections = max(int(max_connections), 1)
+        self.max_connections_per_host = max(int(max_connections_per_host), 1)
+        self.http2 = bool(http2) and _http2_available()
+        if http2 and not self.http2:
+            safe_log(
+                log,
+                "warning",
+                "HTTP/2 requested but 'h2' is not installed; using HTTP/1.1",
+                {"source": source},
+            )
+        self.backend = self._resolve_backend(backend, transport)
+        self.transport = transport
+
+    def _resolve_backend(
+        self, backend: Optional[str], transport: Optional[httpx.AsyncBaseTransport]
+    ) -> str:
+        if backend is not None:
+            backend = backend.lower()
+            if backend not in BACKENDS:
+                raise ValueError(
+                    f"Unknown async HTTP backend '{backend}'; expected one of {BACKENDS}"
+                )
+            if backend == "aiohttp" and aiohttp is None:
+                raise RuntimeError("The aiohttp backend requires the 'aiohttp' package")
+            return backend
+        if self.http2 or transport is not None or aiohttp is None:
+            return "httpx"
+        return "aiohttp"
+
+    # ------------------------------------------------------------ loop state
+    def _state(self) -> _LoopState:
+        loop = asyncio.get_running_loop()
+        state = self._states.get(loop)
+        if state is None:
+            state = _LoopState()
+            max_concurrent = int(getattr(self.limiter, "max_concurrent", 0) or 0)
+            if max_concurrent > 0:
+                state.in_flight = asyncio.Semaphore(max_concurrent)
+            if self.backend == "aiohttp":
+                state.session = aiohttp.ClientSession(
+                    connector=aiohttp.TCPConnector(
+                        limit=self.max_connections,
+                        limit_per_host=self.max_connections_per_host,
+                    ),
+                    headers=self.config.headers,
+                    timeout=aiohttp.ClientTimeout(total=self.config.timeout),
+                )
+            self._states[loop] = state
+        return state
+
+    def _client(self, state: _LoopState, proxy: Optional[str]) -> httpx.AsyncClient:
+        client = state.clients.get(proxy)
+        if client is None:
+            client = httpx.AsyncClient(
+                headers=self.config.headers,
+                timeout=self.config.timeout,
+                limits=httpx.Limits(
+                    max_connections=self.max_connections,
+                    max_keepalive_connections=self.max_connections,
+                ),
+                http2=self.http2,
+                proxy=None if self.transport is not None else proxy,
+                transport=self.transport,
+                follow_redirects=True,
+            )
+            state.clients[proxy] = client
+        return client
+
+    def _host_slot(self, state: _LoopState, url: str) -> asyncio.Semaphore:
+        parsed = httpx.URL(url)
+        host = f"{parsed.host}:{parsed.port or ''}"
+        slot = state.host_slots.get(host)
+        if slot is None:
+            slot = asyncio.Semaphore(self.max_connections_per_host)
+            state.host_slots[host] = slot
+        return slot
+
+    # ---------------------------------------------------------------- async
+    async def _send_aiohttp(
+        self, state: _LoopState, method: str, url: str, proxy: Optional[str], kwargs: Dict[str, Any]
+    ) -> _Response:
+        async with state.session.request(method, url, proxy=proxy, **kwargs) as response:
+            text = await response.text(errors="replace")
+            return _Response(
+                status_code=response.status,
+                text=text,
+                headers=dict(response.headers),
+                url=str(response.url),
+                http_version=f"HTTP/{response.version.major}.{response.version.minor}",
+            )
+
+    async def _send_httpx(
+        self, state: _LoopState, method: str, url: str, proxy: Optional[str], kwargs: Dict[str, Any]
+    ) -> _Response:
+        async with self._host_slot(state, url):
+            response = await self._client(state, proxy).request(method, url, **kwargs)
+        return _Response(
+            status_code=response.status_code,
+            text=response.text,
+            headers=dict(response.headers),
+            url=str(response.url),
+            http_version=response.http_version,
+        )
+
+    async def afetch(self, url: str, method: str = "GET", **kwargs: Any) -> EngineResult:
+        """
+        Fetch ``url`` once. Status handling matches :meth:`HttpEngine.fetch`,
+        except that 429 raises :class:`RateLimitError` so it gets the longer
+        rate-limit backoff. ``kwargs`` go to the backend's ``request`` call
+        (``params``, ``headers``, ``json`` and ``data`` work on both).
+
+        Raises:
+            EngineError on failure
+        """
+        if self._closed:
+            raise EngineError("Engine has been closed")
+
+        state = self._state()
+        proxy = self._choose_proxy(url)
+        send = self._send_aiohttp if self.backend == "aiohttp" else self._send_httpx
+        in_flight = state.in_flight
+
+        if in_flight is not None:
+            await in_flight.acquire()
+        try:
+            start = time.time()
+            response = await send(state, method, url, proxy, kwargs)
+            elapsed = time.time() - start
+        except (asyncio.TimeoutError, httpx.TimeoutException) as exc:
+            self._report_proxy(proxy, ok=False)
+            raise EngineError(f"Request timeout: {exc}", url=url) from exc
+        except _TRANSIENT_ERRORS as exc:
+            self._report_proxy(proxy, ok=False)
+            raise EngineError(f"Connection error: {exc}", url=url) from exc
+        except (httpx.HTTPError, *((aiohttp.ClientError,) if aiohttp is not None else ())) as exc:
+            raise EngineError(f"Request failed: {exc}", url=url) from exc
+        finally:
+            if in_flight is not None:
+                in_flight.release()
+
+        if response.status_code == 429:
+            self._report_proxy(proxy, ok=False)
+            raise RateLimitError(
+                f"Rate limited: {response.status_code}", url=url, status_code=response.status_code
+            )
+        if response.status_code >= 500:
+            self._report_proxy(proxy, ok=False)
+            raise EngineError(
+                f"Server error: {response.status_code}", url=url, status_code=response.status_code
+            )
+        self._report_proxy(proxy, ok=True, latency=elapsed, url=url)
+
+        return EngineResult(
+            url=response.url,
+            status_code=response.status_code,
+            content=response.text,
+            headers=response.headers,
+            elapsed_seconds=elapsed,
+            metadata={
+                "method": method,
+                "final_url": response.url,
+                "http_version": response.http_version,
+                "proxy": proxy,
+                "backend": self.backend,
+            },
+        )
+
+    def _default_window(self) -> int:
+        return self.max_connections
+
+    async def aclose(self) -> None:
+        """Close the connection pools bound to the running event loop."""
+        state = self._states.pop(asyncio.get_running_loop(), None)
+        if state is None:
+            return
+        closers = [client.aclose() for client in state.clients.values()]
+        if state.session is not None:
+            closers.append(state.session.close())
+        await asyncio.gather(*closers)
+
+
+__all__ = ["AsyncHttpEngine"]
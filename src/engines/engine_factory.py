@@ -6,14 +6,24 @@ This provides dependency injection and unified engine creation.
 
 from __future__ import annotations
 
+from dataclasses import replace
 from typing import Any, Mapping, Optional
 
 from src.common.logging_utils import get_logger
+from src.engines.async_http_engine import AsyncHttpEngine
 from src.engines.base_engine import BaseEngine, EngineConfig
 from src.engines.groq_browser import GroqBrowserAutomationClient
+from src.engines.http_cache import get_http_cache
 from src.engines.http_engine import HttpEngine
+from src.engines.playwright_engine import (
+    DEFAULT_BLOCKED_HOSTS,
+    DEFAULT_BLOCKED_RESOURCE_TYPES,
+    PlaywrightEngine,
+)
 from src.engines.rate_limiter import SimpleRateLimiter
 from src.engines.selenium_engine import BrowserSession, create_driver, open_with_session
+from src.resource_manager.proxy_pool import get_default_proxy_pool
+from src.resource_manager.rate_limiter import get_rate_limiter
 from src.sessions.session_manager import SessionRecord
 
 log = get_logger("engine-factory")
@@ -30,7 +40,7 @@ def create_engine(
     Create an engine instance based on type and configuration.
 
     Args:
-        engine_type: Engine type ('http', 'selenium', 'playwright', 'groq_browser')
+        engine_type: Engine type ('http', 'async_http', 'selenium', 'playwright', 'groq_browser')
         source_config: Source configuration dict
         proxy: Optional proxy string
         session_record: Optional session record for browser engines
@@ -63,7 +73,25 @@ def create_engine(
     engine_type = engine_type.lower().strip()
 
     if engine_type in ("http", "requests", "rest"):
-        return HttpEngine(config)
+        source = source_config.get("source")
+        return HttpEngine(config, cache=get_http_cache(source) if source else None)
+
+    elif engine_type in ("async_http", "async-http", "httpx"):
+        # Paced by the shared per-source RateLimiter instead of a per-call
+        # SimpleRateLimiter sleep, which would not bound concurrent requests.
+        source = source_config.get("source")
+        return AsyncHttpEngine(
+            replace(config, rate_limiter=None),
+            source=source,
+            max_connections=int(engine_cfg.get("max_connections", 100)),
+            max_connections_per_host=int(engine_cfg.get("max_connections_per_host", 10)),
+            http2=bool(engine_cfg.get("http2", False)),
+            backend=engine_cfg.get("backend"),
+            limiter=get_rate_limiter(source) if source else None,
+            proxy_pool=(
+                get_default_proxy_pool() if source and engine_cfg.get("rotate_proxies") else None
+            ),
+        )
 
     elif engine_type in ("selenium", "chrome", "webdriver"):
         # Selenium engine is special - it returns BrowserSession, not BaseEngine
@@ -74,8 +102,26 @@ def create_engine(
             raise ValueError("Selenium engine requires session_record")
 
     elif engine_type in ("playwright", "pw"):
-        # Playwright is async - needs special handling
-        raise NotImplementedError("Playwright engine wrapper not yet implemented")
+        # One browser per engine with a pool of contexts; like async_http it is
+        # paced by the shared per-source RateLimiter.
+        source = source_config.get("source")
+        return PlaywrightEngine(
+            replace(config, rate_limiter=None),
+            source=source,
+            browser=engine_cfg.get("browser", "chromium"),
+            headless=bool(engine_cfg.get("headless", True)),
+            contexts=int(engine_cfg.get("contexts", 4)),
+            pages_per_context=int(engine_cfg.get("pages_per_context", 4)),
+            recycle_after_pages=int(engine_cfg.get("recycle_after_pages", 500)),
+            wait_until=engine_cfg.get("wait_until", "domcontentloaded"),
+            block_resources=engine_cfg.get("block_resources", DEFAULT_BLOCKED_RESOURCE_TYPES),
+            blocked_hosts=engine_cfg.get("blocked_hosts", DEFAULT_BLOCKED_HOSTS),
+            session_records=[session_record] if session_record else None,
+            limiter=get_rate_limiter(source) if source else None,
+            proxy_pool=(
+                get_default_proxy_pool() if source and engine_cfg.get("rotate_proxies") else None
+            ),
+        )
 
     elif engine_type in ("groq", "groq_browser", "groq-browser", "browserbase"):
         # Groq browser automation
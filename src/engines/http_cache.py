@@ -0,0 +1,332 @@
+"""
+Conditional-request HTTP cache for the fetch layer.
+
+Daily re-scrapes mostly refetch pages that have not changed. :class:`HttpCache`
+keeps, per URL, the last response body (zlib-compressed) together with its
+``ETag``/``Last-Modified`` validators and a sha256 of the body, in one SQLite
+file per source under ``OUTPUT_DIR/http_cache/``:
+
+- entries younger than the source's ``ttl_seconds`` are served without a
+  request (``fresh``);
+- older entries are revalidated with ``If-None-Match``/``If-Modified-Since``;
+  a ``304`` serves the stored body (``revalidated``);
+- a full ``200`` whose body hash matches the stored one is ``unchanged``.
+
+In all three cases results are flagged ``not_modified`` and the page is not
+parsed again: ``HttpFetchAgent`` records the flag and ``HtmlParseAgent`` skips
+the page. The file is kept under ``max_bytes`` (compressed bodies) by evicting
+least recently used entries. Counters go to :mod:`src.observability.metrics`:
+``http_cache_hits{kind}``, ``http_cache_misses``, ``http_cache_bytes_saved``
+and ``http_cache_evictions``, all labelled by ``source``.
+
+Per-source policy lives in ``config/sources/<source>.yaml``::
+
+    http_cache:
+      enabled: true
+      ttl_seconds: 0          # 0 = always revalidate
+      max_bytes: 536870912
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import sqlite3
+import threading
+import time
+import zlib
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Dict, Mapping, Optional, Tuple
+from urllib.parse import urlencode
+
+from src.common.logging_utils import get_logger
+from src.common.paths import OUTPUT_DIR
+from src.observability import metrics
+from src.resource_manager.settings import get_http_cache_settings
+
+log = get_logger("http-cache")
+
+HTTP_CACHE_DIR = OUTPUT_DIR / "http_cache"
+DEFAULT_MAX_BYTES = 512 * 1024 * 1024
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS entries (
+    url TEXT PRIMARY KEY,
+    status_code INTEGER NOT NULL,
+    headers TEXT NOT NULL,
+    etag TEXT,
+    last_modified TEXT,
+    body_hash TEXT NOT NULL,
+    body BLOB NOT NULL,
+    size INTEGER NOT NULL,
+    body_bytes INTEGER NOT NULL,
+    stored_at REAL NOT NULL,
+    accessed_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS entries_accessed_at ON entries (accessed_at);
+"""
+
+
+@dataclass
+class CachedResponse:
+    """A stored response and its validators."""
+
+    url: str
+    status_code: int
+    headers: Dict[str, str]
+    etag: Optional[str]
+    last_modified: Optional[str]
+    body_hash: str
+    text: str
+    body_bytes: int
+    stored_at: float
+
+
+def cache_key(url: str, params: Optional[Mapping[str, Any]] = None) -> str:
+    """Key a GET by its URL including query ``params``."""
+
+    if not params:
+        return url
+    return f"{url}{'&' if '?' in url else '?'}{urlencode(params, doseq=True)}"
+
+
+def body_hash(text: str) -> str:
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+def _header(headers: Mapping[str, str], name: str) -> Optional[str]:
+    lowered = name.lower()
+    for key, value in headers.items():
+        if key.lower() == lowered:
+            return value
+    return None
+
+
+class HttpCache:
+    """SQLite-backed, size-bounded LRU cache of GET responses for one source."""
+
+    def __init__(
+        self,
+        path: Path,
+        *,
+        source: str = "default",
+        ttl_seconds: float = 0.0,
+        max_bytes: int = DEFAULT_MAX_BYTES,
+    ) -> None:
+        self.path = path
+        self.source = source
+        self.ttl_seconds = max(float(ttl_seconds or 0.0), 0.0)
+        self.max_bytes = max(int(max_bytes), 0)
+        self._lock = threading.RLock()
+
+        path.parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(str(path), check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(_SCHEMA)
+        self._conn.commit()
+        self._total_bytes = int(
+            self._conn.execute("SELECT COALESCE(SUM(size), 0) FROM entries").fetchone()[0]
+        )
+
+    # ------------------------------------------------------------------- reads
+    def lookup(self, url: str) -> Optional[CachedResponse]:
+        """Return the stored entry for ``url`` (marking it recently used)."""
+
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT status_code, headers, etag, last_modified, body_hash, body, body_bytes, "
+                "stored_at FROM entries WHERE url = ?",
+                (url,),
+            ).fetchone()
+            if row is None:
+                return None
+            with self._conn:
+                self._conn.execute(
+                    "UPDATE entries SET accessed_at = ? WHERE url = ?", (time.time(), url)
+                )
+        status_code, headers, etag, last_modified, digest, body, body_bytes, stored_at = row
+        return CachedResponse(
+            url=url,
+            status_code=status_code,
+            headers=json.loads(headers),
+            etag=etag,
+            last_modified=last_modified,
+            body_hash=digest,
+            text=zlib.decompress(body).decode("utf-8"),
+            body_bytes=body_bytes,
+            stored_at=stored_at,
+        )
+
+    def is_fresh(self, entry: CachedResponse) -> bool:
+        return self.ttl_seconds > 0 and time.time() - entry.stored_at < self.ttl_seconds
+
+    @staticmethod
+    def conditional_headers(entry: Optional[CachedResponse]) -> Dict[str, str]:
+        """``If-None-Match``/``If-Modified-Since`` headers for revalidating ``entry``."""
+
+        if entry is None:
+            return {}
+        headers: Dict[str, str] = {}
+        if entry.etag:
+            headers["If-None-Match"] = entry.etag
+        if entry.last_modified:
+            headers["If-Modified-Since"] = entry.last_modified
+        return headers
+
+    # ------------------------------------------------------------------ writes
+    def record_fresh_hit(self, entry: CachedResponse) -> None:
+        """Count a hit served without any request."""
+
+        metrics.incr("http_cache_hits", source=self.source, kind="fresh")
+        metrics.incr("http_cache_bytes_saved", entry.body_bytes, source=self.source)
+
+    def revalidated(self, entry: CachedResponse, headers: Mapping[str, str]) -> CachedResponse:
+        """Handle a ``304``: restart the entry's TTL and adopt any new validators."""
+
+        etag = _header(headers, "ETag") or entry.etag
+        last_modified = _header(headers, "Last-Modified") or entry.last_modified
+        now = time.time()
+        with self._lock, self._conn:
+            self._conn.execute(
+                "UPDATE entries SET etag = ?, last_modified = ?, stored_at = ?, accessed_at = ? "
+                "WHERE url = ?",
+                (etag, last_modified, now, now, entry.url),
+            )
+        metrics.incr("http_cache_hits", source=self.source, kind="revalidated")
+        metrics.incr("http_cache_bytes_saved", entry.body_bytes, source=self.source)
+        entry.etag, entry.last_modified, entry.stored_at = etag, last_modified, now
+        return entry
+
+    def store(
+        self,
+        url: str,
+        status_code: int,
+        headers: Mapping[str, str],
+        text: str,
+        *,
+        previous: Optional[CachedResponse] = None,
+    ) -> Tuple[CachedResponse, bool]:
+        """Store a full response; returns ``(entry, unchanged)``.
+
+        ``unchanged`` is true when the body hash equals ``previous``'s, i.e.
+        the page was re-downloaded but did not change.
+        """
+
+        encoded = text.encode("utf-8")
+        digest = hashlib.sha256(encoded).hexdigest()
+        unchanged = previous is not None and previous.body_hash == digest
+        header_map = dict(headers)
+        entry = CachedResponse(
+            url=url,
+            status_code=status_code,
+            headers=header_map,
+            etag=_header(header_map, "ETag"),
+            last_modified=_header(header_map, "Last-Modified"),
+            body_hash=digest,
+            text=text,
+            body_bytes=len(encoded),
+            stored_at=time.time(),
+        )
+        if unchanged:
+            metrics.incr("http_cache_hits", source=self.source, kind="unchanged")
+        else:
+            metrics.incr("http_cache_misses", source=self.source)
+
+        body = zlib.compress(encoded, 6)
+        size = len(body) + len(url)
+        with self._lock:
+            old = self._conn.execute("SELECT size FROM entries WHERE url = ?", (url,)).fetchone()
+            with self._conn:
+                self._conn.execute(
+                    "INSERT OR REPLACE INTO entries VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                    (
+                        url,
+                        status_code,
+                        json.dumps(header_map),
+                        entry.etag,
+                        entry.last_modified,
+                        digest,
+                        body,
+                        size,
+                        entry.body_bytes,
+                        entry.stored_at,
+                        entry.stored_at,
+                    ),
+                )
+            self._total_bytes += size - (old[0] if old else 0)
+            if self._total_bytes > self.max_bytes:
+                self._evict()
+        return entry, unchanged
+
+    def _evict(self) -> None:
+        """Drop least recently used entries until 90% of ``max_bytes``."""
+
+        target = int(self.max_bytes * 0.9)
+        with self._conn:
+            cursor = self._conn.execute("SELECT url, size FROM entries ORDER BY accessed_at")
+            victims = []
+            for url, size in cursor:
+                if self._total_bytes <= target:
+                    break
+                victims.append((url,))
+                self._total_bytes -= size
+            self._conn.executemany("DELETE FROM entries WHERE url = ?", victims)
+            evicted = len(victims)
+        if evicted:
+            metrics.incr("http_cache_evictions", evicted, source=self.source)
+            log.debug("Evicted %d HTTP cache entries for %s", evicted, self.source)
+
+    # --------------------------------------------------------------- lifecycle
+    @property
+    def total_bytes(self) -> int:
+        return self._total_bytes
+
+    def __len__(self) -> int:
+        with self._lock:
+            return int(self._conn.execute("SELECT COUNT(*) FROM entries").fetchone()[0])
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+
+_default_caches: Dict[str, Optional[HttpCache]] = {}
+_default_caches_lock = threading.Lock()
+
+
+def get_http_cache(source: str, *, root: Optional[Path] = None) -> Optional[HttpCache]:
+    """Obtain (or open) the cache for ``source``; ``None`` unless enabled in its config."""
+
+    with _default_caches_lock:
+        if source not in _default_caches:
+            settings = get_http_cache_settings(source)
+            cache: Optional[HttpCache] = None
+            if settings.get("enabled"):
+                cache = HttpCache(
+                    (root or HTTP_CACHE_DIR) / f"{source}.sqlite",
+                    source=source,
+                    ttl_seconds=float(settings.get("ttl_seconds") or 0.0),
+                    max_bytes=int(settings.get("max_bytes") or DEFAULT_MAX_BYTES),
+                )
+            _default_caches[source] = cache
+        return _default_caches[source]
+
+
+def cache_metadata(status: str) -> Dict[str, Any]:
+    """Result metadata for a cache outcome (``miss``/``fresh``/``revalidated``/``unchanged``)."""
+
+    return {"cache": status, "not_modified": status in ("fresh", "revalidated", "unchanged")}
+
+
+__all__ = [
+    "CachedResponse",
+    "DEFAULT_MAX_BYTES",
+    "HTTP_CACHE_DIR",
+    "HttpCache",
+    "body_hash",
+    "cache_key",
+    "cache_metadata",
+    "get_http_cache",
+]
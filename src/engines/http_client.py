@@ -7,6 +7,7 @@ This is intentionally simple but robust:
 - Optional SimpleRateLimiter integration
 - Retries with backoff on transient failures
 - Proxy support via a single proxy string
+- Optional conditional-request cache (see ``http_cache``)
 """
 
 from __future__ import annotations
@@ -20,6 +21,7 @@ import requests
 from requests import Response
 
 from src.common.logging_utils import sanitize_for_log, safe_log
+from .http_cache import HttpCache, cache_key
 from .rate_limiter import SimpleRateLimiter
 
 log = logging.getLogger("http-engine")
@@ -56,6 +58,10 @@ class HttpRequestConfig:
 class HttpResult:
     """
     Result of a successful HTTP request.
+
+    ``not_modified`` is set when the body is known to match the previous
+    fetch (cache ``fresh``/``revalidated``/``unchanged``), so callers can skip
+    parsing it again.
     """
 
     url: str
@@ -63,6 +69,8 @@ class HttpResult:
     text: str
     headers: Dict[str, str]
     elapsed_seconds: float
+    not_modified: bool = False
+    cache_status: Optional[str] = None
 
 
 def _build_proxies(proxy: Optional[str]) -> Optional[Dict[str, str]]:
@@ -83,11 +91,14 @@ def send_request(
     *,
     session: Optional[requests.Session] = None,
     rate_limiter: Optional[SimpleRateLimiter] = None,
+    cache: Optional[HttpCache] = None,
 ) -> HttpResult:
     """
     Core HTTP request function with retries and optional rate limiting.
 
-    This is the only function pipelines should call directly.
+    This is the only function pipelines should call directly. With a
+    ``cache``, GETs are served fresh from it or revalidated with
+    ``If-None-Match``/``If-Modified-Since``; a 304 returns the cached body.
 
     Raises:
         RuntimeError if all retries are exhausted or status is not allowed.
@@ -95,6 +106,25 @@ def send_request(
 
     sess = session or requests.Session()
     proxies = _build_proxies(cfg.proxy)
+    headers = cfg.headers
+
+    if cfg.method.upper() != "GET":
+        cache = None
+    key = cache_key(cfg.url, cfg.params)
+    cached = cache.lookup(key) if cache is not None else None
+    if cached is not None:
+        if cache.is_fresh(cached):
+            cache.record_fresh_hit(cached)
+            return HttpResult(
+                url=cached.url,
+                status_code=cached.status_code,
+                text=cached.text,
+                headers=cached.headers,
+                elapsed_seconds=0.0,
+                not_modified=True,
+                cache_status="fresh",
+            )
+        headers = {**HttpCache.conditional_headers(cached), **(cfg.headers or {})}
 
     attempt = 0
     last_exc: Optional[Exception] = None
@@ -109,7 +139,7 @@ def send_request(
             resp: Response = sess.request(
                 method=cfg.method,
                 url=cfg.url,
-                headers=cfg.headers,
+                headers=headers,
                 params=cfg.params,
                 data=cfg.data,
                 json=cfg.json,
@@ -118,6 +148,18 @@ def send_request(
             )
             elapsed = time.time() - start
 
+            if cached is not None and resp.status_code == 304:
+                cached = cache.revalidated(cached, resp.headers)
+                return HttpResult(
+                    url=cached.url,
+                    status_code=cached.status_code,
+                    text=cached.text,
+                    headers=cached.headers,
+                    elapsed_seconds=elapsed,
+                    not_modified=True,
+                    cache_status="revalidated",
+                )
+
             if resp.status_code not in cfg.allowed_statuses:
                 safe_log(
                     log,
@@ -138,13 +180,21 @@ def send_request(
                     f"Unexpected status {resp.status_code} for {cfg.url}"
                 )
             else:
-                # success
+                # success; only 200 bodies are cached, as HttpEngine does
+                unchanged = False
+                stored = cache is not None and resp.status_code == 200
+                if stored:
+                    _entry, unchanged = cache.store(
+                        key, resp.status_code, resp.headers, resp.text, previous=cached
+                    )
                 return HttpResult(
                     url=str(resp.url),
                     status_code=resp.status_code,
                     text=resp.text,
                     headers=dict(resp.headers),
                     elapsed_seconds=elapsed,
+                    not_modified=unchanged,
+                    cache_status=("unchanged" if unchanged else "miss") if stored else None,
                 )
 
         except (requests.Timeout, requests.ConnectionError) as exc:
@@ -8,22 +8,30 @@ from __future__ import annotations
 
 import time
 from typing import Any, Dict, Optional
+from urllib.parse import urlsplit
 
 import requests
 from requests import Response
 
 from src.common.logging_utils import get_logger, safe_log
 from src.engines.base_engine import BaseEngine, EngineConfig, EngineError, EngineResult
+from src.engines.http_cache import CachedResponse, HttpCache, cache_key, cache_metadata
+from src.resource_manager import proxy_site_health
 
 log = get_logger("http-engine")
 
 
 class HttpEngine(BaseEngine):
-    """HTTP engine using requests library."""
+    """HTTP engine using requests library.
 
-    def __init__(self, config: EngineConfig):
+    With a :class:`HttpCache`, GETs are revalidated with conditional headers
+    and results carry ``metadata["not_modified"]`` when the page is unchanged.
+    """
+
+    def __init__(self, config: EngineConfig, *, cache: Optional[HttpCache] = None):
         super().__init__(config)
         self._session: Optional[requests.Session] = None
+        self.cache = cache
 
     def _get_session(self) -> requests.Session:
         """Get or create requests session."""
@@ -39,6 +47,25 @@ class HttpEngine(BaseEngine):
             return None
         return {"http": self.config.proxy, "https": self.config.proxy}
 
+    def _record_proxy_latency(self, url: str, seconds: float) -> None:
+        """Feed the proxy's per-site latency histogram (used by latency-aware proxy routing)."""
+        hostname = urlsplit(url).hostname
+        if self.config.proxy and hostname:
+            proxy_site_health.record_latency(self.config.proxy, hostname, seconds)
+
+    @staticmethod
+    def _cached_result(
+        entry: CachedResponse, method: str, status: str, elapsed: float
+    ) -> EngineResult:
+        return EngineResult(
+            url=entry.url,
+            status_code=entry.status_code,
+            content=entry.text,
+            headers=entry.headers,
+            elapsed_seconds=elapsed,
+            metadata={"method": method, "final_url": entry.url, **cache_metadata(status)},
+        )
+
     def fetch(self, url: str, method: str = "GET", **kwargs: Any) -> EngineResult:
         """
         Fetch content from URL.
@@ -60,6 +87,18 @@ class HttpEngine(BaseEngine):
         session = self._get_session()
         proxies = self._build_proxies()
 
+        cache = self.cache if method.upper() == "GET" else None
+        key = cache_key(url, kwargs.get("params")) if cache is not None else url
+        cached = cache.lookup(key) if cache is not None else None
+        if cached is not None:
+            if cache.is_fresh(cached):
+                cache.record_fresh_hit(cached)
+                return self._cached_result(cached, method, "fresh", 0.0)
+            kwargs["headers"] = {
+                **HttpCache.conditional_headers(cached),
+                **(kwargs.get("headers") or {}),
+            }
+
         try:
             start = time.time()
             response: Response = session.request(
@@ -70,6 +109,12 @@ class HttpEngine(BaseEngine):
                 **kwargs,
             )
             elapsed = time.time() - start
+            self._record_proxy_latency(url, elapsed)
+
+            if cached is not None and response.status_code == 304:
+                return self._cached_result(
+                    cache.revalidated(cached, response.headers), method, "revalidated", elapsed
+                )
 
             # Check for rate limiting
             if response.status_code == 429:
@@ -87,19 +132,27 @@ class HttpEngine(BaseEngine):
                     status_code=response.status_code,
                 )
 
+            metadata: Dict[str, Any] = {
+                "method": method,
+                "final_url": str(response.url),
+            }
+            if cache is not None and response.status_code == 200:
+                _entry, unchanged = cache.store(
+                    key, response.status_code, response.headers, response.text, previous=cached
+                )
+                metadata.update(cache_metadata("unchanged" if unchanged else "miss"))
+
             return EngineResult(
                 url=str(response.url),
                 status_code=response.status_code,
                 content=response.text,
                 headers=dict(response.headers),
                 elapsed_seconds=elapsed,
-                metadata={
-                    "method": method,
-                    "final_url": str(response.url),
-                },
+                metadata=metadata,
             )
 
         except requests.Timeout as exc:
+            self._record_proxy_latency(url, float(self.config.timeout))
             raise EngineError(f"Request timeout: {exc}", url=url) from exc
         except requests.ConnectionError as exc:
             raise EngineError(f"Connection error: {exc}", url=url) from exc
@@ -1,16 +1,40 @@
-"""Lightweight Playwright helpers with retry + jitter semantics.
+"""Playwright engine: a pooled, async-native browser fetcher.
 
-The real Playwright dependency is optional; these utilities operate against any
-object exposing ``goto``/``wait_for_timeout``/``content``-like methods, which
-keeps them testable with fakes while still providing reliability primitives
-for live scrapes.
+:class:`PlaywrightEngine` drives one browser process per worker and spreads
+pages over a pool of isolated ``BrowserContext`` objects. Each context gets its
+own proxy and, when built from a :class:`~src.sessions.session_manager.SessionRecord`,
+that session's cookies (saved back when the engine closes). Many pages run
+concurrently on one event loop; requests for images, media, fonts and known
+analytics hosts are aborted before they leave the browser. ``fetch_many``
+streams results as pages finish, and the usual retry/pacing/proxy-feedback
+rules come from :class:`~src.engines.async_base.AsyncEngine`.
+
+The real Playwright dependency is optional: it is only imported when a local
+browser is launched. :func:`goto_with_retry` remains as a lightweight helper
+that operates against any object exposing ``goto``/``wait_for_timeout``/
+``content``-like methods, which keeps it testable with fakes.
 """
 
 import asyncio
 import random
-from typing import Awaitable, Callable, Optional
+import time
+from dataclasses import dataclass, field
+from typing import Any, Awaitable, Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+from urllib.parse import urlsplit
 
 from src.common.logging_utils import get_logger, sanitize_for_log, safe_log
+from src.engines.async_base import AsyncEngine
+from src.engines.base_engine import EngineConfig, EngineError, EngineResult, RateLimitError
+from src.observability import metrics
+from src.sessions.session_manager import SessionRecord
+
+try:
+    from playwright.async_api import Error as PlaywrightError
+    from playwright.async_api import TimeoutError as PlaywrightTimeoutError
+    from playwright.async_api import async_playwright
+except ImportError:  # pragma: no cover - optional dependency
+    async_playwright = None
+    PlaywrightError = PlaywrightTimeoutError = None
 
 log = get_logger("playwright-engine")
 
@@ -94,3 +118,398 @@ async def goto_with_retry(
 
     if last_exc:
         raise last_exc
+
+
+# ---------------------------------------------------------------------------
+# Pooled engine
+# ---------------------------------------------------------------------------
+
+DEFAULT_BLOCKED_RESOURCE_TYPES = ("image", "media", "font")
+DEFAULT_BLOCKED_HOSTS = (
+    "google-analytics.com",
+    "googletagmanager.com",
+    "doubleclick.net",
+    "facebook.net",
+    "hotjar.com",
+    "segment.io",
+    "clarity.ms",
+)
+
+_TIMEOUT_ERRORS: Tuple[type, ...] = (asyncio.TimeoutError,)
+_TRANSIENT_ERRORS: Tuple[type, ...] = (asyncio.TimeoutError,)
+if async_playwright is not None:
+    _TIMEOUT_ERRORS += (PlaywrightTimeoutError,)
+    # Navigation failures (net::ERR_CONNECTION_RESET, proxy tunnel errors, ...).
+    _TRANSIENT_ERRORS += (PlaywrightError,)
+
+
+def playwright_proxy(proxy: Optional[str]) -> Optional[Dict[str, str]]:
+    """Translate a proxy string (``[scheme://][user:pass@]host:port``) into Playwright's format."""
+
+    if not proxy:
+        return None
+    parsed = urlsplit(proxy if "://" in proxy else f"http://{proxy}")
+    port = f":{parsed.port}" if parsed.port else ""
+    settings = {"server": f"{parsed.scheme}://{parsed.hostname}{port}"}
+    if parsed.username:
+        settings["username"] = parsed.username
+        settings["password"] = parsed.password or ""
+    return settings
+
+
+def _to_playwright_cookie(cookie: Dict[str, Any]) -> Dict[str, Any]:
+    """Selenium-style cookie (as stored by ``SessionRecord``) to Playwright's shape."""
+
+    converted = {
+        key: cookie[key]
+        for key in ("name", "value", "domain", "path", "httpOnly", "secure")
+        if key in cookie
+    }
+    converted.setdefault("path", "/")
+    if cookie.get("expiry") is not None:
+        converted["expires"] = float(cookie["expiry"])
+    if cookie.get("sameSite") in ("Strict", "Lax", "None"):
+        converted["sameSite"] = cookie["sameSite"]
+    return converted
+
+
+def _to_selenium_cookie(cookie: Dict[str, Any]) -> Dict[str, Any]:
+    keys = ("name", "value", "domain", "path", "httpOnly", "secure", "sameSite")
+    converted = {key: cookie[key] for key in keys if key in cookie}
+    expires = cookie.get("expires")
+    if expires is not None and expires >= 0:
+        converted["expiry"] = int(expires)
+    return converted
+
+
+class _CookieJar:
+    """Driver-shaped adapter so ``SessionRecord`` can load/save context cookies."""
+
+    def __init__(self, cookies: Optional[List[Dict[str, Any]]] = None) -> None:
+        self.cookies = list(cookies or [])
+
+    def add_cookie(self, cookie: Dict[str, Any]) -> None:
+        self.cookies.append(cookie)
+
+    def get_cookies(self) -> List[Dict[str, Any]]:
+        return list(self.cookies)
+
+
+@dataclass
+class _ContextSlot:
+    """One pooled ``BrowserContext`` and its identity."""
+
+    context: Any
+    proxy: Optional[str]
+    session_record: Optional[SessionRecord]
+    active: int = 0
+    pages: int = 0
+
+
+@dataclass
+class _BrowserState:
+    """Browser and context pool bound to one event loop."""
+
+    lock: asyncio.Lock
+    capacity: asyncio.Semaphore
+    playwright: Any = None
+    browser: Any = None
+    placeholder_proxy: bool = False
+    slots: List[_ContextSlot] = field(default_factory=list)
+    created: int = 0
+
+
+class PlaywrightEngine(AsyncEngine):
+    """Browser engine with a pool of isolated contexts and concurrent pages."""
+
+    transient_errors = _TRANSIENT_ERRORS
+
+    def __init__(
+        self,
+        config: EngineConfig,
+        *,
+        source: Optional[str] = None,
+        browser: str = "chromium",
+        headless: bool = True,
+        contexts: int = 4,
+        pages_per_context: int = 4,
+        recycle_after_pages: int = 500,
+        wait_until: str = "domcontentloaded",
+        block_resources: Iterable[str] = DEFAULT_BLOCKED_RESOURCE_TYPES,
+        blocked_hosts: Iterable[str] = DEFAULT_BLOCKED_HOSTS,
+        session_records: Optional[Sequence[SessionRecord]] = None,
+        limiter: Optional[Any] = None,
+        proxy_pool: Optional[Any] = None,
+        launcher: Optional[Callable[[], Awaitable[Any]]] = None,
+    ):
+        """
+        Args:
+            config: Shared engine configuration. ``config.proxy`` pins every
+                context to one proxy; otherwise ``proxy_pool`` picks one per
+                context. ``config.timeout`` bounds each navigation.
+            source: Source key used for proxy rotation, metrics and logging.
+            browser: ``chromium``, ``firefox`` or ``webkit``.
+            headless: Launch the local browser headless.
+            contexts: Maximum number of pooled contexts (identities).
+            pages_per_context: Concurrent pages per context; the pool's total
+                capacity (and default ``fetch_many`` window) is
+                ``contexts * pages_per_context``.
+            recycle_after_pages: Close and replace a context after this many
+                pages to bound renderer memory growth (0 disables).
+            wait_until: Navigation milestone passed to ``page.goto``.
+            block_resources: Resource types aborted by request interception.
+            blocked_hosts: Hosts (and their subdomains) whose requests are aborted.
+            session_records: Identities assigned round-robin to new contexts;
+                each brings its proxy (``proxy_id``) and cookies.
+            limiter: Per-source ``RateLimiter``; ``max_qps`` paces navigations.
+            proxy_pool: ``ProxyPool`` used to pick a proxy per context.
+            launcher: Coroutine factory returning a connected ``Browser``, e.g.
+                ``chromium.connect_over_cdp`` to a remote browser farm. By
+                default a local browser is launched.
+        """
+        super().__init__(config, source=source, limiter=limiter, proxy_pool=proxy_pool)
+        self.browser_name = browser
+        self.headless = headless
+        self.contexts = max(int(contexts), 1)
+        self.pages_per_context = max(int(pages_per_context), 1)
+        self.recycle_after_pages = max(int(recycle_after_pages), 0)
+        self.wait_until = wait_until
+        self.block_resources = frozenset(block_resources)
+        self.blocked_hosts = tuple(host.lower().lstrip(".") for host in blocked_hosts)
+        self.session_records = list(session_records or [])
+        self.launcher = launcher
+
+    def _default_window(self) -> int:
+        return self.contexts * self.pages_per_context
+
+    async def _fetch_indexed(
+        self, urls: Iterable[str], concurrency: Optional[int], kwargs: Dict[str, Any]
+    ):
+        # Launch up front so a missing browser fails the stream once instead of every URL.
+        await self._state()
+        async for item in super()._fetch_indexed(urls, concurrency, kwargs):
+            yield item
+
+    # ------------------------------------------------------------- browser
+    async def _state(self) -> _BrowserState:
+        loop = asyncio.get_running_loop()
+        state = self._states.get(loop)
+        if state is None:
+            state = _BrowserState(
+                lock=asyncio.Lock(), capacity=asyncio.Semaphore(self._default_window())
+            )
+            self._states[loop] = state
+        if state.browser is None:
+            async with state.lock:
+                if state.browser is None:
+                    await self._launch(state)
+        return state
+
+    async def _launch(self, state: _BrowserState) -> None:
+        if self.launcher is not None:
+            state.browser = await self.launcher()
+            return
+        if async_playwright is None:
+            raise EngineError("The playwright engine requires the 'playwright' package")
+        state.playwright = await async_playwright().start()
+        browser_type = getattr(state.playwright, self.browser_name)
+        # Chromium only honours per-context proxies when launched with one, and
+        # contexts opened without a proxy would inherit that placeholder.
+        state.placeholder_proxy = self.browser_name == "chromium" and self._uses_proxies()
+        launch_proxy = {"server": "http://per-context"} if state.placeholder_proxy else None
+        state.browser = await browser_type.launch(headless=self.headless, proxy=launch_proxy)
+        safe_log(
+            log, "info", "Launched browser", {"source": self.source, "browser": self.browser_name}
+        )
+
+    def _uses_proxies(self) -> bool:
+        """Whether any context may be given a proxy of its own."""
+
+        return bool(
+            self.config.proxy
+            or self.proxy_pool is not None
+            or any(record.proxy_id for record in self.session_records)
+        )
+
+    async def _open_context(self, state: _BrowserState) -> _ContextSlot:
+        record = None
+        if self.session_records:
+            record = self.session_records[state.created % len(self.session_records)]
+        proxy = (
+            self.config.proxy
+            or (record.proxy_id if record is not None else None)
+            or self._choose_proxy()
+        )
+        state.created += 1
+
+        options: Dict[str, Any] = {}
+        if proxy:
+            options["proxy"] = playwright_proxy(proxy)
+        elif state.placeholder_proxy:
+            options["proxy"] = {"server": "direct://"}  # e.g. an empty proxy pool
+        if self.config.headers:
+            options["extra_http_headers"] = dict(self.config.headers)
+        context = await state.browser.new_context(**options)
+        context.set_default_navigation_timeout(self.config.timeout * 1000)
+        if self.block_resources or self.blocked_hosts:
+            await context.route("**/*", self._intercept)
+        if record is not None:
+            jar = _CookieJar()
+            if record.try_restore_cookies(jar) and jar.cookies:
+                await context.add_cookies([_to_playwright_cookie(cookie) for cookie in jar.cookies])
+        metrics.incr("playwright_contexts_opened", source=self.source or "default")
+        return _ContextSlot(context=context, proxy=proxy or None, session_record=record)
+
+    async def _close_context(self, slot: _ContextSlot) -> None:
+        try:
+            if slot.session_record is not None:
+                cookies = await slot.context.cookies()
+                slot.session_record.save_cookies(
+                    _CookieJar([_to_selenium_cookie(c) for c in cookies])
+                )
+        finally:
+            await slot.context.close()
+
+    def _is_blocked_host(self, url: str) -> bool:
+        host = (urlsplit(url).hostname or "").lower()
+        return any(
+            host == blocked or host.endswith(f".{blocked}") for blocked in self.blocked_hosts
+        )
+
+    async def _intercept(self, route: Any) -> None:
+        request = route.request
+        if request.resource_type in self.block_resources or self._is_blocked_host(request.url):
+            metrics.incr(
+                "playwright_blocked_requests",
+                source=self.source or "default",
+                kind=request.resource_type,
+            )
+            await route.abort()
+        else:
+            await route.continue_()
+
+    async def _acquire(self, state: _BrowserState) -> _ContextSlot:
+        """Reserve a page slot on the least-loaded context, opening contexts on demand."""
+        await state.capacity.acquire()
+        try:
+            async with state.lock:
+                open_slots = [slot for slot in state.slots if slot.active < self.pages_per_context]
+                slot = min(open_slots, key=lambda candidate: candidate.active, default=None)
+                if len(state.slots) < self.contexts and (slot is None or slot.active > 0):
+                    slot = await self._open_context(state)
+                    state.slots.append(slot)
+                assert slot is not None  # capacity guarantees a free page slot
+                slot.active += 1
+                slot.pages += 1
+                return slot
+        except BaseException:
+            state.capacity.release()
+            raise
+
+    async def _release(self, state: _BrowserState, slot: _ContextSlot) -> None:
+        retire = False
+        async with state.lock:
+            slot.active -= 1
+            if (
+                self.recycle_after_pages
+                and slot.pages >= self.recycle_after_pages
+                and slot.active == 0
+            ):
+                state.slots.remove(slot)
+                retire = True
+        state.capacity.release()
+        if retire:
+            await self._close_context(slot)
+
+    # -------------------------------------------------------------- fetching
+    async def afetch(
+        self,
+        url: str,
+        *,
+        wait_until: Optional[str] = None,
+        wait_for_selector: Optional[str] = None,
+        **_kwargs: Any,
+    ) -> EngineResult:
+        """
+        Render ``url`` in a pooled context and return the page HTML.
+
+        ``wait_for_selector`` additionally waits for an element before the
+        DOM is captured. A 429 raises :class:`RateLimitError`; 5xx and
+        navigation failures raise :class:`EngineError` and count against the
+        context's proxy.
+        """
+        if self._closed:
+            raise EngineError("Engine has been closed")
+
+        state = await self._state()
+        slot = await self._acquire(state)
+        page = None
+        try:
+            start = time.time()
+            page = await slot.context.new_page()
+            response = await page.goto(url, wait_until=wait_until or self.wait_until)
+            if wait_for_selector:
+                await page.wait_for_selector(wait_for_selector, timeout=self.config.timeout * 1000)
+            content = await page.content()
+            elapsed = time.time() - start
+            final_url = page.url
+        except _TIMEOUT_ERRORS as exc:
+            self._report_proxy(slot.proxy, ok=False)
+            raise EngineError(f"Navigation timeout: {exc}", url=url) from exc
+        except Exception as exc:
+            self._report_proxy(slot.proxy, ok=False)
+            raise EngineError(f"Navigation failed: {exc}", url=url) from exc
+        finally:
+            if page is not None:
+                await page.close()
+            await self._release(state, slot)
+
+        status = response.status if response is not None else 200
+        if status == 429:
+            self._report_proxy(slot.proxy, ok=False)
+            raise RateLimitError(f"Rate limited: {status}", url=url, status_code=status)
+        if status >= 500:
+            self._report_proxy(slot.proxy, ok=False)
+            raise EngineError(f"Server error: {status}", url=url, status_code=status)
+        self._report_proxy(slot.proxy, ok=True, latency=elapsed, url=url)
+        metrics.incr("playwright_pages", source=self.source or "default")
+
+        return EngineResult(
+            url=final_url,
+            status_code=status,
+            content=content,
+            headers=dict(response.headers) if response is not None else {},
+            elapsed_seconds=elapsed,
+            metadata={
+                "driver": "playwright",
+                "browser": self.browser_name,
+                "final_url": final_url,
+                "proxy": slot.proxy,
+                "account_id": (
+                    slot.session_record.account_id if slot.session_record is not None else None
+                ),
+            },
+        )
+
+    async def aclose(self) -> None:
+        """Save session cookies and close the contexts and browser bound to the running loop."""
+        state = self._states.pop(asyncio.get_running_loop(), None)
+        if state is None:
+            return
+        try:
+            await asyncio.gather(*(self._close_context(slot) for slot in state.slots))
+        finally:
+            state.slots.clear()
+            if state.browser is not None:
+                await state.browser.close()
+            if state.playwright is not None:
+                await state.playwright.stop()
+
+
+__all__ = [
+    "DEFAULT_BLOCKED_HOSTS",
+    "DEFAULT_BLOCKED_RESOURCE_TYPES",
+    "PlaywrightEngine",
+    "goto_with_retry",
+    "playwright_proxy",
+]
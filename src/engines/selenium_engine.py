@@ -1,15 +1,28 @@
+import atexit
+import dataclasses
 import os
 import random
+import threading
 import time
-from typing import Mapping, Optional
+from dataclasses import dataclass
+from typing import Any, Dict, List, Mapping, Optional, Tuple
+from urllib.parse import urlsplit
 
 from selenium import webdriver
-from selenium.common.exceptions import WebDriverException
+from selenium.common.exceptions import TimeoutException, WebDriverException
 from selenium.webdriver.chrome.options import Options
 from selenium.webdriver.chrome.service import Service
+from selenium.webdriver.common.by import By
+from selenium.webdriver.support import expected_conditions
+from selenium.webdriver.support.ui import WebDriverWait
 from webdriver_manager.chrome import ChromeDriverManager
 
 from src.common.logging_utils import get_logger, sanitize_for_log, safe_log
+from src.observability import metrics
+from src.resource_manager import proxy_site_health
+from src.resource_manager.adaptive_concurrency import get_concurrency_controller
+from src.resource_manager.browser_pool import DriverPool
+from src.resource_manager.settings import get_driver_pool_settings, get_load_profile_settings
 from src.sessions.session_manager import SessionRecord
 
 log = get_logger("selenium-engine")
@@ -23,6 +36,115 @@ DEFAULT_RETRIES = 3
 DEFAULT_BACKOFF = 1.0
 DEFAULT_JITTER = 0.5
 DEFAULT_WAIT = 0.25
+DEFAULT_READY_TIMEOUT = 10.0
+
+# CDP URL patterns (``Network.setBlockedURLs`` wildcards) per resource type.
+_RESOURCE_URL_PATTERNS: Dict[str, Tuple[str, ...]] = {
+    "image": ("*.png", "*.jpg", "*.jpeg", "*.gif", "*.webp", "*.avif", "*.svg", "*.ico", "*.bmp"),
+    "font": ("*.woff", "*.woff2", "*.ttf", "*.otf", "*.eot"),
+    "media": ("*.mp4", "*.webm", "*.ogg", "*.mp3", "*.wav", "*.m3u8"),
+    "stylesheet": ("*.css",),
+}
+TRACKER_URL_PATTERNS: Tuple[str, ...] = (
+    "*google-analytics.com*",
+    "*googletagmanager.com*",
+    "*doubleclick.net*",
+    "*connect.facebook.net*",
+    "*hotjar.com*",
+    "*segment.io*",
+    "*clarity.ms*",
+)
+
+# Bytes fetched for the current document and its subresources. Cross-origin
+# responses without Timing-Allow-Origin report 0, so this is a lower bound.
+_TRANSFERRED_BYTES_JS = """
+const entries = performance.getEntriesByType('navigation')
+    .concat(performance.getEntriesByType('resource'));
+return entries.reduce((total, entry) => total + (entry.transferSize || 0), 0);
+"""
+
+
+@dataclass(frozen=True)
+class LoadProfile:
+    """How much of a page the browser loads and when navigation counts as done.
+
+    ``page_load_strategy`` is Chrome's (``normal`` waits for every
+    subresource, ``eager`` returns at DOMContentLoaded). Requests for
+    ``blocked_resources`` types and ``blocked_urls`` patterns are dropped by
+    the browser. With a ``ready_selector`` navigation waits up to
+    ``ready_timeout`` seconds for that element instead of sleeping ``wait``
+    (plus up to ``jitter``) seconds.
+    """
+
+    name: str = "full"
+    page_load_strategy: str = "normal"
+    blocked_resources: Tuple[str, ...] = ()
+    blocked_urls: Tuple[str, ...] = ()
+    ready_selector: Optional[str] = None
+    ready_timeout: float = DEFAULT_READY_TIMEOUT
+    wait: float = DEFAULT_WAIT
+    jitter: float = DEFAULT_JITTER
+
+    def blocked_patterns(self) -> List[str]:
+        patterns: List[str] = []
+        for resource in self.blocked_resources:
+            if resource not in _RESOURCE_URL_PATTERNS:
+                raise ValueError(f"Unknown resource type to block: {resource}")
+            patterns.extend(_RESOURCE_URL_PATTERNS[resource])
+        patterns.extend(self.blocked_urls)
+        return patterns
+
+
+LOAD_PROFILES: Dict[str, LoadProfile] = {
+    "full": LoadProfile(),
+    "lite": LoadProfile(
+        name="lite",
+        page_load_strategy="eager",
+        blocked_resources=("image", "font", "media"),
+        wait=0.0,
+    ),
+    "minimal": LoadProfile(
+        name="minimal",
+        page_load_strategy="eager",
+        blocked_resources=("image", "font", "media", "stylesheet"),
+        blocked_urls=TRACKER_URL_PATTERNS,
+        wait=0.0,
+    ),
+}
+
+
+def resolve_load_profile(source: Optional[str] = None, **overrides: Any) -> LoadProfile:
+    """Build the load profile configured for ``source`` (``load_profile:`` in its YAML).
+
+    The block names a built-in profile (``full``, ``lite``, ``minimal``) and
+    may override any :class:`LoadProfile` field; keyword ``overrides`` win
+    over the configuration.
+    """
+
+    settings: Dict[str, Any] = dict(get_load_profile_settings(source)) if source else {}
+    settings.update(overrides)
+    name = settings.pop("name", None) or "full"
+    if name not in LOAD_PROFILES:
+        raise ValueError(f"Unknown load profile '{name}' (expected one of {sorted(LOAD_PROFILES)})")
+    fields = {field.name for field in dataclasses.fields(LoadProfile)}
+    changes = {key: value for key, value in settings.items() if key in fields and value is not None}
+    for key in ("blocked_resources", "blocked_urls"):
+        if key in changes:
+            changes[key] = tuple(changes[key])
+    profile = dataclasses.replace(LOAD_PROFILES[name], **changes)
+    profile.blocked_patterns()  # reject unknown resource types up front
+    return profile
+
+
+@dataclass
+class PageStats:
+    """Cost of one page load under a profile."""
+
+    url: str
+    profile: str
+    seconds: float
+    bytes_transferred: int
+    ready: bool = True
 
 
 class FakeDriver:
@@ -42,57 +164,189 @@ class FakeDriver:
     def get_cookies(self):
         return list(self._cookies)
 
+    def delete_all_cookies(self):
+        self._cookies = []
+
     def quit(self):
         """Quit the fake driver (no-op)."""
         return None
 
 
+def apply_load_profile(driver, profile: LoadProfile) -> None:
+    """Install the profile's URL blocklist on a Chrome driver via CDP."""
+
+    patterns = profile.blocked_patterns()
+    if not patterns or not hasattr(driver, "execute_cdp_cmd"):
+        return
+    driver.execute_cdp_cmd("Network.enable", {})
+    driver.execute_cdp_cmd("Network.setBlockedURLs", {"urls": patterns})
+
+
+def _transferred_bytes(driver) -> int:
+    if not hasattr(driver, "execute_script"):
+        return 0
+    try:
+        return int(driver.execute_script(_TRANSFERRED_BYTES_JS) or 0)
+    except Exception:  # pragma: no cover - page navigated away mid-script
+        return 0
+
+
 class BrowserSession:
-    """Browser session wrapper that manages driver lifecycle and cookie persistence."""
+    """Browser session wrapper that manages driver lifecycle and cookie persistence.
+
+    With a ``pool`` the driver is leased from it: ``quit`` returns it warm,
+    proxy failover leases one for the new proxy, and a driver the pool marks
+    for recycling is swapped for a fresh one before the next page.
+    """
 
-    def __init__(self, driver, session_record: Optional[SessionRecord] = None, proxy: Optional[str] = None):
+    def __init__(
+        self,
+        driver,
+        session_record: Optional[SessionRecord] = None,
+        proxy: Optional[str] = None,
+        profile: Optional[LoadProfile] = None,
+        pool: Optional[DriverPool] = None,
+    ):
         self.driver = driver
         self.session_record = session_record
         self.proxy = proxy
+        self.profile = profile or LOAD_PROFILES["full"]
+        self.pool = pool
+        self.source = getattr(session_record, "source", None)
+        self.last_page_stats: Optional[PageStats] = None
+        self._recycle_due = False
+
+    def _release_driver(self) -> None:
+        if self.pool is not None:
+            self.pool.release(self.driver)
+        else:
+            self.driver.quit()
 
     def quit(self):
         try:
             if self.session_record:
                 self.session_record.save_cookies(self.driver)
         finally:
-            self.driver.quit()
+            self._release_driver()
 
     def _recreate_driver(self, proxy: Optional[str]):
         try:
-            self.driver.quit()
+            self._release_driver()
         except Exception:  # pragma: no cover - defensive cleanup
             pass
 
-        self.driver = create_driver(proxy)
+        if self.pool is not None:
+            self.driver = self.pool.checkout(proxy, self.profile)
+        else:
+            self.driver = create_driver(proxy, self.profile)
         self.proxy = proxy
+        self._recycle_due = False
+        if self.session_record:
+            self.session_record.try_restore_cookies(self.driver)
+
+    def _recycle_driver(self, url: str) -> None:
+        """Swap in a fresh pooled driver, carrying the session's cookies over."""
+
         if self.session_record:
+            self.session_record.save_cookies(self.driver)
+        self._recreate_driver(self.proxy)
+        if self.session_record:
+            # Cookies can only be set once the browser is on their site.
+            self.driver.get(_origin(url))
             self.session_record.try_restore_cookies(self.driver)
 
+    def _wait_until_ready(self, selector: str) -> bool:
+        if not hasattr(self.driver, "find_element"):
+            return True
+        try:
+            WebDriverWait(self.driver, self.profile.ready_timeout).until(
+                expected_conditions.presence_of_element_located((By.CSS_SELECTOR, selector))
+            )
+            return True
+        except TimeoutException:
+            metrics.incr(
+                "selenium_ready_timeouts",
+                source=self.source or "unknown",
+                profile=self.profile.name,
+            )
+            safe_log(
+                log,
+                "warning",
+                "Ready selector not found before timeout; continuing",
+                extra=sanitize_for_log(
+                    {"selector": selector, "timeout": self.profile.ready_timeout}
+                ),
+            )
+            return False
+
+    def load(self, url: str, ready_selector: Optional[str] = None) -> PageStats:
+        """Load ``url`` once under the session's profile and record what it cost.
+
+        Waits for ``ready_selector`` (default: the profile's) when one is set.
+        Latency and bytes transferred are kept in ``last_page_stats`` and
+        accumulated in the ``selenium_page_*`` metrics per source and profile.
+        """
+
+        if self._recycle_due:
+            self._recycle_driver(url)
+        selector = ready_selector or self.profile.ready_selector
+        started = time.perf_counter()
+        self.driver.get(url)
+        ready = self._wait_until_ready(selector) if selector else True
+        stats = PageStats(
+            url=url,
+            profile=self.profile.name,
+            seconds=time.perf_counter() - started,
+            bytes_transferred=_transferred_bytes(self.driver),
+            ready=ready,
+        )
+        labels = {"source": self.source or "unknown", "profile": self.profile.name}
+        metrics.incr("selenium_pages", **labels)
+        metrics.incr("selenium_page_seconds_total", stats.seconds, **labels)
+        metrics.incr("selenium_page_bytes_total", stats.bytes_transferred, **labels)
+        hostname = urlsplit(url).hostname
+        if self.proxy and hostname:
+            proxy_site_health.record_latency(self.proxy, hostname, stats.seconds)
+        self.last_page_stats = stats
+        if self.pool is not None:
+            self._recycle_due = self.pool.note_page(self.driver)
+        return stats
+
     def navigate(
         self,
         url: str,
         retries: int = DEFAULT_RETRIES,
         backoff: float = DEFAULT_BACKOFF,
-        jitter: float = DEFAULT_JITTER,
+        jitter: Optional[float] = None,
         allow_proxy_fallback: bool = True,
-        wait: float = DEFAULT_WAIT,
+        wait: Optional[float] = None,
+        ready_selector: Optional[str] = None,
     ):
-        """Navigate with retry, jitter, and optional proxy failover."""
+        """Navigate with retry, jitter, and optional proxy failover.
 
+        Pages with a ready selector (argument or profile) are done once it
+        appears; others settle for ``wait`` plus up to ``jitter`` seconds,
+        both defaulting to the profile's.
+        """
+
+        jitter = self.profile.jitter if jitter is None else jitter
+        wait = self.profile.wait if wait is None else wait
+        selector = ready_selector or self.profile.ready_selector
         attempt = 0
         last_exc: Optional[Exception] = None
 
         while attempt < retries:
             try:
-                self.driver.get(url)
+                stats = self.load(url, selector)
+                controller = get_concurrency_controller(self.source) if self.source else None
                 if _looks_rate_limited(self.driver):
+                    if controller is not None:
+                        controller.observe(rate_limited=True)
                     raise WebDriverException("rate limited or blocked")
-                _sleep_with_jitter(wait, jitter)
+                if controller is not None:
+                    controller.observe(stats.seconds)
+                if not selector:
+                    _sleep_with_jitter(wait, jitter)
                 return
             except Exception as exc:  # pragma: no cover - guarded retries
                 last_exc = exc
@@ -122,6 +376,11 @@ class BrowserSession:
         if last_exc:
             raise last_exc
 
+def _origin(url: str) -> str:
+    parts = url.split("/")
+    return parts[0] + "//" + parts[2]
+
+
 def _use_fake_driver() -> bool:
     """Check if fake driver mode is enabled via environment variable."""
     return os.getenv(FAKE_BROWSER_ENV, "").lower() in {"1", "true", "yes", "on"}
@@ -199,13 +458,15 @@ def _sleep_with_jitter(delay: float, jitter: float) -> None:
         time.sleep(delay)
 
 
-def create_driver(proxy: Optional[str] = None):
+def create_driver(proxy: Optional[str] = None, profile: Optional[LoadProfile] = None):
     """Create a Selenium WebDriver instance (real or fake based on environment)."""
     if _use_fake_driver():
         log.info("Using FakeDriver (env %s)", FAKE_BROWSER_ENV)
         return FakeDriver()
 
+    profile = profile or LOAD_PROFILES["full"]
     opts = Options()
+    opts.page_load_strategy = profile.page_load_strategy
     opts.add_argument("--headless=new")
     opts.add_argument("--disable-gpu")
     opts.add_argument("--no-sandbox")
@@ -216,17 +477,70 @@ def create_driver(proxy: Optional[str] = None):
     driver_path = _get_chromedriver_path()
     driver = webdriver.Chrome(service=Service(driver_path), options=opts)
     driver.set_window_size(1280, 800)
+    apply_load_profile(driver, profile)
     return driver
 
 
-def open_with_session(url: str, session_record: SessionRecord) -> BrowserSession:
-    """Open a browser session with cookie restoration."""
+_default_pools: Dict[str, Optional[DriverPool]] = {}
+_default_pools_lock = threading.Lock()
+
+
+def get_driver_pool(source: str) -> Optional[DriverPool]:
+    """The shared warm driver pool for ``source``; ``None`` unless ``driver_pool.enabled``.
+
+    A ``warm`` count keeps that many direct (proxy-less) drivers ready for the
+    source's load profile, which is also what proxy failover switches to.
+    """
+
+    with _default_pools_lock:
+        if source not in _default_pools:
+            settings = get_driver_pool_settings(source)
+            pool: Optional[DriverPool] = None
+            if settings.get("enabled"):
+                pool = DriverPool(
+                    lambda proxy, profile: create_driver(proxy, profile),
+                    max_size=int(settings.get("max_size") or 8),
+                    max_pages=settings.get("max_pages"),
+                    max_rss_mb=settings.get("max_rss_mb"),
+                    idle_seconds=float(settings.get("idle_seconds") or 300),
+                    name=source,
+                )
+                warm = int(settings.get("warm") or 0)
+                if warm:
+                    pool.prewarm(None, resolve_load_profile(source), warm, keep=True)
+            _default_pools[source] = pool
+        return _default_pools[source]
+
+
+@atexit.register
+def _close_default_pools() -> None:
+    with _default_pools_lock:
+        pools = [pool for pool in _default_pools.values() if pool is not None]
+        _default_pools.clear()
+    for pool in pools:
+        pool.close()
+
+
+def open_with_session(
+    url: str,
+    session_record: SessionRecord,
+    profile: Optional[LoadProfile] = None,
+    pool: Optional[DriverPool] = None,
+) -> BrowserSession:
+    """Open a browser session with cookie restoration.
+
+    ``profile`` defaults to the load profile configured for the record's
+    source, and ``pool`` to the source's shared driver pool, if enabled.
+    """
+    profile = profile or resolve_load_profile(session_record.source)
+    pool = pool or get_driver_pool(session_record.source)
     proxy = session_record.proxy_id or None
-    driver = create_driver(proxy)
-    parts = url.split("/")
-    base = parts[0] + "//" + parts[2]
-    browser_session = BrowserSession(driver, session_record, proxy=proxy)
+    driver = pool.checkout(proxy, profile) if pool is not None else create_driver(proxy, profile)
+    base = _origin(url)
+    browser_session = BrowserSession(
+        driver, session_record, proxy=proxy, profile=profile, pool=pool
+    )
     browser_session.navigate(base)
-    session_record.try_restore_cookies(driver)
+    session_record.try_restore_cookies(browser_session.driver)
     browser_session.navigate(url)
     return browser_session
@@ -3,19 +3,34 @@
 from __future__ import annotations
 
 import json
+import threading
 from dataclasses import dataclass, asdict, field
 from datetime import datetime, timezone
 from pathlib import Path
-from typing import Optional, List, Dict, Any
+from typing import Optional, List, Dict, Any, Mapping, Sequence, Tuple
 import sqlite3
 
 from src.common.paths import LOGS_DIR
 from src.common.logging_utils import get_logger
+from src.observability import metrics
+from src.observability.run_trace_context import get_current_run_id
 
 log = get_logger("cost-tracking")
 
 COST_LOG_PATH: Path = LOGS_DIR / "cost_runs.jsonl"
 COST_DB_PATH: Path = LOGS_DIR / "cost_runs.db"
+LLM_LEDGER_PATH: Path = LOGS_DIR / "llm_calls.jsonl"
+
+# USD per million (prompt, completion) tokens; override per source with ``llm.prices``.
+LLM_PRICES_PER_MTOK: Dict[str, Tuple[float, float]] = {
+    "gpt-4o-mini": (0.15, 0.60),
+    "gpt-4o": (2.50, 10.00),
+    "gpt-4.1-mini": (0.40, 1.60),
+    "gpt-4.1": (2.00, 8.00),
+    "deepseek-chat": (0.27, 1.10),
+    "llama-3.1-8b-instant": (0.05, 0.08),
+    "llama-3.3-70b-versatile": (0.59, 0.79),
+}
 
 
 @dataclass
@@ -25,12 +40,16 @@ class CostRecord:
     proxy_cost_usd: float = 0.0
     compute_cost_usd: float = 0.0
     other_cost_usd: float = 0.0
+    llm_cost_usd: float = 0.0
+    llm_saved_usd: float = 0.0
+    llm_calls: int = 0
+    llm_cache_hits: int = 0
     currency: str = "USD"
     created_at: str = field(default_factory=lambda: datetime.now(timezone.utc).isoformat())
 
     @property
     def total_usd(self) -> float:
-        return self.proxy_cost_usd + self.compute_cost_usd + self.other_cost_usd
+        return self.proxy_cost_usd + self.compute_cost_usd + self.other_cost_usd + self.llm_cost_usd
 
 
 def record_run_cost(
@@ -40,13 +59,21 @@ def record_run_cost(
     compute_cost_usd: float = 0.0,
     other_cost_usd: float = 0.0,
     currency: str = "USD",
+    llm_usage: Optional[Mapping[str, Any]] = None,
 ) -> CostRecord:
+    """Persist a run's costs; ``llm_usage`` is a :meth:`LLMCostLedger.drain` summary."""
+
+    llm_usage = llm_usage or {}
     rec = CostRecord(
         run_id=run_id,
         source=source,
         proxy_cost_usd=proxy_cost_usd,
         compute_cost_usd=compute_cost_usd,
         other_cost_usd=other_cost_usd,
+        llm_cost_usd=float(llm_usage.get("cost_usd", 0.0)),
+        llm_saved_usd=float(llm_usage.get("saved_usd", 0.0)),
+        llm_calls=int(llm_usage.get("calls", 0)),
+        llm_cache_hits=int(llm_usage.get("hits", 0)),
         currency=currency,
     )
     payload: Dict[str, Any] = asdict(rec)
@@ -98,7 +125,7 @@ def _persist_cost_record(payload: Dict[str, Any]) -> None:
                     payload["run_id"],
                     payload["proxy_cost_usd"],
                     payload["compute_cost_usd"],
-                    payload["other_cost_usd"],
+                    payload["other_cost_usd"] + payload["llm_cost_usd"],  # no dedicated LLM column
                     payload["currency"],
                     tenant_id,
                 ),
@@ -110,6 +137,105 @@ def _persist_cost_record(payload: Dict[str, Any]) -> None:
         # Don't raise - file log is sufficient fallback
 
 
+def llm_call_cost(
+    model: str,
+    prompt_tokens: int,
+    completion_tokens: int,
+    prices: Optional[Mapping[str, Sequence[float]]] = None,
+) -> float:
+    """USD cost of one call; models without a known price cost 0."""
+
+    price = (prices or {}).get(model) or LLM_PRICES_PER_MTOK.get(model)
+    if not price:
+        return 0.0
+    return (prompt_tokens * float(price[0]) + completion_tokens * float(price[1])) / 1_000_000
+
+
+class LLMCostLedger:
+    """Per-call record of LLM usage: cache outcome, tokens and dollars.
+
+    ``outcome`` is ``hit`` (served from the response cache; ``cost_usd`` is
+    what the original call cost, i.e. what was saved), ``miss`` (cacheable
+    but sent) or ``bypass`` (not cacheable, e.g. temperature > 0).
+    """
+
+    def __init__(self, path: Path = LLM_LEDGER_PATH) -> None:
+        self.path = path
+        self._lock = threading.Lock()
+        self._calls: List[Dict[str, Any]] = []
+
+    def record(
+        self,
+        provider: str,
+        model: str,
+        *,
+        outcome: str,
+        prompt_tokens: int = 0,
+        completion_tokens: int = 0,
+        cost_usd: float = 0.0,
+        seconds: float = 0.0,
+    ) -> None:
+        call = {
+            "run_id": get_current_run_id(),
+            "provider": provider,
+            "model": model,
+            "outcome": outcome,
+            "prompt_tokens": prompt_tokens,
+            "completion_tokens": completion_tokens,
+            "cost_usd": cost_usd,
+            "seconds": round(seconds, 4),
+            "at": datetime.now(timezone.utc).isoformat(),
+        }
+        with self._lock:
+            self._calls.append(call)
+        if outcome == "hit":
+            metrics.incr("llm_cache_hits", provider=provider, model=model)
+            metrics.incr("llm_saved_usd", cost_usd, provider=provider, model=model)
+        else:
+            if outcome == "miss":
+                metrics.incr("llm_cache_misses", provider=provider, model=model)
+            metrics.incr("llm_cost_usd", cost_usd, provider=provider, model=model)
+
+    def summary(self) -> Dict[str, Any]:
+        with self._lock:
+            return _summarise(list(self._calls))
+
+    def drain(self, run_id: Optional[str] = None) -> Dict[str, Any]:
+        """Summarise and clear the calls so far, appending them to ``path`` tagged ``run_id``."""
+
+        with self._lock:
+            calls, self._calls = self._calls, []
+        if calls:
+            try:
+                self.path.parent.mkdir(parents=True, exist_ok=True)
+                with self.path.open("a", encoding="utf-8") as f:
+                    for call in calls:
+                        f.write(json.dumps({**call, "run_id": run_id or call["run_id"]}) + "\n")
+            except OSError as e:
+                log.warning("Failed to write LLM call ledger: %s", e)
+        return _summarise(calls)
+
+
+def _summarise(calls: List[Dict[str, Any]]) -> Dict[str, Any]:
+    hits = sum(1 for call in calls if call["outcome"] == "hit")
+    misses = sum(1 for call in calls if call["outcome"] == "miss")
+    return {
+        "calls": len(calls),
+        "hits": hits,
+        "misses": misses,
+        "hit_rate": hits / (hits + misses) if hits + misses else 0.0,
+        "cost_usd": sum(call["cost_usd"] for call in calls if call["outcome"] != "hit"),
+        "saved_usd": sum(call["cost_usd"] for call in calls if call["outcome"] == "hit"),
+        "prompt_tokens": sum(call["prompt_tokens"] for call in calls if call["outcome"] != "hit"),
+        "completion_tokens": sum(
+            call["completion_tokens"] for call in calls if call["outcome"] != "hit"
+        ),
+    }
+
+
+llm_ledger = LLMCostLedger()
+
+
 def iter_cost_records() -> List[Dict[str, Any]]:
     if not COST_LOG_PATH.exists():
         return []
@@ -169,7 +295,12 @@ __all__ = [
     "iter_cost_records",
     "iter_cost_records_from_db",
     "latest_cost_for_source",
+    "llm_call_cost",
+    "llm_ledger",
     "CostRecord",
+    "LLMCostLedger",
     "COST_DB_PATH",
     "COST_LOG_PATH",
+    "LLM_LEDGER_PATH",
+    "LLM_PRICES_PER_MTOK",
 ]
@@ -2,10 +2,11 @@
 
 from __future__ import annotations
 
+from bisect import bisect_left
 from collections import defaultdict
 from dataclasses import dataclass
 from threading import Lock
-from typing import Dict, Tuple, Any, List
+from typing import Dict, Tuple, Any, List, Optional, Sequence
 import json
 import time
 from pathlib import Path
@@ -16,6 +17,82 @@ from src.common.paths import LOGS_DIR
 
 log = get_logger(__name__)
 
+# Upper bounds (seconds) of latency histogram buckets; an open-ended bucket follows the last.
+DEFAULT_LATENCY_BUCKETS: Tuple[float, ...] = (
+    0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.0, 4.0, 8.0, 16.0, 32.0, 60.0,
+)
+# Halve every bucket after this many observations so percentiles track recent traffic.
+DEFAULT_DECAY_EVERY = 500
+
+
+class LatencyHistogram:
+    """Fixed-bucket latency histogram, optionally halved every ``decay_every`` observations.
+
+    Percentiles are interpolated within buckets the way Prometheus'
+    ``histogram_quantile`` does. Not thread-safe; callers hold their lock.
+    """
+
+    def __init__(
+        self,
+        buckets: Sequence[float] = DEFAULT_LATENCY_BUCKETS,
+        decay_every: int = DEFAULT_DECAY_EVERY,
+    ):
+        self.buckets = tuple(buckets)
+        self.counts: List[float] = [0.0] * (len(self.buckets) + 1)
+        self.total = 0.0
+        self.sum = 0.0
+        self.decay_every = decay_every
+        self._since_decay = 0
+        self._cache: Dict[float, Optional[float]] = {}
+
+    def observe(self, seconds: float) -> None:
+        self.counts[bisect_left(self.buckets, seconds)] += 1.0
+        self.total += 1.0
+        self.sum += seconds
+        self._cache.clear()
+        self._since_decay += 1
+        if self.decay_every and self._since_decay >= self.decay_every:
+            self.counts = [count / 2 for count in self.counts]
+            self.total /= 2
+            self.sum /= 2
+            self._since_decay = 0
+
+    def percentile(self, q: float) -> Optional[float]:
+        """Latency below which a ``q`` fraction (0-1) of observations fall; ``None`` when empty."""
+
+        if q in self._cache:
+            return self._cache[q]
+        value: Optional[float] = None
+        if self.total > 0:
+            rank = q * self.total
+            cumulative = 0.0
+            for idx, count in enumerate(self.counts):
+                if count and cumulative + count >= rank:
+                    if idx == len(self.buckets):
+                        value = self.buckets[-1]  # open-ended bucket: report its lower bound
+                    else:
+                        lower = self.buckets[idx - 1] if idx else 0.0
+                        value = lower + (self.buckets[idx] - lower) * (rank - cumulative) / count
+                    break
+                cumulative += count
+        self._cache[q] = value
+        return value
+
+    def cumulative_counts(self) -> List[float]:
+        """Observations at or below each bucket bound, as Prometheus exposes them."""
+
+        cumulative, running = [], 0.0
+        for count in self.counts[:-1]:
+            running += count
+            cumulative.append(running)
+        return cumulative
+
+    def copy(self) -> "LatencyHistogram":
+        clone = LatencyHistogram(self.buckets, self.decay_every)
+        clone.counts = list(self.counts)
+        clone.total, clone.sum = self.total, self.sum
+        return clone
+
 
 @dataclass
 class MetricSample:
@@ -24,12 +101,53 @@ class MetricSample:
     value: float
 
 
+@dataclass
+class HistogramSample:
+    """A histogram series: ``counts[i]`` observations fell at or below ``buckets[i]``."""
+
+    name: str
+    labels: Dict[str, Any]
+    histogram: LatencyHistogram
+
+    @property
+    def buckets(self) -> List[float]:
+        return list(self.histogram.buckets)
+
+    @property
+    def counts(self) -> List[float]:
+        return self.histogram.cumulative_counts()
+
+    @property
+    def count(self) -> int:
+        return int(self.histogram.total)
+
+    @property
+    def sum(self) -> float:
+        return self.histogram.sum
+
+    def percentile(self, q: float) -> Optional[float]:
+        return self.histogram.percentile(q)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "name": self.name,
+            "labels": self.labels,
+            "buckets": self.buckets,
+            "counts": self.counts,
+            "count": self.count,
+            "sum": self.sum,
+        }
+
+
 class MetricsRegistry:
     def __init__(self) -> None:
         self._counters: Dict[
             Tuple[str, Tuple[Tuple[str, Any], ...]], Tuple[float, float]
         ] = defaultdict(lambda: (0.0, 0.0))
         self._gauges: Dict[Tuple[str, Tuple[Tuple[str, Any], ...]], Tuple[float, float]] = {}
+        self._histograms: Dict[
+            Tuple[str, Tuple[Tuple[str, Any], ...]], Tuple[LatencyHistogram, float]
+        ] = {}
         self._lock = Lock()
 
     def incr(self, name: str, amount: float = 1.0, **labels: Any) -> None:
@@ -43,7 +161,24 @@ class MetricsRegistry:
         with self._lock:
             self._gauges[key] = (value, time.time())
 
-    def snapshot(self) -> Dict[str, List[MetricSample]]:
+    def observe(
+        self,
+        name: str,
+        value: float,
+        buckets: Sequence[float] = DEFAULT_LATENCY_BUCKETS,
+        **labels: Any,
+    ) -> None:
+        """Add ``value`` to the histogram series; ``buckets`` apply from its first observation."""
+
+        key = (name, tuple(sorted(labels.items())))
+        with self._lock:
+            entry = self._histograms.get(key)
+            # Never decayed: exported histograms are cumulative, as Prometheus expects.
+            histogram = entry[0] if entry else LatencyHistogram(sorted(buckets), decay_every=0)
+            histogram.observe(value)
+            self._histograms[key] = (histogram, time.time())
+
+    def snapshot(self) -> Dict[str, List[Any]]:
         with self._lock:
             counters = [
                 MetricSample(name=k[0], labels=dict(k[1]), value=v)
@@ -53,7 +188,11 @@ class MetricsRegistry:
                 MetricSample(name=k[0], labels=dict(k[1]), value=v)
                 for k, (v, _ts) in self._gauges.items()
             ]
-        return {"counters": counters, "gauges": gauges}
+            histograms = [
+                HistogramSample(name=k[0], labels=dict(k[1]), histogram=h.copy())
+                for k, (h, _ts) in self._histograms.items()
+            ]
+        return {"counters": counters, "gauges": gauges, "histograms": histograms}
 
     def cleanup_expired(self, ttl_seconds: int = 3600) -> int:
         """
@@ -75,6 +214,11 @@ class MetricsRegistry:
                     del self._gauges[key]
                     removed += 1
 
+            for key, (_histogram, ts) in list(self._histograms.items()):
+                if (now - ts) > ttl_seconds:
+                    del self._histograms[key]
+                    removed += 1
+
         return removed
 
 
@@ -89,7 +233,13 @@ def set_gauge(name: str, value: float, **labels: Any) -> None:
     _registry.set_gauge(name, value, **labels)
 
 
-def dump_metrics() -> Dict[str, List[MetricSample]]:
+def observe(
+    name: str, value: float, buckets: Sequence[float] = DEFAULT_LATENCY_BUCKETS, **labels: Any
+) -> None:
+    _registry.observe(name, value, buckets, **labels)
+
+
+def dump_metrics() -> Dict[str, List[Any]]:
     return _registry.snapshot()
 
 
@@ -101,6 +251,7 @@ def persist_snapshot(path: Path | None = None) -> Path:
     serializable = {
         "counters": [s.__dict__ for s in snapshot["counters"]],
         "gauges": [s.__dict__ for s in snapshot["gauges"]],
+        "histograms": [s.to_dict() for s in snapshot["histograms"]],
     }
     path.parent.mkdir(parents=True, exist_ok=True)
     with path.open("w", encoding="utf-8") as f:
@@ -127,9 +278,14 @@ def cleanup_expired_metrics(ttl_seconds: int = 3600) -> int:
 __all__ = [
     "incr",
     "set_gauge",
+    "observe",
     "dump_metrics",
     "persist_snapshot",
     "cleanup_expired_metrics",
+    "DEFAULT_DECAY_EVERY",
+    "DEFAULT_LATENCY_BUCKETS",
+    "HistogramSample",
+    "LatencyHistogram",
     "MetricSample",
     "MetricsRegistry",
 ]
@@ -1,9 +1,12 @@
 from __future__ import annotations
 
+import hashlib
 import os
-from typing import Dict, Optional, Any
+from typing import Dict, Iterator, Optional, Any
 
 from src.common.logging_utils import get_logger
+from src.observability import metrics as registry_metrics
+from src.resource_manager import proxy_health, proxy_site_health
 
 log = get_logger("prometheus-exporter")
 
@@ -21,6 +24,15 @@ except Exception:  # pragma: no cover
     PromCollectorRegistry = None  # type: ignore[assignment]
     generate_latest = None  # type: ignore[assignment]
 
+try:
+    from prometheus_client.core import (  # type: ignore[import]
+        REGISTRY,
+        GaugeMetricFamily,
+        HistogramMetricFamily,
+    )
+except Exception:  # pragma: no cover
+    REGISTRY = GaugeMetricFamily = HistogramMetricFamily = None  # type: ignore[assignment]
+
 
 class _StubCollectorRegistry:
     """Lightweight stand-in when prometheus_client is unavailable."""
@@ -54,6 +66,79 @@ PROMETHEUS_AVAILABLE = Counter is not None and CollectorRegistry is not _StubCol
 SCRAPER_RUNS = None
 SCRAPER_ERRORS = None
 
+PROXY_LATENCY_QUANTILES = (0.5, 0.95, 0.99)
+
+
+def proxy_label(proxy: str) -> str:
+    """Proxy label without credentials; a digest keeps differently-authenticated sessions apart."""
+
+    if "@" not in proxy:
+        return proxy
+    return f"{proxy.rsplit('@', 1)[1]}#{hashlib.sha1(proxy.encode('utf-8')).hexdigest()[:8]}"
+
+
+class LatencyCollector:
+    """Exports latency histograms at scrape time.
+
+    Proxy health histograms become per-proxy percentile gauges; the histograms
+    of :mod:`src.observability.metrics` (e.g. ``llm_request_seconds``) are
+    exported as Prometheus histograms named ``scraper_<name>``.
+    """
+
+    def describe(self) -> list:
+        return []
+
+    def collect(self) -> Iterator[Any]:
+        per_site = GaugeMetricFamily(
+            "scraper_proxy_latency_seconds",
+            "Proxy response latency percentile per target site",
+            labels=["proxy", "site", "quantile"],
+        )
+        per_source = GaugeMetricFamily(
+            "scraper_proxy_source_latency_seconds",
+            "Proxy response latency percentile per scraper source",
+            labels=["source", "proxy", "quantile"],
+        )
+        for proxy, site, histogram in proxy_site_health.latency_snapshot():
+            for q in PROXY_LATENCY_QUANTILES:
+                per_site.add_metric(
+                    [proxy_label(proxy), site, str(q)], histogram.percentile(q) or 0.0
+                )
+        for source, proxy, histogram in proxy_health.latency_snapshot():
+            for q in PROXY_LATENCY_QUANTILES:
+                per_source.add_metric(
+                    [source, proxy_label(proxy), str(q)], histogram.percentile(q) or 0.0
+                )
+        yield per_site
+        yield per_source
+        yield from self._registry_histograms()
+
+    @staticmethod
+    def _registry_histograms() -> Iterator[Any]:
+        families: Dict[str, Any] = {}
+        for sample in registry_metrics.dump_metrics()["histograms"]:
+            labels = sorted(sample.labels)
+            family = families.get(sample.name)
+            if family is None:
+                family = families[sample.name] = HistogramMetricFamily(
+                    f"scraper_{sample.name}", f"{sample.name} histogram", labels=labels
+                )
+            buckets = [(f"{bound:g}", count) for bound, count in zip(sample.buckets, sample.counts)]
+            buckets.append(("+Inf", sample.count))
+            family.add_metric([str(sample.labels[name]) for name in labels], buckets, sample.sum)
+        yield from families.values()
+
+
+def register_latency_collector(registry: Optional[Any] = None) -> Optional[LatencyCollector]:
+    """Attach a :class:`LatencyCollector` to ``registry`` (default: the global one)."""
+
+    registry = registry or REGISTRY
+    if not PROMETHEUS_AVAILABLE or GaugeMetricFamily is None or registry is None:
+        return None
+    collector = LatencyCollector()
+    registry.register(collector)
+    return collector
+
 
 def init_metrics() -> None:
     """
@@ -78,6 +163,7 @@ def init_metrics() -> None:
 
     SCRAPER_RUNS = Counter("scraper_runs_total", "Total scraper runs", ["source"])  # type: ignore[call-arg]
     SCRAPER_ERRORS = Counter("scraper_errors_total", "Total scraper errors", ["source"])  # type: ignore[call-arg]
+    register_latency_collector()
 
     port = int(os.getenv("PROMETHEUS_PORT", "9100"))
     start_http_server(port)  # type: ignore[call-arg]
@@ -112,6 +198,7 @@ def create_metrics(*, registry: Optional[CollectorRegistry] = None) -> Dict[str,
         )
         runs_total = runs_total.labels(source="default")
         runs_failed = runs_failed.labels(source="default")
+        register_latency_collector(reg)
     else:
         runs_total = _NoopCounter()
         runs_failed = _NoopCounter()
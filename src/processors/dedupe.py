@@ -1,37 +1,31 @@
 from __future__ import annotations
 
 import logging
-from typing import Iterable, List, Sequence
+from typing import Iterable, Iterator, List, Sequence
 
 from src.core_kernel.models import NormalizedRecord
 
 log = logging.getLogger("dedupe")
 
 
-def dedupe_records(records: Iterable[NormalizedRecord], key_fields: Sequence[str] = ("product_url", "name")) -> List[NormalizedRecord]:
-    """Remove duplicate records based on the provided key fields.
+def iter_unique_records(
+    records: Iterable[NormalizedRecord], key_fields: Sequence[str] = ("product_url", "name")
+) -> Iterator[NormalizedRecord]:
+    """Yield records whose key tuple has not been seen yet.
 
-    Args:
-        records: Iterable of normalized records to inspect.
-        key_fields: Field names used to build the deduplication key.
-
-    Returns:
-        List of ``NormalizedRecord`` items with only the first instance of each
-        key tuple retained.
-
-    Side effects:
-        Logs a message for each dropped duplicate for observability.
+    Streaming counterpart of :func:`dedupe_records`: only the key tuples are
+    retained, so memory grows with the number of distinct keys rather than
+    with the records themselves.
     """
 
     seen = set()
-    unique: List[NormalizedRecord] = []
 
     for record in records:
         try:
             key = tuple(record.get(field) if isinstance(record, dict) else getattr(record, field) for field in key_fields)
         except Exception as exc:  # pragma: no cover - defensive guard
             log.warning("Failed to compute dedupe key: %s", exc)
-            unique.append(record)
+            yield record
             continue
 
         if key in seen:
@@ -39,6 +33,24 @@ def dedupe_records(records: Iterable[NormalizedRecord], key_fields: Sequence[str
             continue
 
         seen.add(key)
-        unique.append(record)
+        yield record
+
+
+def dedupe_records(
+    records: Iterable[NormalizedRecord], key_fields: Sequence[str] = ("product_url", "name")
+) -> List[NormalizedRecord]:
+    """Remove duplicate records based on the provided key fields.
+
+    Args:
+        records: Iterable of normalized records to inspect.
+        key_fields: Field names used to build the deduplication key.
+
+    Returns:
+        List of ``NormalizedRecord`` items with only the first instance of each
+        key tuple retained.
+
+    Side effects:
+        Logs a message for each dropped duplicate for observability.
+    """
 
-    return unique
+    return list(iter_unique_records(records, key_fields))
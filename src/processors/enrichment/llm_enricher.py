@@ -14,6 +14,7 @@ import json
 from typing import Any, Dict, Iterable, List, Optional
 
 from src.common.logging_utils import get_logger
+from src.processors.llm.llm_batch import LLMBatcher, get_llm_batcher
 from src.processors.llm.llm_client import LLMClient, get_llm_client_from_config
 
 log = get_logger("llm-enricher")
@@ -68,6 +69,77 @@ def translate_record(
     return translated
 
 
+def translate_records(
+    records: List[Dict[str, Any]],
+    target_language: str,
+    fields: Optional[List[str]] = None,
+    llm_client: Optional[LLMClient] = None,
+    source_config: Optional[Dict[str, Any]] = None,
+    batcher: Optional[LLMBatcher] = None,
+) -> List[Dict[str, Any]]:
+    """
+    Translate text fields of many records in packed, concurrent requests.
+
+    All fields of all records share the batches and identical texts (the
+    same lab name on many records) are translated once.
+    
+    Args:
+        records: Records to translate
+        target_language: Target language code (e.g., "en", "es", "fr")
+        fields: Optional list of field names to translate (defaults to text fields)
+        llm_client: Optional LLM client
+        source_config: Optional source config for LLM client
+        batcher: Optional batcher to reuse (one is created otherwise)
+    
+    Returns:
+        Copies of the records with translated fields
+    """
+    if llm_client is None:
+        if source_config:
+            llm_client = get_llm_client_from_config(source_config.get("llm", {}))
+        else:
+            raise ValueError("Either llm_client or source_config must be provided")
+    
+    if llm_client is None:
+        log.warning("LLM client not available, skipping translation")
+        return records
+    
+    # Default fields to translate
+    if fields is None:
+        fields = ["name", "description", "presentation", "company"]
+    
+    translated = [record.copy() for record in records]
+    targets = [
+        (idx, field) for idx, record in enumerate(records) for field in fields if record.get(field)
+    ]
+    if not targets:
+        return translated
+
+    instruction = (
+        f"Translate each item's input to {target_language}. "
+        "Each result is the translation only, as a JSON string, no explanation."
+    )
+    own_batcher = batcher is None
+    batcher = batcher or get_llm_batcher(llm_client, (source_config or {}).get("llm"))
+    try:
+        results = batcher.extract_json_batched(
+            [str(records[idx][field]) for idx, field in targets], instruction
+        )
+    finally:
+        if own_batcher:
+            batcher.close()
+
+    for (idx, field), result in zip(targets, results):
+        if isinstance(result, str) and result.strip():
+            translated[idx][field] = result.strip()
+        else:
+            log.warning(
+                f"Translation failed for field {field}", extra={"error": "no translation returned"}
+            )
+
+    return translated
+
+
 def expand_metadata(
     record: Dict[str, Any],
     llm_client: Optional[LLMClient] = None,
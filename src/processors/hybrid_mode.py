@@ -80,7 +80,7 @@ def process_pdf_hybrid(
 
         try:
             # Step 1: Try classic extraction
-            extracted = extract_pdf_text_classic(pdf_path)
+            extracted = extract_pdf_text_classic(pdf_path, source_config.get("pdf_extraction"))
             score = score_classic_extraction(extracted)
 
             record["pdf_pages"] = extracted["pages"]
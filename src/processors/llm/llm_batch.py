@@ -0,0 +1,463 @@
+"""
+Batched, concurrent LLM calls.
+
+Calling :meth:`LLMClient.complete` once per record (or per field) leaves a run
+waiting on one round trip at a time. :class:`LLMBatcher` removes both costs:
+
+- :meth:`LLMBatcher.extract_json_batched` packs up to ``size`` small inputs
+  into one prompt as an id-tagged JSON array and maps the model's array of
+  ``{"id", "result"}`` objects back to the inputs. Items the model skipped
+  are retried once in a smaller batch; identical inputs are sent once. With
+  a deterministic client each item's result is also kept in the LLM response
+  cache, so an item seen in any earlier batch is not sent again;
+- requests run on a thread pool of ``workers`` threads (:meth:`map`,
+  :meth:`extract_json_many` for large inputs that cannot be packed).
+
+Every request first passes the provider's :class:`ProviderLimits`: a request
+and a token bucket (``requests_per_minute``/``tokens_per_minute``, shared by
+all batchers of a provider in the process) and a concurrency gate driven by
+an :class:`~src.resource_manager.adaptive_concurrency.AdaptiveConcurrency`
+controller. A 429/503 from the provider halves the gate and the request is
+retried after ``Retry-After`` or an exponential backoff. The batcher sends
+through its own copy of the client with the SDK's retries (``max_retries``)
+turned off, which would otherwise retry a throttled request inside its slot,
+unseen by the controller; the caller's client is left as it is.
+
+Settings live in the source's ``llm`` config section::
+
+    llm:
+      batch:
+        size: 20                 # inputs per packed prompt
+        workers: 8               # concurrent requests
+        requests_per_minute: 500
+        tokens_per_minute: 200000
+        max_retries: 4
+"""
+
+from __future__ import annotations
+
+import copy
+import json
+import random
+import threading
+import time
+import weakref
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Iterator, List, Mapping, Optional, Sequence, TypeVar, Union
+
+from src.common.logging_utils import get_logger
+from src.observability import metrics
+from src.observability.cost_tracking import llm_call_cost, llm_ledger
+from src.processors.llm.llm_cache import cache_key
+from src.processors.llm.llm_client import LLMClient
+from src.resource_manager.adaptive_concurrency import THROTTLE_STATUS_CODES, AdaptiveConcurrency
+from src.resource_manager.rate_limit_backends import InProcessBackend
+from src.resource_manager.rate_limiter import ConcurrencyGate
+
+log = get_logger("llm-batch")
+
+T = TypeVar("T")
+R = TypeVar("R")
+
+DEFAULT_LLM_BATCH_SETTINGS: Dict[str, Any] = {
+    "size": 20,
+    "workers": 8,
+    "requests_per_minute": None,
+    "tokens_per_minute": None,
+    "max_retries": 4,
+}
+MAX_BACKOFF_SECONDS = 30.0
+
+
+def _status_code(exc: BaseException) -> Optional[int]:
+    status = getattr(exc, "status_code", None)
+    if status is None:
+        status = getattr(getattr(exc, "response", None), "status_code", None)
+    return status if isinstance(status, int) else None
+
+
+def _retry_after(exc: BaseException) -> Optional[float]:
+    headers = getattr(getattr(exc, "response", None), "headers", None) or {}
+    try:
+        value = headers.get("retry-after") or headers.get("Retry-After")
+        return float(value) if value is not None else None
+    except (TypeError, ValueError):
+        return None
+
+
+class ProviderLimits:
+    """Request/token buckets and an adaptive concurrency gate for one LLM provider."""
+
+    def __init__(
+        self,
+        provider: str,
+        *,
+        max_concurrent: int = 8,
+        requests_per_minute: Optional[float] = None,
+        tokens_per_minute: Optional[float] = None,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.provider = provider
+        self.requests_per_minute = requests_per_minute
+        self.tokens_per_minute = tokens_per_minute
+        self._buckets = InProcessBackend(clock)
+        self.gate = ConcurrencyGate(max_concurrent)
+        # Latency is not fed to the controller: packed prompts of different sizes
+        # take different times without the provider being any more loaded.
+        self.controller = AdaptiveConcurrency(
+            f"llm:{provider}",
+            initial=max_concurrent,
+            max_limit=max_concurrent,
+            min_window=1,
+            clock=clock,
+        )
+        self.controller.subscribe(lambda controller: self.gate.resize(controller.concurrency))
+
+    def _reserve(self, name: str, per_minute: Optional[float], amount: float) -> float:
+        if not per_minute:
+            return 0.0
+        rate = float(per_minute) / 60.0
+        # One second of budget as burst: smooths the start instead of spending a
+        # minute's quota at once.
+        _, wait = self._buckets.reserve(f"{self.provider}:{name}", rate, max(rate, 1.0), amount)
+        return wait
+
+    @contextmanager
+    def slot(self, tokens: int) -> Iterator[None]:
+        """Wait for request and token budget and a free slot, then hold the slot."""
+
+        wait = max(
+            self._reserve("requests", self.requests_per_minute, 1.0),
+            self._reserve("tokens", self.tokens_per_minute, float(tokens)),
+        )
+        if wait > 0:
+            metrics.incr("llm_rate_limit_wait_seconds", wait, provider=self.provider)
+            time.sleep(wait)
+        self.gate.acquire()
+        try:
+            yield
+        finally:
+            self.gate.release()
+
+    def observe(self, *, status_code: Optional[int] = None, error: bool = False) -> None:
+        self.controller.observe(status_code=status_code, error=error)
+
+
+_provider_limits: Dict[str, ProviderLimits] = {}
+_provider_limits_lock = threading.Lock()
+
+
+def get_provider_limits(
+    provider: str,
+    *,
+    max_concurrent: int = 8,
+    requests_per_minute: Optional[float] = None,
+    tokens_per_minute: Optional[float] = None,
+) -> ProviderLimits:
+    """The process-wide limits for ``provider``; configured rates replace earlier ones."""
+
+    with _provider_limits_lock:
+        limits = _provider_limits.get(provider)
+        if limits is None:
+            limits = ProviderLimits(
+                provider,
+                max_concurrent=max_concurrent,
+                requests_per_minute=requests_per_minute,
+                tokens_per_minute=tokens_per_minute,
+            )
+            _provider_limits[provider] = limits
+        else:
+            limits.requests_per_minute = requests_per_minute or limits.requests_per_minute
+            limits.tokens_per_minute = tokens_per_minute or limits.tokens_per_minute
+        return limits
+
+
+def _without_sdk_retries(client: LLMClient) -> LLMClient:
+    """Copy of ``client`` (same settings and cache) whose SDK client makes no retries."""
+
+    clone = copy.copy(client)
+    clone.max_retries = 0
+    clone._client = None
+    clone._async_clients = weakref.WeakKeyDictionary()
+    clone._client_lock = threading.Lock()
+    return clone
+
+
+class LLMBatcher:
+    """Packs and parallelises calls to one :class:`LLMClient`; use as a context manager."""
+
+    def __init__(
+        self,
+        client: LLMClient,
+        *,
+        size: int = 20,
+        workers: int = 8,
+        requests_per_minute: Optional[float] = None,
+        tokens_per_minute: Optional[float] = None,
+        max_retries: int = 4,
+        limits: Optional[ProviderLimits] = None,
+    ) -> None:
+        self._owns_client = bool(client.max_retries)
+        if self._owns_client:
+            client = _without_sdk_retries(client)
+        self.client = client
+        self.size = max(int(size), 1)
+        self.workers = max(int(workers), 1)
+        self.max_retries = max(int(max_retries), 0)
+        self.limits = limits or get_provider_limits(
+            client.provider,
+            max_concurrent=self.workers,
+            requests_per_minute=requests_per_minute,
+            tokens_per_minute=tokens_per_minute,
+        )
+        self._pool = ThreadPoolExecutor(
+            max_workers=self.workers, thread_name_prefix=f"llm-{client.provider}"
+        )
+
+    def __enter__(self) -> "LLMBatcher":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def close(self) -> None:
+        self._pool.shutdown(wait=True)
+        if self._owns_client:
+            self.client.close()
+
+    # ------------------------------------------------------------ requests
+    def call(self, func: Callable[[], R], *, prompt_chars: int = 0) -> R:
+        """Run one provider request under the provider limits, retrying throttled attempts."""
+
+        tokens = prompt_chars // 4 + self.client.max_tokens
+        for attempt in range(self.max_retries + 1):
+            with self.limits.slot(tokens):
+                try:
+                    result = func()
+                except Exception as exc:
+                    status = _status_code(exc)
+                    throttled = status in THROTTLE_STATUS_CODES
+                    self.limits.observe(status_code=status, error=not throttled)
+                    if not throttled or attempt == self.max_retries:
+                        raise
+                    delay = _retry_after(exc) or min(MAX_BACKOFF_SECONDS, 0.5 * 2**attempt)
+                    metrics.incr("llm_throttled", provider=self.client.provider)
+                else:
+                    self.limits.observe()
+                    return result
+            time.sleep(delay * random.uniform(1.0, 1.25))  # outside the slot, jittered
+        raise AssertionError("unreachable")  # pragma: no cover
+
+    def map(self, func: Callable[[T], R], items: Sequence[T]) -> List[Union[R, Exception]]:
+        """``func(item)`` for every item on the pool, in order; failures are returned."""
+
+        def _run(item: T) -> Union[R, Exception]:
+            try:
+                return func(item)
+            except Exception as exc:  # noqa: BLE001 - returned to the caller per item
+                return exc
+
+        return list(self._pool.map(_run, items))
+
+    def complete_many(
+        self, prompts: Sequence[str], *, system_prompt: Optional[str] = None
+    ) -> List[Union[str, Exception]]:
+        return self.map(
+            lambda prompt: self.call(
+                lambda: self.client.complete(prompt, system_prompt=system_prompt),
+                prompt_chars=len(prompt),
+            ),
+            prompts,
+        )
+
+    def extract_json_many(
+        self, prompts: Sequence[str], *, system_prompt: Optional[str] = None
+    ) -> List[Union[Any, Exception]]:
+        """:meth:`LLMClient.extract_json` for each prompt, concurrently."""
+
+        return self.map(
+            lambda prompt: self.call(
+                lambda: self.client.extract_json(prompt, system_prompt=system_prompt),
+                prompt_chars=len(prompt),
+            ),
+            prompts,
+        )
+
+    # -------------------------------------------------------------- packing
+    def _item_key(self, instruction: str, system_prompt: Optional[str], item: str) -> str:
+        client = self.client
+        return cache_key(
+            client.provider,
+            client.model,
+            0.0,
+            client.max_tokens,
+            system_prompt,
+            f"{instruction}\n[batch item]\n{item}",
+        )
+
+    def _packed_prompt(self, instruction: str, inputs: Sequence[Any]) -> str:
+        items = json.dumps(
+            [{"id": idx, "input": value} for idx, value in enumerate(inputs)], ensure_ascii=False
+        )
+        return (
+            f"{instruction}\n\n"
+            f'Items (a JSON array; each item has an "id" and an "input"):\n'
+            f"<items>\n{items}\n</items>\n\n"
+            f"Return a JSON array with exactly one object per item: "
+            f'{{"id": <the item\'s id>, "result": <the result for that item\'s input>}}.'
+        )
+
+    def _run_packed(
+        self, instruction: str, system_prompt: Optional[str], inputs: Sequence[Any]
+    ) -> List[Any]:
+        prompt = self._packed_prompt(instruction, inputs)
+        try:
+            # Rejecting a reply without any id-tagged result also keeps it out of the cache.
+            return self.call(
+                lambda: self.client.extract_json(
+                    prompt,
+                    system_prompt=system_prompt,
+                    check=lambda reply: _unpack(reply, len(inputs)),
+                ),
+                prompt_chars=len(prompt),
+            )
+        except Exception as exc:  # noqa: BLE001 - items stay unanswered
+            log.warning(
+                "Batched LLM request failed", extra={"items": len(inputs), "error": str(exc)}
+            )
+            return [_MISSING] * len(inputs)
+
+    def extract_json_batched(
+        self,
+        inputs: Sequence[Any],
+        instruction: str,
+        *,
+        system_prompt: Optional[str] = None,
+    ) -> List[Optional[Any]]:
+        """One JSON result per input (``None`` where the model gave none).
+
+        Inputs are sent ``size`` per request. ``instruction`` says what to do
+        with each input and what its ``result`` should be; inputs must be
+        JSON-serialisable.
+        """
+
+        results: List[Any] = [_MISSING] * len(inputs)
+        serialised = [json.dumps(value, ensure_ascii=False, sort_keys=True) for value in inputs]
+        positions: Dict[str, List[int]] = {}
+        for idx, text in enumerate(serialised):
+            positions.setdefault(text, []).append(idx)
+
+        cache = self.client.response_cache() if self.client.temperature == 0 else None
+        pending: List[str] = []
+        for text in positions:
+            cached = (
+                cache.lookup(self._item_key(instruction, system_prompt, text))
+                if cache is not None
+                else None
+            )
+            if cached is None:
+                pending.append(text)
+                continue
+            llm_ledger.record(
+                self.client.provider, self.client.model, outcome="hit", cost_usd=cached.cost_usd
+            )
+            for idx in positions[text]:
+                results[idx] = json.loads(cached.text)
+
+        for attempt, size in enumerate((self.size, max(self.size // 4, 1))):
+            if not pending:
+                break
+            batches = [pending[start : start + size] for start in range(0, len(pending), size)]
+            answers = self.map(
+                lambda batch: self._run_packed(
+                    instruction, system_prompt, [json.loads(text) for text in batch]
+                ),
+                batches,
+            )
+            missed: List[str] = []
+            for batch, answer in zip(batches, answers):
+                if isinstance(answer, Exception):
+                    answer = [_MISSING] * len(batch)
+                for text, result in zip(batch, answer):
+                    if result is _MISSING:
+                        missed.append(text)
+                        continue
+                    for idx in positions[text]:
+                        results[idx] = result
+                    if cache is not None:
+                        self._store_item(cache, instruction, system_prompt, text, result)
+            if missed:
+                metrics.incr("llm_batch_items_missed", len(missed), provider=self.client.provider)
+            pending = missed
+        return [None if result is _MISSING else result for result in results]
+
+    def _store_item(
+        self, cache: Any, instruction: str, system_prompt: Optional[str], text: str, result: Any
+    ) -> None:
+        answer = json.dumps(result, ensure_ascii=False)
+        # The packed call was billed as a whole; attribute an estimated share to the item.
+        prompt_tokens, completion_tokens = (len(instruction) + len(text)) // 4, len(answer) // 4
+        cache.store(
+            self._item_key(instruction, system_prompt, text),
+            provider=self.client.provider,
+            model=self.client.model,
+            text=answer,
+            prompt_tokens=prompt_tokens,
+            completion_tokens=completion_tokens,
+            cost_usd=llm_call_cost(
+                self.client.model, prompt_tokens, completion_tokens, self.client.prices
+            ),
+        )
+
+
+class _Missing:
+    def __repr__(self) -> str:
+        return "<missing>"
+
+
+_MISSING = _Missing()
+
+
+def _unpack(reply: Any, count: int) -> List[Any]:
+    """Results of a packed reply by item id; raises ``ValueError`` if it answers no item."""
+
+    if isinstance(reply, dict):
+        reply = reply.get("results") or reply.get("items") or [reply]
+    results: List[Any] = [_MISSING] * count
+    for entry in reply if isinstance(reply, list) else []:
+        if (
+            isinstance(entry, dict)
+            and isinstance(entry.get("id"), int)
+            and 0 <= entry["id"] < count
+        ):
+            results[entry["id"]] = entry.get("result")
+    if all(result is _MISSING for result in results):
+        raise ValueError("Batched LLM reply has no id-tagged results")
+    return results
+
+
+def get_llm_batcher(
+    client: LLMClient, llm_config: Optional[Mapping[str, Any]] = None
+) -> LLMBatcher:
+    """A batcher for ``client`` configured from the ``batch`` block of an ``llm`` config section."""
+
+    settings = dict(DEFAULT_LLM_BATCH_SETTINGS)
+    settings.update((llm_config or {}).get("batch") or {})
+    return LLMBatcher(
+        client,
+        size=settings["size"],
+        workers=settings["workers"],
+        requests_per_minute=settings.get("requests_per_minute"),
+        tokens_per_minute=settings.get("tokens_per_minute"),
+        max_retries=settings["max_retries"],
+    )
+
+
+__all__ = [
+    "DEFAULT_LLM_BATCH_SETTINGS",
+    "LLMBatcher",
+    "ProviderLimits",
+    "get_llm_batcher",
+    "get_provider_limits",
+]
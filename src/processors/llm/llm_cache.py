@@ -0,0 +1,240 @@
+"""
+Persistent cache of deterministic LLM responses.
+
+Enrichment, QC and normalisation ask the model the same questions over and
+over (the same product and lab names recur across runs and sources).
+:class:`LLMCache` stores each temperature-0 completion in one SQLite file,
+keyed on a sha256 of provider, model, temperature, ``max_tokens``, system
+prompt and prompt, so a repeated call is answered locally instead of being
+re-sent and re-billed. Prompts are keyed with whitespace runs collapsed, so
+re-indented templates still hit.
+
+Entries older than ``ttl_seconds`` are dropped when read, and the file is kept
+under ``max_bytes`` by evicting least recently used entries. Each entry keeps
+the tokens and dollars of the original call so hits can be reported as money
+saved (see :class:`~src.observability.cost_tracking.LLMCostLedger`).
+
+Policy lives in the source's ``llm`` config section::
+
+    llm:
+      cache:
+        enabled: true
+        ttl_seconds: 2592000    # 30 days; 0 = never expire
+        max_bytes: 268435456
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import sqlite3
+import threading
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Dict, Mapping, Optional
+
+from src.common.logging_utils import get_logger
+from src.common.paths import OUTPUT_DIR
+from src.observability import metrics
+
+log = get_logger("llm-cache")
+
+LLM_CACHE_PATH = OUTPUT_DIR / "llm_cache.sqlite"
+DEFAULT_TTL_SECONDS = 30 * 24 * 3600
+DEFAULT_MAX_BYTES = 256 * 1024 * 1024
+DEFAULT_LLM_CACHE_SETTINGS: Dict[str, Any] = {
+    "enabled": True,
+    "ttl_seconds": DEFAULT_TTL_SECONDS,
+    "max_bytes": DEFAULT_MAX_BYTES,
+    "path": None,
+}
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS responses (
+    key TEXT PRIMARY KEY,
+    provider TEXT NOT NULL,
+    model TEXT NOT NULL,
+    response TEXT NOT NULL,
+    prompt_tokens INTEGER NOT NULL,
+    completion_tokens INTEGER NOT NULL,
+    cost_usd REAL NOT NULL,
+    size INTEGER NOT NULL,
+    stored_at REAL NOT NULL,
+    accessed_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS responses_accessed_at ON responses (accessed_at);
+"""
+
+
+@dataclass
+class CachedCompletion:
+    """A stored response and what producing it cost."""
+
+    text: str
+    prompt_tokens: int
+    completion_tokens: int
+    cost_usd: float
+    stored_at: float
+
+
+def cache_key(
+    provider: str,
+    model: str,
+    temperature: float,
+    max_tokens: int,
+    system_prompt: Optional[str],
+    prompt: str,
+) -> str:
+    """Key a completion request; whitespace differences in the prompts do not matter."""
+
+    system = " ".join((system_prompt or "").split())
+    payload = json.dumps(
+        [provider, model, float(temperature), int(max_tokens), system, " ".join(prompt.split())],
+        ensure_ascii=False,
+    )
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class LLMCache:
+    """SQLite-backed, TTL- and size-bounded LRU cache of LLM responses."""
+
+    def __init__(
+        self,
+        path: Path = LLM_CACHE_PATH,
+        *,
+        ttl_seconds: float = DEFAULT_TTL_SECONDS,
+        max_bytes: int = DEFAULT_MAX_BYTES,
+    ) -> None:
+        self.path = Path(path)
+        self.ttl_seconds = max(float(ttl_seconds or 0.0), 0.0)
+        self.max_bytes = max(int(max_bytes), 0)
+        self._lock = threading.RLock()
+
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(str(self.path), check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(_SCHEMA)
+        self._conn.commit()
+        self._total_bytes = int(
+            self._conn.execute("SELECT COALESCE(SUM(size), 0) FROM responses").fetchone()[0]
+        )
+
+    def lookup(self, key: str) -> Optional[CachedCompletion]:
+        """Return the live entry for ``key``, marking it recently used; expired ones are dropped."""
+
+        now = time.time()
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT response, prompt_tokens, completion_tokens, cost_usd, stored_at, size "
+                "FROM responses WHERE key = ?",
+                (key,),
+            ).fetchone()
+            if row is None:
+                return None
+            text, prompt_tokens, completion_tokens, cost_usd, stored_at, size = row
+            with self._conn:
+                if self.ttl_seconds and now - stored_at >= self.ttl_seconds:
+                    self._conn.execute("DELETE FROM responses WHERE key = ?", (key,))
+                    self._total_bytes -= size
+                    metrics.incr("llm_cache_expired")
+                    return None
+                self._conn.execute("UPDATE responses SET accessed_at = ? WHERE key = ?", (now, key))
+        return CachedCompletion(text, prompt_tokens, completion_tokens, cost_usd, stored_at)
+
+    def store(
+        self,
+        key: str,
+        *,
+        provider: str,
+        model: str,
+        text: str,
+        prompt_tokens: int = 0,
+        completion_tokens: int = 0,
+        cost_usd: float = 0.0,
+    ) -> None:
+        size = len(text.encode("utf-8")) + len(key)
+        now = time.time()
+        with self._lock:
+            old = self._conn.execute("SELECT size FROM responses WHERE key = ?", (key,)).fetchone()
+            with self._conn:
+                self._conn.execute(
+                    "INSERT OR REPLACE INTO responses VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                    (
+                        key,
+                        provider,
+                        model,
+                        text,
+                        prompt_tokens,
+                        completion_tokens,
+                        cost_usd,
+                        size,
+                        now,
+                        now,
+                    ),
+                )
+            self._total_bytes += size - (old[0] if old else 0)
+            if self._total_bytes > self.max_bytes:
+                self._evict()
+
+    def _evict(self) -> None:
+        """Drop least recently used entries until 90% of ``max_bytes``."""
+
+        target = int(self.max_bytes * 0.9)
+        with self._conn:
+            cursor = self._conn.execute("SELECT key, size FROM responses ORDER BY accessed_at")
+            victims = []
+            for key, size in cursor:
+                if self._total_bytes <= target:
+                    break
+                victims.append((key,))
+                self._total_bytes -= size
+            self._conn.executemany("DELETE FROM responses WHERE key = ?", victims)
+        if victims:
+            metrics.incr("llm_cache_evictions", len(victims))
+            log.debug("Evicted %d LLM cache entries", len(victims))
+
+    @property
+    def total_bytes(self) -> int:
+        return self._total_bytes
+
+    def __len__(self) -> int:
+        with self._lock:
+            return int(self._conn.execute("SELECT COUNT(*) FROM responses").fetchone()[0])
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+
+_default_caches: Dict[Path, LLMCache] = {}
+_default_caches_lock = threading.Lock()
+
+
+def get_llm_cache(settings: Optional[Mapping[str, Any]] = None) -> Optional[LLMCache]:
+    """Obtain (or open) the shared cache for an ``llm.cache`` section; ``None`` if disabled."""
+
+    merged = dict(DEFAULT_LLM_CACHE_SETTINGS)
+    merged.update(settings or {})
+    if not merged.get("enabled"):
+        return None
+    path = Path(merged.get("path") or LLM_CACHE_PATH)
+    with _default_caches_lock:
+        if path not in _default_caches:
+            _default_caches[path] = LLMCache(
+                path,
+                ttl_seconds=float(merged.get("ttl_seconds") or 0.0),
+                max_bytes=int(merged.get("max_bytes") or DEFAULT_MAX_BYTES),
+            )
+        return _default_caches[path]
+
+
+__all__ = [
+    "CachedCompletion",
+    "DEFAULT_LLM_CACHE_SETTINGS",
+    "LLMCache",
+    "LLM_CACHE_PATH",
+    "cache_key",
+    "get_llm_cache",
+]
@@ -2,17 +2,44 @@
 LLM client abstraction for multiple providers (OpenAI, DeepSeek, etc.).
 
 Provides a unified interface for LLM calls with config-driven provider selection.
+Deterministic (temperature 0) completions are served from the persistent
+:mod:`~src.processors.llm.llm_cache` when possible, and every call is entered
+in the LLM cost ledger of :mod:`src.observability.cost_tracking`.
+
+Each client keeps one provider SDK client with a keep-alive connection pool
+(see ``DEFAULT_LLM_POOL_SETTINGS``) for all calls and threads, plus one async
+SDK client per event loop for :meth:`LLMClient.acomplete`. Call latencies go
+to the ``llm_request_seconds`` histogram of :mod:`src.observability.metrics`.
 """
 
 from __future__ import annotations
 
+import asyncio
+import json
 import os
-from typing import Any, Dict, List, Optional
+import threading
+import time
+import weakref
+from typing import Any, Callable, Dict, List, Mapping, Optional, Sequence, Tuple
+
+import httpx
 
 from src.common.logging_utils import get_logger
+from src.observability import metrics
+from src.observability.cost_tracking import llm_call_cost, llm_ledger
+from src.processors.llm.llm_cache import LLMCache, cache_key, get_llm_cache
 
 log = get_logger("llm-client")
 
+# HTTP pool of the provider SDK client (the ``llm.pool`` config section).
+DEFAULT_LLM_POOL_SETTINGS: Dict[str, Any] = {
+    "max_connections": 32,
+    "max_keepalive_connections": 16,
+    "keepalive_expiry": 90.0,  # seconds an idle connection (and its TLS session) is kept
+    "timeout": 60.0,
+    "connect_timeout": 10.0,
+}
+
 
 class LLMClient:
     """Unified LLM client supporting multiple providers."""
@@ -25,6 +52,11 @@ class LLMClient:
         max_tokens: int = 2048,
         temperature: float = 0.0,
         base_url: Optional[str] = None,
+        cache: Optional[LLMCache] = None,
+        use_cache: bool = True,
+        prices: Optional[Mapping[str, Sequence[float]]] = None,
+        max_retries: int = 2,
+        pool: Optional[Mapping[str, Any]] = None,
     ) -> None:
         """
         Initialize LLM client.
@@ -36,12 +68,27 @@ class LLMClient:
             max_tokens: Maximum tokens in response
             temperature: Temperature (0.0 = deterministic)
             base_url: Custom base URL (for compatible APIs)
+            cache: Response cache for deterministic calls (defaults to the shared one)
+            use_cache: Set False to always call the provider
+            prices: USD per million (prompt, completion) tokens by model, overriding the defaults
+            max_retries: Retries the provider SDK makes on its own (0 leaves them to the caller)
+            pool: HTTP connection pool settings, overriding ``DEFAULT_LLM_POOL_SETTINGS``
         """
         self.provider = provider.lower()
         self.model = model
         self.max_tokens = max_tokens
         self.temperature = temperature
         self.base_url = base_url
+        self.cache = cache
+        self.use_cache = use_cache
+        self.prices = prices
+        self.max_retries = max_retries
+        self.pool = {**DEFAULT_LLM_POOL_SETTINGS, **(pool or {})}
+        self._client: Any = None
+        self._async_clients: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, Any]" = (
+            weakref.WeakKeyDictionary()
+        )
+        self._client_lock = threading.Lock()
 
         # Get API key
         if api_key:
@@ -61,52 +108,174 @@ class LLMClient:
                 "LLM calls will fail."
             )
 
-    def _get_openai_client(self):
-        """Get OpenAI client."""
-        try:
-            from openai import OpenAI  # type: ignore[import]
-
-            client_kwargs = {"api_key": self.api_key}
-            if self.base_url:
-                client_kwargs["base_url"] = self.base_url
-            return OpenAI(**client_kwargs)
-        except ImportError:
-            raise RuntimeError("openai package not installed. Install with: pip install openai")
-
-    def _get_deepseek_client(self):
-        """Get DeepSeek client (OpenAI-compatible)."""
-        try:
-            from openai import OpenAI  # type: ignore[import]
-
-            return OpenAI(
-                api_key=self.api_key,
-                base_url=self.base_url or "https://api.deepseek.com",
-            )
-        except ImportError:
-            raise RuntimeError("openai package not installed. Install with: pip install openai")
-
-    def _get_groq_client(self):
-        """Get Groq client."""
-        try:
-            from groq import Groq  # type: ignore[import]
-        except ImportError as exc:  # pragma: no cover - optional dependency not installed
-            raise RuntimeError("groq package not installed. Install with: pip install groq") from exc
-
-        client_kwargs = {"api_key": self.api_key}
-        if self.base_url:
-            client_kwargs["base_url"] = self.base_url
-        return Groq(**client_kwargs)
+    def _sdk(self) -> Tuple[Any, Any, Any]:
+        """Provider SDK module with its sync and async client classes."""
+        if self.provider in ("openai", "deepseek"):
+            try:
+                import openai as sdk  # type: ignore[import]
+            except ImportError as exc:
+                raise RuntimeError(
+                    "openai package not installed. Install with: pip install openai"
+                ) from exc
+            return sdk, sdk.OpenAI, sdk.AsyncOpenAI
+        if self.provider == "groq":
+            try:
+                import groq as sdk  # type: ignore[import]
+            except ImportError as exc:  # pragma: no cover - optional dependency not installed
+                raise RuntimeError(
+                    "groq package not installed. Install with: pip install groq"
+                ) from exc
+            return sdk, sdk.Groq, sdk.AsyncGroq
+        raise ValueError(f"Unsupported LLM provider: {self.provider}")
+
+    def _build_client(self, asynchronous: bool = False):
+        """New provider SDK client on a tuned keep-alive HTTP pool."""
+        sdk, client_cls, async_client_cls = self._sdk()
+        http_client_cls = sdk.DefaultAsyncHttpxClient if asynchronous else sdk.DefaultHttpxClient
+        timeout, connect = self.pool["timeout"], self.pool["connect_timeout"]
+        http_client = http_client_cls(
+            limits=httpx.Limits(
+                max_connections=self.pool["max_connections"],
+                max_keepalive_connections=self.pool["max_keepalive_connections"],
+                keepalive_expiry=self.pool["keepalive_expiry"],
+            ),
+            # (connect, read, write, pool): SDKs on an httpx fork take a tuple, not httpx.Timeout.
+            timeout=(connect, timeout, timeout, timeout),
+        )
+        client_kwargs = {
+            "api_key": self.api_key,
+            "max_retries": self.max_retries,
+            "http_client": http_client,
+        }
+        default_url = "https://api.deepseek.com" if self.provider == "deepseek" else None
+        base_url = self.base_url or default_url
+        if base_url:
+            client_kwargs["base_url"] = base_url
+        return (async_client_cls if asynchronous else client_cls)(**client_kwargs)
 
     def _get_client(self):
-        """Get appropriate client for provider."""
-        if self.provider == "openai":
-            return self._get_openai_client()
-        elif self.provider == "deepseek":
-            return self._get_deepseek_client()
-        elif self.provider == "groq":
-            return self._get_groq_client()
-        else:
-            raise ValueError(f"Unsupported LLM provider: {self.provider}")
+        """Provider SDK client, created on first use and shared by all calls and threads."""
+        if self._client is None:
+            with self._client_lock:
+                if self._client is None:
+                    self._client = self._build_client()
+        return self._client
+
+    def _get_async_client(self):
+        """Async SDK client of the running event loop (async connections cannot change loops)."""
+        loop = asyncio.get_running_loop()
+        with self._client_lock:
+            client = self._async_clients.get(loop)
+            if client is None:
+                client = self._async_clients[loop] = self._build_client(asynchronous=True)
+        return client
+
+    def close(self) -> None:
+        """Close the pooled connections of the sync client; the next call opens a new pool."""
+        with self._client_lock:
+            client, self._client = self._client, None
+        if client is not None:
+            client.close()
+
+    async def aclose(self) -> None:
+        """Close the async client of the running event loop."""
+        with self._client_lock:
+            client = self._async_clients.pop(asyncio.get_running_loop(), None)
+        if client is not None:
+            await client.close()
+
+    def response_cache(self) -> Optional[LLMCache]:
+        """Cache of deterministic responses (the shared one unless given), ``None`` if disabled."""
+        if not self.use_cache:
+            return None
+        if self.cache is None:
+            self.cache = get_llm_cache()
+        return self.cache
+
+    def _cached(
+        self, prompt: str, system_prompt: Optional[str], max_tokens: int, temperature: float
+    ) -> Tuple[Optional[str], Optional[LLMCache], Optional[str]]:
+        """Cached text (or None), plus the cache and key a fresh response should be stored under."""
+        cache = self.response_cache() if temperature == 0 else None
+        if cache is None:
+            return None, None, None
+        key = cache_key(self.provider, self.model, temperature, max_tokens, system_prompt, prompt)
+        cached = cache.lookup(key)
+        if cached is None:
+            return None, cache, key
+        llm_ledger.record(
+            self.provider,
+            self.model,
+            outcome="hit",
+            prompt_tokens=cached.prompt_tokens,
+            completion_tokens=cached.completion_tokens,
+            cost_usd=cached.cost_usd,
+        )
+        return cached.text, cache, key
+
+    def _request(
+        self, prompt: str, system_prompt: Optional[str], max_tokens: int, temperature: float
+    ) -> Dict[str, Any]:
+        if not self.api_key:
+            raise RuntimeError(f"API key not configured for provider {self.provider}")
+        messages = []
+        if system_prompt:
+            messages.append({"role": "system", "content": system_prompt})
+        messages.append({"role": "user", "content": prompt})
+        return {
+            "model": self.model,
+            "messages": messages,
+            "max_tokens": max_tokens,
+            "temperature": temperature,
+        }
+
+    def _failed(self, exc: Exception) -> None:
+        metrics.incr("llm_request_errors", provider=self.provider, model=self.model)
+        log.error("LLM completion failed", extra={"provider": self.provider, "error": str(exc)})
+
+    def _record(
+        self,
+        text: str,
+        response: Any,
+        messages: List[Dict[str, str]],
+        cache: Optional[LLMCache],
+        key: Optional[str],
+        seconds: float,
+        parse: Optional[Callable[[str], Any]] = None,
+    ) -> Any:
+        """Account a provider response (latency, tokens, cost) and cache it; returns ``text``.
+
+        With ``parse`` the parsed text is returned instead, and a reply it rejects
+        (by raising) is not cached.
+        """
+        metrics.observe("llm_request_seconds", seconds, provider=self.provider, model=self.model)
+        usage = getattr(response, "usage", None)
+        # Rough 4-characters-per-token estimate when the provider reports no usage.
+        estimated = sum(len(m["content"]) for m in messages) // 4
+        prompt_tokens = int(getattr(usage, "prompt_tokens", 0) or estimated)
+        completion_tokens = int(getattr(usage, "completion_tokens", 0) or len(text) // 4)
+        cost_usd = llm_call_cost(self.model, prompt_tokens, completion_tokens, self.prices)
+        llm_ledger.record(
+            self.provider,
+            self.model,
+            outcome="miss" if cache is not None else "bypass",
+            prompt_tokens=prompt_tokens,
+            completion_tokens=completion_tokens,
+            cost_usd=cost_usd,
+            seconds=seconds,
+        )
+        result = text if parse is None else parse(text)
+        if cache is not None and key is not None:
+            cache.store(
+                key,
+                provider=self.provider,
+                model=self.model,
+                text=text,
+                prompt_tokens=prompt_tokens,
+                completion_tokens=completion_tokens,
+                cost_usd=cost_usd,
+            )
+        return result
 
     def complete(
         self,
@@ -127,53 +296,80 @@ class LLMClient:
         Returns:
             Generated text
         """
-        if not self.api_key:
-            raise RuntimeError(f"API key not configured for provider {self.provider}")
+        return self._complete(prompt, system_prompt, max_tokens, temperature)
 
+    def _complete(
+        self,
+        prompt: str,
+        system_prompt: Optional[str],
+        max_tokens: Optional[int],
+        temperature: Optional[float],
+        parse: Optional[Callable[[str], Any]] = None,
+    ) -> Any:
+        max_tokens = max_tokens or self.max_tokens
+        temperature = temperature if temperature is not None else self.temperature
+        cached, cache, key = self._cached(prompt, system_prompt, max_tokens, temperature)
+        if cached is not None:
+            return cached if parse is None else parse(cached)
+
+        request = self._request(prompt, system_prompt, max_tokens, temperature)
         client = self._get_client()
-        messages = []
-        if system_prompt:
-            messages.append({"role": "system", "content": system_prompt})
-        messages.append({"role": "user", "content": prompt})
-
+        started = time.perf_counter()
         try:
-            response = client.chat.completions.create(
-                model=self.model,
-                messages=messages,
-                max_tokens=max_tokens or self.max_tokens,
-                temperature=temperature if temperature is not None else self.temperature,
-            )
-            return response.choices[0].message.content or ""
+            response = client.chat.completions.create(**request)
+            text = response.choices[0].message.content or ""
         except Exception as exc:
-            log.error("LLM completion failed", extra={"provider": self.provider, "error": str(exc)})
+            self._failed(exc)
             raise
+        elapsed = time.perf_counter() - started
+        return self._record(text, response, request["messages"], cache, key, elapsed, parse)
 
-    def extract_json(
+    async def acomplete(
         self,
         prompt: str,
         system_prompt: Optional[str] = None,
-        schema: Optional[Dict[str, Any]] = None,
-    ) -> Dict[str, Any] | List[Dict[str, Any]]:
-        """
-        Extract structured JSON from prompt.
-
-        Args:
-            prompt: User prompt with data to extract
-            system_prompt: Optional system prompt
-            schema: Optional JSON schema (for structured output)
+        max_tokens: Optional[int] = None,
+        temperature: Optional[float] = None,
+    ) -> str:
+        """Async :meth:`complete`; concurrent calls share the event loop's connection pool."""
+        return await self._acomplete(prompt, system_prompt, max_tokens, temperature)
 
-        Returns:
-            Parsed JSON (dict or list)
-        """
-        import json
+    async def _acomplete(
+        self,
+        prompt: str,
+        system_prompt: Optional[str],
+        max_tokens: Optional[int],
+        temperature: Optional[float],
+        parse: Optional[Callable[[str], Any]] = None,
+    ) -> Any:
+        max_tokens = max_tokens or self.max_tokens
+        temperature = temperature if temperature is not None else self.temperature
+        cached, cache, key = self._cached(prompt, system_prompt, max_tokens, temperature)
+        if cached is not None:
+            return cached if parse is None else parse(cached)
+
+        request = self._request(prompt, system_prompt, max_tokens, temperature)
+        client = self._get_async_client()
+        started = time.perf_counter()
+        try:
+            response = await client.chat.completions.create(**request)
+            text = response.choices[0].message.content or ""
+        except Exception as exc:
+            self._failed(exc)
+            raise
+        elapsed = time.perf_counter() - started
+        return self._record(text, response, request["messages"], cache, key, elapsed, parse)
 
+    @staticmethod
+    def _json_prompt(prompt: str, schema: Optional[Dict[str, Any]]) -> str:
         # Enhance prompt to request JSON
         json_prompt = f"{prompt}\n\nReturn only valid JSON, no markdown, no explanation."
         if schema:
             json_prompt += f"\n\nSchema: {json.dumps(schema, indent=2)}"
+        return json_prompt
 
-        response = self.complete(json_prompt, system_prompt=system_prompt)
-        
+    @staticmethod
+    def _parse_json(response: str) -> Dict[str, Any] | List[Dict[str, Any]]:
         # Try to extract JSON from response
         response = response.strip()
         if response.startswith("```json"):
@@ -190,6 +386,49 @@ class LLMClient:
             log.error("Failed to parse LLM JSON response", extra={"response": response[:200]})
             raise ValueError(f"Invalid JSON from LLM: {exc}") from exc
 
+    @classmethod
+    def _json_parser(cls, check: Optional[Callable[[Any], Any]] = None) -> Callable[[str], Any]:
+        if check is None:
+            return cls._parse_json
+        return lambda response: check(cls._parse_json(response))
+
+    def extract_json(
+        self,
+        prompt: str,
+        system_prompt: Optional[str] = None,
+        schema: Optional[Dict[str, Any]] = None,
+        check: Optional[Callable[[Any], Any]] = None,
+    ) -> Any:
+        """
+        Extract structured JSON from prompt.
+
+        Only replies that parse (and pass ``check``) are cached.
+
+        Args:
+            prompt: User prompt with data to extract
+            system_prompt: Optional system prompt
+            schema: Optional JSON schema (for structured output)
+            check: Optional callable applied to the parsed JSON; its result is
+                returned, and raising ``ValueError`` rejects the reply
+
+        Returns:
+            Parsed JSON (dict or list), or what ``check`` returned
+        """
+        json_prompt = self._json_prompt(prompt, schema)
+        return self._complete(json_prompt, system_prompt, None, None, self._json_parser(check))
+
+    async def aextract_json(
+        self,
+        prompt: str,
+        system_prompt: Optional[str] = None,
+        schema: Optional[Dict[str, Any]] = None,
+        check: Optional[Callable[[Any], Any]] = None,
+    ) -> Any:
+        """Async :meth:`extract_json`."""
+        json_prompt = self._json_prompt(prompt, schema)
+        parse = self._json_parser(check)
+        return await self._acomplete(json_prompt, system_prompt, None, None, parse)
+
 
 def get_llm_client_from_config(config: Dict[str, Any]) -> Optional[LLMClient]:
     """
@@ -211,6 +450,7 @@ def get_llm_client_from_config(config: Dict[str, Any]) -> Optional[LLMClient]:
     max_tokens = llm_config.get("max_tokens", 2048)
     temperature = llm_config.get("temperature", 0.0)
     base_url = llm_config.get("base_url")
+    cache_settings = llm_config.get("cache") or {}
 
     return LLMClient(
         provider=provider,
@@ -218,5 +458,10 @@ def get_llm_client_from_config(config: Dict[str, Any]) -> Optional[LLMClient]:
         max_tokens=max_tokens,
         temperature=temperature,
         base_url=base_url,
+        cache=get_llm_cache(cache_settings),
+        use_cache=cache_settings.get("enabled", True),
+        prices=llm_config.get("prices"),
+        max_retries=llm_config.get("max_retries", 2),
+        pool=llm_config.get("pool"),
     )
 
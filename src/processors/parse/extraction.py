@@ -0,0 +1,190 @@
+# file: src/processors/parse/extraction.py
+"""
+Compiled, parse-once field extraction for selector-driven scrapers.
+
+A scraper describes the fields it wants as CSS selectors, each optionally
+overridden by a key of its ``selectors.json``. :func:`compile_plan` translates
+them once into lxml XPath expressions (via cssselect) and caches the resulting
+:class:`ExtractionPlan`; each page is then parsed a single time with
+``lxml.html`` and every field is read off that tree by its precompiled
+expression, instead of building a BeautifulSoup tree and running soupsieve per
+field.
+
+Text follows ``BeautifulSoup.get_text(strip=True)``: every text node under the
+match is stripped and joined, skipping comments, scripts and styles.
+
+:func:`extract_many` runs a plan over many HTML strings, optionally in a
+process pool (plans pickle as their field specs and recompile on arrival).
+"""
+
+from __future__ import annotations
+
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Any, Dict, Iterable, List, Mapping, Optional, Tuple, Union
+
+import lxml.html
+from cssselect import HTMLTranslator
+from lxml import etree
+
+_TRANSLATOR = HTMLTranslator()
+_TEXT_NODES = etree.XPath("descendant-or-self::text()[not(parent::script or parent::style)]")
+
+
+@dataclass(frozen=True)
+class Field:
+    """One value to extract: the text (or ``attr``) of the first match, or every match if ``many``.
+
+    ``key`` names the ``selectors.json`` entry that overrides ``selector`` when present.
+    """
+
+    selector: str
+    attr: Optional[str] = None
+    many: bool = False
+    key: Optional[str] = None
+
+
+FieldLike = Union[str, Field]
+
+
+def _node_text(node: Any) -> str:
+    return "".join(part.strip() for part in _TEXT_NODES(node))
+
+
+class ExtractionPlan:
+    """Precompiled field extractors; build with :func:`compile_plan`."""
+
+    def __init__(self, fields: Tuple[Tuple[str, Field], ...]):
+        self.fields = fields
+        self._compiled: List[Tuple[str, etree.XPath, Field]] = []
+        for name, field in fields:
+            xpath = _TRANSLATOR.css_to_xpath(field.selector)
+            if not field.many:
+                xpath = f"({xpath})[1]"  # lets libxml2 stop at the first match
+            self._compiled.append((name, etree.XPath(xpath), field))
+
+    def __reduce__(self):
+        return (_compile, (self.fields,))  # recompiled (once per process) on unpickling
+
+    def _value(self, node: Any, field: Field) -> Optional[str]:
+        if field.attr is None:
+            return _node_text(node)
+        return node.get(field.attr)
+
+    def matches(self, tree: Any, name: str) -> List[Any]:
+        """The elements field ``name`` matches in ``tree``, for callers that need more than text."""
+
+        for field_name, xpath, _ in self._compiled:
+            if field_name == name:
+                return list(xpath(tree)) if tree is not None else []
+        raise KeyError(name)
+
+    def extract_tree(self, tree: Any) -> Dict[str, Any]:
+        """Extract every field from an already parsed lxml tree."""
+
+        record: Dict[str, Any] = {}
+        for name, xpath, field in self._compiled:
+            nodes = xpath(tree) if tree is not None else []
+            if field.many:
+                values = (self._value(node, field) for node in nodes)
+                record[name] = [value for value in values if value]
+            else:
+                record[name] = self._value(nodes[0], field) if nodes else None
+        return record
+
+    def extract(self, html: Union[str, bytes]) -> Dict[str, Any]:
+        """Parse ``html`` once and extract every field."""
+
+        return self.extract_tree(parse_document(html))
+
+
+def parse_document(html: Union[str, bytes]) -> Any:
+    """Parse ``html`` with ``lxml.html``; ``None`` for an empty document."""
+
+    if not html or not html.strip():
+        return None
+    try:
+        return lxml.html.fromstring(html)
+    except ValueError:
+        # Unicode strings carrying an XML encoding declaration must be parsed as bytes.
+        return lxml.html.fromstring(html.encode("utf-8") if isinstance(html, str) else html)
+    except etree.ParserError:
+        return None
+
+
+def _as_field(spec: FieldLike) -> Field:
+    return spec if isinstance(spec, Field) else Field(selector=spec)
+
+
+@lru_cache(maxsize=256)
+def _compile(fields: Tuple[Tuple[str, Field], ...]) -> ExtractionPlan:
+    return ExtractionPlan(fields)
+
+
+def compile_plan(
+    fields: Mapping[str, FieldLike],
+    selectors: Optional[Mapping[str, Any]] = None,
+) -> ExtractionPlan:
+    """Compile ``fields`` (name -> CSS selector or :class:`Field`) into a cached plan.
+
+    Fields with a ``key`` take their selector from ``selectors`` (a source's
+    ``selectors.json``) when it has that key, so configuration changes apply
+    without code edits.
+    """
+
+    selectors = selectors or {}
+    resolved = []
+    for name, spec in fields.items():
+        field = _as_field(spec)
+        configured = selectors.get(field.key) if field.key else None
+        if isinstance(configured, str) and configured:
+            field = Field(configured, field.attr, field.many)
+        elif field.key:
+            # Keep the cache key independent of ``key``.
+            field = Field(field.selector, field.attr, field.many)
+        resolved.append((name, field))
+    return _compile(tuple(resolved))
+
+
+def plan_from_selectors(selectors: Mapping[str, Any], suffix: str = "_selector") -> ExtractionPlan:
+    """Plan with one first-match text field per ``*_selector`` key of ``selectors``."""
+
+    return compile_plan({key[: -len(suffix)]: value for key, value in selectors.items()
+                         if key.endswith(suffix) and isinstance(value, str) and value})
+
+
+def _extract_chunk(plan: ExtractionPlan, pages: List[Union[str, bytes]]) -> List[Dict[str, Any]]:
+    return [plan.extract(html) for html in pages]
+
+
+def extract_many(
+    plan: ExtractionPlan,
+    pages: Iterable[Union[str, bytes]],
+    *,
+    workers: Optional[int] = None,
+    chunksize: int = 32,
+) -> List[Dict[str, Any]]:
+    """Extract ``plan`` from every page, in order.
+
+    With ``workers`` > 1 pages are parsed in a process pool, ``chunksize``
+    pages per task so the pickling cost of each HTML string is amortised.
+    """
+
+    pages = list(pages)
+    if not workers or workers <= 1 or len(pages) <= chunksize:
+        return _extract_chunk(plan, pages)
+    chunks = [pages[start:start + chunksize] for start in range(0, len(pages), chunksize)]
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        results = pool.map(_extract_chunk, [plan] * len(chunks), chunks)
+        return [record for chunk in results for record in chunk]
+
+
+__all__ = [
+    "ExtractionPlan",
+    "Field",
+    "compile_plan",
+    "extract_many",
+    "parse_document",
+    "plan_from_selectors",
+]
@@ -0,0 +1,339 @@
+"""Compiled on-disk PCID master index.
+
+Rebuilding the PCID index on every run means re-reading the master, validating
+every row and re-embedding everything. This module compiles the master once
+into an index directory and reopens it zero-copy on later runs:
+
+- ``manifest.json``: format version, dims, embedding fingerprint, the master
+  file's sha256/mtime/size stamp and the current generation's file names.
+- ``keys-<gen>.json``: the exact-match hash table (joined key -> PCID).
+- ``rows-<gen>.json``: per-row content hashes, PCIDs and metadata.
+- ``embeddings-<gen>.f32``: L2-normalized float32 embedding matrix opened
+  with ``np.memmap``.
+
+When the master changes, every row is validated and keyed again, but rows
+whose content hash is already indexed reuse their stored embedding; only new
+or edited rows are embedded.
+The manifest is replaced last, so a crash mid-build leaves the previous
+generation readable.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+from src.common.logging_utils import get_logger
+from src.core_kernel.models import RawRecord
+from src.processors.pcid_matcher import _fast_key_and_payload, read_pcid_master_rows
+from src.processors.vector_store import (
+    MatrixPCIDVectorStore,
+    _require_numpy,
+    embed_pcid_record,
+    embed_pcid_records,
+    np,
+)
+
+log = get_logger("pcid-index")
+
+INDEX_FORMAT_VERSION = 1
+MANIFEST_NAME = "manifest.json"
+_KEY_SEPARATOR = "\x1f"
+_FINGERPRINT_PROBE = {"name": "pcid index probe 10mg", "company": "probe labs", "currency": "ARS"}
+
+
+@dataclass
+class CompiledPCIDIndex:
+    """An opened compiled index: exact-key table plus memmap-backed store."""
+
+    path: Path
+    manifest: Dict[str, Any]
+    pcid_index: Dict[Tuple[str, str, str], str]
+    store: MatrixPCIDVectorStore
+    row_hashes: List[str]
+
+    @property
+    def rows(self) -> int:
+        return len(self.store)
+
+
+def _embedding_width(dims: int) -> int:
+    return 2 * dims + dims // 2
+
+
+def embedding_fingerprint(dims: int) -> str:
+    """Fingerprint the embedding function so stale vectors are never reused."""
+
+    probe = np.asarray(embed_pcid_record(_FINGERPRINT_PROBE, dims=dims), dtype=np.float32)
+    return hashlib.sha256(probe.tobytes()).hexdigest()[:16]
+
+
+def _file_sha256(path: Path) -> str:
+    digest = hashlib.sha256()
+    with path.open("rb") as handle:
+        for chunk in iter(lambda: handle.read(1 << 20), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def _row_hash(row: Dict[str, Any]) -> str:
+    canonical = json.dumps(row, sort_keys=True, separators=(",", ":"), default=str)
+    return hashlib.blake2b(canonical.encode("utf-8"), digest_size=16).hexdigest()
+
+
+def _read_manifest(index_dir: Path) -> Optional[Dict[str, Any]]:
+    manifest_path = index_dir / MANIFEST_NAME
+    if not manifest_path.exists():
+        return None
+    try:
+        manifest = json.loads(manifest_path.read_text(encoding="utf-8"))
+    except (OSError, json.JSONDecodeError) as exc:
+        log.warning(
+            "Unreadable PCID index manifest; rebuilding",
+            extra={"path": str(manifest_path), "error": str(exc)},
+        )
+        return None
+    if not isinstance(manifest, dict) or manifest.get("format_version") != INDEX_FORMAT_VERSION:
+        return None
+    return manifest
+
+
+def _write_json_atomic(path: Path, payload: Any) -> None:
+    tmp_path = path.with_name(path.name + ".tmp")
+    tmp_path.write_text(json.dumps(payload, separators=(",", ":")), encoding="utf-8")
+    os.replace(tmp_path, path)
+
+
+def open_pcid_index(index_dir: Path, *, batch_size: int = 256) -> CompiledPCIDIndex:
+    """Open a compiled index; the embedding matrix is memory-mapped read-only.
+
+    Raises:
+        FileNotFoundError: When the directory holds no compiled index.
+        ValueError: When the manifest is from an incompatible format.
+    """
+
+    _require_numpy()
+    manifest = _read_manifest(index_dir)
+    if manifest is None:
+        raise FileNotFoundError(f"No compiled PCID index at {index_dir}")
+
+    files = manifest["files"]
+    rows_payload = json.loads((index_dir / files["rows"]).read_text(encoding="utf-8"))
+    keys_payload = json.loads((index_dir / files["keys"]).read_text(encoding="utf-8"))
+    rows = int(manifest["rows"])
+    width = int(manifest["width"])
+    if len(rows_payload["pcids"]) != rows:
+        raise ValueError(f"PCID index rows do not match manifest at {index_dir}")
+
+    if rows:
+        matrix = np.memmap(
+            index_dir / files["embeddings"], dtype=np.float32, mode="r", shape=(rows, width)
+        )
+    else:
+        matrix = np.zeros((0, width), dtype=np.float32)
+
+    pcid_index = {tuple(key.split(_KEY_SEPARATOR)): pcid for key, pcid in keys_payload.items()}
+    store = MatrixPCIDVectorStore.from_arrays(
+        rows_payload["pcids"],
+        matrix,
+        rows_payload["metadata"],
+        dims=int(manifest["dims"]),
+        batch_size=batch_size,
+        generation=f"{manifest['master']['sha256'][:12]}-{manifest['embedding_fingerprint']}",
+    )
+    return CompiledPCIDIndex(
+        path=index_dir,
+        manifest=manifest,
+        pcid_index=pcid_index,  # type: ignore[arg-type]
+        store=store,
+        row_hashes=list(rows_payload["row_hashes"]),
+    )
+
+
+def _stamp(master_path: Path) -> Dict[str, Any]:
+    stat = master_path.stat()
+    return {"mtime_ns": stat.st_mtime_ns, "size": stat.st_size}
+
+
+def _is_current(manifest: Dict[str, Any], dims: int, fingerprint: str) -> bool:
+    return manifest.get("dims") == dims and manifest.get("embedding_fingerprint") == fingerprint
+
+
+def compile_pcid_index(
+    master_path: Path,
+    index_dir: Path,
+    *,
+    dims: int = 48,
+    previous: Optional[CompiledPCIDIndex] = None,
+    master_sha256: Optional[str] = None,
+) -> Dict[str, Any]:
+    """Compile ``master_path`` into ``index_dir`` and return the new manifest.
+
+    Every row is validated as :class:`RawRecord` and keyed; rows already present
+    in ``previous`` (matched by content hash) reuse their embeddings, the rest
+    are embedded.
+    """
+
+    _require_numpy()
+    index_dir.mkdir(parents=True, exist_ok=True)
+    width = _embedding_width(dims)
+    fingerprint = embedding_fingerprint(dims)
+    master_sha256 = master_sha256 or _file_sha256(master_path)
+    stamp = _stamp(master_path)
+
+    reusable: Dict[str, int] = {}
+    if previous is not None and _is_current(previous.manifest, dims, fingerprint):
+        reusable = {row_hash: position for position, row_hash in enumerate(previous.row_hashes)}
+
+    pcids: List[str] = []
+    metadata: List[Dict[str, Any]] = []
+    row_hashes: List[str] = []
+    keys: Dict[str, str] = {}
+    reused_positions: List[Tuple[int, int]] = []
+    fresh_rows: List[Tuple[int, Dict[str, Any]]] = []
+
+    for row in read_pcid_master_rows(master_path):
+        validated = RawRecord.model_validate(row).model_dump()
+        if not validated.get("pcid"):
+            continue
+        row_hash = _row_hash(row)
+        position = len(pcids)
+        previous_position = reusable.get(row_hash)
+        if previous_position is None:
+            fresh_rows.append((position, validated))
+        else:
+            reused_positions.append((position, previous_position))
+
+        # Key the validated row, whether or not its embedding is reused; fields left
+        # empty take their NormalizedRecord defaults.
+        pcid = str(validated["pcid"])
+        key, _payload = _fast_key_and_payload({k: v for k, v in validated.items() if v is not None})
+        keys[_KEY_SEPARATOR.join(key)] = pcid
+        pcids.append(pcid)
+        metadata.append({"source": validated.get("source")})
+        row_hashes.append(row_hash)
+
+    generation = master_sha256[:12]
+    files = {
+        "embeddings": f"embeddings-{generation}.f32",
+        "rows": f"rows-{generation}.json",
+        "keys": f"keys-{generation}.json",
+    }
+
+    embeddings_path = index_dir / files["embeddings"]
+    tmp_embeddings = embeddings_path.with_name(embeddings_path.name + ".tmp")
+    if pcids:
+        matrix = np.memmap(tmp_embeddings, dtype=np.float32, mode="w+", shape=(len(pcids), width))
+        if reused_positions:
+            new_idx, old_idx = (np.asarray(column) for column in zip(*reused_positions))
+            matrix[new_idx] = previous.store.matrix[old_idx]  # type: ignore[union-attr]
+        if fresh_rows:
+            new_idx = np.asarray([position for position, _row in fresh_rows])
+            matrix[new_idx] = embed_pcid_records([row for _position, row in fresh_rows], dims=dims)
+        matrix.flush()
+        del matrix
+    else:
+        tmp_embeddings.write_bytes(b"")
+    os.replace(tmp_embeddings, embeddings_path)
+
+    _write_json_atomic(
+        index_dir / files["rows"], {"pcids": pcids, "metadata": metadata, "row_hashes": row_hashes}
+    )
+    _write_json_atomic(index_dir / files["keys"], keys)
+
+    old_manifest = _read_manifest(index_dir)
+    manifest = {
+        "format_version": INDEX_FORMAT_VERSION,
+        "dims": dims,
+        "width": width,
+        "rows": len(pcids),
+        "embedding_fingerprint": fingerprint,
+        "master": {"path": str(master_path), "sha256": master_sha256, **stamp},
+        "files": files,
+    }
+    _write_json_atomic(index_dir / MANIFEST_NAME, manifest)
+
+    if old_manifest:
+        for name in (old_manifest.get("files") or {}).values():
+            if name not in files.values():
+                (index_dir / name).unlink(missing_ok=True)
+
+    log.info(
+        "Compiled PCID index",
+        extra={
+            "path": str(index_dir),
+            "rows": len(pcids),
+            "reused": len(reused_positions),
+            "embedded": len(fresh_rows),
+        },
+    )
+    return manifest
+
+
+def load_or_build_pcid_index(
+    master_path: Path,
+    index_dir: Path,
+    *,
+    dims: int = 48,
+    batch_size: int = 256,
+) -> Optional[CompiledPCIDIndex]:
+    """Open the compiled index for ``master_path``, rebuilding it if stale.
+
+    The mtime/size stamp is checked first; the sha256 is only computed when the
+    stamp moved, so an unchanged master costs a ``stat`` and a memmap open.
+    Returns ``None`` when the master file does not exist.
+    """
+
+    if not master_path.exists():
+        return None
+
+    _require_numpy()
+    manifest = _read_manifest(index_dir)
+    previous: Optional[CompiledPCIDIndex] = None
+    if manifest is not None:
+        try:
+            previous = open_pcid_index(index_dir, batch_size=batch_size)
+        except (OSError, ValueError, KeyError) as exc:
+            log.warning(
+                "Failed to open PCID index; rebuilding",
+                extra={"path": str(index_dir), "error": str(exc)},
+            )
+
+    fingerprint = embedding_fingerprint(dims)
+    if previous is not None and _is_current(previous.manifest, dims, fingerprint):
+        master_meta = previous.manifest.get("master") or {}
+        stamp = _stamp(master_path)
+        if (
+            master_meta.get("mtime_ns") == stamp["mtime_ns"]
+            and master_meta.get("size") == stamp["size"]
+        ):
+            return previous
+
+        master_sha256 = _file_sha256(master_path)
+        if master_meta.get("sha256") == master_sha256:
+            refreshed = dict(previous.manifest)
+            refreshed["master"] = {**master_meta, **stamp}
+            _write_json_atomic(index_dir / MANIFEST_NAME, refreshed)
+            previous.manifest = refreshed
+            return previous
+    else:
+        master_sha256 = None
+
+    compile_pcid_index(
+        master_path, index_dir, dims=dims, previous=previous, master_sha256=master_sha256
+    )
+    return open_pcid_index(index_dir, batch_size=batch_size)
+
+
+__all__ = [
+    "CompiledPCIDIndex",
+    "INDEX_FORMAT_VERSION",
+    "compile_pcid_index",
+    "embedding_fingerprint",
+    "load_or_build_pcid_index",
+    "open_pcid_index",
+]
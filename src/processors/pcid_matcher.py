@@ -3,7 +3,7 @@ from __future__ import annotations
 
 import json
 from pathlib import Path
-from typing import Any, Dict, Iterable, List, Mapping, Optional, Tuple
+from typing import Any, Dict, Iterable, List, Mapping, Optional, Sequence, Tuple
 
 from src.core_kernel.models import NormalizedRecord, PCIDMatchResult, RawRecord
 from src.governance.openfeature import is_enabled
@@ -12,6 +12,7 @@ from src.processors.vector_store import (
     PCIDVectorStore,
     connect_vector_store_backend,
     embed_pcid_record,
+    embed_pcid_records,
 )
 
 
@@ -45,6 +46,50 @@ def _make_key(record: NormalizedRecord | RawRecord | Mapping[str, Any]) -> Tuple
     return name, company, currency
 
 
+def _is_plainly_valid(record: Mapping[str, Any]) -> bool:
+    """True when ``NormalizedRecord`` would accept the mapping's typed fields unchanged."""
+
+    for field in ("product_url", "name", "company", "source"):
+        value = record.get(field)
+        if value is not None and type(value) is not str:
+            return False
+    if "currency" in record and type(record["currency"]) is not str:
+        return False
+    price = record.get("price")
+    return price is None or type(price) in (int, float)
+
+
+def _fast_key_and_payload(
+    record: NormalizedRecord | RawRecord | Mapping[str, Any]
+) -> Tuple[Tuple[str, str, str], Dict[str, str]]:
+    """Build the match key and embedding payload, skipping Pydantic for plainly valid records.
+
+    Gives the same key as :func:`_make_key`: ``currency`` defaults to ``ARS``
+    only when it is absent, and records needing coercion (or failing
+    validation, e.g. ``currency=None``) go through ``NormalizedRecord``.
+    """
+
+    if isinstance(record, RawRecord) and record.currency is None:
+        record = _coerce_normalized_record(record)  # raises like _make_key
+    if isinstance(record, (NormalizedRecord, RawRecord)):
+        get = lambda field: getattr(record, field, None)  # noqa: E731
+    elif isinstance(record, Mapping):
+        if not _is_plainly_valid(record):
+            return _fast_key_and_payload(_coerce_normalized_record(record))
+        get = record.get
+    else:  # pragma: no cover - defensive type guard
+        raise TypeError(f"Unsupported record type for normalization: {type(record)!r}")
+
+    name = get("name")
+    company = get("company")
+    currency = get("currency")
+    name = "" if name is None else name
+    company = "" if company is None else company
+    currency = "ARS" if currency is None else currency
+    key = (_normalize_field(name), _normalize_field(company), _normalize_field(currency))
+    return key, {"name": name, "company": company, "currency": currency}
+
+
 def load_pcid_master(path: Path) -> List[RawRecord]:
     """Load PCID master records from a JSONL or JSON array file.
 
@@ -57,6 +102,16 @@ def load_pcid_master(path: Path) -> List[RawRecord]:
         List of ``RawRecord`` entries parsed from the file.
     """
 
+    return [RawRecord.model_validate(row) for row in read_pcid_master_rows(path)]
+
+
+def read_pcid_master_rows(path: Path) -> List[Dict[str, Any]]:
+    """Read PCID master rows as plain dicts without model validation.
+
+    Accepts the same JSONL / JSON array layouts as :func:`load_pcid_master`;
+    malformed JSONL lines are skipped.
+    """
+
     if not path.exists():
         return []
 
@@ -68,10 +123,10 @@ def load_pcid_master(path: Path) -> List[RawRecord]:
     if content.lstrip().startswith("["):
         data = json.loads(content)
         if isinstance(data, list):
-            return [RawRecord.model_validate(item) for item in data if isinstance(item, dict)]
+            return [item for item in data if isinstance(item, dict)]
         return []
 
-    records: List[RawRecord] = []
+    rows: List[Dict[str, Any]] = []
     for line in content.splitlines():
         if not line.strip():
             continue
@@ -80,8 +135,8 @@ def load_pcid_master(path: Path) -> List[RawRecord]:
         except json.JSONDecodeError:
             continue
         if isinstance(parsed, dict):
-            records.append(RawRecord.model_validate(parsed))
-    return records
+            rows.append(parsed)
+    return rows
 
 
 def build_pcid_index(
@@ -107,8 +162,14 @@ def build_vector_store(records: Iterable[Mapping[str, Any]], dims: int = 48) ->
     return store
 
 
-def persist_pcid_mappings(mappings: Iterable[PCIDMatchResult | Mapping[str, Any]], path: Path) -> None:
-    """Write PCID mapping decisions to JSONL for downstream auditing."""
+def persist_pcid_mappings(
+    mappings: Iterable[PCIDMatchResult | Mapping[str, Any]], path: Path, *, append: bool = False
+) -> None:
+    """Write PCID mapping decisions to JSONL for downstream auditing.
+
+    With ``append=True`` the mappings are added to an existing file, which
+    lets streaming exports persist decisions chunk by chunk.
+    """
 
     path.parent.mkdir(parents=True, exist_ok=True)
     lines = []
@@ -118,7 +179,14 @@ def persist_pcid_mappings(mappings: Iterable[PCIDMatchResult | Mapping[str, Any]
         else:
             payload = dict(mapping)
         lines.append(json.dumps(payload))
-    path.write_text("\n".join(lines), encoding="utf-8")
+    if not append:
+        path.write_text("\n".join(lines), encoding="utf-8")
+        return
+    if not lines:
+        return
+    separator = "\n" if path.exists() and path.stat().st_size else ""
+    with path.open("a", encoding="utf-8") as handle:
+        handle.write(separator + "\n".join(lines))
 
 
 def match_pcid_with_confidence(
@@ -176,6 +244,77 @@ def match_pcid_with_confidence(
     return pcid, score
 
 
+def match_pcid_batch(
+    records: Sequence[NormalizedRecord | RawRecord | Mapping[str, Any]],
+    pcid_index: Mapping[Tuple[str, str, str], str],
+    backend: Optional[BasePCIDVectorBackend] = None,
+    *,
+    min_similarity: float = 0.8,
+) -> List[Tuple[Optional[str], float]]:
+    """Match many records at once, returning ``(pcid, confidence)`` per record.
+
+    Keys are computed in one pass over plain mappings, exact hits are resolved
+    from ``pcid_index`` and only the misses are sent to the vector backend. The
+    backend's ``query_many`` is used when available so the misses cost one
+    batched query; remote backends still receive one ``query_record`` per miss.
+    Results follow :func:`match_pcid_with_confidence` semantics.
+    """
+
+    results: List[Tuple[Optional[str], float]] = [(None, 0.0)] * len(records)
+    misses: List[Tuple[int, Dict[str, str]]] = []
+    for position, record in enumerate(records):
+        key, payload = _fast_key_and_payload(record)
+        exact = pcid_index.get(key)
+        if exact:
+            results[position] = (exact, 1.0)
+        else:
+            misses.append((position, payload))
+
+    if not misses or not is_enabled("pcid.vector_store.similarity_fallback", default=True):
+        return results
+
+    if backend is None and is_enabled("pcid.vector_store.remote_backend", default=True):
+        backend = connect_vector_store_backend()
+    if backend is None:
+        return results
+
+    if hasattr(backend, "query_record"):
+        batched = [
+            backend.query_record(  # type: ignore[attr-defined]
+                dict(records[position])
+                if isinstance(records[position], Mapping)
+                else records[position].model_dump(),  # type: ignore[union-attr]
+                top_k=1,
+                threshold=min_similarity,
+            )
+            for position, payload in misses
+        ]
+    else:
+        dims = getattr(backend, "dims", 48)
+        payloads = [payload for _position, payload in misses]
+        if hasattr(backend, "query_many"):
+            vectors = embed_pcid_records(payloads, dims=dims)
+            query_many = backend.query_many  # type: ignore[attr-defined]
+            batched = query_many(vectors, top_k=1, threshold=min_similarity)
+        else:
+            vectors = [embed_pcid_record(payload, dims=dims) for payload in payloads]
+            batched = [
+                backend.query(vector, top_k=1, threshold=min_similarity) for vector in vectors
+            ]
+
+    for (position, _payload), matches in zip(misses, batched):
+        if not matches or not isinstance(matches[0], Mapping):
+            continue
+        best = matches[0]
+        pcid = best.get("pcid")
+        score = float(best.get("score", 0.0))
+        if not pcid:
+            results[position] = (None, score)
+        elif score > 0:
+            results[position] = (pcid, score)
+    return results
+
+
 def match_pcid(
     unified_record: NormalizedRecord | RawRecord | Mapping[str, Any],
     pcid_index: Mapping[Tuple[str, str, str], str],
@@ -209,15 +348,11 @@ def match_records(
     synchronous and async contexts.
     """
 
+    records = list(records)
+    decisions = match_pcid_batch(records, pcid_index, vector_store, min_similarity=min_similarity)
     results: List[PCIDMatchResult] = []
-    for record in records:
+    for record, (pcid, confidence) in zip(records, decisions):
         normalized = _coerce_normalized_record(record)
-        pcid, confidence = match_pcid_with_confidence(
-            normalized,
-            pcid_index,
-            vector_store=vector_store,
-            min_similarity=min_similarity,
-        )
         results.append(
             PCIDMatchResult(
                 record=normalized,
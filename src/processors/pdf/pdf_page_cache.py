@@ -0,0 +1,213 @@
+"""
+Persistent cache of extracted PDF pages.
+
+Classic extraction (page text plus ``find_tables``) is the slow part of PDF
+processing, and price-list PDFs are reprocessed whenever an LLM prompt or a
+table schema changes although their pages have not. :class:`PdfPageCache`
+keeps each page's text and tables in one SQLite file keyed on the document's
+sha256 and the page number, plus the page count and extraction method per
+document, so a known PDF is streamed back without being opened. Recording a
+document under another method drops its pages, which that method did not
+extract.
+
+Entries never go stale (the key is the content); the file is kept under
+``max_bytes`` by evicting least recently used pages. Policy lives in the
+source's ``pdf_extraction`` config section::
+
+    pdf_extraction:
+      cache:
+        enabled: true
+        max_bytes: 1073741824
+"""
+
+from __future__ import annotations
+
+import json
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, Iterable, Mapping, Optional, Tuple
+
+from src.common.logging_utils import get_logger
+from src.common.paths import OUTPUT_DIR
+from src.observability import metrics
+
+log = get_logger("pdf-page-cache")
+
+PDF_PAGE_CACHE_PATH = OUTPUT_DIR / "pdf_pages.sqlite"
+DEFAULT_MAX_BYTES = 1024 * 1024 * 1024
+DEFAULT_PDF_PAGE_CACHE_SETTINGS: Dict[str, Any] = {
+    "enabled": True,
+    "max_bytes": DEFAULT_MAX_BYTES,
+    "path": None,
+}
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS documents (
+    sha256 TEXT PRIMARY KEY,
+    page_count INTEGER NOT NULL,
+    method TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS pages (
+    sha256 TEXT NOT NULL,
+    page INTEGER NOT NULL,
+    text TEXT NOT NULL,
+    tables TEXT NOT NULL,
+    size INTEGER NOT NULL,
+    accessed_at REAL NOT NULL,
+    PRIMARY KEY (sha256, page)
+);
+CREATE INDEX IF NOT EXISTS pages_accessed_at ON pages (accessed_at);
+"""
+
+
+class PdfPageCache:
+    """SQLite-backed, size-bounded LRU cache of page text and tables by (sha256, page)."""
+
+    def __init__(
+        self, path: Path = PDF_PAGE_CACHE_PATH, *, max_bytes: int = DEFAULT_MAX_BYTES
+    ) -> None:
+        self.path = Path(path)
+        self.max_bytes = max(int(max_bytes), 0)
+        self._lock = threading.RLock()
+
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(str(self.path), check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(_SCHEMA)
+        self._conn.commit()
+        self._total_bytes = int(
+            self._conn.execute("SELECT COALESCE(SUM(size), 0) FROM pages").fetchone()[0]
+        )
+
+    def document(self, sha256: str) -> Optional[Tuple[int, str]]:
+        """``(page_count, extraction method)`` of a document seen before, else ``None``."""
+
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT page_count, method FROM documents WHERE sha256 = ?", (sha256,)
+            ).fetchone()
+        return (int(row[0]), row[1]) if row else None
+
+    def store_document(self, sha256: str, page_count: int, method: str) -> None:
+        """Record a document; its cached pages are dropped if they came from another method."""
+
+        with self._lock, self._conn:
+            known = self._conn.execute(
+                "SELECT method FROM documents WHERE sha256 = ?", (sha256,)
+            ).fetchone()
+            if known is not None and known[0] != method:
+                dropped = self._conn.execute(
+                    "SELECT COALESCE(SUM(size), 0) FROM pages WHERE sha256 = ?", (sha256,)
+                ).fetchone()[0]
+                self._conn.execute("DELETE FROM pages WHERE sha256 = ?", (sha256,))
+                self._total_bytes -= int(dropped)
+            self._conn.execute(
+                "INSERT OR REPLACE INTO documents VALUES (?, ?, ?)", (sha256, page_count, method)
+            )
+
+    def pages(self, sha256: str, first: int, last: int) -> Dict[int, Dict[str, Any]]:
+        """Cached pages ``first``..``last`` (inclusive) by number, marking them recently used."""
+
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT page, text, tables FROM pages WHERE sha256 = ? AND page BETWEEN ? AND ?",
+                (sha256, first, last),
+            ).fetchall()
+            if rows:
+                with self._conn:
+                    self._conn.execute(
+                        "UPDATE pages SET accessed_at = ? "
+                        "WHERE sha256 = ? AND page BETWEEN ? AND ?",
+                        (time.time(), sha256, first, last),
+                    )
+        if rows:
+            metrics.incr("pdf_page_cache_hits", len(rows))
+        return {
+            page: {"page": page, "text": text, "tables": json.loads(tables)}
+            for page, text, tables in rows
+        }
+
+    def store(self, sha256: str, pages: Iterable[Mapping[str, Any]]) -> None:
+        """Store pages shaped as a :class:`~.pdf_text_extractor.PdfPageStream` yields them."""
+
+        now = time.time()
+        rows = []
+        for page in pages:
+            tables = json.dumps(page.get("tables") or [], ensure_ascii=False)
+            size = len(page["text"].encode("utf-8")) + len(tables.encode("utf-8")) + len(sha256)
+            rows.append((sha256, int(page["page"]), page["text"], tables, size, now))
+        if not rows:
+            return
+        placeholders = ",".join("?" * len(rows))
+        with self._lock:
+            replaced = self._conn.execute(
+                "SELECT COALESCE(SUM(size), 0) FROM pages "
+                f"WHERE sha256 = ? AND page IN ({placeholders})",
+                (sha256, *(row[1] for row in rows)),
+            ).fetchone()[0]
+            with self._conn:
+                self._conn.executemany(
+                    "INSERT OR REPLACE INTO pages VALUES (?, ?, ?, ?, ?, ?)", rows
+                )
+            self._total_bytes += sum(row[4] for row in rows) - int(replaced)
+            if self._total_bytes > self.max_bytes:
+                self._evict()
+
+    def _evict(self) -> None:
+        """Drop least recently used pages until 90% of ``max_bytes``."""
+
+        target = int(self.max_bytes * 0.9)
+        with self._conn:
+            cursor = self._conn.execute("SELECT sha256, page, size FROM pages ORDER BY accessed_at")
+            victims = []
+            for sha256, page, size in cursor:
+                if self._total_bytes <= target:
+                    break
+                victims.append((sha256, page))
+                self._total_bytes -= size
+            self._conn.executemany("DELETE FROM pages WHERE sha256 = ? AND page = ?", victims)
+        if victims:
+            metrics.incr("pdf_page_cache_evictions", len(victims))
+            log.debug("Evicted %d cached PDF pages", len(victims))
+
+    @property
+    def total_bytes(self) -> int:
+        return self._total_bytes
+
+    def __len__(self) -> int:
+        with self._lock:
+            return int(self._conn.execute("SELECT COUNT(*) FROM pages").fetchone()[0])
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+
+_default_caches: Dict[Path, PdfPageCache] = {}
+_default_caches_lock = threading.Lock()
+
+
+def get_pdf_page_cache(settings: Optional[Mapping[str, Any]] = None) -> Optional[PdfPageCache]:
+    """Obtain (or open) the shared cache for a ``pdf_extraction.cache`` section; ``None`` if off."""
+
+    merged = dict(DEFAULT_PDF_PAGE_CACHE_SETTINGS)
+    merged.update(settings or {})
+    if not merged.get("enabled"):
+        return None
+    path = Path(merged.get("path") or PDF_PAGE_CACHE_PATH)
+    max_bytes = int(merged.get("max_bytes") or DEFAULT_MAX_BYTES)
+    with _default_caches_lock:
+        if path not in _default_caches:
+            _default_caches[path] = PdfPageCache(path, max_bytes=max_bytes)
+        return _default_caches[path]
+
+
+__all__ = [
+    "DEFAULT_PDF_PAGE_CACHE_SETTINGS",
+    "PDF_PAGE_CACHE_PATH",
+    "PdfPageCache",
+    "get_pdf_page_cache",
+]
@@ -1,7 +1,8 @@
 """
 LLM-based PDF table extractor.
 
-Uses LLM to extract structured tables from PDF text chunks.
+Uses LLM to extract structured tables from PDF text chunks. The chunks of a
+document are sent concurrently (see :mod:`src.processors.llm.llm_batch`).
 """
 
 from __future__ import annotations
@@ -9,11 +10,40 @@ from __future__ import annotations
 from typing import Any, Dict, Iterable, List, Optional
 
 from src.common.logging_utils import get_logger
+from src.processors.llm.llm_batch import get_llm_batcher
 from src.processors.llm.llm_client import LLMClient, get_llm_client_from_config
 from src.processors.pdf.pdf_text_extractor import chunk_pdf_text
 
 log = get_logger("pdf-table-llm")
 
+TABLE_SYSTEM_PROMPT = (
+    "You are a data extraction specialist. Extract structured data from text "
+    "and return it as a JSON array of objects."
+)
+
+
+def _table_prompt(text_chunk: str, columns: List[str]) -> str:
+    columns_str = ", ".join(columns)
+    return f"""Extract a table from the following text with columns: {columns_str}
+
+Text:
+{text_chunk}
+
+Return a JSON array where each object has these keys: {columns_str}
+Only include rows where you can extract all required columns.
+Return only valid JSON, no markdown, no explanation."""
+
+
+def _rows_from_result(result: Any) -> List[Dict[str, Any]]:
+    if isinstance(result, list):
+        return result
+    elif isinstance(result, dict):
+        # Sometimes LLM returns single object
+        return [result]
+    else:
+        log.warning("Unexpected LLM response format", extra={"result_type": type(result)})
+        return []
+
 
 def extract_table_with_llm(
     text_chunk: str,
@@ -33,32 +63,11 @@ def extract_table_with_llm(
     Returns:
         List of row dicts
     """
-    if not system_prompt:
-        system_prompt = (
-            "You are a data extraction specialist. Extract structured data from text "
-            "and return it as a JSON array of objects."
-        )
-
-    columns_str = ", ".join(columns)
-    prompt = f"""Extract a table from the following text with columns: {columns_str}
-
-Text:
-{text_chunk}
-
-Return a JSON array where each object has these keys: {columns_str}
-Only include rows where you can extract all required columns.
-Return only valid JSON, no markdown, no explanation."""
-
     try:
-        result = llm_client.extract_json(prompt, system_prompt=system_prompt)
-        if isinstance(result, list):
-            return result
-        elif isinstance(result, dict):
-            # Sometimes LLM returns single object
-            return [result]
-        else:
-            log.warning("Unexpected LLM response format", extra={"result_type": type(result)})
-            return []
+        result = llm_client.extract_json(
+            _table_prompt(text_chunk, columns), system_prompt=system_prompt or TABLE_SYSTEM_PROMPT
+        )
+        return _rows_from_result(result)
     except Exception as exc:
         log.error("LLM table extraction failed", extra={"error": str(exc)})
         return []
@@ -102,6 +111,18 @@ def process_pdf_table_llm(
     
     columns = table_schema.get(table_type, table_schema.get("default", []))
 
+    with get_llm_batcher(llm_client, llm_config) as batcher:
+        yield from _extract_tables(records, batcher, columns, table_type, chunk_size, overlap)
+
+
+def _extract_tables(
+    records: Iterable[Dict[str, Any]],
+    batcher: Any,
+    columns: List[str],
+    table_type: str,
+    chunk_size: int,
+    overlap: int,
+) -> Iterable[Dict[str, Any]]:
     for record in records:
         pdf_pages = record.get("pdf_pages")
         pdf_text = record.get("pdf_text")
@@ -118,14 +139,17 @@ def process_pdf_table_llm(
                 # Single text, split into chunks
                 chunks = chunk_pdf_text([pdf_text], chunk_size, overlap)
 
-            # Extract tables from each chunk
+            # Extract tables from all chunks concurrently
+            results = batcher.extract_json_many(
+                [_table_prompt(chunk["text"], columns) for chunk in chunks],
+                system_prompt=TABLE_SYSTEM_PROMPT,
+            )
             all_rows: List[Dict[str, Any]] = []
-            for chunk in chunks:
-                rows = extract_table_with_llm(
-                    chunk["text"],
-                    columns,
-                    llm_client,
-                )
+            for chunk, result in zip(chunks, results):
+                if isinstance(result, Exception):
+                    log.error("LLM table extraction failed", extra={"error": str(result)})
+                    continue
+                rows = _rows_from_result(result)
                 # Add chunk metadata to rows
                 for row in rows:
                     row["_chunk_id"] = chunk["chunk_id"]
@@ -2,26 +2,270 @@
 PDF text extractor using classic libraries (PyMuPDF, pdfplumber, etc.).
 
 Extracts raw text and basic table structures from PDFs.
+
+:class:`PdfPageStream` yields a document page by page: large documents are
+split into page ranges extracted by a process pool, and pages already in the
+:class:`~src.processors.pdf.pdf_page_cache.PdfPageCache` (keyed by the PDF's
+sha256 and page number) are not extracted again. Settings come from the
+source's ``pdf_extraction`` config section::
+
+    pdf_extraction:
+      workers: null              # extraction processes; null = one per CPU
+      pages_per_task: 25
+      parallel_min_pages: 60     # smaller documents are extracted in-process
+      cache:
+        enabled: true
 """
 
 from __future__ import annotations
 
+import hashlib
+import os
+from collections import deque
+from concurrent.futures import Future, ProcessPoolExecutor
+from itertools import islice
 from pathlib import Path
-from typing import Any, Dict, List, Optional
+from typing import Any, Deque, Dict, Iterable, Iterator, List, Mapping, Optional, Tuple
 
 from src.common.logging_utils import get_logger
+from src.observability import metrics
+from src.processors.pdf.pdf_page_cache import PdfPageCache, get_pdf_page_cache
 
 log = get_logger("pdf-text-extractor")
 
+DEFAULT_PDF_EXTRACTION_SETTINGS: Dict[str, Any] = {
+    "workers": None,
+    "pages_per_task": 25,
+    "parallel_min_pages": 60,
+    "cache": {},  # see DEFAULT_PDF_PAGE_CACHE_SETTINGS
+}
+
+
+def _pymupdf():
+    """PyMuPDF module (``fitz`` before 1.24.3), or None if not installed."""
+    try:
+        import pymupdf  # type: ignore[import]
+
+        return pymupdf
+    except ImportError:
+        pass
+    try:
+        import fitz  # PyMuPDF  # type: ignore[import]
+
+        return fitz
+    except ImportError:
+        return None
+
+
+def _pdf_backend() -> str:
+    """Extraction library: PyMuPDF first (faster), pdfplumber as fallback."""
+    if _pymupdf() is not None:
+        return "pymupdf"
+    try:
+        import pdfplumber  # type: ignore[import]  # noqa: F401
+    except ImportError:
+        raise RuntimeError(
+            "No PDF extraction library available. Install one of: "
+            "pip install pymupdf OR pip install pdfplumber"
+        )
+    return "pdfplumber"
+
+
+def _page_count(pdf_path: str, method: str) -> int:
+    if method == "pymupdf":
+        doc = _pymupdf().open(pdf_path)
+        try:
+            return doc.page_count
+        finally:
+            doc.close()
+
+    import pdfplumber  # type: ignore[import]
+
+    with pdfplumber.open(pdf_path) as pdf:
+        return len(pdf.pages)
+
+
+def _iter_page_range(pdf_path: str, first: int, last: int, method: str) -> Iterator[Dict[str, Any]]:
+    """Pages ``first``..``last`` (1-based, inclusive) as ``{"page", "text", "tables"}`` dicts."""
+    if method == "pymupdf":
+        doc = _pymupdf().open(pdf_path)
+        try:
+            for page_num in range(first, last + 1):
+                page = doc[page_num - 1]
+                tables: List[Any] = []
+                # Try to detect tables (basic approach)
+                # PyMuPDF can extract tables with newer versions
+                try:
+                    tables = [table.extract() for table in page.find_tables()]
+                except Exception:
+                    pass  # Table extraction not available or failed
+                yield {"page": page_num, "text": page.get_text(), "tables": tables}
+        finally:
+            doc.close()
+        return
+
+    import pdfplumber  # type: ignore[import]
+
+    with pdfplumber.open(pdf_path, pages=list(range(first, last + 1))) as pdf:
+        for page in pdf.pages:
+            yield {
+                "page": page.page_number,
+                "text": page.extract_text() or "",
+                "tables": page.extract_tables(),
+            }
+
+
+def _extract_page_range(pdf_path: str, first: int, last: int, method: str) -> List[Dict[str, Any]]:
+    return list(_iter_page_range(pdf_path, first, last, method))
+
+
+def pdf_sha256(pdf_path: str | Path) -> str:
+    """Hex sha256 of a PDF file, read in 1 MiB blocks."""
+    digest = hashlib.sha256()
+    with open(pdf_path, "rb") as fh:
+        for block in iter(lambda: fh.read(1 << 20), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+class PdfPageStream:
+    """
+    A PDF's pages, in order, as ``{"page", "text", "tables"}`` dicts.
+
+    ``page_count`` and ``method`` are known on construction (from the cache
+    for a known document, without opening it). Iterating extracts documents of
+    at least ``parallel_min_pages`` pages as ``pages_per_task``-page ranges in
+    ``workers`` processes (``None``: one per CPU), at most two ranges per
+    worker ahead of the consumer so memory stays bounded.
+    """
+
+    def __init__(
+        self,
+        pdf_path: str | Path,
+        *,
+        workers: Optional[int] = None,
+        pages_per_task: int = 25,
+        parallel_min_pages: int = 60,
+        cache: Optional[PdfPageCache] = None,
+    ) -> None:
+        self.pdf_path = Path(pdf_path)
+        if not self.pdf_path.exists():
+            raise FileNotFoundError(f"PDF not found: {self.pdf_path}")
+        self.workers = (os.cpu_count() or 1) if workers is None else max(int(workers), 1)
+        self.pages_per_task = max(int(pages_per_task), 1)
+        self.parallel_min_pages = parallel_min_pages
+        self.cache = cache
+
+        self.sha256 = pdf_sha256(self.pdf_path) if cache is not None else None
+        known = cache.document(self.sha256) if cache is not None else None
+        if known:
+            self.page_count, self.method = known
+        else:
+            self.method = _pdf_backend()
+            self.page_count = _page_count(str(self.pdf_path), self.method)
+            if cache is not None:
+                cache.store_document(self.sha256, self.page_count, self.method)
+
+    def _ranges(self) -> Iterator[Tuple[int, int]]:
+        for first in range(1, self.page_count + 1, self.pages_per_task):
+            yield first, min(first + self.pages_per_task - 1, self.page_count)
+
+    def __iter__(self) -> Iterator[Dict[str, Any]]:
+        ranges = self._ranges()
+        parallel = (
+            self.workers > 1
+            and self.page_count >= self.parallel_min_pages
+            and self.page_count > self.pages_per_task
+        )
+        pool = ProcessPoolExecutor(max_workers=self.workers) if parallel else None
+
+        def schedule(
+            first: int, last: int
+        ) -> Tuple[int, int, Dict[int, Dict[str, Any]], Optional[Future]]:
+            cached = self.cache.pages(self.sha256, first, last) if self.cache is not None else {}
+            if len(cached) == last - first + 1 or pool is None:
+                return first, last, cached, None
+            future = pool.submit(_extract_page_range, str(self.pdf_path), first, last, self.method)
+            return first, last, cached, future
+
+        window: Deque[Tuple[int, int, Dict[int, Dict[str, Any]], Optional[Future]]] = deque(
+            schedule(*span) for span in islice(ranges, 2 * self.workers if pool is not None else 1)
+        )
+        extracted = 0
+        try:
+            while window:
+                first, last, cached, future = window.popleft()
+                span = next(ranges, None)
+                if span is not None:
+                    window.append(schedule(*span))
+                if len(cached) == last - first + 1:
+                    for page_num in range(first, last + 1):
+                        yield cached[page_num]
+                    continue
+                if future is not None:
+                    pages: Iterable[Dict[str, Any]] = future.result()
+                else:
+                    pages = _iter_page_range(str(self.pdf_path), first, last, self.method)
+                fresh = []
+                for page in pages:
+                    if self.cache is not None:
+                        fresh.append(page)
+                    extracted += 1
+                    yield page
+                if self.cache is not None:
+                    self.cache.store(self.sha256, fresh)
+        finally:
+            if pool is not None:
+                pool.shutdown(wait=True, cancel_futures=True)
+            if extracted:
+                metrics.incr("pdf_pages_extracted", extracted, method=self.method)
+
+
+def open_pdf_pages(
+    pdf_path: str | Path, settings: Optional[Mapping[str, Any]] = None
+) -> PdfPageStream:
+    """
+    Page stream for a PDF under a ``pdf_extraction`` config section.
+
+    Args:
+        pdf_path: Path to PDF file
+        settings: Overrides of ``DEFAULT_PDF_EXTRACTION_SETTINGS``
 
-def extract_pdf_text_classic(pdf_path: str | Path) -> Dict[str, Any]:
+    Returns:
+        PdfPageStream using the shared page cache (unless disabled)
+    """
+    merged = {**DEFAULT_PDF_EXTRACTION_SETTINGS, **(settings or {})}
+    return PdfPageStream(
+        pdf_path,
+        workers=merged["workers"],
+        pages_per_task=merged["pages_per_task"],
+        parallel_min_pages=merged["parallel_min_pages"],
+        cache=get_pdf_page_cache(merged["cache"]),
+    )
+
+
+def _collect(stream: PdfPageStream) -> Tuple[List[str], List[Dict[str, Any]]]:
+    pages: List[str] = []
+    raw_tables: List[Dict[str, Any]] = []
+    for page in stream:
+        pages.append(page["text"])
+        raw_tables.extend({"page": page["page"], "rows": rows} for rows in page["tables"])
+    return pages, raw_tables
+
+
+def extract_pdf_text_classic(
+    pdf_path: str | Path, settings: Optional[Mapping[str, Any]] = None
+) -> Dict[str, Any]:
     """
     Extract text and basic tables from PDF using classic libraries.
 
-    Tries PyMuPDF first, falls back to pdfplumber if available.
+    Tries PyMuPDF first, falls back to pdfplumber if available. Pages come
+    from :func:`open_pdf_pages`, so large documents are extracted in parallel
+    and cached pages are reused.
 
     Args:
         pdf_path: Path to PDF file
+        settings: ``pdf_extraction`` config section (workers, cache, ...)
 
     Returns:
         Dict with:
@@ -30,82 +274,18 @@ def extract_pdf_text_classic(pdf_path: str | Path) -> Dict[str, Any]:
             - page_count: Number of pages
             - extraction_method: Library used
     """
-    pdf_path = Path(pdf_path)
-    if not pdf_path.exists():
-        raise FileNotFoundError(f"PDF not found: {pdf_path}")
-
-    # Try PyMuPDF first (faster)
-    try:
-        import fitz  # PyMuPDF  # type: ignore[import]
-
-        doc = fitz.open(str(pdf_path))
-        pages: List[str] = []
-        raw_tables: List[Dict[str, Any]] = []
-
-        for page_num, page in enumerate(doc, start=1):
-            text = page.get_text()
-            pages.append(text)
-
-            # Try to detect tables (basic approach)
-            # PyMuPDF can extract tables with newer versions
-            try:
-                tables = page.find_tables()
-                for table in tables:
-                    raw_tables.append({
-                        "page": page_num,
-                        "rows": table.extract(),
-                    })
-            except Exception:
-                pass  # Table extraction not available or failed
-
-        doc.close()
-
-        return {
-            "pages": pages,
-            "raw_tables": raw_tables,
-            "page_count": len(pages),
-            "extraction_method": "pymupdf",
-        }
-
-    except ImportError:
-        pass  # Try pdfplumber
-
-    # Fallback to pdfplumber
-    try:
-        import pdfplumber  # type: ignore[import]
-
-        pages: List[str] = []
-        raw_tables: List[Dict[str, Any]] = []
-
-        with pdfplumber.open(str(pdf_path)) as pdf:
-            for page_num, page in enumerate(pdf.pages, start=1):
-                text = page.extract_text() or ""
-                pages.append(text)
-
-                # Extract tables
-                tables = page.extract_tables()
-                for table in tables:
-                    raw_tables.append({
-                        "page": page_num,
-                        "rows": table,
-                    })
-
-        return {
-            "pages": pages,
-            "raw_tables": raw_tables,
-            "page_count": len(pages),
-            "extraction_method": "pdfplumber",
-        }
-
-    except ImportError:
-        raise RuntimeError(
-            "No PDF extraction library available. Install one of: "
-            "pip install pymupdf OR pip install pdfplumber"
-        )
+    stream = open_pdf_pages(pdf_path, settings)
+    pages, raw_tables = _collect(stream)
+    return {
+        "pages": pages,
+        "raw_tables": raw_tables,
+        "page_count": stream.page_count,
+        "extraction_method": stream.method,
+    }
 
 
 def chunk_pdf_text(
-    pages: List[str],
+    pages: Iterable[str],
     chunk_size_chars: int = 6000,
     overlap_chars: int = 500,
 ) -> List[Dict[str, Any]]:
@@ -113,16 +293,26 @@ def chunk_pdf_text(
     Chunk PDF text into smaller pieces for LLM processing.
 
     Args:
-        pages: List of page text
+        pages: Page texts, in order
         chunk_size_chars: Maximum characters per chunk
         overlap_chars: Characters to overlap between chunks
 
     Returns:
         List of chunks with metadata
     """
-    chunks: List[Dict[str, Any]] = []
+    return list(iter_pdf_chunks(pages, chunk_size_chars, overlap_chars))
+
+
+def iter_pdf_chunks(
+    pages: Iterable[str],
+    chunk_size_chars: int = 6000,
+    overlap_chars: int = 500,
+) -> Iterator[Dict[str, Any]]:
+    """Lazy :func:`chunk_pdf_text`: each chunk is yielded once full, pages are read as needed."""
+    chunk_id = 0
     current_chunk = ""
     current_page_start = 1
+    page_num = 0
 
     for page_num, page_text in enumerate(pages, start=1):
         if len(current_chunk) + len(page_text) <= chunk_size_chars:
@@ -133,13 +323,14 @@ def chunk_pdf_text(
         else:
             # Current chunk is full, save it
             if current_chunk:
-                chunks.append({
-                    "chunk_id": len(chunks) + 1,
+                chunk_id += 1
+                yield {
+                    "chunk_id": chunk_id,
                     "page_start": current_page_start,
                     "page_end": page_num - 1,
                     "text": current_chunk,
                     "char_count": len(current_chunk),
-                })
+                }
 
             # Start new chunk with overlap
             if overlap_chars > 0 and current_chunk:
@@ -154,42 +345,49 @@ def chunk_pdf_text(
             while len(current_chunk) > chunk_size_chars:
                 split_point = chunk_size_chars - overlap_chars
                 chunk_text = current_chunk[:split_point]
-                chunks.append({
-                    "chunk_id": len(chunks) + 1,
+                chunk_id += 1
+                yield {
+                    "chunk_id": chunk_id,
                     "page_start": current_page_start,
                     "page_end": current_page_start,
                     "text": chunk_text,
                     "char_count": len(chunk_text),
-                })
+                }
                 current_chunk = current_chunk[split_point:]
                 current_page_start = page_num
 
     # Add final chunk
     if current_chunk:
-        chunks.append({
-            "chunk_id": len(chunks) + 1,
+        chunk_id += 1
+        yield {
+            "chunk_id": chunk_id,
             "page_start": current_page_start,
-            "page_end": len(pages),
+            "page_end": page_num,
             "text": current_chunk,
             "char_count": len(current_chunk),
-        })
-
-    return chunks
+        }
 
 
-def process_pdf_extraction(records: Iterable[Dict[str, Any]]) -> Iterable[Dict[str, Any]]:
+def process_pdf_extraction(
+    records: Iterable[Dict[str, Any]],
+    source_config: Optional[Dict[str, Any]] = None,
+) -> Iterable[Dict[str, Any]]:
     """
     Process records with PDF paths and extract text.
 
     Expects records with 'pdf_path' or 'pdf_id'.
-    Adds 'pdf_text', 'pdf_pages', 'pdf_chunks' fields.
+    Adds 'pdf_pages', 'pdf_raw_tables', 'pdf_page_count' and
+    'pdf_extraction_method' fields. The text is kept once, as pages; join
+    them (or chunk them with :func:`iter_pdf_chunks`) where one string is needed.
 
     Args:
         records: Iterable of records with PDF info
+        source_config: Source config; its 'pdf_extraction' section tunes workers and caching
 
     Yields:
         Records with extracted text
     """
+    settings = (source_config or {}).get("pdf_extraction")
     for record in records:
         pdf_path = record.get("pdf_path")
         if not pdf_path:
@@ -197,8 +395,7 @@ def process_pdf_extraction(records: Iterable[Dict[str, Any]]) -> Iterable[Dict[s
             continue
 
         try:
-            extracted = extract_pdf_text_classic(pdf_path)
-            record["pdf_text"] = "\n\n".join(extracted["pages"])
+            extracted = extract_pdf_text_classic(pdf_path, settings)
             record["pdf_pages"] = extracted["pages"]
             record["pdf_raw_tables"] = extracted["raw_tables"]
             record["pdf_page_count"] = extracted["page_count"]
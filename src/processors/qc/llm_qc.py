@@ -2,17 +2,58 @@
 LLM-based quality control.
 
 Uses LLM to validate records, detect anomalies, and flag issues.
+:func:`process_llm_qc` validates records in packed, concurrent batches
+(see :mod:`src.processors.llm.llm_batch`).
 """
 
 from __future__ import annotations
 
-from typing import Any, Dict, Iterable, List, Optional
+from itertools import islice
+from typing import Any, Dict, Iterable, Iterator, List, Optional
 
 from src.common.logging_utils import get_logger
+from src.processors.llm.llm_batch import LLMBatcher, get_llm_batcher
 from src.processors.llm.llm_client import LLMClient, get_llm_client_from_config
 
 log = get_logger("llm-qc")
 
+QC_SYSTEM_PROMPT = """You are a data quality validator. Analyze records and identify issues.
+
+Check for:
+- Missing or null required fields
+- Invalid data types
+- Suspicious values (e.g., prices that are too high/low)
+- Inconsistent data
+- Duplicate indicators"""
+QC_RESULT_SHAPE = '{"valid": bool, "issues": [str], "score": float}'
+
+
+def _record_text(record: Dict[str, Any]) -> str:
+    return "\n".join(f"{k}: {v}" for k, v in record.items() if v is not None)
+
+
+def _missing_fields_result(
+    record: Dict[str, Any], required_fields: List[str]
+) -> Optional[Dict[str, Any]]:
+    missing_fields = [f for f in required_fields if not record.get(f)]
+    if not missing_fields:
+        return None
+    return {
+        "valid": False,
+        "issues": [f"Missing required fields: {', '.join(missing_fields)}"],
+        "score": 0.0,
+    }
+
+
+def _qc_result(result: Any) -> Dict[str, Any]:
+    if isinstance(result, dict):
+        return {
+            "valid": result.get("valid", True),
+            "issues": result.get("issues", []),
+            "score": float(result.get("score", 1.0)),
+        }
+    return {"valid": True, "issues": [], "score": 1.0}
+
 
 def validate_record_with_llm(
     record: Dict[str, Any],
@@ -36,27 +77,14 @@ def validate_record_with_llm(
             - score: float (0.0 to 1.0)
     """
     # Check required fields first (fast)
-    missing_fields = [f for f in required_fields if not record.get(f)]
-    if missing_fields:
-        return {
-            "valid": False,
-            "issues": [f"Missing required fields: {', '.join(missing_fields)}"],
-            "score": 0.0,
-        }
+    missing = _missing_fields_result(record, required_fields)
+    if missing is not None:
+        return missing
 
     # Build validation prompt
-    system_prompt = """You are a data quality validator. Analyze records and identify issues.
+    system_prompt = f"{QC_SYSTEM_PROMPT}\n\nReturn JSON with: {QC_RESULT_SHAPE}"
 
-Check for:
-- Missing or null required fields
-- Invalid data types
-- Suspicious values (e.g., prices that are too high/low)
-- Inconsistent data
-- Duplicate indicators
-
-Return JSON with: {"valid": bool, "issues": [str], "score": float}"""
-
-    record_str = "\n".join(f"{k}: {v}" for k, v in record.items() if v is not None)
+    record_str = _record_text(record)
     prompt = f"""Validate this record:
 
 {record_str}
@@ -69,19 +97,73 @@ Required fields: {', '.join(required_fields)}
 
     try:
         result = llm_client.extract_json(prompt, system_prompt=system_prompt)
-        if isinstance(result, dict):
-            return {
-                "valid": result.get("valid", True),
-                "issues": result.get("issues", []),
-                "score": float(result.get("score", 1.0)),
-            }
-        else:
-            return {"valid": True, "issues": [], "score": 1.0}
+        return _qc_result(result)
     except Exception as exc:
         log.warning("LLM validation failed, assuming valid", extra={"error": str(exc)})
         return {"valid": True, "issues": [], "score": 1.0}
 
 
+def validate_records_with_llm(
+    records: List[Dict[str, Any]],
+    required_fields: List[str],
+    llm_client: LLMClient,
+    validation_rules: Optional[Dict[str, Any]] = None,
+    batcher: Optional[LLMBatcher] = None,
+) -> List[Dict[str, Any]]:
+    """
+    Validate many records with packed, concurrent LLM requests.
+
+    Same results as :func:`validate_record_with_llm` per record; records the
+    model gives no verdict for are assumed valid.
+
+    Args:
+        records: Records to validate
+        required_fields: List of required field names
+        llm_client: LLM client instance
+        validation_rules: Optional validation rules (e.g., price ranges)
+        batcher: Optional batcher to reuse (one is created otherwise)
+
+    Returns:
+        One result dict per record, in order
+    """
+    results: List[Optional[Dict[str, Any]]] = [
+        _missing_fields_result(r, required_fields) for r in records
+    ]
+    to_check = [idx for idx, result in enumerate(results) if result is None]
+    if not to_check:
+        return [result for result in results if result is not None]
+
+    instruction = (
+        "Validate each record; an item's input is the record's fields, one per line.\n"
+        f"Required fields: {', '.join(required_fields)}\n"
+        + (f"Validation rules: {validation_rules}\n" if validation_rules else "")
+        + f"Each result is {QC_RESULT_SHAPE}."
+    )
+    own_batcher = batcher is None
+    batcher = batcher or LLMBatcher(llm_client)
+    try:
+        answers = batcher.extract_json_batched(
+            [_record_text(records[idx]) for idx in to_check],
+            instruction,
+            system_prompt=QC_SYSTEM_PROMPT,
+        )
+    finally:
+        if own_batcher:
+            batcher.close()
+    for idx, answer in zip(to_check, answers):
+        results[idx] = _qc_result(answer)
+    return [result for result in results if result is not None]
+
+
+def _chunks(records: Iterable[Dict[str, Any]], size: int) -> Iterator[List[Dict[str, Any]]]:
+    iterator = iter(records)
+    while True:
+        chunk = list(islice(iterator, size))
+        if not chunk:
+            return
+        yield chunk
+
+
 def process_llm_qc(
     records: Iterable[Dict[str, Any]],
     source_config: Dict[str, Any],
@@ -117,23 +199,28 @@ def process_llm_qc(
 
     validation_rules = source_config.get("quality", {}).get("validation_rules", {})
 
-    for record in records:
-        try:
-            qc_result = validate_record_with_llm(
-                record,
-                required_fields or [],
-                llm_client,
-                validation_rules,
-            )
-            record["_qc_llm"] = qc_result
-            record["_qc_valid"] = qc_result["valid"]
-            record["_qc_score"] = qc_result["score"]
-            if qc_result["issues"]:
-                record["_qc_issues"] = qc_result["issues"]
-        except Exception as exc:
-            log.error("LLM QC failed for record", extra={"error": str(exc)})
-            record["_qc_llm"] = {"valid": True, "issues": [], "score": 1.0}
-            record["_qc_valid"] = True
-
-        yield record
+    # Records are validated a window at a time: enough for every worker to have a full batch.
+    with get_llm_batcher(llm_client, llm_config) as batcher:
+        for chunk in _chunks(records, batcher.size * batcher.workers):
+            try:
+                qc_results = validate_records_with_llm(
+                    chunk,
+                    required_fields or [],
+                    llm_client,
+                    validation_rules,
+                    batcher=batcher,
+                )
+            except Exception as exc:
+                log.error(
+                    "LLM QC failed for records", extra={"error": str(exc), "records": len(chunk)}
+                )
+                qc_results = [{"valid": True, "issues": [], "score": 1.0} for _ in chunk]
+
+            for record, qc_result in zip(chunk, qc_results):
+                record["_qc_llm"] = qc_result
+                record["_qc_valid"] = qc_result["valid"]
+                record["_qc_score"] = qc_result["score"]
+                if qc_result["issues"]:
+                    record["_qc_issues"] = qc_result["issues"]
+                yield record
 
@@ -3,9 +3,10 @@
 This module intentionally avoids heavyweight dependencies so it can operate in
 unit tests and constrained environments. It offers:
 
-- Hash-based text embeddings for name/company/currency fields.
+- Deterministic hashed word/character n-gram embeddings for name/company/currency.
 - Cosine similarity search with configurable thresholds.
-- JSONL persistence helpers so offline-built indices can be loaded at runtime.
+- Loading of compiled on-disk indices (see ``src.processors.pcid_index``).
+- An optional NumPy matrix-backed store for batched queries over large masters.
 
 It is not a production-grade ANN implementation, but provides a functional
 backend for local PCID matching and replay scenarios until a dedicated service
@@ -14,17 +15,24 @@ is wired in.
 
 from __future__ import annotations
 
-import json
+from functools import lru_cache
 import math
 import os
 from pathlib import Path
+import re
 import time
+import zlib
 from typing import Any, Dict, Iterable, List, Mapping, Optional, Protocol, Sequence, Tuple
 
 import requests
 
 from src.common.logging_utils import get_logger
 
+try:  # pragma: no cover - optional dependency import
+    import numpy as np
+except ImportError:  # pragma: no cover
+    np = None  # type: ignore[assignment]
+
 log = get_logger(__name__)
 
 
@@ -41,23 +49,63 @@ def _cosine(a: Sequence[float], b: Sequence[float]) -> float:
     return sum(x * y for x, y in zip(a, b))
 
 
-def _text_to_vector(text: str, dims: int = 48) -> List[float]:
+_TOKEN_RE = re.compile(r"\w+", re.UNICODE)
+NGRAM_SIZE = 3
+_NGRAM_WEIGHT = 0.5
+_EMBED_CACHE_SIZE = 131072
+
+
+@lru_cache(maxsize=_EMBED_CACHE_SIZE)
+def _text_vector_cached(text: str, dims: int) -> Tuple[float, ...]:
     vec = [0.0] * dims
-    for token in text.lower().split():
-        vec[hash(token) % dims] += 1.0
-    return vec
+    if dims <= 0:
+        return ()
+    crc = zlib.crc32
+    for token in _TOKEN_RE.findall(text.lower()):
+        # Whole-word feature plus padded character n-grams so near-miss
+        # spellings ("amoxicilina" / "amoxicilin") still share most features.
+        features = [("w:" + token, 1.0)]
+        padded = f"#{token}#"
+        features.extend(
+            (padded[i : i + NGRAM_SIZE], _NGRAM_WEIGHT)
+            for i in range(max(len(padded) - NGRAM_SIZE + 1, 1))
+        )
+        for feature, weight in features:
+            # crc32 is stable across processes (unlike the salted builtin
+            # hash) and its top bit gives a sign so collisions tend to cancel.
+            h = crc(feature.encode("utf-8"))
+            vec[h % dims] += weight if h & 0x80000000 else -weight
+    return tuple(vec)
 
 
-def _record_embedding(record: Mapping[str, str], dims: int = 48) -> List[float]:
-    name = (record.get("name") or "").strip()
-    company = (record.get("company") or "").strip()
-    currency = (record.get("currency") or "").strip()
+def _text_to_vector(text: str, dims: int = 48) -> List[float]:
+    """Deterministic signed hashed word + character n-gram embedding."""
+
+    return list(_text_vector_cached(text, dims))
+
+
+@lru_cache(maxsize=_EMBED_CACHE_SIZE)
+def _record_embedding_cached(
+    name: str, company: str, currency: str, dims: int
+) -> Tuple[float, ...]:
     raw_vec = [
-        *_text_to_vector(name, dims=dims),
-        *_text_to_vector(company, dims=dims),
-        *_text_to_vector(currency, dims=dims // 2),
+        *_text_vector_cached(name, dims),
+        *_text_vector_cached(company, dims),
+        *_text_vector_cached(currency, dims // 2),
     ]
-    return _normalize(raw_vec)
+    return tuple(_normalize(raw_vec))
+
+
+def _record_fields(record: Mapping[str, str]) -> Tuple[str, str, str]:
+    return (
+        (record.get("name") or "").strip(),
+        (record.get("company") or "").strip(),
+        (record.get("currency") or "").strip(),
+    )
+
+
+def _record_embedding(record: Mapping[str, str], dims: int = 48) -> List[float]:
+    return list(_record_embedding_cached(*_record_fields(record), dims))
 
 
 class BasePCIDVectorBackend(Protocol):
@@ -78,6 +126,33 @@ def embed_pcid_record(record: Mapping[str, str], dims: int = 48) -> List[float]:
     return _record_embedding(record, dims=dims)
 
 
+def embed_pcid_records(records: Sequence[Mapping[str, str]], dims: int = 48) -> Any:
+    """Embed many records into a ``(len(records), width)`` float32 array.
+
+    Each distinct name/company/currency string is embedded once and the
+    per-field blocks are gathered and normalized with array operations, so
+    repeated labs and currencies cost nothing after the first row.
+    """
+
+    _require_numpy()
+    width = 2 * dims + dims // 2
+    if not records:
+        return np.zeros((0, width), dtype=np.float32)
+
+    blocks = []
+    for column, field_dims in enumerate((dims, dims, dims // 2)):
+        values = [_record_fields(record)[column] for record in records]
+        unique = list(dict.fromkeys(values))
+        lookup = {value: position for position, value in enumerate(unique)}
+        table = np.asarray(
+            [_text_vector_cached(value, field_dims) for value in unique], dtype=np.float32
+        )
+        table = table.reshape(len(unique), field_dims)
+        positions = np.fromiter((lookup[v] for v in values), dtype=np.int64, count=len(values))
+        blocks.append(table[positions])
+    return MatrixPCIDVectorStore._normalize_rows(np.hstack(blocks))
+
+
 class PCIDVectorStore:
     """In-memory vector store to support PCID similarity lookups."""
 
@@ -106,22 +181,6 @@ class PCIDVectorStore:
         above_threshold.sort(key=lambda row: row["score"], reverse=True)
         return above_threshold[:top_k]
 
-    @classmethod
-    def from_jsonl(cls, path: Path, dims: int = 48) -> "PCIDVectorStore":
-        store = cls(dims=dims)
-        for line in path.read_text(encoding="utf-8").splitlines():
-            if not line.strip():
-                continue
-            entry = json.loads(line)
-            store.add(entry["pcid"], entry["vector"], entry.get("metadata") or {})
-        return store
-
-    def to_jsonl(self, path: Path) -> None:
-        lines = []
-        for pcid, vector, metadata in self._entries:
-            lines.append(json.dumps({"pcid": pcid, "vector": vector, "metadata": metadata}))
-        path.write_text("\n".join(lines), encoding="utf-8")
-
     def populate_from_records(self, records: Iterable[Mapping[str, str]]) -> None:
         for record in records:
             if hasattr(record, "model_dump"):
@@ -151,15 +210,387 @@ class HashVectorBackend(BasePCIDVectorBackend):
         store.populate_from_records(records)
         return cls(store)
 
+    def query(
+        self, vector: Sequence[float], top_k: int = 3, threshold: float = 0.75
+    ) -> Sequence[Mapping[str, Any]]:
+        return self.store.query(vector, top_k=top_k, threshold=threshold)
+
+
+def _require_numpy() -> None:
+    if np is None:
+        raise RuntimeError("numpy package not installed. Install with: pip install numpy")
+
+
+class MatrixPCIDVectorStore:
+    """PCID vector store backed by one contiguous float32 matrix.
+
+    Embeddings are L2-normalized on insert so a single matrix product yields
+    cosine scores for a whole batch of queries. Query results follow the same
+    threshold semantics as :class:`PCIDVectorStore`.
+    """
+
+    def __init__(self, dims: int = 48, *, batch_size: int = 256):
+        _require_numpy()
+        self.dims = dims
+        self.batch_size = max(int(batch_size), 1)
+        self._pcids: List[str] = []
+        self._metadata: List[Dict] = []
+        self._matrix = np.zeros((0, 0), dtype=np.float32)
+        self._pending: List[Sequence[float]] = []
+        self.generation: Optional[str] = None
+
+    def __len__(self) -> int:
+        return len(self._pcids)
+
+    @property
+    def matrix(self):
+        """Return the packed ``(rows, width)`` embedding matrix."""
+
+        if self._pending:
+            pending = np.asarray(self._pending, dtype=np.float32)
+            if self._matrix.size:
+                self._matrix = np.ascontiguousarray(np.vstack([self._matrix, pending]))
+            else:
+                self._matrix = np.ascontiguousarray(pending)
+            self._pending = []
+        return self._matrix
+
+    @staticmethod
+    def _normalize_rows(matrix):
+        norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+        norms[norms == 0] = 1.0
+        return (matrix / norms).astype(np.float32, copy=False)
+
+    def add(self, pcid: str, vector: Sequence[float], metadata: Optional[Dict] = None) -> None:
+        self._pcids.append(pcid)
+        self._metadata.append(metadata or {})
+        self._pending.append(_normalize(vector))
+
+    def add_many(
+        self,
+        pcids: Sequence[str],
+        vectors: Any,
+        metadata: Optional[Sequence[Dict]] = None,
+    ) -> None:
+        """Append a block of embeddings in one copy."""
+
+        block = self._normalize_rows(np.asarray(vectors, dtype=np.float32).reshape(len(pcids), -1))
+        current = self.matrix
+        self._matrix = np.ascontiguousarray(np.vstack([current, block])) if current.size else block
+        self._pcids.extend(pcids)
+        self._metadata.extend(metadata or [{} for _ in pcids])
+
+    def embed_record(self, record: Mapping[str, str]) -> List[float]:
+        return embed_pcid_record(record, dims=self.dims)
+
+    def query(
+        self, vector: Sequence[float], top_k: int = 3, threshold: float = 0.75
+    ) -> Sequence[Mapping[str, Any]]:
+        return self.query_many([vector], top_k=top_k, threshold=threshold)[0]
+
+    def query_many(
+        self, vectors: Sequence[Sequence[float]], top_k: int = 3, threshold: float = 0.75
+    ) -> List[List[Mapping[str, Any]]]:
+        """Score a batch of query vectors with one matmul per chunk."""
+
+        queries = np.asarray(vectors, dtype=np.float32)
+        if queries.ndim == 1:
+            queries = queries.reshape(1, -1)
+        results: List[List[Mapping[str, Any]]] = [[] for _ in range(len(queries))]
+        matrix = self.matrix
+        rows = len(self._pcids)
+        if not rows or not len(queries) or top_k <= 0:
+            return results
+        if queries.shape[1] != matrix.shape[1]:
+            # Mirrors _cosine: mismatched dimensions never score above zero.
+            log.warning(
+                "PCID query width does not match index",
+                extra={"query_width": queries.shape[1], "index_width": matrix.shape[1]},
+            )
+            queries = np.zeros((len(queries), matrix.shape[1]), dtype=np.float32)
+        queries = self._normalize_rows(queries)
+
+        k = min(top_k, rows)
+        for start in range(0, len(queries), self.batch_size):
+            scores = queries[start : start + self.batch_size] @ matrix.T
+            if k < rows:
+                top_idx = np.argpartition(-scores, k - 1, axis=1)[:, :k]
+            else:
+                top_idx = np.broadcast_to(np.arange(rows), scores.shape)
+            top_scores = np.take_along_axis(scores, top_idx, axis=1)
+            order = np.argsort(-top_scores, axis=1, kind="stable")
+            top_idx = np.take_along_axis(top_idx, order, axis=1)
+            top_scores = np.take_along_axis(top_scores, order, axis=1)
+
+            for offset, (idx_row, score_row) in enumerate(zip(top_idx, top_scores)):
+                results[start + offset] = self._matches(idx_row, score_row, threshold)
+        return results
+
+    def _matches(self, idx_row, score_row, threshold: float) -> List[Mapping[str, Any]]:
+        """Apply threshold semantics to descending ``(row index, score)`` pairs."""
+
+        keep = score_row >= threshold
+        if not keep.any():
+            if threshold > 0.1 or not len(keep):
+                return []
+            keep[0] = True
+        return [
+            {"pcid": self._pcids[idx], "score": float(score), "metadata": self._metadata[idx]}
+            for idx, score in zip(idx_row[keep], score_row[keep])
+        ]
+
+    @classmethod
+    def from_store(
+        cls, store: PCIDVectorStore, *, batch_size: int = 256
+    ) -> "MatrixPCIDVectorStore":
+        """Pack an existing :class:`PCIDVectorStore` into a matrix store."""
+
+        matrix_store = cls(dims=store.dims, batch_size=batch_size)
+        for pcid, vector, metadata in store._entries:
+            matrix_store._pcids.append(pcid)
+            matrix_store._metadata.append(metadata)
+            matrix_store._pending.append(vector)
+        return matrix_store
+
+    @classmethod
+    def from_arrays(
+        cls,
+        pcids: Sequence[str],
+        matrix: Any,
+        metadata: Sequence[Dict],
+        *,
+        dims: int = 48,
+        batch_size: int = 256,
+        generation: Optional[str] = None,
+    ) -> "MatrixPCIDVectorStore":
+        """Wrap pre-normalized embeddings (e.g. an ``np.memmap``) without copying.
+
+        ``generation`` identifies the on-disk build the matrix came from so
+        derived structures (such as IVF lists) can detect staleness.
+        """
+
+        store = cls(dims=dims, batch_size=batch_size)
+        store.generation = generation
+        store._pcids = list(pcids)
+        store._metadata = list(metadata)
+        store._matrix = matrix
+        return store
+
+    def to_vector_store(self) -> PCIDVectorStore:
+        """Materialize a pure-Python :class:`PCIDVectorStore` copy."""
+
+        store = PCIDVectorStore(dims=self.dims)
+        for pcid, vector, metadata in zip(self._pcids, self.matrix.tolist(), self._metadata):
+            store._entries.append((pcid, vector, metadata))
+        return store
+
+    def populate_from_records(self, records: Iterable[Mapping[str, str]]) -> None:
+        rows: List[Mapping[str, Any]] = []
+        for record in records:
+            if hasattr(record, "model_dump"):
+                record = record.model_dump()
+            elif not isinstance(record, Mapping):
+                record = dict(record)
+            if record.get("pcid"):
+                rows.append(record)
+        if rows:
+            self.add_many(
+                [row["pcid"] for row in rows],
+                embed_pcid_records(rows, dims=self.dims),
+                [{"source": row.get("source")} for row in rows],
+            )
+
+
+class MatrixVectorBackend(BasePCIDVectorBackend):
+    """NumPy matrix backend with batched ``query_many`` support."""
+
+    def __init__(self, store: MatrixPCIDVectorStore):
+        self.store = store
+        self.dims = store.dims
+
     @classmethod
-    def from_jsonl(cls, path: Path, dims: int = 48) -> "HashVectorBackend":
-        return cls(PCIDVectorStore.from_jsonl(path, dims=dims))
+    def from_records(
+        cls, records: Iterable[Mapping[str, str]], dims: int = 48
+    ) -> "MatrixVectorBackend":
+        store = MatrixPCIDVectorStore(dims=dims)
+        store.populate_from_records(records)
+        return cls(store)
 
     def query(
         self, vector: Sequence[float], top_k: int = 3, threshold: float = 0.75
     ) -> Sequence[Mapping[str, Any]]:
         return self.store.query(vector, top_k=top_k, threshold=threshold)
 
+    def query_many(
+        self, vectors: Sequence[Sequence[float]], top_k: int = 3, threshold: float = 0.75
+    ) -> List[List[Mapping[str, Any]]]:
+        return self.store.query_many(vectors, top_k=top_k, threshold=threshold)
+
+
+class IVFPCIDVectorBackend(BasePCIDVectorBackend):
+    """Approximate PCID search with an inverted-file (IVF) index in pure NumPy.
+
+    A spherical k-means coarse quantizer splits the master into ``nlist``
+    cells; each query scores only the rows in its ``nprobe`` closest cells.
+    Raising ``nprobe`` trades latency for recall, and ``nprobe == nlist`` is
+    exact search. Cell assignments can be saved next to a compiled index and
+    reloaded as long as the store's ``generation`` is unchanged.
+    """
+
+    def __init__(
+        self,
+        store: MatrixPCIDVectorStore,
+        *,
+        nlist: Optional[int] = None,
+        nprobe: int = 8,
+        iterations: int = 10,
+        train_size: Optional[int] = None,
+        seed: int = 0,
+    ):
+        _require_numpy()
+        self.store = store
+        self.dims = store.dims
+        rows = len(store)
+        self.nlist = max(1, min(int(nlist or 4 * math.sqrt(max(rows, 1))), max(rows, 1)))
+        self.nprobe = max(1, int(nprobe))
+        self.iterations = iterations
+        self.train_size = train_size
+        self.seed = seed
+        self.centroids = None
+        self.list_rows = None
+        self.list_offsets = None
+
+    @property
+    def is_trained(self) -> bool:
+        return self.centroids is not None
+
+    def _assign(self, vectors):
+        labels = np.empty(len(vectors), dtype=np.int64)
+        for start in range(0, len(vectors), 8192):
+            chunk = np.asarray(vectors[start : start + 8192], dtype=np.float32)
+            labels[start : start + len(chunk)] = np.argmax(chunk @ self.centroids.T, axis=1)
+        return labels
+
+    def train(self) -> "IVFPCIDVectorBackend":
+        """Fit the coarse quantizer and build the inverted lists."""
+
+        matrix = self.store.matrix
+        rows = len(self.store)
+        rng = np.random.default_rng(self.seed)
+        if not rows:
+            self.centroids = np.zeros(
+                (1, matrix.shape[1] if matrix.ndim == 2 else 0), dtype=np.float32
+            )
+            self.list_rows = np.zeros(0, dtype=np.int64)
+            self.list_offsets = np.zeros(2, dtype=np.int64)
+            self.nlist = 1
+            return self
+
+        sample_size = min(rows, self.train_size or max(self.nlist * 64, 10_000))
+        sample_idx = np.sort(rng.choice(rows, size=sample_size, replace=False))
+        sample = np.asarray(matrix[sample_idx], dtype=np.float32)
+        self.centroids = sample[rng.choice(sample_size, size=self.nlist, replace=False)].copy()
+
+        for _ in range(self.iterations):
+            labels = self._assign(sample)
+            sums = np.zeros_like(self.centroids)
+            np.add.at(sums, labels, sample)
+            counts = np.bincount(labels, minlength=self.nlist)
+            empty = counts == 0
+            if empty.any():
+                sums[empty] = sample[rng.choice(sample_size, size=int(empty.sum()))]
+            self.centroids = MatrixPCIDVectorStore._normalize_rows(sums)
+
+        labels = self._assign(matrix)
+        self.list_rows = np.argsort(labels, kind="stable")
+        self.list_offsets = np.concatenate(
+            [[0], np.cumsum(np.bincount(labels, minlength=self.nlist))]
+        ).astype(np.int64)
+        log.info("Trained PCID IVF index", extra={"rows": rows, "nlist": self.nlist})
+        return self
+
+    def query(
+        self, vector: Sequence[float], top_k: int = 3, threshold: float = 0.75
+    ) -> Sequence[Mapping[str, Any]]:
+        return self.query_many([vector], top_k=top_k, threshold=threshold)[0]
+
+    def query_many(
+        self, vectors: Sequence[Sequence[float]], top_k: int = 3, threshold: float = 0.75
+    ) -> List[List[Mapping[str, Any]]]:
+        if not self.is_trained:
+            self.train()
+        queries = np.asarray(vectors, dtype=np.float32)
+        if queries.ndim == 1:
+            queries = queries.reshape(1, -1)
+        results: List[List[Mapping[str, Any]]] = [[] for _ in range(len(queries))]
+        matrix = self.store.matrix
+        if not len(self.store) or not len(queries) or top_k <= 0:
+            return results
+        if queries.shape[1] != matrix.shape[1]:
+            return results
+        queries = MatrixPCIDVectorStore._normalize_rows(queries)
+
+        nprobe = min(self.nprobe, self.nlist)
+        coarse = queries @ self.centroids.T
+        if nprobe < self.nlist:
+            probes = np.argpartition(-coarse, nprobe - 1, axis=1)[:, :nprobe]
+        else:
+            probes = np.broadcast_to(np.arange(self.nlist), coarse.shape)
+
+        starts, ends = self.list_offsets[:-1], self.list_offsets[1:]
+        for position, (query, cells) in enumerate(zip(queries, probes)):
+            candidates = np.concatenate(
+                [self.list_rows[starts[cell] : ends[cell]] for cell in cells]
+            )
+            if not len(candidates):
+                continue
+            candidates.sort()
+            scores = np.asarray(matrix[candidates], dtype=np.float32) @ query
+            k = min(top_k, len(candidates))
+            top = (
+                np.argpartition(-scores, k - 1)[:k]
+                if k < len(candidates)
+                else np.arange(len(candidates))
+            )
+            top = top[np.argsort(-scores[top], kind="stable")]
+            results[position] = self.store._matches(candidates[top], scores[top], threshold)
+        return results
+
+    def save(self, path: Path) -> None:
+        """Persist the quantizer and inverted lists to ``path`` (``.npz``)."""
+
+        if not self.is_trained:
+            self.train()
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = path.with_name(path.name + ".tmp.npz")
+        np.savez(
+            tmp_path,
+            centroids=self.centroids,
+            list_rows=self.list_rows,
+            list_offsets=self.list_offsets,
+            rows=np.int64(len(self.store)),
+            generation=np.str_(self.store.generation or ""),
+        )
+        os.replace(tmp_path, path)
+
+    @classmethod
+    def load(
+        cls, path: Path, store: MatrixPCIDVectorStore, *, nprobe: int = 8
+    ) -> Optional["IVFPCIDVectorBackend"]:
+        """Reload a saved IVF index; returns ``None`` when it no longer fits ``store``."""
+
+        if not path.exists():
+            return None
+        with np.load(path) as data:
+            generation = str(data["generation"])
+            if int(data["rows"]) != len(store) or generation != (store.generation or ""):
+                return None
+            backend = cls(store, nlist=len(data["centroids"]), nprobe=nprobe)
+            backend.centroids = data["centroids"]
+            backend.list_rows = data["list_rows"]
+            backend.list_offsets = data["list_offsets"]
+        return backend
+
 
 class InMemoryVectorStore:
     def _embed(self, text: str) -> List[float]:
@@ -173,7 +604,7 @@ class InMemoryVectorStore:
         return self._hash_embedding(text)
 
     def _hash_embedding(self, text: str) -> List[float]:
-        h = hash(text)
+        h = zlib.crc32(text.encode("utf-8"))
         return [(h % 1_000_000) / 1_000_000.0]
 
 
@@ -282,12 +713,63 @@ def connect_vector_store_backend() -> Optional[RemotePCIDVectorBackend]:
     return RemotePCIDVectorBackend(url)
 
 
+def _load_compiled_store(
+    index_path: Any, *, batch_size: int = 256
+) -> Optional[MatrixPCIDVectorStore]:
+    """Open a compiled PCID index directory built by ``src.processors.pcid_index``."""
+
+    from src.processors.pcid_index import open_pcid_index
+
+    index_dir = Path(index_path)
+    try:
+        return open_pcid_index(index_dir, batch_size=batch_size).store
+    except (FileNotFoundError, ValueError) as exc:
+        log.warning(
+            "Configured PCID index could not be opened",
+            extra={"path": str(index_dir), "error": str(exc)},
+        )
+        return None
+
+
+def _build_ivf_backend(
+    ivf_cfg: Mapping[str, Any], store: MatrixPCIDVectorStore, index_dir: Optional[Path]
+) -> IVFPCIDVectorBackend:
+    nprobe = int(ivf_cfg.get("nprobe", 8))
+    nlist = ivf_cfg.get("nlist")
+    cache_path = Path(index_dir) / f"ivf-{nlist or 'auto'}.npz" if index_dir else None
+    if cache_path is not None:
+        cached = IVFPCIDVectorBackend.load(cache_path, store, nprobe=nprobe)
+        if cached is not None:
+            return cached
+
+    backend = IVFPCIDVectorBackend(
+        store,
+        nlist=int(nlist) if nlist else None,
+        nprobe=nprobe,
+        iterations=int(ivf_cfg.get("iterations", 10)),
+        seed=int(ivf_cfg.get("seed", 0)),
+    ).train()
+    if cache_path is not None and store.generation:
+        backend.save(cache_path)
+    return backend
+
+
 def get_pcid_backend(
     settings: Optional[Mapping[str, Any]],
     *,
-    vector_store: Optional[PCIDVectorStore] = None,
+    vector_store: Optional[PCIDVectorStore | MatrixPCIDVectorStore] = None,
+    index_dir: Optional[Path] = None,
 ) -> Optional[BasePCIDVectorBackend]:
-    """Instantiate a PCID backend based on configuration."""
+    """Instantiate a PCID backend based on configuration.
+
+    ``pcid.hash.index_path`` may point at a compiled index directory (see
+    ``src.processors.pcid_index``); it is only consulted when no
+    ``vector_store`` is supplied. A compiled (memory-mapped) store is queried
+    in place, so the ``hash`` backend serves it through
+    :class:`MatrixVectorBackend` rather than copying it into a
+    :class:`PCIDVectorStore`. ``index_dir`` is where derived ANN structures are
+    cached for the ``ivf`` backend.
+    """
 
     pcid_cfg = settings.get("pcid", {}) if isinstance(settings, Mapping) else {}
     backend_name = str(pcid_cfg.get("backend") or "hash").lower()
@@ -307,22 +789,44 @@ def get_pcid_backend(
                 dims=int(remote_cfg.get("dims", 48)),
             )
 
-    if backend_name in {"hash", ""}:
-        hash_cfg = pcid_cfg.get("hash", {}) if isinstance(pcid_cfg, Mapping) else {}
-        dims = int(hash_cfg.get("dims", 48))
-        store = vector_store or PCIDVectorStore(dims=dims)
+    hash_cfg = pcid_cfg.get("hash", {}) if isinstance(pcid_cfg, Mapping) else {}
+    dims = int(hash_cfg.get("dims", 48))
+    index_path = hash_cfg.get("index_path")
 
-        index_path = hash_cfg.get("index_path")
-        if index_path and vector_store is None:
-            index_file = Path(index_path)
-            if index_file.exists():
-                store = PCIDVectorStore.from_jsonl(index_file, dims=dims)
+    if backend_name in {"matrix", "ivf"}:
+        matrix_cfg = pcid_cfg.get("matrix", {}) if isinstance(pcid_cfg, Mapping) else {}
+        batch_size = int(matrix_cfg.get("batch_size", 256))
+        if np is None:
+            log.warning(
+                "PCID %s backend requested but numpy is not installed; using hash backend",
+                backend_name,
+            )
+        else:
+            if isinstance(vector_store, MatrixPCIDVectorStore):
+                matrix_store: Optional[MatrixPCIDVectorStore] = vector_store
+            elif vector_store is not None:
+                matrix_store = MatrixPCIDVectorStore.from_store(vector_store, batch_size=batch_size)
+            elif index_path:
+                matrix_store = _load_compiled_store(index_path, batch_size=batch_size)
+                index_dir = index_dir or Path(index_path)
             else:
-                log.warning("Configured PCID hash index not found", extra={"path": str(index_file)})
+                matrix_store = None
+            matrix_store = matrix_store or MatrixPCIDVectorStore(dims=dims, batch_size=batch_size)
+            if backend_name == "matrix":
+                return MatrixVectorBackend(matrix_store)
+            return _build_ivf_backend(pcid_cfg.get("ivf", {}) or {}, matrix_store, index_dir)
+
+    if backend_name in {"hash", "matrix", "ivf", ""}:
+        store = vector_store
+        if store is None and index_path:
+            store = _load_compiled_store(index_path)
+        store = store or PCIDVectorStore(dims=dims)
 
         if getattr(store, "dims", dims) != dims:
             log.warning("PCID vector store dims mismatch; expected %s", dims)
 
+        if isinstance(store, MatrixPCIDVectorStore):
+            return MatrixVectorBackend(store)
         return HashVectorBackend(store)
 
     log.warning("Unsupported PCID backend configured", extra={"backend": backend_name})
@@ -5,6 +5,8 @@ from typing import Dict, Mapping, Optional, Tuple
 
 from src.common.logging_utils import get_logger, safe_log
 from src.observability import metrics
+from src.resource_manager.adaptive_concurrency import get_concurrency_controller
+from src.resource_manager.rate_limiter import ConcurrencyGate
 from src.resource_manager.settings import get_rate_limit_settings
 
 log = get_logger("account-router")
@@ -29,7 +31,7 @@ class AccountRouter:
         self._accounts_cache: Dict[str, Dict[str, Tuple[str, str]]] = {}
         self._account_index: Dict[str, int] = {}
         self._account_stats: Dict[str, Dict[str, AccountStats]] = {}
-        self._account_gates: Dict[str, threading.BoundedSemaphore] = {}
+        self._account_gates: Dict[str, ConcurrencyGate] = {}
         self._account_lock = threading.Lock()
 
     def _parse_account_key(self, account_key: str) -> Tuple[str, str]:
@@ -97,8 +99,19 @@ class AccountRouter:
             self._account_index[source] = 0
             rate_limit_settings = get_rate_limit_settings(source)
             max_concurrent = rate_limit_settings.get("max_concurrent") or 0
-            if max_concurrent > 0:
-                self._account_gates[source] = threading.BoundedSemaphore(max_concurrent)
+            controller = get_concurrency_controller(source)
+            if controller is not None:
+                gate = ConcurrencyGate(controller.concurrency)
+                controller.subscribe(lambda ctl: gate.resize(ctl.concurrency))
+                self._account_gates[source] = gate
+                safe_log(
+                    log,
+                    "info",
+                    "Initialized adaptive account gate",
+                    {"source": source, "max_concurrent": controller.concurrency},
+                )
+            elif max_concurrent > 0:
+                self._account_gates[source] = ConcurrencyGate(max_concurrent)
                 safe_log(
                     log,
                     "info",
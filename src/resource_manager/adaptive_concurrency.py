@@ -0,0 +1,340 @@
+# file: src/resource_manager/adaptive_concurrency.py
+"""Per-source concurrency limits learned from 429s, 503s and latency.
+
+Static ``max_concurrent``/``max_qps`` either under-use a tolerant site or get
+a strict one to ban us. :class:`AdaptiveConcurrency` runs an AIMD loop with a
+latency gradient instead:
+
+- every *window* (about one request per allowed slot, i.e. one round trip of
+  the whole fleet) with flat latency and few errors adds ``increase`` slots;
+- a rate-limit signal (429, 503, or a page :func:`_is_rate_limited` flags)
+  multiplies the limit by ``backoff`` at once. Signals from requests that were
+  already in flight under the old limit are ignored, so one burst of 429s
+  costs one cut rather than many;
+- a window whose mean latency exceeds ``latency_tolerance`` times the no-load
+  baseline shrinks the limit in proportion, before the site starts refusing;
+- an error rate above ``error_threshold`` holds the limit where it is.
+
+Subscribers (the source's :class:`~src.resource_manager.rate_limiter.RateLimiter`
+and :class:`~src.resource_manager.account_router.AccountRouter` gate) are told
+whenever the limit moves, and learned limits are saved to
+``OUTPUT_DIR/adaptive_limits.json`` so the next run starts where this one
+ended.
+"""
+
+from __future__ import annotations
+
+import atexit
+import json
+import math
+import os
+import threading
+import time
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional
+
+from src.common.logging_utils import get_logger, safe_log
+from src.common.paths import OUTPUT_DIR
+from src.observability import metrics
+from src.resource_manager.settings import get_adaptive_concurrency_settings, get_rate_limit_settings
+
+log = get_logger("adaptive-concurrency")
+
+ADAPTIVE_LIMITS_PATH = OUTPUT_DIR / "adaptive_limits.json"
+# Status codes that mean "slow down" rather than "this request failed".
+THROTTLE_STATUS_CODES = (429, 503)
+
+
+class LimitStore:
+    """JSON file of learned limits per source, rewritten atomically."""
+
+    def __init__(self, path: Path = ADAPTIVE_LIMITS_PATH) -> None:
+        self.path = Path(path)
+        self._lock = threading.Lock()
+
+    def _read(self) -> Dict[str, Dict[str, Any]]:
+        try:
+            data = json.loads(self.path.read_text(encoding="utf-8"))
+        except FileNotFoundError:
+            return {}
+        except (OSError, ValueError) as exc:
+            safe_log(
+                log,
+                "warning",
+                "adaptive_limits_unreadable",
+                {"path": str(self.path), "error": str(exc)},
+            )
+            return {}
+        return data if isinstance(data, dict) else {}
+
+    def load(self, source: str) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            state = self._read().get(source)
+        return state if isinstance(state, dict) else None
+
+    def save(self, source: str, state: Dict[str, Any]) -> None:
+        with self._lock:
+            data = self._read()
+            data[source] = state
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            tmp = self.path.with_suffix(f".{os.getpid()}.tmp")
+            tmp.write_text(json.dumps(data, indent=2, sort_keys=True), encoding="utf-8")
+            os.replace(tmp, self.path)
+
+
+class AdaptiveConcurrency:
+    """AIMD/gradient controller for one source's concurrency (and, optionally, QPS)."""
+
+    def __init__(
+        self,
+        source: str,
+        *,
+        initial: float = 4,
+        min_limit: float = 1,
+        max_limit: float = 64,
+        increase: float = 1.0,
+        backoff: float = 0.5,
+        latency_tolerance: float = 2.0,
+        error_threshold: float = 0.2,
+        qps_per_slot: Optional[float] = None,
+        min_window: int = 4,
+        baseline_drift: float = 0.02,
+        store: Optional[LimitStore] = None,
+        save_interval: float = 30.0,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.source = source
+        self.min_limit = max(float(min_limit), 1.0)
+        self.max_limit = max(float(max_limit), self.min_limit)
+        self.increase = float(increase)
+        self.backoff = min(max(float(backoff), 0.05), 1.0)
+        self.latency_tolerance = max(float(latency_tolerance), 1.0)
+        self.error_threshold = float(error_threshold)
+        self.qps_per_slot = qps_per_slot
+        self.min_window = max(int(min_window), 1)
+        self.baseline_drift = baseline_drift
+        self.store = store
+        self.save_interval = save_interval
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._listeners: List[Callable[["AdaptiveConcurrency"], None]] = []
+
+        self._limit = self._clamp(initial)
+        self.baseline: Optional[float] = None
+        learned = store.load(source) if store is not None else None
+        if learned:
+            self._limit = self._clamp(learned.get("limit", self._limit))
+            self.baseline = learned.get("baseline")
+        self._ignore_throttles = 0
+        self._last_saved = clock()
+        self._saved_limit = self._limit
+        self._reset_window()
+        self.decisions: Dict[str, int] = {"probe": 0, "throttle": 0, "latency": 0, "errors": 0}
+
+    # ------------------------------------------------------------------ state
+    def _clamp(self, value: float) -> float:
+        return min(max(float(value), self.min_limit), self.max_limit)
+
+    def _reset_window(self) -> None:
+        self._window_count = 0
+        self._window_errors = 0
+        self._window_samples = 0
+        self._window_latency = 0.0
+
+    @property
+    def limit(self) -> float:
+        """The current (fractional) limit; it moves in steps smaller than one slot."""
+
+        return self._limit
+
+    @property
+    def concurrency(self) -> int:
+        """Slots callers may use right now."""
+
+        return max(int(math.floor(self._limit)), int(self.min_limit))
+
+    @property
+    def qps(self) -> Optional[float]:
+        """QPS matching the current concurrency, when the source configured one."""
+
+        return self.qps_per_slot * self._limit if self.qps_per_slot else None
+
+    def subscribe(self, listener: Callable[["AdaptiveConcurrency"], None]) -> None:
+        """Call ``listener(self)`` now and whenever the limit moves."""
+
+        with self._lock:
+            self._listeners.append(listener)
+        listener(self)
+
+    # ----------------------------------------------------------- observations
+    def observe(self, latency: Optional[float] = None, *, status_code: Optional[int] = None,
+                rate_limited: bool = False, error: bool = False) -> None:
+        """Feed one finished request: its latency, status code and how it ended."""
+
+        if status_code in THROTTLE_STATUS_CODES:
+            rate_limited = True
+        elif status_code is not None and status_code >= 500:
+            error = True
+        with self._lock:
+            previous = self._limit
+            if rate_limited:
+                self._on_throttle()
+            else:
+                if self._ignore_throttles:
+                    self._ignore_throttles -= 1
+                self._window_count += 1
+                if error:
+                    self._window_errors += 1
+                elif latency is not None:
+                    self._window_samples += 1
+                    self._window_latency += latency
+                if self._window_count >= max(self.concurrency, self.min_window):
+                    self._close_window()
+            listeners = list(self._listeners) if self._limit != previous else []
+            save = self._save_due()
+        self._after_change(listeners, save)
+
+    def record_success(self, latency: float) -> None:
+        self.observe(latency)
+
+    def record_throttle(self) -> None:
+        self.observe(rate_limited=True)
+
+    def record_error(self) -> None:
+        self.observe(error=True)
+
+    def _on_throttle(self) -> None:
+        self.decisions["throttle"] += 1
+        metrics.incr("adaptive_concurrency_throttles", source=self.source)
+        if self._ignore_throttles:
+            self._ignore_throttles -= 1  # issued before the last cut
+            return
+        in_flight = self.concurrency
+        self._limit = self._clamp(self._limit * self.backoff)
+        self._ignore_throttles = in_flight
+        self._reset_window()
+
+    def _close_window(self) -> None:
+        error_rate = self._window_errors / self._window_count
+        mean = self._window_latency / self._window_samples if self._window_samples else None
+        if mean is not None:
+            if self.baseline is None or mean < self.baseline:
+                self.baseline = mean
+            else:
+                self.baseline += (mean - self.baseline) * self.baseline_drift
+        self._reset_window()
+
+        if error_rate > self.error_threshold:
+            # Hold: failures that are not throttling say nothing about load.
+            self.decisions["errors"] += 1
+        elif mean is not None and self.baseline and mean > self.baseline * self.latency_tolerance:
+            self.decisions["latency"] += 1
+            self._limit = self._clamp(
+                self._limit * max(self.backoff, self.baseline * self.latency_tolerance / mean)
+            )
+        else:
+            self.decisions["probe"] += 1
+            self._limit = self._clamp(self._limit + self.increase)
+
+    # ------------------------------------------------------------ persistence
+    def _save_due(self) -> bool:
+        if self.store is None or self._limit == self._saved_limit:
+            return False
+        return self._clock() - self._last_saved >= self.save_interval
+
+    def _after_change(
+        self, listeners: List[Callable[["AdaptiveConcurrency"], None]], save: bool
+    ) -> None:
+        if listeners:
+            metrics.set_gauge("adaptive_concurrency_limit", self._limit, source=self.source)
+            for listener in listeners:
+                listener(self)
+        if save:
+            self.flush()
+
+    def snapshot(self) -> Dict[str, Any]:
+        return {
+            "limit": round(self._limit, 3),
+            "baseline": self.baseline,
+            "updated_at": time.time(),
+        }
+
+    def flush(self) -> None:
+        """Persist the learned limit now."""
+
+        if self.store is None:
+            return
+        with self._lock:
+            state = self.snapshot()
+            self._saved_limit = self._limit
+            self._last_saved = self._clock()
+        try:
+            self.store.save(self.source, state)
+        except OSError as exc:
+            safe_log(
+                log,
+                "warning",
+                "adaptive_limits_save_failed",
+                {"source": self.source, "error": str(exc)},
+            )
+
+
+_default_controllers: Dict[str, Optional[AdaptiveConcurrency]] = {}
+_default_controllers_lock = threading.Lock()
+_default_store: Optional[LimitStore] = None
+
+
+def get_concurrency_controller(source: str) -> Optional[AdaptiveConcurrency]:
+    """Obtain (or create) the controller for ``source``; ``None`` unless enabled in its config."""
+
+    global _default_store
+    with _default_controllers_lock:
+        if source not in _default_controllers:
+            settings = get_adaptive_concurrency_settings(source)
+            controller: Optional[AdaptiveConcurrency] = None
+            if settings.get("enabled"):
+                rate_limits = get_rate_limit_settings(source)
+                initial = settings.get("initial") or rate_limits.get("max_concurrent") or 4
+                max_qps = rate_limits.get("max_qps")
+                store = None
+                if settings.get("persist", True):
+                    _default_store = _default_store or LimitStore()
+                    store = _default_store
+                controller = AdaptiveConcurrency(
+                    source,
+                    initial=initial,
+                    min_limit=settings.get("min_limit", 1),
+                    max_limit=settings.get("max_limit", 64),
+                    increase=settings.get("increase", 1.0),
+                    backoff=settings.get("backoff", 0.5),
+                    latency_tolerance=settings.get("latency_tolerance", 2.0),
+                    error_threshold=settings.get("error_threshold", 0.2),
+                    # Keep the configured QPS-per-slot ratio as the limit moves.
+                    qps_per_slot=(float(max_qps) / float(initial)) if max_qps else None,
+                    store=store,
+                )
+                safe_log(
+                    log,
+                    "info",
+                    "adaptive_concurrency_enabled",
+                    {"source": source, "limit": controller.limit},
+                )
+            _default_controllers[source] = controller
+        return _default_controllers[source]
+
+
+def _flush_default_controllers() -> None:
+    for controller in list(_default_controllers.values()):
+        if controller is not None:
+            controller.flush()
+
+
+atexit.register(_flush_default_controllers)
+
+
+__all__ = [
+    "AdaptiveConcurrency",
+    "LimitStore",
+    "THROTTLE_STATUS_CODES",
+    "get_concurrency_controller",
+]
@@ -1,23 +1,45 @@
 """
-Manages a pool of reusable browser sessions.
+Manages pools of reusable browsers.
+
+:class:`BrowserPool` hands out a fixed set of ready-made sessions (e.g. one
+logged-in session per account). :class:`DriverPool` sits underneath it: it
+keeps warm WebDriver instances keyed by ``(proxy, profile)`` so opening a
+session, or failing over to another proxy, does not cold-start Chrome.
 """
 from __future__ import annotations
 
+import os
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
 from contextlib import contextmanager
+from dataclasses import dataclass, field
 from queue import Queue
-from typing import Iterator
+from typing import Any, Callable, Deque, Dict, Hashable, Iterator, List, Optional, Tuple
 
 from src.common.logging_utils import get_logger
+from src.observability import metrics
 
 log = get_logger("browser-pool")
 
+DriverKey = Tuple[Optional[str], Hashable]
+
 
 class BrowserPool:
     def __init__(self, factory, size: int = 2) -> None:
         self.factory = factory
+        self.size = size
         self.pool: Queue = Queue(maxsize=size)
-        for _ in range(size):
-            self.pool.put(self.factory())
+        self._members: List = []
+        try:
+            for _ in range(size):
+                browser = self.factory()
+                self._members.append(browser)
+                self.pool.put(browser)
+        except Exception:
+            self.close()
+            raise
 
     @contextmanager
     def acquire(self) -> Iterator:
@@ -29,3 +51,461 @@ class BrowserPool:
             self.pool.put(browser)
             log.debug("Released browser session")
 
+    def close(self) -> None:
+        """Quit every browser created by the pool."""
+
+        for browser in self._members:
+            try:
+                browser.quit()
+            except Exception as exc:  # pragma: no cover - defensive cleanup
+                log.warning("Failed to quit pooled browser: %s", exc)
+        self._members = []
+
+
+def process_tree_rss_mb(pid: int) -> Optional[float]:
+    """Resident memory (MB) of ``pid`` and its descendants, read from ``/proc``.
+
+    Returns ``None`` where ``/proc`` is unavailable (non-Linux hosts).
+    """
+
+    children: Dict[int, List[int]] = {}
+    try:
+        entries = os.listdir("/proc")
+    except OSError:
+        return None
+    for entry in entries:
+        if not entry.isdigit():
+            continue
+        try:
+            with open(f"/proc/{entry}/stat", encoding="utf-8") as handle:
+                ppid = int(handle.read().rsplit(")", 1)[1].split()[1])
+        except (OSError, IndexError, ValueError):
+            continue
+        children.setdefault(ppid, []).append(int(entry))
+
+    total_kb = 0
+    stack = [pid]
+    while stack:
+        current = stack.pop()
+        stack.extend(children.get(current, []))
+        try:
+            with open(f"/proc/{current}/status", encoding="utf-8") as handle:
+                for line in handle:
+                    if line.startswith("VmRSS:"):
+                        total_kb += int(line.split()[1])
+                        break
+        except OSError:
+            continue
+    return total_kb / 1024.0
+
+
+def driver_rss_mb(driver: Any) -> Optional[float]:
+    """RSS of a Selenium driver's chromedriver process and the browser it spawned."""
+
+    process = getattr(getattr(driver, "service", None), "process", None)
+    pid = getattr(process, "pid", None)
+    return process_tree_rss_mb(pid) if pid else None
+
+
+def driver_alive(driver: Any) -> bool:
+    """Liveness probe: a round trip to the browser must succeed."""
+
+    try:
+        getattr(driver, "current_url")
+        return True
+    except Exception:
+        return False
+
+
+def reset_driver(driver: Any) -> None:
+    """Forget the previous lease's cookies and page before the driver is reused."""
+
+    if hasattr(driver, "execute_cdp_cmd"):
+        driver.execute_cdp_cmd("Network.clearBrowserCookies", {})
+    elif hasattr(driver, "delete_all_cookies"):
+        driver.delete_all_cookies()
+    driver.get("about:blank")
+
+
+def _quit(driver: Any) -> None:
+    try:
+        driver.quit()
+    except Exception as exc:  # pragma: no cover - defensive cleanup
+        log.warning("Failed to quit pooled driver: %s", exc)
+
+
+@dataclass
+class _PooledDriver:
+    driver: Any
+    key: DriverKey
+    created_at: float = field(default_factory=time.monotonic)
+    last_used: float = field(default_factory=time.monotonic)
+    pages: int = 0
+    over_memory: bool = False
+
+
+class DriverPool:
+    """Warm WebDriver instances keyed by ``(proxy, profile)``.
+
+    ``factory(proxy, profile)`` creates a driver. ``checkout`` prefers an
+    idle driver for the key, checking it is alive first; otherwise it waits
+    for one being prewarmed for that key, creates one if fewer than
+    ``max_size`` drivers exist, or evicts the least recently used idle driver
+    of another key. A driver that has served ``max_pages`` pages or whose
+    process tree exceeds ``max_rss_mb`` (sampled every ``rss_check_every``
+    pages) is quit when released. A background thread quits drivers idle
+    for ``idle_seconds`` beyond the standing ``prewarm(..., keep=True)``
+    targets and tops those targets back up.
+
+    Metrics (label ``pool``): ``driver_pool_acquires``, ``driver_pool_hits``,
+    ``driver_pool_misses``, ``driver_pool_wait_seconds_total``,
+    ``driver_pool_recycled`` (label ``reason``) and the ``driver_pool_idle``
+    / ``driver_pool_leased`` gauges.
+    """
+
+    def __init__(
+        self,
+        factory: Callable[[Optional[str], Any], Any],
+        *,
+        max_size: int = 8,
+        max_pages: Optional[int] = 200,
+        max_rss_mb: Optional[float] = None,
+        rss_check_every: int = 25,
+        idle_seconds: float = 300.0,
+        maintenance_interval: float = 5.0,
+        prewarm_workers: int = 2,
+        health_check: Callable[[Any], bool] = driver_alive,
+        reset: Callable[[Any], None] = reset_driver,
+        rss_probe: Callable[[Any], Optional[float]] = driver_rss_mb,
+        name: str = "default",
+    ) -> None:
+        self.factory = factory
+        self.max_size = max(int(max_size), 1)
+        self.max_pages = max_pages
+        self.max_rss_mb = max_rss_mb
+        self.rss_check_every = max(int(rss_check_every), 1)
+        self.idle_seconds = idle_seconds
+        self.health_check = health_check
+        self.reset = reset
+        self.rss_probe = rss_probe
+        self.name = name
+
+        self._cond = threading.Condition()
+        self._idle: Dict[DriverKey, Deque[_PooledDriver]] = {}
+        self._leased: Dict[int, _PooledDriver] = {}
+        self._warming: Dict[DriverKey, int] = {}
+        self._targets: Dict[DriverKey, int] = {}
+        self._reserved = 0
+        self._closed = False
+        self._stats: Dict[str, Any] = {
+            "acquires": 0,
+            "hits": 0,
+            "misses": 0,
+            "wait_seconds": 0.0,
+            "recycled": {},
+        }
+
+        self._prewarmer = ThreadPoolExecutor(
+            max_workers=max(prewarm_workers, 1), thread_name_prefix="driver-prewarm"
+        )
+        self._stop = threading.Event()
+        self._maintenance_interval = maintenance_interval
+        self._maintainer = threading.Thread(
+            target=self._maintain, name=f"driver-pool-{name}", daemon=True
+        )
+        self._maintainer.start()
+
+    # ----------------------------------------------------------------- leases
+    def checkout(
+        self, proxy: Optional[str] = None, profile: Hashable = None, timeout: Optional[float] = None
+    ) -> Any:
+        """Lease a live driver for ``(proxy, profile)``.
+
+        Raises ``TimeoutError`` when none is free within ``timeout`` seconds.
+        """
+
+        key: DriverKey = (proxy or None, profile)
+        started = time.monotonic()
+        deadline = None if timeout is None else started + timeout
+        while True:
+            entry, victim = self._claim(key, deadline)
+            if victim is not None:
+                self._discard(victim, "evicted")
+            if entry is not None:
+                if self.health_check(entry.driver):
+                    hit = True
+                    break
+                self._forget(entry)
+                self._discard(entry, "dead")
+                continue
+            try:
+                driver = self.factory(key[0], profile)
+            except Exception:
+                with self._cond:
+                    self._reserved -= 1
+                    self._cond.notify_all()
+                raise
+            entry = _PooledDriver(driver, key)
+            with self._cond:
+                self._reserved -= 1
+                self._leased[id(driver)] = entry
+            hit = False
+            break
+
+        waited = time.monotonic() - started
+        with self._cond:
+            entry.last_used = time.monotonic()
+            self._stats["acquires"] += 1
+            self._stats["hits" if hit else "misses"] += 1
+            self._stats["wait_seconds"] += waited
+        metrics.incr("driver_pool_acquires", pool=self.name)
+        metrics.incr("driver_pool_hits" if hit else "driver_pool_misses", pool=self.name)
+        metrics.incr("driver_pool_wait_seconds_total", waited, pool=self.name)
+        self._publish_gauges()
+        return entry.driver
+
+    def _claim(
+        self, key: DriverKey, deadline: Optional[float]
+    ) -> Tuple[Optional[_PooledDriver], Optional[_PooledDriver]]:
+        """Under the lock: take an idle driver, or reserve a slot (evicting a victim if needed)."""
+
+        with self._cond:
+            while True:
+                if self._closed:
+                    raise RuntimeError("Driver pool is closed")
+                idle = self._idle.get(key)
+                if idle:
+                    entry = idle.pop()
+                    self._leased[id(entry.driver)] = entry
+                    return entry, None
+                if not self._warming.get(key):
+                    if self._size() < self.max_size:
+                        self._reserved += 1
+                        return None, None
+                    victim = self._least_recently_used()
+                    if victim is not None:
+                        self._reserved += 1
+                        return None, victim
+                remaining = None if deadline is None else deadline - time.monotonic()
+                if remaining is not None and remaining <= 0:
+                    raise TimeoutError(
+                        f"No driver available for {key[0] or 'direct'} within the timeout"
+                    )
+                self._cond.wait(remaining)
+
+    def release(self, driver: Any, *, healthy: bool = True) -> None:
+        """Return a leased driver; it is reset and kept warm unless due for recycling."""
+
+        with self._cond:
+            entry = self._leased.pop(id(driver), None)
+            closed = self._closed
+            if entry is not None:
+                pages, over_memory = entry.pages, entry.over_memory
+        if entry is None:
+            _quit(driver)
+            return
+
+        reason = None
+        if closed:
+            reason = "closed"
+        elif not healthy:
+            reason = "unhealthy"
+        elif self.max_pages and pages >= self.max_pages:
+            reason = "pages"
+        elif over_memory:
+            reason = "rss"
+        else:
+            try:
+                self.reset(driver)
+            except Exception:
+                reason = "dead"
+
+        if reason is not None:
+            self._discard(entry, reason)
+        else:
+            with self._cond:
+                entry.last_used = time.monotonic()
+                self._idle.setdefault(entry.key, deque()).append(entry)
+                self._cond.notify_all()
+        self._publish_gauges()
+
+    @contextmanager
+    def lease(self, proxy: Optional[str] = None, profile: Hashable = None) -> Iterator[Any]:
+        driver = self.checkout(proxy, profile)
+        healthy = True
+        try:
+            yield driver
+        except Exception:
+            healthy = self.health_check(driver)
+            raise
+        finally:
+            self.release(driver, healthy=healthy)
+
+    def note_page(self, driver: Any) -> bool:
+        """Count a page served by ``driver``; ``True`` once it should be recycled."""
+
+        with self._cond:
+            entry = self._leased.get(id(driver))
+            if entry is None:
+                return False
+            entry.pages += 1
+            pages = entry.pages
+        if self.max_pages and pages >= self.max_pages:
+            return True
+        rss = None
+        if self.max_rss_mb and pages % self.rss_check_every == 0:
+            rss = self.rss_probe(driver)  # reads /proc: kept outside the lock
+        with self._cond:
+            if rss is not None and rss >= self.max_rss_mb:
+                entry.over_memory = True
+            return entry.over_memory
+
+    # --------------------------------------------------------------- warming
+    def prewarm(
+        self,
+        proxy: Optional[str] = None,
+        profile: Hashable = None,
+        count: int = 1,
+        *,
+        keep: bool = False,
+    ):
+        """Start ``count`` drivers for ``(proxy, profile)`` in the background.
+
+        With ``keep`` the count becomes a standing target: idle eviction
+        leaves that many drivers alone and the maintenance thread replaces
+        recycled ones.
+        """
+
+        key: DriverKey = (proxy or None, profile)
+        with self._cond:
+            if keep:
+                self._targets[key] = count
+            idle = len(self._idle.get(key, ()))
+            missing = count - idle - self._warming.get(key, 0)
+            self._start_warming(key, missing)
+
+    def _start_warming(self, key: DriverKey, count: int) -> None:
+        count = min(count, self.max_size - self._size())
+        if count <= 0 or self._closed:
+            return
+        self._warming[key] = self._warming.get(key, 0) + count
+        for _ in range(count):
+            self._prewarmer.submit(self._warm_one, key)
+
+    def _warm_one(self, key: DriverKey) -> None:
+        try:
+            driver = self.factory(key[0], key[1])
+        except Exception as exc:
+            log.warning("Driver prewarm failed: %s", exc)
+            metrics.incr("driver_pool_prewarm_failures", pool=self.name)
+            with self._cond:
+                self._warming[key] -= 1
+                self._cond.notify_all()
+            return
+        with self._cond:
+            self._warming[key] -= 1
+            closed = self._closed
+            if not closed:
+                self._idle.setdefault(key, deque()).append(_PooledDriver(driver, key))
+            self._cond.notify_all()
+        if closed:
+            _quit(driver)
+        self._publish_gauges()
+
+    # ----------------------------------------------------------- maintenance
+    def evict_idle(self, now: Optional[float] = None) -> int:
+        """Quit drivers idle for ``idle_seconds`` beyond their key's standing target."""
+
+        now = time.monotonic() if now is None else now
+        victims: List[_PooledDriver] = []
+        with self._cond:
+            for key, idle in self._idle.items():
+                keep = self._targets.get(key, 0)
+                while len(idle) > keep and now - idle[0].last_used >= self.idle_seconds:
+                    victims.append(idle.popleft())
+        for entry in victims:
+            self._discard(entry, "idle")
+        if victims:
+            self._publish_gauges()
+        return len(victims)
+
+    def _maintain(self) -> None:
+        while not self._stop.wait(self._maintenance_interval):
+            try:
+                self.evict_idle()
+                with self._cond:
+                    for key, target in self._targets.items():
+                        self._start_warming(
+                            key, target - len(self._idle.get(key, ())) - self._warming.get(key, 0)
+                        )
+            except Exception as exc:  # pragma: no cover - keep the maintainer alive
+                log.warning("Driver pool maintenance failed: %s", exc)
+
+    # ---------------------------------------------------------------- helpers
+    def _size(self) -> int:
+        idle = sum(len(entries) for entries in self._idle.values())
+        return idle + len(self._leased) + sum(self._warming.values()) + self._reserved
+
+    def _least_recently_used(self) -> Optional[_PooledDriver]:
+        candidates = [idle[0] for idle in self._idle.values() if idle]
+        if not candidates:
+            return None
+        victim = min(candidates, key=lambda entry: entry.last_used)
+        self._idle[victim.key].popleft()
+        return victim
+
+    def _forget(self, entry: _PooledDriver) -> None:
+        with self._cond:
+            self._leased.pop(id(entry.driver), None)
+            self._cond.notify_all()
+
+    def _discard(self, entry: _PooledDriver, reason: str) -> None:
+        _quit(entry.driver)
+        with self._cond:
+            recycled = self._stats["recycled"]
+            recycled[reason] = recycled.get(reason, 0) + 1
+            self._cond.notify_all()
+        metrics.incr("driver_pool_recycled", pool=self.name, reason=reason)
+        log.debug("Recycled pooled driver (%s)", reason)
+
+    def _publish_gauges(self) -> None:
+        with self._cond:
+            idle = sum(len(entries) for entries in self._idle.values())
+            leased = len(self._leased)
+        metrics.set_gauge("driver_pool_idle", idle, pool=self.name)
+        metrics.set_gauge("driver_pool_leased", leased, pool=self.name)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._cond:
+            stats = dict(self._stats, recycled=dict(self._stats["recycled"]))
+            stats["idle"] = sum(len(entries) for entries in self._idle.values())
+            stats["leased"] = len(self._leased)
+        stats["hit_rate"] = stats["hits"] / stats["acquires"] if stats["acquires"] else 0.0
+        return stats
+
+    def close(self) -> None:
+        """Quit idle drivers and stop warming; leased drivers are quit when released."""
+
+        with self._cond:
+            if self._closed:
+                return
+            self._closed = True
+            idle = [entry for entries in self._idle.values() for entry in entries]
+            self._idle.clear()
+            self._cond.notify_all()
+        self._stop.set()
+        self._maintainer.join()
+        self._prewarmer.shutdown(wait=True)
+        for entry in idle:
+            self._discard(entry, "closed")
+        self._publish_gauges()
+
+
+__all__ = [
+    "BrowserPool",
+    "DriverPool",
+    "driver_alive",
+    "driver_rss_mb",
+    "process_tree_rss_mb",
+    "reset_driver",
+]
@@ -1,10 +1,11 @@
 # src/resource_manager/proxy_health.py
 
-from dataclasses import dataclass
-from typing import Dict, Tuple
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Tuple
 import threading
 
 from src.common.logging_utils import get_logger
+from src.observability.metrics import LatencyHistogram
 
 log = get_logger("proxy-health")
 
@@ -13,6 +14,7 @@ log = get_logger("proxy-health")
 class ProxyHealth:
     successes: int = 0
     failures: int = 0
+    latency: LatencyHistogram = field(default_factory=LatencyHistogram)
 
     @property
     def total(self) -> int:
@@ -29,12 +31,14 @@ _HEALTH: Dict[Tuple[str, str], ProxyHealth] = {}  # (source, proxy) -> health
 _LOCK = threading.Lock()
 
 
-def record_success(source: str, proxy: str) -> None:
+def record_success(source: str, proxy: str, latency: Optional[float] = None) -> None:
     key = (source, proxy)
     with _LOCK:
         ph = _HEALTH.setdefault(key, ProxyHealth())
         ph.successes += 1
-        log.debug("Proxy success %s/%s -> %s", source, proxy, ph)
+        if latency is not None:
+            ph.latency.observe(latency)
+        log.debug("Proxy success %s/%s -> %s", source, proxy, ph.successes)
 
 
 def record_failure(source: str, proxy: str) -> None:
@@ -42,8 +46,31 @@ def record_failure(source: str, proxy: str) -> None:
     with _LOCK:
         ph = _HEALTH.setdefault(key, ProxyHealth())
         ph.failures += 1
-        log.debug("Proxy failure %s/%s -> %s", source, proxy, ph)
+        log.debug("Proxy failure %s/%s -> %s", source, proxy, ph.failures)
 
 
 def get_health(source: str, proxy: str) -> ProxyHealth:
     return _HEALTH.setdefault((source, proxy), ProxyHealth())
+
+
+def latency_percentile(
+    source: str, proxy: str, q: float = 0.95, min_samples: float = 5
+) -> Optional[float]:
+    """``q`` latency percentile of ``proxy`` for ``source``; ``None`` below ``min_samples``."""
+
+    with _LOCK:
+        ph = _HEALTH.get((source, proxy))
+        if ph is None or ph.latency.total < min_samples:
+            return None
+        return ph.latency.percentile(q)
+
+
+def latency_snapshot() -> List[Tuple[str, str, LatencyHistogram]]:
+    """``(source, proxy, histogram)`` copies for exporters."""
+
+    with _LOCK:
+        return [
+            (source, proxy, ph.latency.copy())
+            for (source, proxy), ph in _HEALTH.items()
+            if ph.latency.total
+        ]
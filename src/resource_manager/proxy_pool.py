@@ -1,15 +1,32 @@
 # src/resource_manager/proxy_pool.py
 
-"""Proxy pool with per-source settings and metrics."""
-
+"""Proxy pool with per-source settings and metrics.
+
+Each source's proxies live in a :class:`_SourcePool`: a Fenwick (binary
+indexed) tree over selection weights gives O(log n) weighted picks and weight
+updates, and a heap of ban expiries un-bans proxies lazily without scanning
+the pool. Weights come from exponentially decayed success rate and latency,
+so a proxy recovers from (or wears out) old results instead of carrying raw
+counters forever. Every per-source structure is guarded by its own lock.
+
+Reported latencies also feed the per-proxy histograms in ``proxy_health``
+and the per-(proxy, site) ones in ``proxy_site_health``. Picks use the power
+of two choices: two weighted draws, keeping the proxy with the lower p95 for
+the target site (falling back to the proxy's p95 for the source, then across
+all sites, while the narrower histogram has too few samples).
+"""
+
+import heapq
+import logging
 import os
 import random
+import threading
 import time
 from collections import deque
 from dataclasses import dataclass, field
 from functools import lru_cache
 from pathlib import Path
-from typing import Deque, Dict, Iterable, List, Mapping, Optional, Sequence
+from typing import Any, Callable, Deque, Dict, Iterable, List, Mapping, Optional, Sequence, Tuple
 
 import yaml
 
@@ -17,11 +34,22 @@ from src.common.logging_utils import get_logger, safe_log
 from src.common.paths import CONFIG_DIR
 from src.integrations.scraperapi import ScraperAPIClient, maybe_create_scraperapi_client
 from src.observability import metrics
+from src.resource_manager import proxy_health, proxy_site_health
 from src.resource_manager.settings import get_proxy_settings
 
 log = get_logger("proxy-pool")
 
 
+# Weight of the newest observation in the decayed success/latency averages.
+DEFAULT_SCORE_ALPHA = 0.2
+# Floor so a struggling (but not banned) proxy still gets the odd request.
+_MIN_WEIGHT = 0.01
+# Rebuild the tree after this many updates to shed accumulated float error.
+_REBUILD_EVERY = 100_000
+# Latency percentile compared between the two candidates of a pick.
+ROUTING_PERCENTILE = 0.95
+
+
 @dataclass
 class ProxyStats:
     proxy: str
@@ -30,13 +58,127 @@ class ProxyStats:
     banned: bool = False
     banned_at: float = 0.0
     failure_history: Deque[float] = field(default_factory=deque)
+    success_rate: float = 1.0
+    latency: float = 0.0
+
+    def observe(
+        self, ok: bool, latency: Optional[float] = None, alpha: float = DEFAULT_SCORE_ALPHA
+    ) -> None:
+        """Fold one outcome into the decayed success rate (and latency, in seconds)."""
+
+        self.success_rate += alpha * ((1.0 if ok else 0.0) - self.success_rate)
+        if latency is not None:
+            if self.latency == 0.0:
+                self.latency = latency
+            else:
+                self.latency += alpha * (latency - self.latency)
 
     @property
-    def score(self) -> float:
-        # Simple heuristic: more successes, fewer failures; banned = terrible.
+    def weight(self) -> float:
+        """Selection weight: decayed success rate, discounted by decayed latency."""
+
         if self.banned:
-            return -1.0
-        return self.success_count - 2 * self.failure_count
+            return 0.0
+        return max(self.success_rate, _MIN_WEIGHT) / (1.0 + self.latency)
+
+    @property
+    def score(self) -> float:
+        return -1.0 if self.banned else self.weight
+
+
+class _FenwickTree:
+    """Prefix sums over non-negative weights with O(log n) update and search."""
+
+    def __init__(self, weights: Sequence[float]) -> None:
+        self.size = len(weights)
+        self.values = list(weights)
+        self._tree = [0.0] * (self.size + 1)
+        for idx, weight in enumerate(self.values, start=1):
+            self._tree[idx] += weight
+            parent = idx + (idx & -idx)
+            if parent <= self.size:
+                self._tree[parent] += self._tree[idx]
+        self._top = 1 << max(self.size.bit_length() - 1, 0) if self.size else 0
+        self.total = sum(self.values)
+
+    def set(self, index: int, weight: float) -> None:
+        delta = weight - self.values[index]
+        if delta == 0.0:
+            return
+        self.values[index] = weight
+        self.total += delta
+        idx = index + 1
+        while idx <= self.size:
+            self._tree[idx] += delta
+            idx += idx & -idx
+
+    def find(self, target: float) -> int:
+        """Index of the first weight whose running sum exceeds ``target``."""
+
+        pos = 0
+        step = self._top
+        while step:
+            nxt = pos + step
+            if nxt <= self.size and self._tree[nxt] <= target:
+                pos = nxt
+                target -= self._tree[nxt]
+            step >>= 1
+        return min(pos, self.size - 1)
+
+
+class _SourcePool:
+    """One source's proxies, selection tree, ban-expiry heap and cached settings."""
+
+    def __init__(self, proxies: Mapping[str, ProxyStats], settings: Mapping[str, Any]) -> None:
+        self.lock = threading.Lock()
+        self.stats: List[ProxyStats] = list(proxies.values())
+        self.index: Dict[str, int] = {ps.proxy: idx for idx, ps in enumerate(self.stats)}
+        self.tree = _FenwickTree([ps.weight for ps in self.stats])
+        self.bans: List[Tuple[float, int, float]] = []
+        self.updates = 0
+        self.configure(settings)
+
+    def configure(self, settings: Mapping[str, Any]) -> None:
+        self.max_errors_before_ban = settings.get("max_errors_before_ban", 3)
+        self.ban_window_seconds = max(settings.get("ban_window_minutes", 30), 0) * 60
+        self.alpha = float(settings.get("score_alpha") or DEFAULT_SCORE_ALPHA)
+
+    def __len__(self) -> int:
+        return len(self.stats)
+
+    def refresh(self, index: int) -> None:
+        """Push ``stats[index]``'s current weight into the tree (lock held)."""
+
+        self.tree.set(index, self.stats[index].weight)
+        self.updates += 1
+        if self.updates >= _REBUILD_EVERY:
+            self.tree = _FenwickTree(self.tree.values)
+            self.updates = 0
+
+    def expire_bans(self, now: float) -> None:
+        while self.bans and self.bans[0][0] < now:
+            _expires_at, index, banned_at = heapq.heappop(self.bans)
+            ps = self.stats[index]
+            # Entries for bans that were renewed or already lifted are stale.
+            if ps.banned and ps.banned_at == banned_at:
+                ps.banned = False
+                ps.banned_at = 0.0
+                self.refresh(index)
+
+    def pick(self) -> Tuple[ProxyStats, str]:
+        total = self.tree.total
+        if total > 0:
+            for _ in range(3):
+                ps = self.stats[self.tree.find(random.random() * total)]
+                if not ps.banned:
+                    return ps, "weighted"
+            # Float drift pointed at a zero-weight slot repeatedly; start over exact.
+            self.tree = _FenwickTree([stat.weight for stat in self.stats])
+            self.updates = 0
+            if self.tree.total > 0:
+                return self.stats[self.tree.find(random.random() * self.tree.total)], "weighted"
+        # Every proxy is banned: fall back to any of them.
+        return random.choice(self.stats), "uniform"
 
 
 def _proxies_config_path() -> Path:
@@ -77,11 +219,14 @@ class ProxyPool:
         settings: Optional[Mapping[str, object]] = None,
         *,
         blueprint_path: Optional[Path] = None,
+        clock: Callable[[], float] = time.time,
     ):
         self._settings = settings or {}
-        self._pools: Dict[str, Dict[str, ProxyStats]] = {}
+        self._pools: Dict[str, _SourcePool] = {}
+        self._pools_lock = threading.Lock()
         self._blueprint = _load_proxies_blueprint(blueprint_path)
         self._scraperapi_clients: Dict[str, ScraperAPIClient] = {}
+        self._clock = clock
 
     def _load_pool_for_source(self, source: str) -> Dict[str, ProxyStats]:
         """
@@ -234,98 +379,150 @@ class ProxyPool:
             return [str(p).strip() for p in value if str(p).strip()]
         return None
 
-    def _get_pool(self, source: str) -> Dict[str, ProxyStats]:
-        if source not in self._pools:
-            self._pools[source] = self._load_pool_for_source(source)
-        return self._pools[source]
+    def _get_pool(self, source: str) -> _SourcePool:
+        pool = self._pools.get(source)
+        if pool is None:
+            with self._pools_lock:
+                pool = self._pools.get(source)
+                if pool is None:
+                    pool = _SourcePool(
+                        self._load_pool_for_source(source), get_proxy_settings(source)
+                    )
+                    self._pools[source] = pool
+        return pool
+
+    def reload_settings(self, source: Optional[str] = None) -> None:
+        """Re-read cached proxy settings (ban thresholds, score decay) from config."""
 
-    def choose_proxy(self, source: str) -> Optional[str]:
+        with self._pools_lock:
+            targets = [source] if source else list(self._pools)
+            pools = [(name, self._pools[name]) for name in targets if name in self._pools]
+        for name, pool in pools:
+            with pool.lock:
+                pool.configure(get_proxy_settings(name))
+
+    def stats(self, source: str) -> List[ProxyStats]:
+        """Snapshot of the source's proxy stats (for dashboards and debugging)."""
+
+        return list(self._get_pool(source).stats)
+
+    @staticmethod
+    def _p95(source: str, proxy: str, site: Optional[str]) -> Optional[float]:
+        latency = None
+        if site:
+            latency = proxy_site_health.latency_percentile(proxy, site, ROUTING_PERCENTILE)
+        if latency is None:
+            latency = proxy_health.latency_percentile(source, proxy, ROUTING_PERCENTILE)
+        if latency is None:
+            latency = proxy_site_health.proxy_latency_percentile(proxy, ROUTING_PERCENTILE)
+        return latency
+
+    def _better(
+        self, source: str, first: ProxyStats, second: ProxyStats, site: Optional[str]
+    ) -> ProxyStats:
+        """Lower p95 wins; while either is unmeasured, the higher health weight does."""
+
+        first_p95 = self._p95(source, first.proxy, site)
+        second_p95 = self._p95(source, second.proxy, site) if first_p95 is not None else None
+        if first_p95 is None or second_p95 is None:
+            return second if second.weight > first.weight else first
+        return second if second_p95 < first_p95 else first
+
+    def choose_proxy(self, source: str, site: Optional[str] = None) -> Optional[str]:
         """
-        Choose a proxy for the given source using a simple scoring scheme.
-        Returns None if no proxies configured.
+        Choose a proxy for the given source, weighted by decayed health scores.
+        Of two weighted draws the one with the lower p95 latency for ``site``
+        (a hostname) wins. Banned proxies are skipped until their ban expires;
+        if every proxy is banned one is picked uniformly. Returns None if no
+        proxies configured.
         """
 
         pool = self._get_pool(source)
         if not pool:
             return None
 
-        proxy_settings = get_proxy_settings(source)
-        ban_window_seconds = max(proxy_settings.get("ban_window_minutes", 30), 0) * 60
-
-        now = time.time()
-        for p in pool.values():
-            if p.banned and p.banned_at and (now - p.banned_at) > ban_window_seconds:
-                p.banned = False
-                p.banned_at = 0.0
-
-        active: List[ProxyStats] = [p for p in pool.values() if not p.banned] or list(pool.values())
-        if not active:
-            return None
-
-        max_score = max(p.score for p in active)
-        if max_score <= 0:
-            chosen = random.choice(active)
+        now = self._clock()
+        with pool.lock:
+            pool.expire_bans(now)
+            chosen, selection = pool.pick()
+            rival = pool.pick()[0] if selection == "weighted" and len(pool) > 1 else chosen
+        if rival is not chosen:
+            chosen = self._better(source, chosen, rival, site)
+        if log.isEnabledFor(logging.DEBUG):
             safe_log(
                 log,
-                "info",
+                "debug",
                 "Chose proxy",
-                {"proxy": chosen.proxy, "source": source, "selection": "uniform"},
+                {"proxy": chosen.proxy, "source": source, "selection": selection},
             )
-            return chosen.proxy
-
-        weights = [max(p.score, 0.0) for p in active]
-        chosen = random.choices(active, weights=weights, k=1)[0]
-        safe_log(
-            log,
-            "info",
-            "Chose proxy",
-            {"proxy": chosen.proxy, "source": source, "selection": "weighted"},
-        )
         return chosen.proxy
 
-    def mark_success(self, source: str, proxy: str) -> None:
+    def mark_success(
+        self,
+        source: str,
+        proxy: str,
+        latency: Optional[float] = None,
+        site: Optional[str] = None,
+    ) -> None:
+        """Record a successful request through ``proxy``; ``latency`` is in seconds, to ``site``."""
+
         pool = self._get_pool(source)
-        if proxy not in pool:
+        index = pool.index.get(proxy)
+        if index is None:
             return
-        pool[proxy].success_count += 1
-        ps = pool[proxy]
-        safe_log(
-            log,
-            "debug",
-            "Proxy success",
-            {
-                "proxy": proxy,
-                "source": source,
-                "success_count": ps.success_count,
-                "failure_count": ps.failure_count,
-                "banned": ps.banned,
-            },
-        )
+        with pool.lock:
+            ps = pool.stats[index]
+            ps.success_count += 1
+            ps.observe(True, latency, pool.alpha)
+            pool.refresh(index)
+        proxy_health.record_success(source, proxy, latency)
+        if site and latency is not None:
+            proxy_site_health.record_latency(proxy, site, latency)
+        if log.isEnabledFor(logging.DEBUG):
+            safe_log(
+                log,
+                "debug",
+                "Proxy success",
+                {
+                    "proxy": proxy,
+                    "source": source,
+                    "success_count": ps.success_count,
+                    "failure_count": ps.failure_count,
+                    "banned": ps.banned,
+                },
+            )
 
-    def mark_failure(self, source: str, proxy: str, ban: bool = False) -> None:
+    def mark_failure(
+        self, source: str, proxy: str, ban: bool = False, latency: Optional[float] = None
+    ) -> None:
         pool = self._get_pool(source)
-        if proxy not in pool:
+        index = pool.index.get(proxy)
+        if index is None:
             return
-        proxy_settings = get_proxy_settings(source)
-        max_errors_before_ban = proxy_settings.get("max_errors_before_ban", 3)
-        ban_window_seconds = max(proxy_settings.get("ban_window_minutes", 30), 0) * 60
-        now = time.time()
-
-        ps = pool[proxy]
-        ps.failure_count += 1
-        ps.failure_history.append(now)
-        while ps.failure_history and (now - ps.failure_history[0]) > ban_window_seconds:
-            ps.failure_history.popleft()
-
-        should_ban = ban or (
-            max_errors_before_ban
-            and max_errors_before_ban > 0
-            and len(ps.failure_history) >= max_errors_before_ban
-        )
+        now = self._clock()
+
+        with pool.lock:
+            ps = pool.stats[index]
+            ps.failure_count += 1
+            ps.observe(False, latency, pool.alpha)
+            ps.failure_history.append(now)
+            while ps.failure_history and (now - ps.failure_history[0]) > pool.ban_window_seconds:
+                ps.failure_history.popleft()
+
+            max_errors_before_ban = pool.max_errors_before_ban
+            should_ban = ban or (
+                max_errors_before_ban
+                and max_errors_before_ban > 0
+                and len(ps.failure_history) >= max_errors_before_ban
+            )
+            if should_ban:
+                ps.banned = True
+                ps.banned_at = now
+                heapq.heappush(pool.bans, (now + pool.ban_window_seconds, index, now))
+            pool.refresh(index)
+        proxy_health.record_failure(source, proxy)
 
         if should_ban:
-            ps.banned = True
-            ps.banned_at = now
             metrics.incr("proxy_ban_count", source=source, proxy_id=proxy)
             safe_log(
                 log,
@@ -338,7 +535,7 @@ class ProxyPool:
                     "banned": ps.banned,
                 },
             )
-        else:
+        elif log.isEnabledFor(logging.DEBUG):
             safe_log(
                 log,
                 "debug",
@@ -359,12 +556,14 @@ def get_default_proxy_pool() -> ProxyPool:
     return _DEFAULT_POOL
 
 
-def choose_proxy(source: str) -> Optional[str]:
-    return _DEFAULT_POOL.choose_proxy(source)
+def choose_proxy(source: str, site: Optional[str] = None) -> Optional[str]:
+    return _DEFAULT_POOL.choose_proxy(source, site)
 
 
-def mark_success(source: str, proxy: str) -> None:
-    _DEFAULT_POOL.mark_success(source, proxy)
+def mark_success(
+    source: str, proxy: str, latency: Optional[float] = None, site: Optional[str] = None
+) -> None:
+    _DEFAULT_POOL.mark_success(source, proxy, latency, site)
 
 
 def mark_failure(source: str, proxy: str, ban: bool = False) -> None:
@@ -1,10 +1,11 @@
 # src/resource_manager/proxy_site_health.py
 
-from dataclasses import dataclass
-from typing import Dict, Tuple
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Tuple
 import threading
 
 from src.common.logging_utils import get_logger
+from src.resource_manager.proxy_health import LatencyHistogram
 
 log = get_logger("proxy-site-health")
 
@@ -13,9 +14,11 @@ log = get_logger("proxy-site-health")
 class ProxySiteStatus:
     blocked: bool = False
     last_error: str | None = None
+    latency: LatencyHistogram = field(default_factory=LatencyHistogram)
 
 
 _STATUS: Dict[Tuple[str, str], ProxySiteStatus] = {}  # (proxy, hostname) -> status
+_PROXY_LATENCY: Dict[str, LatencyHistogram] = {}  # proxy -> latency across all sites
 _LOCK = threading.Lock()
 
 
@@ -41,3 +44,46 @@ def mark_healthy(proxy: str, hostname: str) -> None:
 
 def is_blocked(proxy: str, hostname: str) -> bool:
     return _STATUS.get((proxy, hostname), ProxySiteStatus()).blocked
+
+
+def record_latency(proxy: str, hostname: str, seconds: float) -> None:
+    """Record how long a response from ``hostname`` took through ``proxy``."""
+
+    with _LOCK:
+        _STATUS.setdefault((proxy, hostname), ProxySiteStatus()).latency.observe(seconds)
+        _PROXY_LATENCY.setdefault(proxy, LatencyHistogram()).observe(seconds)
+
+
+def latency_percentile(
+    proxy: str, hostname: str, q: float = 0.95, min_samples: float = 5
+) -> Optional[float]:
+    """``q`` latency percentile of ``proxy`` on ``hostname``; ``None`` below ``min_samples``."""
+
+    with _LOCK:
+        st = _STATUS.get((proxy, hostname))
+        if st is None or st.latency.total < min_samples:
+            return None
+        return st.latency.percentile(q)
+
+
+def proxy_latency_percentile(
+    proxy: str, q: float = 0.95, min_samples: float = 5
+) -> Optional[float]:
+    """``q`` latency percentile of ``proxy`` across every site it was used for."""
+
+    with _LOCK:
+        histogram = _PROXY_LATENCY.get(proxy)
+        if histogram is None or histogram.total < min_samples:
+            return None
+        return histogram.percentile(q)
+
+
+def latency_snapshot() -> List[Tuple[str, str, LatencyHistogram]]:
+    """``(proxy, hostname, histogram)`` copies for exporters."""
+
+    with _LOCK:
+        return [
+            (proxy, host, st.latency.copy())
+            for (proxy, host), st in _STATUS.items()
+            if st.latency.total
+        ]
@@ -0,0 +1,357 @@
+# file: src/resource_manager/rate_limit_backends.py
+"""Token-bucket state stores for :mod:`src.resource_manager.rate_limiter`.
+
+A bucket is two numbers per key: the token level and when it was last
+updated. Every backend exposes one atomic operation, :meth:`BucketBackend.reserve`,
+which refills the bucket, takes the requested tokens and reports how long the
+caller must wait before using them. The level may go negative: a negative
+level is a queue of granted reservations, so callers are served in the order
+they reached the backend and nobody sleeps while holding a lock.
+
+- :class:`InProcessBackend`: a dict behind a lock (one process).
+- :class:`SQLiteBackend`: a shared SQLite file updated under ``BEGIN IMMEDIATE``,
+  i.e. SQLite's file lock (every worker on one host).
+- :class:`RedisBackend`: ``WATCH``/``MULTI``/``EXEC`` over the Redis protocol
+  (workers on several hosts). It only needs plain commands, so Redis, Valkey,
+  KeyDB or :class:`~src.resource_manager.redis_standin.LocalRedisServer` all work.
+"""
+
+from __future__ import annotations
+
+import socket
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+from urllib.parse import unquote, urlsplit
+
+from src.common.paths import OUTPUT_DIR
+
+RATE_LIMIT_DB = OUTPUT_DIR / "rate_limits.sqlite3"
+DEFAULT_REDIS_URL = "redis://localhost:6379/0"
+
+
+def take_tokens(
+    level: Optional[float],
+    stamp: Optional[float],
+    now: float,
+    rate: float,
+    burst: float,
+    tokens: float,
+) -> Tuple[float, float]:
+    """Refill a bucket to ``now`` and take ``tokens``; returns ``(new_level, wait_seconds)``.
+
+    A bucket that was never seen (``level is None``) starts full.
+    """
+
+    if level is None or stamp is None:
+        level = burst
+    else:
+        level = min(burst, level + max(now - stamp, 0.0) * rate)
+    level -= tokens
+    return level, (-level / rate if level < 0 else 0.0)
+
+
+class BucketBackend:
+    """Atomic token-bucket store shared by every limiter built on it."""
+
+    #: ``reserve`` does network/disk I/O; async callers run it off the event loop.
+    blocking_io = True
+
+    def reserve(
+        self,
+        key: str,
+        rate: float,
+        burst: float,
+        tokens: float = 1.0,
+        max_wait: Optional[float] = None,
+    ) -> Tuple[bool, float]:
+        """Take ``tokens`` from ``key``'s bucket, returning ``(granted, wait_seconds)``.
+
+        When the tokens would only be available after more than ``max_wait``
+        seconds nothing is taken and ``(False, wait)`` is returned.
+        """
+
+        raise NotImplementedError
+
+    def close(self) -> None:
+        return None
+
+
+class InProcessBackend(BucketBackend):
+    """Buckets in a dict; limits hold for the threads of one process."""
+
+    blocking_io = False
+
+    def __init__(self, clock=time.monotonic) -> None:
+        self._clock = clock
+        self._buckets: Dict[str, Tuple[float, float]] = {}
+        self._lock = threading.Lock()
+
+    def reserve(self, key, rate, burst, tokens=1.0, max_wait=None):
+        with self._lock:
+            now = self._clock()
+            level, stamp = self._buckets.get(key, (None, None))
+            level, wait = take_tokens(level, stamp, now, rate, burst, tokens)
+            if max_wait is not None and wait > max_wait:
+                return False, wait
+            self._buckets[key] = (level, now)
+        return True, wait
+
+
+_SQLITE_SCHEMA = """
+CREATE TABLE IF NOT EXISTS buckets (
+    key TEXT PRIMARY KEY,
+    level REAL NOT NULL,
+    updated_at REAL NOT NULL
+);
+"""
+
+
+class SQLiteBackend(BucketBackend):
+    """Buckets in a SQLite file; limits hold for every process on the host.
+
+    Each reservation is a short ``BEGIN IMMEDIATE`` transaction, i.e. it holds
+    the database's write lock only for the read-modify-write. Threads of one
+    process share a connection and queue on a local lock first, so SQLite's
+    coarse busy-wait back-off only comes into play between processes.
+    """
+
+    def __init__(self, path: Path = RATE_LIMIT_DB, *, busy_timeout: float = 10.0) -> None:
+        self.path = Path(path)
+        self._lock = threading.Lock()
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        # Autocommit mode: transactions are opened explicitly in reserve().
+        self._conn = sqlite3.connect(
+            str(self.path), timeout=busy_timeout, isolation_level=None, check_same_thread=False
+        )
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(_SQLITE_SCHEMA)
+
+    def reserve(self, key, rate, burst, tokens=1.0, max_wait=None):
+        with self._lock:
+            conn = self._conn
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                row = conn.execute(
+                    "SELECT level, updated_at FROM buckets WHERE key = ?", (key,)
+                ).fetchone()
+                now = time.time()
+                level, wait = take_tokens(
+                    row[0] if row else None, row[1] if row else None, now, rate, burst, tokens
+                )
+                if max_wait is not None and wait > max_wait:
+                    conn.execute("ROLLBACK")
+                    return False, wait
+                conn.execute(
+                    "INSERT INTO buckets (key, level, updated_at) VALUES (?, ?, ?) "
+                    "ON CONFLICT(key) DO UPDATE SET "
+                    "level = excluded.level, updated_at = excluded.updated_at",
+                    (key, level, now),
+                )
+                conn.execute("COMMIT")
+            except BaseException:
+                if conn.in_transaction:
+                    conn.execute("ROLLBACK")
+                raise
+        return True, wait
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+
+class RedisError(RuntimeError):
+    """Error reply from a Redis-protocol server."""
+
+
+class RespConnection:
+    """Minimal blocking RESP2 client: enough commands for the rate limiter."""
+
+    def __init__(self, url: str = DEFAULT_REDIS_URL, *, timeout: float = 5.0) -> None:
+        parts = urlsplit(url)
+        if parts.scheme not in ("redis", ""):
+            raise ValueError(f"Unsupported rate limit backend URL: {url}")
+        self._sock = socket.create_connection(
+            (parts.hostname or "localhost", parts.port or 6379), timeout=timeout
+        )
+        self._sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        self._reader = self._sock.makefile("rb")
+        if parts.password:
+            auth = [parts.username, parts.password] if parts.username else [parts.password]
+            self.execute("AUTH", *(unquote(value) for value in auth))
+        db = parts.path.strip("/")
+        if db and db != "0":
+            self.execute("SELECT", db)
+
+    @staticmethod
+    def _encode(command: Sequence[Any]) -> bytes:
+        chunks = [b"*%d\r\n" % len(command)]
+        for arg in command:
+            data = arg if isinstance(arg, bytes) else str(arg).encode("utf-8")
+            chunks.append(b"$%d\r\n%s\r\n" % (len(data), data))
+        return b"".join(chunks)
+
+    def _read(self) -> Any:
+        line = self._reader.readline()
+        if not line:
+            raise ConnectionError("Redis connection closed")
+        kind, payload = line[:1], line[1:-2]
+        if kind == b"+":
+            return payload.decode("utf-8")
+        if kind == b"-":
+            return RedisError(payload.decode("utf-8"))
+        if kind == b":":
+            return int(payload)
+        if kind == b"$":
+            size = int(payload)
+            if size < 0:
+                return None
+            data = self._reader.read(size + 2)
+            return data[:-2]
+        if kind == b"*":
+            size = int(payload)
+            return None if size < 0 else [self._read() for _ in range(size)]
+        raise RedisError(f"Unexpected reply prefix: {line!r}")
+
+    def pipeline(self, *commands: Sequence[Any]) -> List[Any]:
+        """Send ``commands`` in one write; their replies, errors included, are returned in order."""
+
+        self._sock.sendall(b"".join(self._encode(command) for command in commands))
+        return [self._read() for _ in commands]
+
+    def execute(self, *command: Any) -> Any:
+        reply = self.pipeline(command)[0]
+        if isinstance(reply, RedisError):
+            raise reply
+        return reply
+
+    def close(self) -> None:
+        try:
+            self._reader.close()
+            self._sock.close()
+        except OSError:  # pragma: no cover - already gone
+            pass
+
+
+class RedisBackend(BucketBackend):
+    """Buckets in a Redis-protocol server; limits hold across hosts.
+
+    Reservations are optimistic transactions (``WATCH``, read, ``MULTI``,
+    write, ``EXEC``) timed with the server's ``TIME`` so host clocks do not
+    have to agree; each round trip is pipelined. Threads of one process share
+    a connection behind a local lock, so ``EXEC`` only conflicts (and is
+    retried) when another process touched the bucket in between.
+    """
+
+    def __init__(
+        self,
+        url: str = DEFAULT_REDIS_URL,
+        *,
+        prefix: str = "ratelimit:",
+        timeout: float = 5.0,
+        max_retries: int = 50,
+    ) -> None:
+        self.url = url
+        self.prefix = prefix
+        self.timeout = timeout
+        self.max_retries = max_retries
+        self._lock = threading.Lock()
+        self._conn: Optional[RespConnection] = None
+
+    def _reserve(
+        self, conn: RespConnection, name: str, rate, burst, tokens, max_wait
+    ) -> Tuple[bool, float]:
+        # Idle buckets expire once they would have refilled anyway.
+        ttl_ms = int((burst / rate + 60) * 1000)
+        for _ in range(self.max_retries):
+            _, fields, server_time = conn.pipeline(
+                ("WATCH", name), ("HMGET", name, "level", "ts"), ("TIME",)
+            )
+            if isinstance(fields, RedisError):
+                conn.execute("UNWATCH")
+                raise fields
+            now = int(server_time[0]) + int(server_time[1]) / 1_000_000
+            level, stamp = (float(value) if value is not None else None for value in fields)
+            level, wait = take_tokens(level, stamp, now, rate, burst, tokens)
+            if max_wait is not None and wait > max_wait:
+                conn.execute("UNWATCH")
+                return False, wait
+            replies = conn.pipeline(
+                ("MULTI",),
+                ("HSET", name, "level", repr(level), "ts", repr(now)),
+                ("PEXPIRE", name, ttl_ms),
+                ("EXEC",),
+            )
+            if isinstance(replies[-1], RedisError):
+                raise replies[-1]
+            if replies[-1] is not None:
+                return True, wait
+        raise RedisError(
+            f"Rate limit bucket {name} stayed contended for {self.max_retries} attempts"
+        )
+
+    def reserve(self, key, rate, burst, tokens=1.0, max_wait=None):
+        with self._lock:
+            for attempt in range(2):
+                if self._conn is None:
+                    self._conn = RespConnection(self.url, timeout=self.timeout)
+                try:
+                    return self._reserve(
+                        self._conn, self.prefix + key, rate, burst, tokens, max_wait
+                    )
+                except (ConnectionError, OSError):
+                    # Dropped connection (server restart, idle timeout): reconnect once.
+                    self._conn.close()
+                    self._conn = None
+                    if attempt:
+                        raise
+        raise AssertionError("unreachable")  # pragma: no cover
+
+    def close(self) -> None:
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
+
+_shared_backends: Dict[Tuple[str, str], BucketBackend] = {}
+_shared_backends_lock = threading.Lock()
+
+
+def get_backend(kind: str = "memory", location: Optional[str] = None) -> BucketBackend:
+    """Shared backend for ``kind`` (``memory``, ``sqlite`` or ``redis``) at ``location``."""
+
+    kind = (kind or "memory").lower()
+    if kind not in ("memory", "sqlite", "redis"):
+        raise ValueError(f"Unknown rate limit backend: {kind}")
+    if kind == "sqlite":
+        location = str(location or RATE_LIMIT_DB)
+    elif kind == "redis":
+        location = location or DEFAULT_REDIS_URL
+    cache_key = (kind, location or "")
+    with _shared_backends_lock:
+        backend = _shared_backends.get(cache_key)
+        if backend is None:
+            if kind == "sqlite":
+                backend = SQLiteBackend(Path(location))
+            elif kind == "redis":
+                backend = RedisBackend(location)
+            else:
+                backend = InProcessBackend()
+            _shared_backends[cache_key] = backend
+        return backend
+
+
+__all__ = [
+    "BucketBackend",
+    "InProcessBackend",
+    "SQLiteBackend",
+    "RedisBackend",
+    "RedisError",
+    "RespConnection",
+    "get_backend",
+    "take_tokens",
+]
@@ -1,73 +1,187 @@
 # file: src/resource_manager/rate_limiter.py
-"""Resource-level rate limiter façade with per-source settings."""
+"""Resource-level rate limiter façade with per-source settings.
+
+QPS is enforced with a token bucket (``max_qps`` tokens per second, up to
+``burst`` banked) whose state lives in a pluggable backend from
+:mod:`src.resource_manager.rate_limit_backends`. Pointing every worker of a
+source at the same SQLite file or Redis server makes the limit hold across
+Airflow workers and hosts, not just within one process.
+
+Callers reserve tokens atomically and then sleep *outside* any lock for the
+wait the backend reports, so waiters are served in the order they asked
+(FIFO) and a sleeping caller never blocks the others. ``max_concurrent`` is
+still a per-process gate. Sources with ``adaptive_concurrency`` enabled get
+both limits retuned at runtime by
+:class:`~src.resource_manager.adaptive_concurrency.AdaptiveConcurrency`.
+"""
 
 from __future__ import annotations
 
+import asyncio
 import time
 import threading
-from collections import deque
 from contextlib import contextmanager
-from typing import Deque, Dict, Optional
+from typing import Dict, Optional
 
 from src.common.logging_utils import get_logger, safe_log
 from src.observability import metrics
+from src.resource_manager.adaptive_concurrency import (
+    AdaptiveConcurrency,
+    get_concurrency_controller,
+)
+from src.resource_manager.rate_limit_backends import BucketBackend, InProcessBackend, get_backend
 from src.resource_manager.settings import get_rate_limit_settings
 
 
 log = get_logger("rate-limiter")
 
 
-class RateLimiter:
-    """Simple rate limiter supporting QPS and concurrency caps."""
+class ConcurrencyGate:
+    """Counting semaphore whose size can change while slots are held or awaited.
+
+    Shrinking never revokes a held slot; new callers just wait until enough
+    are released. Waiters are woken in arrival order.
+    """
+
+    def __init__(self, limit: int):
+        self._limit = max(int(limit), 1)
+        self._held = 0
+        self._cond = threading.Condition()
+
+    @property
+    def limit(self) -> int:
+        return self._limit
+
+    @property
+    def held(self) -> int:
+        return self._held
+
+    def acquire(self, blocking: bool = True, timeout: Optional[float] = None) -> bool:
+        with self._cond:
+            if self._held >= self._limit:
+                if not blocking:
+                    return False
+                if not self._cond.wait_for(lambda: self._held < self._limit, timeout):
+                    return False
+            self._held += 1
+            return True
+
+    def release(self) -> None:
+        with self._cond:
+            if self._held <= 0:
+                raise ValueError("ConcurrencyGate released too many times")
+            self._held -= 1
+            self._cond.notify()
+
+    def resize(self, limit: int) -> None:
+        with self._cond:
+            grew = int(limit) > self._limit
+            self._limit = max(int(limit), 1)
+            if grew:
+                self._cond.notify_all()
 
-    def __init__(self, key: str, *, max_qps: Optional[float], max_concurrent: Optional[int]):
+
+class RateLimiter:
+    """Token-bucket rate limiter supporting QPS and concurrency caps."""
+
+    def __init__(
+        self,
+        key: str,
+        *,
+        max_qps: Optional[float],
+        max_concurrent: Optional[int],
+        burst: Optional[float] = None,
+        backend: Optional[BucketBackend] = None,
+    ):
         self.key = key
-        self.max_qps = max_qps or 0.0
+        self.max_qps = float(max_qps or 0.0)
         self.max_concurrent = max_concurrent or 0
-        self._timestamps: Deque[float] = deque()
-        self._lock = threading.Lock()
-        self._sem = threading.Semaphore(self.max_concurrent) if self.max_concurrent else None
+        self._fixed_burst = burst
+        # A one-second burst matches the sliding window this limiter used to keep.
+        self.burst = float(burst or max(self.max_qps, 1.0))
+        self.backend = backend or InProcessBackend()
+        self._sem = ConcurrencyGate(self.max_concurrent) if self.max_concurrent else None
+
+    def set_limits(
+        self, *, max_qps: Optional[float] = None, max_concurrent: Optional[int] = None
+    ) -> None:
+        """Retune the limits in place; ``None`` leaves a limit unchanged."""
+
+        if max_qps is not None:
+            self.max_qps = float(max_qps)
+            self.burst = float(self._fixed_burst or max(self.max_qps, 1.0))
+        if max_concurrent is not None:
+            self.max_concurrent = int(max_concurrent)
+            if self._sem is None:
+                self._sem = ConcurrencyGate(self.max_concurrent)
+            else:
+                self._sem.resize(self.max_concurrent)
+
+    def follow(self, controller: AdaptiveConcurrency) -> None:
+        """Track ``controller``'s learned concurrency (and QPS, if it scales one)."""
+
+        controller.subscribe(
+            lambda ctl: self.set_limits(max_qps=ctl.qps, max_concurrent=ctl.concurrency)
+        )
+
+    # ------------------------------------------------------------------- QPS
+    def _reserve(self, tokens: float, max_wait: Optional[float]) -> Optional[float]:
+        """Reserve ``tokens``; seconds to wait before using them, ``None`` if over ``max_wait``."""
+
+        if self.max_qps <= 0:
+            return 0.0
+        granted, wait = self.backend.reserve(self.key, self.max_qps, self.burst, tokens, max_wait)
+        if not granted:
+            return None
+        if wait > 0:
+            metrics.incr("rate_limit_hits", source=self.key)
+            metrics.incr("rate_limit_wait_seconds_total", wait, source=self.key)
+        return wait
 
-    def _acquire_concurrency(self) -> bool:
-        if not self._sem:
+    def try_acquire(self, tokens: float = 1.0) -> bool:
+        """Take ``tokens`` only if they are available right now; never waits."""
+
+        return self._reserve(tokens, 0.0) is not None
+
+    def acquire_sync(self, tokens: float = 1.0, timeout: Optional[float] = None) -> bool:
+        """Block until ``tokens`` are ours; ``False`` (nothing taken) if it exceeds ``timeout``."""
+
+        wait = self._reserve(tokens, timeout)
+        if wait is None:
             return False
-        if self._sem.acquire(blocking=False):
+        if wait > 0:
+            time.sleep(wait)
+        return True
+
+    async def acquire(self, tokens: float = 1.0, timeout: Optional[float] = None) -> bool:
+        """Async :meth:`acquire_sync`: waits on the event loop instead of a thread."""
+
+        if self.max_qps > 0 and self.backend.blocking_io:
+            wait = await asyncio.to_thread(self._reserve, tokens, timeout)
+        else:
+            wait = self._reserve(tokens, timeout)
+        if wait is None:
             return False
-        metrics.incr("rate_limit_hits", source=self.key)
-        self._sem.acquire()
+        if wait > 0:
+            await asyncio.sleep(wait)
         return True
 
-    def _respect_qps(self) -> bool:
-        if self.max_qps <= 0:
+    # ------------------------------------------------------------ concurrency
+    def _acquire_concurrency(self, gate: Optional[ConcurrencyGate]) -> bool:
+        if not gate:
             return False
+        if gate.acquire(blocking=False):
+            return False
+        metrics.incr("rate_limit_hits", source=self.key)
+        gate.acquire()
+        return True
 
-        waited = False
-        with self._lock:
-            now = time.time()
-            window_start = now - 1.0
-            while self._timestamps and self._timestamps[0] < window_start:
-                self._timestamps.popleft()
-
-            if len(self._timestamps) >= self.max_qps:
-                sleep_for = self._timestamps[0] + 1.0 - now
-                if sleep_for > 0:
-                    metrics.incr("rate_limit_hits", source=self.key)
-                    waited = True
-                    time.sleep(sleep_for)
-
-                now = time.time()
-                window_start = now - 1.0
-                while self._timestamps and self._timestamps[0] < window_start:
-                    self._timestamps.popleft()
-
-            self._timestamps.append(time.time())
-
-        return waited
-
-    def _acquire(self) -> None:
-        waited_concurrency = self._acquire_concurrency()
-        waited_qps = self._respect_qps()
-        if waited_concurrency or waited_qps:
+    def _acquire(self, gate: Optional[ConcurrencyGate]) -> None:
+        waited_concurrency = self._acquire_concurrency(gate)
+        wait = self._reserve(1.0, None) or 0.0
+        if wait > 0:
+            time.sleep(wait)
+        if waited_concurrency or wait > 0:
             safe_log(
                 log,
                 "debug",
@@ -75,42 +189,52 @@ class RateLimiter:
                 {
                     "source": self.key,
                     "waited_for_concurrency": waited_concurrency,
-                    "waited_for_qps": waited_qps,
+                    "waited_for_qps": wait > 0,
                 },
             )
 
-    def _release(self) -> None:
-        if self._sem:
-            self._sem.release()
-
     @contextmanager
     def limit(self):
         """Context manager that enforces QPS and concurrency limits."""
 
-        self._acquire()
+        gate = self._sem  # release the gate we took even if a controller installs one meanwhile
+        self._acquire(gate)
         try:
             yield
         finally:
-            self._release()
+            if gate:
+                gate.release()
 
     def wait(self) -> None:
         """Maintain compatibility with SimpleRateLimiter-like interface."""
 
+        if self._sem is None:
+            self.acquire_sync()
+            return None
         with self.limit():
             return None
 
 
 _default_limiters: Dict[str, RateLimiter] = {}
+_default_limiters_lock = threading.Lock()
 
 
 def get_rate_limiter(key: str) -> RateLimiter:
     """Obtain (or create) a rate limiter keyed by source using config defaults."""
 
-    if key not in _default_limiters:
-        settings = get_rate_limit_settings(key)
-        _default_limiters[key] = RateLimiter(
-            key,
-            max_qps=settings.get("max_qps"),
-            max_concurrent=settings.get("max_concurrent"),
-        )
-    return _default_limiters[key]
+    with _default_limiters_lock:
+        if key not in _default_limiters:
+            settings = get_rate_limit_settings(key)
+            _default_limiters[key] = RateLimiter(
+                key,
+                max_qps=settings.get("max_qps"),
+                max_concurrent=settings.get("max_concurrent"),
+                burst=settings.get("burst"),
+                backend=get_backend(
+                    settings.get("backend") or "memory", settings.get("backend_url")
+                ),
+            )
+            controller = get_concurrency_controller(key)
+            if controller is not None:
+                _default_limiters[key].follow(controller)
+        return _default_limiters[key]
@@ -0,0 +1,216 @@
+# file: src/resource_manager/redis_standin.py
+"""In-process stand-in for a Redis server.
+
+Speaks enough of RESP2 for :class:`~src.resource_manager.rate_limit_backends.RedisBackend`
+(hashes, ``PEXPIRE``, ``TIME`` and ``WATCH``/``MULTI``/``EXEC`` transactions) so
+tests, benchmarks and single-machine development can share rate limits without
+a real Redis. Not meant for production traffic.
+"""
+
+from __future__ import annotations
+
+import socket
+import socketserver
+import threading
+import time
+from typing import Any, Dict, List, Optional, Tuple
+
+
+class _Store:
+    def __init__(self) -> None:
+        self.lock = threading.Lock()
+        self.hashes: Dict[bytes, Dict[bytes, bytes]] = {}
+        self.expires: Dict[bytes, float] = {}
+        self.versions: Dict[bytes, int] = {}
+
+    def _expire(self, key: bytes) -> None:
+        deadline = self.expires.get(key)
+        if deadline is not None and deadline <= time.monotonic():
+            self.hashes.pop(key, None)
+            self.expires.pop(key, None)
+            self.versions[key] = self.versions.get(key, 0) + 1
+
+    def version(self, key: bytes) -> int:
+        self._expire(key)
+        return self.versions.get(key, 0)
+
+    def apply(self, command: List[bytes]) -> Any:
+        """Run one data command; the caller holds ``lock``."""
+
+        name = command[0].upper()
+        if name == b"PING":
+            return "PONG"
+        if name == b"TIME":
+            now = time.time()
+            return [str(int(now)).encode(), str(int(now % 1 * 1_000_000)).encode()]
+        if name == b"HMGET":
+            self._expire(command[1])
+            fields = self.hashes.get(command[1], {})
+            return [fields.get(field) for field in command[2:]]
+        if name == b"HSET":
+            key = command[1]
+            self._expire(key)
+            fields = self.hashes.setdefault(key, {})
+            pairs = command[2:]
+            added = sum(1 for field in pairs[0::2] if field not in fields)
+            fields.update(zip(pairs[0::2], pairs[1::2]))
+            self.versions[key] = self.versions.get(key, 0) + 1
+            return added
+        if name == b"PEXPIRE":
+            key = command[1]
+            self._expire(key)
+            if key not in self.hashes:
+                return 0
+            self.expires[key] = time.monotonic() + int(command[2]) / 1000
+            return 1
+        if name == b"DEL":
+            removed = 0
+            for key in command[1:]:
+                self._expire(key)
+                if self.hashes.pop(key, None) is not None:
+                    removed += 1
+                    self.versions[key] = self.versions.get(key, 0) + 1
+                self.expires.pop(key, None)
+            return removed
+        if name == b"FLUSHDB":
+            for key in self.hashes:
+                self.versions[key] = self.versions.get(key, 0) + 1
+            self.hashes.clear()
+            self.expires.clear()
+            return "OK"
+        return _Error(f"ERR unknown command '{name.decode('utf-8', 'replace')}'")
+
+
+class _Error(str):
+    pass
+
+
+def _encode(value: Any) -> bytes:
+    if isinstance(value, _Error):
+        return b"-%s\r\n" % value.encode()
+    if isinstance(value, str):
+        return b"+%s\r\n" % value.encode()
+    if isinstance(value, int):
+        return b":%d\r\n" % value
+    if value is None:
+        return b"$-1\r\n"
+    if isinstance(value, bytes):
+        return b"$%d\r\n%s\r\n" % (len(value), value)
+    if isinstance(value, list):
+        return b"*%d\r\n" % len(value) + b"".join(_encode(item) for item in value)
+    raise TypeError(f"Cannot encode {value!r}")
+
+
+class _Handler(socketserver.StreamRequestHandler):
+    server: "_Server"
+
+    def setup(self) -> None:
+        super().setup()
+        # Replies to pipelined commands are separate small writes; don't let Nagle hold them back.
+        self.request.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+
+    def _read_command(self) -> Optional[List[bytes]]:
+        line = self.rfile.readline()
+        if not line:
+            return None
+        if not line.startswith(b"*"):
+            return line.split()  # inline command, e.g. from telnet
+        args = []
+        for _ in range(int(line[1:-2])):
+            size = int(self.rfile.readline()[1:-2])
+            args.append(self.rfile.read(size + 2)[:-2])
+        return args
+
+    def handle(self) -> None:
+        store = self.server.store
+        watched: Dict[bytes, int] = {}
+        queued: Optional[List[List[bytes]]] = None
+        while True:
+            command = self._read_command()
+            if command is None:
+                return
+            if not command:
+                continue
+            name = command[0].upper()
+            reply: Any
+            if name in (b"AUTH", b"SELECT"):
+                reply = "OK"
+            elif name == b"QUIT":
+                self.wfile.write(_encode("OK"))
+                return
+            elif name == b"WATCH":
+                with store.lock:
+                    for key in command[1:]:
+                        watched[key] = store.version(key)
+                reply = "OK"
+            elif name == b"UNWATCH":
+                watched.clear()
+                reply = "OK"
+            elif name == b"MULTI":
+                queued = []
+                reply = "OK"
+            elif name == b"DISCARD":
+                queued, reply = None, "OK"
+                watched.clear()
+            elif name == b"EXEC":
+                if queued is None:
+                    reply = _Error("ERR EXEC without MULTI")
+                else:
+                    with store.lock:
+                        if any(store.version(key) != version for key, version in watched.items()):
+                            reply = None
+                        else:
+                            reply = [store.apply(queued_command) for queued_command in queued]
+                    queued = None
+                    watched.clear()
+            elif queued is not None:
+                queued.append(command)
+                reply = "QUEUED"
+            else:
+                with store.lock:
+                    reply = store.apply(command)
+            self.wfile.write(_encode(reply))
+
+
+class _Server(socketserver.ThreadingTCPServer):
+    daemon_threads = True
+    allow_reuse_address = True
+
+    def __init__(self, address: Tuple[str, int]) -> None:
+        super().__init__(address, _Handler)
+        self.store = _Store()
+
+
+class LocalRedisServer:
+    """Threaded Redis-protocol server on ``host:port`` (``port=0`` picks a free one)."""
+
+    def __init__(self, host: str = "127.0.0.1", port: int = 0) -> None:
+        self._server = _Server((host, port))
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def url(self) -> str:
+        host, port = self._server.server_address[:2]
+        return f"redis://{host}:{port}/0"
+
+    def start(self) -> "LocalRedisServer":
+        self._thread = threading.Thread(
+            target=self._server.serve_forever, name="local-redis", daemon=True
+        )
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self._server.shutdown()
+        self._server.server_close()
+        if self._thread is not None:
+            self._thread.join()
+
+    def __enter__(self) -> "LocalRedisServer":
+        return self.start()
+
+    def __exit__(self, *exc_info) -> None:
+        self.stop()
+
+
+__all__ = ["LocalRedisServer"]
@@ -10,10 +10,42 @@ from src.common.logging_utils import get_logger, safe_log
 
 log = get_logger("resource-settings")
 
-DEFAULT_RATE_LIMITS: Dict[str, Any] = {"max_qps": None, "max_concurrent": None}
+DEFAULT_RATE_LIMITS: Dict[str, Any] = {
+    "max_qps": None,
+    "max_concurrent": None,
+    "burst": None,
+    "backend": "memory",
+    "backend_url": None,
+}
 DEFAULT_PROXY_SETTINGS: Dict[str, Any] = {
     "max_errors_before_ban": 3,
     "ban_window_minutes": 30,
+    "score_alpha": 0.2,
+}
+DEFAULT_HTTP_CACHE_SETTINGS: Dict[str, Any] = {
+    "enabled": False,
+    "ttl_seconds": 0,
+    "max_bytes": None,
+}
+DEFAULT_LOAD_PROFILE_SETTINGS: Dict[str, Any] = {"name": "full"}
+DEFAULT_DRIVER_POOL_SETTINGS: Dict[str, Any] = {
+    "enabled": False,
+    "max_size": 8,
+    "warm": 0,
+    "max_pages": 200,
+    "max_rss_mb": 1536,
+    "idle_seconds": 300,
+}
+DEFAULT_ADAPTIVE_CONCURRENCY_SETTINGS: Dict[str, Any] = {
+    "enabled": False,
+    "initial": None,
+    "min_limit": 1,
+    "max_limit": 64,
+    "increase": 1.0,
+    "backoff": 0.5,
+    "latency_tolerance": 2.0,
+    "error_threshold": 0.2,
+    "persist": True,
 }
 
 
@@ -49,4 +81,47 @@ def get_proxy_settings(source: str) -> Dict[str, Any]:
     return settings
 
 
-__all__ = ["get_rate_limit_settings", "get_proxy_settings", "get_source_config"]
+def get_http_cache_settings(source: str) -> Dict[str, Any]:
+    """Return HTTP cache settings merged with defaults for a source."""
+
+    settings = dict(DEFAULT_HTTP_CACHE_SETTINGS)
+    settings.update(get_source_config(source).get("http_cache", {}) or {})
+    return settings
+
+
+def get_load_profile_settings(source: str) -> Dict[str, Any]:
+    """Return the browser load profile for a source (``load_profile: lite`` or a mapping)."""
+
+    settings = dict(DEFAULT_LOAD_PROFILE_SETTINGS)
+    configured = get_source_config(source).get("load_profile") or {}
+    if isinstance(configured, str):
+        configured = {"name": configured}
+    settings.update(configured)
+    return settings
+
+
+def get_driver_pool_settings(source: str) -> Dict[str, Any]:
+    """Return warm Selenium driver pool settings merged with defaults for a source."""
+
+    settings = dict(DEFAULT_DRIVER_POOL_SETTINGS)
+    settings.update(get_source_config(source).get("driver_pool") or {})
+    return settings
+
+
+def get_adaptive_concurrency_settings(source: str) -> Dict[str, Any]:
+    """Return adaptive concurrency controller settings merged with defaults for a source."""
+
+    settings = dict(DEFAULT_ADAPTIVE_CONCURRENCY_SETTINGS)
+    settings.update(get_source_config(source).get("adaptive_concurrency") or {})
+    return settings
+
+
+__all__ = [
+    "get_rate_limit_settings",
+    "get_proxy_settings",
+    "get_http_cache_settings",
+    "get_load_profile_settings",
+    "get_driver_pool_settings",
+    "get_adaptive_concurrency_settings",
+    "get_source_config",
+]
@@ -0,0 +1,385 @@
+"""Per-URL page fingerprints for delta crawls.
+
+Most product pages do not change between daily runs, yet a full refresh pays
+for navigating, extracting, normalizing and PCID-matching every one of them.
+:class:`FingerprintStore` keeps, per product URL, in one SQLite file per
+source under ``OUTPUT_DIR/fingerprints/``:
+
+- ``listing_hash``: the normalized DOM hash of the product's entry on its
+  listing page (see :func:`dom_fingerprint`);
+- ``record_hash``: a hash of the final record, ignoring run bookkeeping;
+- the final record itself, so an unchanged page can be carried forward.
+
+Every run writes fingerprints; only ``DELTA`` runs act on them.
+:class:`DeltaTracker` is the per-run view the pipelines use: listing stages
+``observe`` each URL's listing hash, extraction stages ask for ``carried``
+records before visiting a page, and export reports every final record so the
+run's change ratio can feed the smart scheduler. Rows are tied to a
+``generation`` (scraper/selectors version), so a new scraper release never
+carries forward records produced by the old one.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import re
+import sqlite3
+import threading
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Dict, Mapping, Optional, Tuple
+
+from bs4 import BeautifulSoup, Comment, Tag
+
+from src.common.logging_utils import get_logger
+from src.common.paths import OUTPUT_DIR
+
+log = get_logger("run-fingerprints")
+
+FINGERPRINT_DIR = OUTPUT_DIR / "fingerprints"
+
+DELTA_RUN_TYPE = "DELTA"
+
+# Attributes that identify content; everything else (ids, nonces, inline
+# styles, tracking data-*) tends to churn between otherwise identical renders.
+_STABLE_ATTRIBUTES = ("href", "src", "alt", "title", "value")
+_DROPPED_TAGS = ("script", "style", "noscript", "template", "iframe")
+# Run bookkeeping that differs on every run even when the product did not change.
+_VOLATILE_RECORD_KEYS = frozenset({"run_id", "scrape_run_id", "_version"})
+_WHITESPACE = re.compile(r"\s+")
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS pages (
+    url TEXT PRIMARY KEY,
+    generation TEXT NOT NULL,
+    listing_hash TEXT,
+    record_hash TEXT NOT NULL,
+    record TEXT NOT NULL,
+    run_id TEXT NOT NULL,
+    updated_at REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS meta (
+    key TEXT PRIMARY KEY,
+    value TEXT NOT NULL
+);
+"""
+
+_Row = Tuple[str, str, Optional[str], str, str, str, float]
+
+
+def _normalized_markup(node: Tag) -> str:
+    parts = []
+    for element in node.descendants:
+        if isinstance(element, Tag):
+            attrs = " ".join(
+                f"{name}={element.get(name)}"
+                for name in _STABLE_ATTRIBUTES
+                if element.get(name) is not None
+            )
+            parts.append(f"<{element.name} {attrs}>" if attrs else f"<{element.name}>")
+        else:
+            text = _WHITESPACE.sub(" ", str(element)).strip()
+            if text:
+                parts.append(text)
+    return "".join(parts)
+
+
+def dom_fingerprint(markup: Any) -> str:
+    """Hash ``markup`` (HTML text or a parsed node) ignoring volatile markup.
+
+    Scripts, styles, comments, attributes other than ``href``/``src``/
+    ``alt``/``title``/``value`` and whitespace runs do not affect the hash.
+    """
+
+    # Parse a copy so callers' trees are left intact.
+    node = BeautifulSoup(str(markup) if isinstance(markup, Tag) else markup or "", "lxml")
+    for dropped in node.find_all(_DROPPED_TAGS):
+        dropped.decompose()
+    for comment in node.find_all(string=lambda text: isinstance(text, Comment)):
+        comment.extract()
+    return hashlib.sha256(_normalized_markup(node).encode("utf-8")).hexdigest()
+
+
+def record_fingerprint(record: Mapping[str, Any]) -> str:
+    """Hash a record's content, ignoring run ids and version metadata."""
+
+    content = {key: value for key, value in record.items() if key not in _VOLATILE_RECORD_KEYS}
+    return hashlib.sha256(
+        json.dumps(content, sort_keys=True, default=str).encode("utf-8")
+    ).hexdigest()
+
+
+def fingerprint_path(source: str, root: Optional[Path] = None) -> Path:
+    return (root or FINGERPRINT_DIR) / f"{source}.sqlite"
+
+
+@dataclass
+class PageFingerprint:
+    """What the last run saw for one URL."""
+
+    url: str
+    listing_hash: Optional[str]
+    record_hash: str
+    record: Dict[str, Any]
+    run_id: str
+
+
+class FingerprintStore:
+    """SQLite-backed per-URL fingerprints for one source.
+
+    Writes are buffered and committed every ``batch_size`` rows; reads see
+    buffered writes and every method is safe to call from worker threads.
+    """
+
+    def __init__(self, path: Path, *, generation: str = "", batch_size: int = 500) -> None:
+        self.path = path
+        self.generation = generation
+        self.batch_size = max(batch_size, 1)
+        self._lock = threading.RLock()
+        self._buffer: Dict[str, _Row] = {}
+
+        path.parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(str(path), check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(_SCHEMA)
+        self._conn.commit()
+
+    @classmethod
+    def open(
+        cls,
+        source: str,
+        *,
+        generation: str = "",
+        root: Optional[Path] = None,
+        batch_size: int = 500,
+    ) -> "FingerprintStore":
+        return cls(fingerprint_path(source, root), generation=generation, batch_size=batch_size)
+
+    def previous(self, url: str) -> Optional[PageFingerprint]:
+        """The fingerprint stored for ``url`` by this generation, if any."""
+
+        with self._lock:
+            row = self._buffer.get(url)
+            if row is None:
+                row = self._conn.execute(
+                    "SELECT url, generation, listing_hash, record_hash, record, run_id, updated_at "
+                    "FROM pages WHERE url = ?",
+                    (url,),
+                ).fetchone()
+        if row is None or row[1] != self.generation:
+            return None
+        return PageFingerprint(
+            url=row[0],
+            listing_hash=row[2],
+            record_hash=row[3],
+            record=json.loads(row[4]),
+            run_id=row[5],
+        )
+
+    def put(
+        self,
+        url: str,
+        *,
+        listing_hash: Optional[str],
+        record_hash: str,
+        record: Mapping[str, Any],
+        run_id: str,
+    ) -> None:
+        row = (
+            url,
+            self.generation,
+            listing_hash,
+            record_hash,
+            json.dumps(record, default=str),
+            run_id,
+            time.time(),
+        )
+        with self._lock:
+            self._buffer[url] = row
+            if len(self._buffer) >= self.batch_size:
+                self.flush()
+
+    def flush(self) -> None:
+        with self._lock:
+            if not self._buffer:
+                return
+            rows = list(self._buffer.values())
+            with self._conn:
+                self._conn.executemany(
+                    "INSERT OR REPLACE INTO pages VALUES (?, ?, ?, ?, ?, ?, ?)", rows
+                )
+            self._buffer.clear()
+
+    def set_meta(self, key: str, value: Any) -> None:
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO meta VALUES (?, ?)", (key, json.dumps(value))
+            )
+
+    def get_meta(self, key: str, default: Any = None) -> Any:
+        with self._lock:
+            row = self._conn.execute("SELECT value FROM meta WHERE key = ?", (key,)).fetchone()
+        return json.loads(row[0]) if row else default
+
+    def __len__(self) -> int:
+        with self._lock:
+            self.flush()
+            return int(self._conn.execute("SELECT COUNT(*) FROM pages").fetchone()[0])
+
+    def close(self) -> None:
+        with self._lock:
+            try:
+                self.flush()
+            finally:
+                self._conn.close()
+
+
+@dataclass
+class DeltaSummary:
+    """Per-run delta-crawl outcome, reported in the run's stats."""
+
+    run_type: str
+    pages_extracted: int
+    pages_skipped: int
+    records: int
+    records_changed: int
+    seconds_saved: float
+
+    @property
+    def change_ratio(self) -> float:
+        return self.records_changed / self.records if self.records else 0.0
+
+    def as_stats(self) -> Dict[str, Any]:
+        return {
+            "run_type": self.run_type,
+            "pages_extracted": self.pages_extracted,
+            "pages_skipped": self.pages_skipped,
+            "records_changed": self.records_changed,
+            "change_ratio": round(self.change_ratio, 4),
+            "seconds_saved": round(self.seconds_saved, 2),
+        }
+
+
+class DeltaTracker:
+    """One run's view of the fingerprint store.
+
+    ``skip_unchanged`` is true for ``DELTA`` runs; other runs only record
+    fingerprints. ``parallelism`` is the number of pages visited at once and
+    scales the wall-clock saved by skipped pages.
+    """
+
+    def __init__(
+        self,
+        store: FingerprintStore,
+        *,
+        run_id: str,
+        run_type: str = "FULL_REFRESH",
+        parallelism: int = 1,
+    ) -> None:
+        self.store = store
+        self.run_id = run_id
+        self.run_type = (run_type or "FULL_REFRESH").upper()
+        self.skip_unchanged = self.run_type == DELTA_RUN_TYPE
+        self.parallelism = max(parallelism, 1)
+        self._lock = threading.Lock()
+        self._listing_hashes: Dict[str, str] = {}
+        self._page_seconds = 0.0
+        self._pages_extracted = 0
+        self._pages_skipped = 0
+        self._records = 0
+        self._records_changed = 0
+
+    def observe(self, url: str, listing_hash: str) -> None:
+        """Remember the listing fingerprint seen for ``url`` in this run."""
+
+        with self._lock:
+            self._listing_hashes[url] = listing_hash
+
+    def carried(self, url: str) -> Optional[Dict[str, Any]]:
+        """The previous final record for ``url`` if it can be reused as is.
+
+        Only ``DELTA`` runs reuse records, and only when this run observed
+        the same listing fingerprint as the run that stored the record.
+        """
+
+        if not self.skip_unchanged:
+            return None
+        with self._lock:
+            listing_hash = self._listing_hashes.get(url)
+        if listing_hash is None:
+            return None
+        previous = self.store.previous(url)
+        if previous is None or previous.listing_hash != listing_hash:
+            return None
+        with self._lock:
+            self._pages_skipped += 1
+        return previous.record
+
+    def page_visited(self, seconds: float) -> None:
+        """Account one extracted page and how long visiting it took."""
+
+        with self._lock:
+            self._pages_extracted += 1
+            self._page_seconds += seconds
+
+    def record(self, record: Mapping[str, Any]) -> None:
+        """Store the fingerprint of a final (exported) record."""
+
+        url = record.get("product_url")
+        if not url:
+            return
+        record_hash = record_fingerprint(record)
+        previous = self.store.previous(url)
+        with self._lock:
+            listing_hash = self._listing_hashes.pop(url, None)
+            self._records += 1
+            if previous is None or previous.record_hash != record_hash:
+                self._records_changed += 1
+        self.store.put(
+            url,
+            listing_hash=listing_hash,
+            record_hash=record_hash,
+            record=record,
+            run_id=self.run_id,
+        )
+
+    def finish(self) -> DeltaSummary:
+        """Flush fingerprints and summarize the run."""
+
+        with self._lock:
+            extracted, skipped = self._pages_extracted, self._pages_skipped
+            page_seconds = self._page_seconds
+            summary_counts = (self._records, self._records_changed)
+        if extracted:
+            mean_page_seconds = page_seconds / extracted
+            self.store.set_meta("mean_page_seconds", mean_page_seconds)
+        else:
+            mean_page_seconds = float(self.store.get_meta("mean_page_seconds", 0.0) or 0.0)
+        self.store.flush()
+        return DeltaSummary(
+            run_type=self.run_type,
+            pages_extracted=extracted,
+            pages_skipped=skipped,
+            records=summary_counts[0],
+            records_changed=summary_counts[1],
+            seconds_saved=skipped * mean_page_seconds / self.parallelism,
+        )
+
+    def close(self) -> None:
+        self.store.close()
+
+
+__all__ = [
+    "DELTA_RUN_TYPE",
+    "DeltaSummary",
+    "DeltaTracker",
+    "FINGERPRINT_DIR",
+    "FingerprintStore",
+    "PageFingerprint",
+    "dom_fingerprint",
+    "fingerprint_path",
+    "record_fingerprint",
+]
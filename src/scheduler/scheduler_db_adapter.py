@@ -208,7 +208,13 @@ def fetch_source_metrics(tenant_id: Optional[str] = None) -> List[SourceRunMetri
                 source,
                 MAX(started_at) AS last_run_at,
                 MAX(finished_at) FILTER (WHERE status = 'success') AS last_success_at,
-                COUNT(*) FILTER (WHERE status != 'success' AND started_at > NOW() - INTERVAL '7 days') AS consecutive_failures
+                COUNT(*) FILTER (
+                    WHERE status != 'success' AND started_at > NOW() - INTERVAL '7 days'
+                ) AS consecutive_failures,
+                (
+                    ARRAY_AGG((stats->>'change_ratio')::float ORDER BY started_at DESC)
+                    FILTER (WHERE status = 'success' AND stats ? 'change_ratio')
+                )[1] AS last_change_ratio
             FROM {RUNS_TABLE}
             WHERE tenant_id = %s
             GROUP BY source
@@ -224,7 +230,7 @@ def fetch_source_metrics(tenant_id: Optional[str] = None) -> List[SourceRunMetri
                 source=row["source"],
                 last_run_at=row["last_run_at"],
                 last_success_at=row["last_success_at"],
-                last_change_ratio=0.0,
+                last_change_ratio=float(row.get("last_change_ratio") or 0.0),
                 consecutive_failures=int(row.get("consecutive_failures") or 0),
                 budget_exhausted=False,
             )
@@ -2,15 +2,22 @@ import re
 from pathlib import Path
 from typing import Dict, Optional
 
-from bs4 import BeautifulSoup
 from selenium.webdriver.remote.webdriver import WebDriver
 
 from src.common.logging_utils import get_logger, sanitize_for_log, safe_log
+from src.processors.parse.extraction import Field, compile_plan
 
 log = get_logger("alfabeta-full-impl")
 
 SAMPLE_PATH = Path(__file__).parent / "samples" / "details_sample.html"
 
+PRODUCT_FIELDS = {
+    "name": Field("h1.product-name", key="product_name_selector"),
+    "lab": Field("div.lab-name", key="lab_name_selector"),
+    "presentation": Field("div.presentation", key="presentation_selector"),
+    "price": Field("div.price", key="price_selector"),
+}
+
 
 def _load_html(driver: WebDriver) -> str:
     html = getattr(driver, "page_source", "") or ""
@@ -37,25 +44,13 @@ def extract_product(
     """Extract product data from a product detail page."""
 
     selectors = selectors or {}
-    name_sel = selectors.get("product_name_selector", "h1.product-name")
-    lab_sel = selectors.get("lab_name_selector", "div.lab-name")
-    presentation_sel = selectors.get("presentation_selector", "div.presentation")
-    price_sel = selectors.get("price_selector", "div.price")
     currency_hint = selectors.get("currency_hint", "ARS")
+    values = compile_plan(PRODUCT_FIELDS, selectors).extract(_load_html(driver))
 
-    html = _load_html(driver)
-    soup = BeautifulSoup(html, "lxml")
-
-    def _text(selector: str) -> Optional[str]:
-        node = soup.select_one(selector)
-        if not node:
-            return None
-        return node.get_text(strip=True)
-
-    name = _text(name_sel)
-    lab = _text(lab_sel)
-    presentation = _text(presentation_sel)
-    price_raw = _text(price_sel)
+    name = values["name"]
+    lab = values["lab"]
+    presentation = values["presentation"]
+    price_raw = values["price"]
     price = _parse_price(price_raw) if price_raw else None
 
     record = {
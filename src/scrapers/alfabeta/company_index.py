@@ -1,11 +1,11 @@
 from pathlib import Path
 from typing import Dict, List, Optional
 
-from bs4 import BeautifulSoup
 from selenium.webdriver.remote.webdriver import WebDriver
 from urllib.parse import urljoin
 
 from src.common.logging_utils import get_logger, sanitize_for_log, safe_log
+from src.processors.parse.extraction import Field, compile_plan
 
 log = get_logger("alfabeta-company-index")
 
@@ -44,15 +44,8 @@ def fetch_company_urls(
         ),
     )
 
-    html = _load_html(driver)
-    soup = BeautifulSoup(html, "lxml")
-    company_links = []
-
-    for a in soup.select(company_selector):
-        href = a.get("href")
-        if not href:
-            continue
-        company_links.append(urljoin(base_url, href))
+    plan = compile_plan({"links": Field(company_selector, attr="href", many=True)})
+    company_links = [urljoin(base_url, href) for href in plan.extract(_load_html(driver))["links"]]
 
     log.info("Found %d company URLs", len(company_links))
     return company_links
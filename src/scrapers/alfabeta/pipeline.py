@@ -1,10 +1,28 @@
+import argparse
 import csv
 import json
 import os
+import time
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
 from dataclasses import dataclass, field
 from datetime import date, datetime
 from pathlib import Path
-from typing import Any, Dict, List, Mapping, Optional, Tuple
+from typing import (
+    Any,
+    Callable,
+    Deque,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Mapping,
+    Optional,
+    TextIO,
+    Tuple,
+    TypeVar,
+)
+from urllib.parse import urlsplit
 
 from selenium.common.exceptions import NoSuchElementException
 
@@ -12,27 +30,32 @@ from src.common.config_loader import load_config, load_source_config
 from src.common.logging_utils import get_logger, sanitize_for_log, safe_log
 from src.common.paths import OUTPUT_DIR
 from src.agents.agent_orchestrator import orchestrate_source_repair, load_recent_output_counts
-from src.engines.selenium_engine import open_with_session
+from src.engines.selenium_engine import (
+    BrowserSession,
+    get_driver_pool,
+    open_with_session,
+    resolve_load_profile,
+)
 from src.observability import metrics
-from src.observability.cost_tracking import record_run_cost
+from src.observability.cost_tracking import llm_ledger, record_run_cost
 from src.observability.run_trace_context import get_current_run_id, start_run_context
 from src.run_tracking import recorder as run_recorder
+from src.run_tracking.checkpoints import RunCheckpointStore
+from src.run_tracking.fingerprints import DeltaSummary, DeltaTracker, FingerprintStore
 from src.processors.exporters import database_loader, gcs_exporter, s3_exporter
 from src.processors.qc_rules import is_valid
-from src.processors.dedupe import dedupe_records
-from src.processors.pcid_matcher import (
-    build_pcid_index,
-    build_vector_store,
-    load_pcid_master,
-    match_pcid_with_confidence,
-    persist_pcid_mappings,
-)
+from src.processors.dedupe import iter_unique_records
+from src.processors.pcid_index import load_or_build_pcid_index
+from src.processors.pcid_matcher import match_pcid_batch, persist_pcid_mappings
 from src.processors.vector_store import BasePCIDVectorBackend, get_pcid_backend
 from src.processors.unify_fields import unify_record
 from src.resource_manager import ResourceManager, get_default_resource_manager
+from src.resource_manager.browser_pool import BrowserPool
+from src.resource_manager.rate_limiter import RateLimiter, get_rate_limiter
+from src.resource_manager.settings import get_rate_limit_settings
 from src.scrapers.alfabeta.alfabeta_full_impl import extract_product
 from src.scrapers.alfabeta.company_index import fetch_company_urls
-from src.scrapers.alfabeta.product_index import fetch_product_urls
+from src.scrapers.alfabeta.product_index import fetch_product_entries, fetch_product_urls
 from src.sessions.session_manager import create_session_record
 from src.versioning.version_manager import (
     attach_version_metadata,
@@ -44,6 +67,15 @@ log = get_logger("alfabeta-pipeline")
 
 DEFAULT_COMPANIES_URL = "https://example.com/companies"
 
+T = TypeVar("T")
+
+
+class CarriedRecord(dict):
+    """A final record reused from the previous run by a delta crawl.
+
+    Normalization and PCID matching pass these through untouched.
+    """
+
 
 @dataclass
 class PipelineContext:
@@ -64,6 +96,12 @@ class PipelineContext:
     variant_id: Optional[str] = None
     invalid_records: int = 0
     output_dir: Path = field(default_factory=lambda: OUTPUT_DIR)
+    browser_pool: Optional[BrowserPool] = None
+    browser_session: Optional[BrowserSession] = None
+    rate_limiter: Optional[RateLimiter] = None
+    stream_batch_size: int = 256
+    checkpoint: Optional[RunCheckpointStore] = None
+    delta: Optional[DeltaTracker] = None
 
 
 def _resolve_pcid_master_path() -> Path:
@@ -73,29 +111,48 @@ def _resolve_pcid_master_path() -> Path:
     return Path(__file__).resolve().parents[3] / "config" / "pcid_master.jsonl"
 
 
+def _resolve_pcid_index_dir(platform_config: Mapping[str, Any], master_path: Path) -> Path:
+    configured = os.getenv("PCID_INDEX_DIR")
+    if not configured and isinstance(platform_config, Mapping):
+        configured = (platform_config.get("pcid", {}) or {}).get("index_dir")
+    if configured:
+        return Path(configured)
+    return OUTPUT_DIR / "pcid_index" / master_path.stem
+
+
 def _prepare_pcid_resources(
     platform_config: Mapping[str, Any]
 ) -> Tuple[Dict[Tuple[str, str, str], str], Optional[BasePCIDVectorBackend]]:
     pcid_master_path = _resolve_pcid_master_path()
-    master_records = load_pcid_master(pcid_master_path)
-    if not master_records:
+    hash_cfg = (
+        platform_config.get("pcid", {}).get("hash", {})
+        if isinstance(platform_config, Mapping)
+        else {}
+    )
+    dims = int(hash_cfg.get("dims", 48)) if isinstance(hash_cfg, Mapping) else 48
+
+    compiled = load_or_build_pcid_index(
+        pcid_master_path, _resolve_pcid_index_dir(platform_config, pcid_master_path), dims=dims
+    )
+    if compiled is None or not compiled.rows:
         log.info(
             "PCID master missing or empty; skipping similarity index build",
             extra={"path": str(pcid_master_path)},
         )
         return {}, get_pcid_backend(platform_config)
 
-    hash_cfg = platform_config.get("pcid", {}).get("hash", {}) if isinstance(platform_config, Mapping) else {}
-    dims = int(hash_cfg.get("dims", 48)) if isinstance(hash_cfg, Mapping) else 48
-
-    pcid_index = build_pcid_index(master_records)
-    vector_store = build_vector_store(master_records, dims=dims)
-    backend = get_pcid_backend(platform_config, vector_store=vector_store)
+    backend = get_pcid_backend(
+        platform_config, vector_store=compiled.store, index_dir=compiled.path
+    )
     log.info(
         "Loaded PCID master",
-        extra={"rows": len(master_records), "index_keys": len(pcid_index), "path": str(pcid_master_path)},
+        extra={
+            "rows": compiled.rows,
+            "index_keys": len(compiled.pcid_index),
+            "path": str(pcid_master_path),
+        },
     )
-    return pcid_index, backend
+    return compiled.pcid_index, backend
 
 
 def _load_selectors() -> Dict[str, str]:
@@ -185,12 +242,198 @@ def ensure_logged_in(
         log.warning("Login attempt failed: %s", exc)
 
 
+def _resolve_session_count(
+    source: str, source_config: Mapping[str, Any], requested: Optional[int]
+) -> int:
+    """Resolve how many browser sessions to fan detail pages out across.
+
+    The primary session already holds one account lease, so the fleet is capped
+    at ``max_concurrent - 1`` to avoid blocking on the account gate.
+    """
+
+    concurrency_cfg = (
+        source_config.get("concurrency", {}) if isinstance(source_config, Mapping) else {}
+    )
+    sessions = requested
+    if sessions is None and isinstance(concurrency_cfg, Mapping):
+        sessions = concurrency_cfg.get("sessions")
+    try:
+        sessions = int(sessions or 1)
+    except (TypeError, ValueError):
+        sessions = 1
+
+    max_concurrent = get_rate_limit_settings(source).get("max_concurrent") or 0
+    if max_concurrent and sessions > max_concurrent - 1:
+        log.info(
+            "Capping browser fleet to account concurrency limit",
+            extra={"requested": sessions, "max_concurrent": max_concurrent},
+        )
+        sessions = max(max_concurrent - 1, 1)
+    return max(sessions, 1)
+
+
+def open_browser_fleet(
+    resource_manager: ResourceManager,
+    source: str,
+    base_url: str,
+    selectors: Dict[str, str],
+    source_config: Dict[str, Any],
+    size: int,
+) -> Tuple[BrowserPool, List[str]]:
+    """Open ``size`` browser sessions, each bound to its own account and proxy.
+
+    Returns the pool together with the acquired account keys so the caller can
+    release them once the pool has been closed. With the source's driver pool
+    enabled, proxies are picked up front and every member's browser is
+    started in the background while earlier members log in.
+    """
+
+    account_keys: List[str] = []
+    proxies: List[str] = []
+    site = urlsplit(base_url).hostname
+    driver_pool = get_driver_pool(source)
+    if driver_pool is not None:
+        profile = resolve_load_profile(source)
+        proxies = [
+            resource_manager.proxy_pool.choose_proxy(source, site=site) or "" for _ in range(size)
+        ]
+        for proxy in proxies:
+            driver_pool.prewarm(proxy or None, profile, proxies.count(proxy))
+        proxies.reverse()
+
+    def _open_member():
+        account_key, username, password = resource_manager.account_router.acquire_account(source)
+        try:
+            if proxies:
+                proxy = proxies.pop()
+            else:
+                proxy = resource_manager.proxy_pool.choose_proxy(source, site=site) or ""
+            account_id = account_key.split(":", 1)[1]
+            session = open_with_session(base_url, create_session_record(source, account_id, proxy))
+        except Exception:
+            resource_manager.account_router.release_account(account_key)
+            raise
+        account_keys.append(account_key)
+        try:
+            ensure_logged_in(
+                session.driver,
+                selectors,
+                source_config,
+                account_username=username,
+                account_password=password,
+            )
+        except Exception:
+            session.quit()
+            raise
+        return session
+
+    try:
+        pool = BrowserPool(_open_member, size=size)
+    except Exception:
+        for account_key in account_keys:
+            resource_manager.account_router.release_account(account_key)
+        raise
+    log.info("Opened browser fleet", extra={"source": source, "sessions": size})
+    return pool, account_keys
+
+
+def _fan_out_iter(
+    ctx: PipelineContext,
+    urls: Iterable[str],
+    visit: Callable[[Any, str], T],
+    *,
+    step: str,
+    cached: Optional[Callable[[str], Optional[T]]] = None,
+    on_page: Optional[Callable[[float], None]] = None,
+) -> Iterator[Optional[T]]:
+    """Visit ``urls`` across the browser fleet, yielding results in input order.
+
+    At most ``2 * pool.size`` pages are in flight, so ``urls`` may be a lazy
+    iterator and results are handed downstream as soon as they are ready.
+    A failing URL yields ``None`` in its slot instead of aborting the batch.
+    URLs for which ``cached`` returns a value are not visited at all.
+    ``on_page`` receives the seconds spent on each successfully visited page.
+    """
+
+    pool = ctx.browser_pool
+    if pool is None:
+        raise RuntimeError("Concurrent extraction requires ctx.browser_pool")
+    limiter = ctx.rate_limiter or get_rate_limiter(ctx.source)
+
+    def _visit(url: str) -> Optional[T]:
+        with pool.acquire() as session:
+            started = time.perf_counter()
+            try:
+                with limiter.limit():
+                    session.load(url)
+                # Read the driver after loading: the session may have recycled it.
+                result = visit(session.driver, url)
+                if on_page is not None:
+                    on_page(time.perf_counter() - started)
+                return result
+            except Exception as exc:
+                metrics.incr("scraper.page_errors", source=ctx.source, step=step)
+                safe_log(
+                    log,
+                    "warning",
+                    "Page visit failed; skipping URL",
+                    extra=sanitize_for_log({"url": url, "step": step, "error": str(exc)}),
+                )
+                return None
+
+    window = max(pool.size * 2, 1)
+    with ThreadPoolExecutor(max_workers=pool.size) as executor:
+        in_flight: Deque[Future] = deque()
+        for url in urls:
+            hit = cached(url) if cached is not None else None
+            if hit is not None:
+                done: Future = Future()
+                done.set_result(hit)
+                in_flight.append(done)
+            else:
+                in_flight.append(executor.submit(_visit, url))
+            if len(in_flight) >= window:
+                yield in_flight.popleft().result()
+        while in_flight:
+            yield in_flight.popleft().result()
+
+
+def _fan_out(
+    ctx: PipelineContext,
+    urls: List[str],
+    visit: Callable[[Any, str], T],
+    *,
+    step: str,
+) -> List[Optional[T]]:
+    """Visit ``urls`` across the browser fleet, preserving input order."""
+
+    return list(_fan_out_iter(ctx, urls, visit, step=step))
+
+
+def _chunked(items: Iterable[T], size: int) -> Iterator[List[T]]:
+    chunk: List[T] = []
+    for item in items:
+        chunk.append(item)
+        if len(chunk) >= size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
 def fetch_listings(ctx: PipelineContext) -> List[str]:
     """Discover company listing URLs."""
 
-    driver = ctx.driver
-    driver.get(ctx.base_url)
+    if ctx.checkpoint is not None:
+        resumed = ctx.checkpoint.children(ctx.base_url)
+        if resumed is not None:
+            log.info("Resumed company listings from checkpoint", extra={"companies": len(resumed)})
+            return resumed
+
+    driver = _open_page(ctx, ctx.base_url)
     companies = fetch_company_urls(driver, ctx.base_url, ctx.selectors, run_id=ctx.run_id)
+    if ctx.checkpoint is not None:
+        ctx.checkpoint.record_children(ctx.base_url, companies, kind="companies")
     run_recorder.record_step(
         ctx.run_id,
         name="company_index",
@@ -199,58 +442,167 @@ def fetch_listings(ctx: PipelineContext) -> List[str]:
     return companies
 
 
+def _open_page(ctx: PipelineContext, url: str) -> Any:
+    """Load ``url`` in the run's own browser and return its driver.
+
+    Through ``ctx.browser_session`` the load waits for the load profile's
+    ``ready_selector`` (and may hand back a recycled driver).
+    """
+
+    if ctx.browser_session is None:
+        ctx.driver.get(url)
+        return ctx.driver
+    ctx.browser_session.load(url)
+    ctx.driver = ctx.browser_session.driver
+    return ctx.driver
+
+
+def iter_details(ctx: PipelineContext, listings: Iterable[str]) -> Iterator[str]:
+    """Yield product detail URLs company by company.
+
+    When ``ctx.browser_pool`` is set, company pages are visited concurrently
+    across the fleet. Companies already expanded in ``ctx.checkpoint`` are
+    replayed without navigating. With ``ctx.delta`` set, each product's
+    listing-entry fingerprint is recorded for the delta crawl.
+    """
+
+    checkpoint = ctx.checkpoint
+    cached = checkpoint.children if checkpoint is not None else None
+    delta = ctx.delta
+
+    def _visit(driver: Any, company_url: str) -> List[str]:
+        if delta is not None:
+            entries = fetch_product_entries(driver, company_url, ctx.selectors, run_id=ctx.run_id)
+            for url, listing_hash in entries:
+                delta.observe(url, listing_hash)
+            urls = [url for url, _ in entries]
+        else:
+            urls = fetch_product_urls(driver, company_url, ctx.selectors, run_id=ctx.run_id)
+        if checkpoint is not None:
+            checkpoint.record_children(company_url, urls, kind="company")
+        return urls
+
+    if ctx.browser_pool is not None:
+        pages = _fan_out_iter(ctx, listings, _visit, step="product_index", cached=cached)
+        for urls in pages:
+            yield from urls or []
+    else:
+        for company_url in listings:
+            resumed = cached(company_url) if cached is not None else None
+            if resumed is not None:
+                yield from resumed
+                continue
+            yield from _visit(_open_page(ctx, company_url), company_url)
+
+    run_recorder.record_step(ctx.run_id, name="product_index", status="success")
+
+
 def fetch_details(ctx: PipelineContext, listings: List[str]) -> List[str]:
     """Expand company listings into product detail URLs."""
 
-    driver = ctx.driver
-    product_urls: List[str] = []
-    for company_url in listings:
-        driver.get(company_url)
-        product_urls.extend(
-            fetch_product_urls(driver, company_url, ctx.selectors, run_id=ctx.run_id)
+    return list(iter_details(ctx, listings))
+
+
+def iter_raw(ctx: PipelineContext, details: Iterable[str]) -> Iterator[Dict[str, Any]]:
+    """Yield raw product payloads as detail pages are extracted.
+
+    When ``ctx.browser_pool`` is set, detail pages are extracted concurrently
+    across the fleet; output order follows ``details`` and failed pages are
+    skipped. Pages already extracted in ``ctx.checkpoint`` are replayed from
+    it without navigating. On delta runs, pages whose listing entry is
+    unchanged yield the previous run's final record as a
+    :class:`CarriedRecord` instead of being visited.
+    """
+
+    checkpoint = ctx.checkpoint
+    delta = ctx.delta
+
+    def _cached(detail_url: str) -> Optional[Dict[str, Any]]:
+        resumed = checkpoint.raw_record(detail_url) if checkpoint is not None else None
+        if resumed is not None:
+            return resumed
+        carried = delta.carried(detail_url) if delta is not None else None
+        if carried is not None:
+            return CarriedRecord(carried, run_id=ctx.run_id)
+        return None
+
+    def _visit(driver: Any, detail_url: str) -> Dict[str, Any]:
+        record = extract_product(driver, detail_url, ctx.selectors, ctx.run_id)
+        if checkpoint is not None:
+            checkpoint.record_raw(detail_url, record)
+        return record
+
+    on_page = delta.page_visited if delta is not None else None
+    if ctx.browser_pool is not None:
+        extracted = _fan_out_iter(
+            ctx, details, _visit, step="extract_product", cached=_cached, on_page=on_page
         )
+        yield from (record for record in extracted if record is not None)
+    else:
+        for detail_url in details:
+            hit = _cached(detail_url)
+            if hit is not None:
+                yield hit
+                continue
+            started = time.perf_counter()
+            record = _visit(_open_page(ctx, detail_url), detail_url)
+            if on_page is not None:
+                on_page(time.perf_counter() - started)
+            yield record
 
-    run_recorder.record_step(ctx.run_id, name="product_index", status="success")
-    return product_urls
+    run_recorder.record_step(ctx.run_id, name="extract_product", status="success")
 
 
 def parse_raw(ctx: PipelineContext, details: List[str]) -> List[Dict[str, Any]]:
     """Extract raw product payloads from detail pages."""
 
-    driver = ctx.driver
-    raw_records: List[Dict[str, Any]] = []
-    for detail_url in details:
-        driver.get(detail_url)
-        raw_records.append(extract_product(driver, detail_url, ctx.selectors, ctx.run_id))
-
-    run_recorder.record_step(ctx.run_id, name="extract_product", status="success")
-    return raw_records
+    return list(iter_raw(ctx, details))
 
 
-def normalize_records(ctx: PipelineContext, parsed: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
-    """Unify raw records and attach metadata."""
+def iter_normalized(
+    ctx: PipelineContext, parsed: Iterable[Dict[str, Any]]
+) -> Iterator[Dict[str, Any]]:
+    """Unify raw records and attach metadata one record at a time."""
 
-    normalized: List[Dict[str, Any]] = []
     for record in parsed:
+        if isinstance(record, CarriedRecord):
+            yield record
+            continue
         unified = unify_record(record)
         enriched = attach_version_metadata(unified, ctx.version_info)
         enriched["run_id"] = ctx.run_id
-        normalized.append(enriched)
+        yield enriched
+
+
+def normalize_records(ctx: PipelineContext, parsed: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """Unify raw records and attach metadata."""
 
-    return normalized
+    return list(iter_normalized(ctx, parsed))
 
 
 def match_pcid(ctx: PipelineContext, normalized: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
-    """Augment normalized records with PCID matches when available."""
+    """Augment normalized records with PCID matches when available.
 
-    matched_records: List[Dict[str, Any]] = []
-    for record in normalized:
-        pcid, confidence = match_pcid_with_confidence(
-            record,
+    Records carried forward by a delta crawl keep their previous match.
+    """
+
+    fresh = [record for record in normalized if not isinstance(record, CarriedRecord)]
+    decisions = iter(
+        match_pcid_batch(
+            fresh,
             ctx.pcid_index,
-            vector_store=ctx.pcid_vector_store,
+            ctx.pcid_vector_store,
             min_similarity=ctx.pcid_min_similarity,
         )
+        if fresh
+        else ()
+    )
+    matched_records: List[Dict[str, Any]] = []
+    for record in normalized:
+        if isinstance(record, CarriedRecord):
+            matched_records.append(record)
+            continue
+        pcid, confidence = next(decisions)
         if pcid:
             record["pcid"] = pcid
             record["pcid_confidence"] = confidence
@@ -259,120 +611,278 @@ def match_pcid(ctx: PipelineContext, normalized: List[Dict[str, Any]]) -> List[D
     return matched_records
 
 
-def run_qc(ctx: PipelineContext, matched: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
-    """Filter invalid records and de-duplicate."""
+def iter_matched(
+    ctx: PipelineContext, normalized: Iterable[Dict[str, Any]]
+) -> Iterator[Dict[str, Any]]:
+    """Match PCIDs in chunks of ``ctx.stream_batch_size`` records.
 
-    valid_records: List[Dict[str, Any]] = []
-    invalid_count = 0
-    for record in matched:
-        if is_valid(record):
-            metrics.incr("scraper.records_valid", source=ctx.source)
-            valid_records.append(record)
-        else:
-            metrics.incr("scraper.records_invalid", source=ctx.source)
-            invalid_count += 1
+    Chunking keeps the vector backend's batched query path while bounding how
+    many records are held between extraction and export.
+    """
+
+    for chunk in _chunked(normalized, max(ctx.stream_batch_size, 1)):
+        yield from match_pcid(ctx, chunk)
+
+
+def iter_qc(ctx: PipelineContext, matched: Iterable[Dict[str, Any]]) -> Iterator[Dict[str, Any]]:
+    """Filter invalid records and drop duplicates as records arrive."""
+
+    ctx.invalid_records = 0
+    counts = {"valid": 0, "unique": 0}
 
-    deduped = dedupe_records(valid_records) if valid_records else []
-    dropped = len(valid_records) - len(deduped)
+    def _valid() -> Iterator[Dict[str, Any]]:
+        for record in matched:
+            if is_valid(record):
+                metrics.incr("scraper.records_valid", source=ctx.source)
+                counts["valid"] += 1
+                yield record
+            else:
+                metrics.incr("scraper.records_invalid", source=ctx.source)
+                ctx.invalid_records += 1
+
+    for record in iter_unique_records(_valid()):
+        counts["unique"] += 1
+        yield record
+
+    dropped = counts["valid"] - counts["unique"]
     if dropped:
         metrics.incr("scraper.records_duplicate", amount=dropped, source=ctx.source)
 
-    ctx.invalid_records = invalid_count
-    return deduped
 
+def run_qc(ctx: PipelineContext, matched: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """Filter invalid records and de-duplicate."""
 
-def export_records(ctx: PipelineContext, final: List[Dict[str, Any]]) -> Path:
-    """Persist output artifacts and run bookkeeping."""
+    return list(iter_qc(ctx, matched))
 
-    export_cfg = ctx.platform_config.get("export", {}) if isinstance(ctx.platform_config, Mapping) else {}
-    backends = export_cfg.get("backends") or ["csv"]
-    backends = [backend.lower() for backend in backends]
-
-    daily_dir = ctx.output_dir / ctx.source / "daily"
-    daily_dir.mkdir(parents=True, exist_ok=True)
-    filename = f"alfabeta_labs_{date.today().isoformat()}.csv"
-    out_path = daily_dir / filename
-
-    pcid_mappings: List[Dict[str, Any]] = [
-        {
-            "product_url": rec.get("product_url"),
-            "pcid": rec.get("pcid"),
-            "confidence": rec.get("pcid_confidence", 0.0),
-            "source": ctx.source,
-            "run_id": ctx.run_id,
-        }
-        for rec in final
-        if rec.get("pcid")
+
+class RecordExporter:
+    """Incremental writer for the CSV, DB and PCID-mapping outputs of a run.
+
+    Records are written as they arrive: CSV rows and PCID mappings are
+    flushed every ``flush_every`` records and DB rows are inserted in
+    ``db_batch_size`` chunks. :meth:`close` flushes
+    whatever is buffered, so a crashed run still leaves its partial output on
+    disk. S3/GCS uploads need the whole file and happen in :meth:`upload`.
+    """
+
+    CSV_FIELDS = [
+        "product_url",
+        "name",
+        "price",
+        "currency",
+        "company",
+        "source",
+        "pcid",
+        "pcid_confidence",
+        "run_id",
+        "_version",
     ]
 
-    if final:
-        if "csv" in backends:
-            with out_path.open("w", newline="", encoding="utf-8") as f:
-                writer = csv.DictWriter(
-                    f,
-                    fieldnames=[
-                        "product_url",
-                        "name",
-                        "price",
-                        "currency",
-                        "company",
-                        "source",
-                        "pcid",
-                        "pcid_confidence",
-                        "run_id",
-                        "_version",
-                    ],
-                )
-                writer.writeheader()
-                writer.writerows(final)
-            log.info("Wrote %d records to %s", len(final), out_path)
-        else:
+    def __init__(self, ctx: PipelineContext, *, flush_every: int = 1000) -> None:
+        self.ctx = ctx
+        export_cfg = (
+            ctx.platform_config.get("export", {})
+            if isinstance(ctx.platform_config, Mapping)
+            else {}
+        )
+        self.export_cfg: Mapping[str, Any] = export_cfg if isinstance(export_cfg, Mapping) else {}
+        self.backends = [
+            backend.lower() for backend in (self.export_cfg.get("backends") or ["csv"])
+        ]
+        self.db_batch_size = int(self.export_cfg.get("db_batch_size", 1000) or 1000)
+        self.flush_every = max(flush_every, 1)
+
+        self.filename = f"alfabeta_labs_{date.today().isoformat()}.csv"
+        daily_dir = ctx.output_dir / ctx.source / "daily"
+        daily_dir.mkdir(parents=True, exist_ok=True)
+        self.out_path = daily_dir / self.filename
+        self.mapping_path = (
+            ctx.output_dir
+            / ctx.source
+            / "pcid_mappings"
+            / f"{ctx.source}_pcid_{date.today().isoformat()}.jsonl"
+        )
+
+        self.written = 0
+        self.mapped = 0
+        self._csv_handle: Optional[TextIO] = None
+        self._csv_writer: Optional[csv.DictWriter] = None
+        self._mappings: List[Dict[str, Any]] = []
+        self._db_buffer: List[Dict[str, Any]] = []
+        self._db_exported = 0
+
+    def write(self, record: Dict[str, Any]) -> None:
+        if "csv" in self.backends:
+            if self._csv_writer is None:
+                self._csv_handle = self.out_path.open("w", newline="", encoding="utf-8")
+                self._csv_writer = csv.DictWriter(self._csv_handle, fieldnames=self.CSV_FIELDS)
+                self._csv_writer.writeheader()
+            self._csv_writer.writerow(record)
+
+        if record.get("pcid"):
+            self._mappings.append(
+                {
+                    "product_url": record.get("product_url"),
+                    "pcid": record.get("pcid"),
+                    "confidence": record.get("pcid_confidence", 0.0),
+                    "source": self.ctx.source,
+                    "run_id": self.ctx.run_id,
+                }
+            )
+
+        if "db" in self.backends:
+            self._db_buffer.append(record)
+            if len(self._db_buffer) >= self.db_batch_size:
+                self._flush_db()
+
+        self.written += 1
+        if self.written % self.flush_every == 0:
+            self._flush_files()
+
+    def write_many(self, records: Iterable[Dict[str, Any]]) -> None:
+        for record in records:
+            self.write(record)
+
+    def _flush_files(self) -> None:
+        if self._csv_handle is not None:
+            self._csv_handle.flush()
+        if self._mappings:
+            persist_pcid_mappings(self._mappings, self.mapping_path, append=self.mapped > 0)
+            self.mapped += len(self._mappings)
+            self._mappings = []
+
+    def _flush_db(self) -> None:
+        if not self._db_buffer:
+            return
+        batch, self._db_buffer = self._db_buffer, []
+        database_loader.export_records(batch)
+        self._db_exported += len(batch)
+
+    def close(self) -> None:
+        """Flush buffered output; safe to call more than once."""
+
+        try:
+            self._flush_files()
+            if "db" in self.backends:
+                self._flush_db()
+                log.info("Exported %d records to DB backend", self._db_exported)
+        finally:
+            if self._csv_handle is not None:
+                self._csv_handle.close()
+            self._csv_handle = None
+            self._csv_writer = None
+
+        if self.written and "csv" in self.backends:
+            log.info("Wrote %d records to %s", self.written, self.out_path)
+        elif self.written:
             log.info("CSV backend disabled; skipping local write")
+        if self.mapped:
+            log.info("Persisted %d PCID mappings to %s", self.mapped, self.mapping_path)
+
+    def _remote_records(
+        self, records: Optional[Iterable[Mapping[str, Any]]]
+    ) -> Iterable[Mapping[str, Any]]:
+        if records is not None:
+            return records
+        if "csv" in self.backends and self.out_path.exists():
+            with self.out_path.open(newline="", encoding="utf-8") as handle:
+                return list(csv.DictReader(handle))
+        log.warning("Streaming export needs the csv backend to stage S3/GCS uploads; skipping")
+        return []
+
+    def upload(self, records: Optional[Iterable[Mapping[str, Any]]] = None) -> None:
+        """Push the run to object-storage backends.
+
+        ``records`` defaults to re-reading the staged CSV, so streaming runs
+        upload from disk instead of keeping the catalog in memory.
+        """
+
+        for backend in self.backends:
+            if backend in {"csv", "db"}:
+                continue
+            if backend not in {"s3", "gcs"}:
+                log.warning("Unknown export backend '%s'; skipping", backend)
+                continue
+            cfg = self.export_cfg.get(backend, {})
+            bucket = cfg.get("bucket") if isinstance(cfg, Mapping) else None
+            prefix = cfg.get("prefix") if isinstance(cfg, Mapping) else None
+            if not bucket:
+                log.warning(
+                    "%s backend configured without a bucket; skipping upload", backend.upper()
+                )
+                continue
+            rows = list(self._remote_records(records))
+            if backend == "s3":
+                key = s3_exporter.export_to_s3(
+                    rows, bucket=bucket, prefix=prefix, object_name=self.filename
+                )
+                log.info("Uploaded %d records to s3://%s/%s", len(rows), bucket, key)
+            else:
+                key = gcs_exporter.export_to_gcs(
+                    rows, bucket=bucket, prefix=prefix, object_name=self.filename
+                )
+                log.info("Uploaded %d records to gs://%s/%s", len(rows), bucket, key)
+
+
+def _tracked(ctx: PipelineContext, records: Iterable[Dict[str, Any]]) -> Iterator[Dict[str, Any]]:
+    """Fingerprint final records on their way to the exporter."""
+
+    if ctx.delta is None:
+        yield from records
+        return
+    for record in records:
+        ctx.delta.record(record)
+        yield record
+
+
+def _report_delta(ctx: PipelineContext) -> Optional[DeltaSummary]:
+    if ctx.delta is None:
+        return None
+    summary = ctx.delta.finish()
+    metrics.incr("scraper.delta_pages_skipped", summary.pages_skipped, source=ctx.source)
+    metrics.incr("scraper.delta_seconds_saved", summary.seconds_saved, source=ctx.source)
+    metrics.set_gauge("scraper.change_ratio", summary.change_ratio, source=ctx.source)
+    log.info(
+        "Delta crawl: skipped %d of %d detail pages (~%.1fs saved), change ratio %.3f",
+        summary.pages_skipped,
+        summary.pages_skipped + summary.pages_extracted,
+        summary.seconds_saved,
+        summary.change_ratio,
+        extra={"run_id": ctx.run_id, **summary.as_stats()},
+    )
+    return summary
+
+
+def _finish_export(ctx: PipelineContext, exporter: RecordExporter) -> Path:
+    """Run post-export bookkeeping: source repair, delta, cost and run tracking."""
 
-        validation_rate = len(final) / max(len(final) + ctx.invalid_records, 1)
+    written = exporter.written
+    if written:
+        validation_rate = written / max(written + ctx.invalid_records, 1)
         if ctx.baseline_rows:
             orchestrate_source_repair(
                 source=ctx.source,
                 baseline_rows=ctx.baseline_rows,
-                current_rows=len(final),
+                current_rows=written,
                 validation_rate=validation_rate,
                 selectors_path=Path(__file__).with_name("selectors.json"),
             )
-
-        if pcid_mappings:
-            pcid_mapping_dir = ctx.output_dir / ctx.source / "pcid_mappings"
-            mapping_path = pcid_mapping_dir / f"{ctx.source}_pcid_{date.today().isoformat()}.jsonl"
-            persist_pcid_mappings(pcid_mappings, mapping_path)
-            log.info("Persisted %d PCID mappings to %s", len(pcid_mappings), mapping_path)
     else:
         log.warning("No valid records to write for AlfaBeta run.")
 
-    for backend in backends:
-        if backend == "csv":
-            continue
-        if backend == "db":
-            database_loader.export_records(final)
-            log.info("Exported %d records to DB backend", len(final))
-        elif backend == "s3":
-            s3_cfg = export_cfg.get("s3", {}) if isinstance(export_cfg, Mapping) else {}
-            bucket = s3_cfg.get("bucket") if isinstance(s3_cfg, Mapping) else None
-            prefix = s3_cfg.get("prefix") if isinstance(s3_cfg, Mapping) else None
-            if not bucket:
-                log.warning("S3 backend configured without a bucket; skipping upload")
-                continue
-            key = s3_exporter.export_to_s3(final, bucket=bucket, prefix=prefix, object_name=filename)
-            log.info("Uploaded %d records to s3://%s/%s", len(final), bucket, key)
-        elif backend == "gcs":
-            gcs_cfg = export_cfg.get("gcs", {}) if isinstance(export_cfg, Mapping) else {}
-            bucket = gcs_cfg.get("bucket") if isinstance(gcs_cfg, Mapping) else None
-            prefix = gcs_cfg.get("prefix") if isinstance(gcs_cfg, Mapping) else None
-            if not bucket:
-                log.warning("GCS backend configured without a bucket; skipping upload")
-                continue
-            key = gcs_exporter.export_to_gcs(final, bucket=bucket, prefix=prefix, object_name=filename)
-            log.info("Uploaded %d records to gs://%s/%s", len(final), bucket, key)
-        else:
-            log.warning("Unknown export backend '%s'; skipping", backend)
+    delta_summary = _report_delta(ctx)
+    llm_usage = llm_ledger.drain(run_id=ctx.run_id)
+    llm_stats: Dict[str, Any] = {}
+    if llm_usage["calls"]:
+        llm_stats = {f"llm_{key}": value for key, value in llm_usage.items()}
+        log.info(
+            "LLM: %d calls, cache hit rate %.1f%%, spent $%.4f, saved $%.4f",
+            llm_usage["calls"],
+            100 * llm_usage["hit_rate"],
+            llm_usage["cost_usd"],
+            llm_usage["saved_usd"],
+            extra={"run_id": ctx.run_id},
+        )
 
     record_run_cost(
         source=ctx.source,
@@ -380,6 +890,7 @@ def export_records(ctx: PipelineContext, final: List[Dict[str, Any]]) -> Path:
         proxy_cost_usd=0.0,
         compute_cost_usd=0.0,
         other_cost_usd=0.0,
+        llm_usage=llm_usage,
     )
 
     run_recorder.finish_run(
@@ -387,25 +898,181 @@ def export_records(ctx: PipelineContext, final: List[Dict[str, Any]]) -> Path:
         source=ctx.source,
         status="success",
         stats={
-            "records": len(final),
+            "records": written,
             "invalid": ctx.invalid_records,
+            **(delta_summary.as_stats() if delta_summary is not None else {}),
+            **llm_stats,
         },
-        metadata={"output_path": str(out_path)},
+        metadata={"output_path": str(exporter.out_path)},
         variant_id=ctx.variant_id,
         started_at=ctx.run_started_at,
     )
-    log.info("Wrote %d records to %s", len(final), out_path)
-    return out_path
+    return exporter.out_path
+
+
+def export_records(ctx: PipelineContext, final: List[Dict[str, Any]]) -> Path:
+    """Persist output artifacts and run bookkeeping."""
+
+    exporter = RecordExporter(ctx)
+    try:
+        exporter.write_many(_tracked(ctx, final))
+    finally:
+        exporter.close()
+    exporter.upload(final)
+    return _finish_export(ctx, exporter)
+
+
+def stream_records(ctx: PipelineContext) -> Path:
+    """Run every stage as a chained generator and export records as they arrive.
+
+    Only a PCID-matching chunk plus the in-flight fleet window is held in
+    memory. If a stage raises, everything exported so far is flushed before
+    the error propagates.
+    """
+
+    listings = fetch_listings(ctx)
+    records = iter_qc(
+        ctx, iter_matched(ctx, iter_normalized(ctx, iter_raw(ctx, iter_details(ctx, listings))))
+    )
+    exporter = RecordExporter(ctx)
+    try:
+        exporter.write_many(_tracked(ctx, records))
+    finally:
+        exporter.close()
+    exporter.upload()
+    return _finish_export(ctx, exporter)
+
+
+def _resolve_streaming(source_config: Mapping[str, Any], requested: Optional[bool]) -> bool:
+    if requested is not None:
+        return requested
+    pipeline_cfg = source_config.get("pipeline", {}) if isinstance(source_config, Mapping) else {}
+    return (
+        bool(pipeline_cfg.get("streaming", False)) if isinstance(pipeline_cfg, Mapping) else False
+    )
+
+
+def _open_checkpoint(
+    source: str,
+    run_id: str,
+    source_config: Mapping[str, Any],
+    *,
+    resume: Optional[str] = None,
+) -> Optional[RunCheckpointStore]:
+    """Open the run's checkpoint store unless ``checkpoint.enabled`` is false."""
+
+    cfg = source_config.get("checkpoint", {}) if isinstance(source_config, Mapping) else {}
+    cfg = cfg if isinstance(cfg, Mapping) else {}
+    if not cfg.get("enabled", True):
+        if resume:
+            log.warning(
+                "Checkpoints are disabled; --resume will re-fetch every page",
+                extra={"run_id": run_id},
+            )
+        return None
+
+    checkpoint = RunCheckpointStore.open(
+        source,
+        run_id,
+        batch_size=int(cfg.get("batch_size", 500)),
+        flush_interval=float(cfg.get("flush_interval_seconds", 5.0)),
+    )
+    if resume:
+        completed = checkpoint.counts()
+        if not completed:
+            log.warning(
+                "No checkpoint found for run; starting from scratch", extra={"run_id": run_id}
+            )
+        else:
+            log.info(
+                "Resuming run from checkpoint", extra={"run_id": run_id, "completed": completed}
+            )
+    else:
+        log.info(
+            "Checkpointing run; restart with --resume %s after a crash",
+            run_id,
+            extra={"run_id": run_id},
+        )
+    return checkpoint
+
+
+def _close_checkpoint(
+    checkpoint: RunCheckpointStore, source_config: Mapping[str, Any], *, succeeded: bool
+) -> None:
+    cfg = source_config.get("checkpoint", {}) if isinstance(source_config, Mapping) else {}
+    keep = bool(cfg.get("keep_completed", False)) if isinstance(cfg, Mapping) else False
+    if succeeded and not keep:
+        checkpoint.delete()
+    else:
+        checkpoint.close()
+
+
+def _open_delta(
+    source: str,
+    run_id: str,
+    run_type: str,
+    source_config: Mapping[str, Any],
+    version_info: Any,
+    *,
+    parallelism: int,
+    root: Optional[Path] = None,
+) -> Optional[DeltaTracker]:
+    """Open the run's delta tracker unless ``delta.enabled`` is false.
+
+    Fingerprints live under ``root`` (default ``delta.root``, else the shared
+    fingerprint directory).
+    """
+
+    cfg = source_config.get("delta", {}) if isinstance(source_config, Mapping) else {}
+    cfg = cfg if isinstance(cfg, Mapping) else {}
+    if not cfg.get("enabled", True):
+        if run_type.upper() == "DELTA":
+            log.warning(
+                "Delta fingerprints are disabled; DELTA run will extract every page",
+                extra={"run_id": run_id},
+            )
+        return None
+
+    # Records are only carried forward between runs of the same scraper/selectors version.
+    generation = "/".join(
+        str(getattr(version_info, attr, None) or "")
+        for attr in ("scraper_version", "schema_version", "selectors_version")
+    )
+    store = FingerprintStore.open(
+        source,
+        generation=generation,
+        root=root or (Path(cfg["root"]) if cfg.get("root") else None),
+        batch_size=int(cfg.get("batch_size", 500)),
+    )
+    return DeltaTracker(store, run_id=run_id, run_type=run_type, parallelism=parallelism)
 
 
 def run_alfabeta(
-    env: Optional[str] = None, variant_id: Optional[str] = None, resource_manager: Optional[ResourceManager] = None
+    env: Optional[str] = None,
+    variant_id: Optional[str] = None,
+    resource_manager: Optional[ResourceManager] = None,
+    sessions: Optional[int] = None,
+    streaming: Optional[bool] = None,
+    resume: Optional[str] = None,
+    run_type: str = "FULL_REFRESH",
+    **_runtime_params: Any,
 ) -> Path:
     """End-to-end pipeline for AlfaBeta.
 
     The flow stitches together config loading, account/proxy routing, session
     management, engine execution, processors, observability, and versioning to
     mirror the v4.9 dependency model.
+
+    ``sessions`` (or ``concurrency.sessions`` in the source config) above one
+    enables concurrent detail-page extraction across a pooled browser fleet.
+    ``streaming`` (or ``pipeline.streaming``) chains the stages as generators
+    and exports records incrementally instead of materializing each stage.
+    ``resume`` continues an earlier ``run_id`` from its checkpoint, skipping
+    listing and detail pages that run already completed.
+    ``run_type="DELTA"`` skips extraction, normalization and PCID matching for
+    product pages whose listing entry is unchanged since the last run and
+    carries their previous record forward. Other runtime parameters passed by
+    ``run_pipeline`` (Jira/Airflow ids) are accepted and ignored.
     """
     source = "alfabeta"
     log.info("Starting AlfaBeta pipeline run")
@@ -417,7 +1084,7 @@ def run_alfabeta(
     active_env = platform_config.get("app", {}).get("environment")
     log.info("Pipeline environment resolved to '%s'", active_env)
 
-    _ = start_run_context()
+    _ = start_run_context(resume)
     run_id = get_current_run_id() or date.today().isoformat()
     log.info("Run context initialized", extra={"run_id": run_id})
     run_started_at = datetime.utcnow()
@@ -440,7 +1107,8 @@ def run_alfabeta(
 
     # 1) ACCOUNT + PROXY
     account_key, username, password = active_resource_manager.account_router.acquire_account(source)
-    proxy = active_resource_manager.proxy_pool.choose_proxy(source) or ""
+    base_host = urlsplit(base_url).hostname
+    proxy = active_resource_manager.proxy_pool.choose_proxy(source, site=base_host) or ""
     account_id = account_key.split(":", 1)[1]
     session_record = create_session_record(source, account_id, proxy)
 
@@ -463,6 +1131,7 @@ def run_alfabeta(
         run_id=run_id,
         version_info=version_info,
         driver=driver,
+        browser_session=browser_session,
         base_url=base_url,
         pcid_index=pcid_index,
         pcid_vector_store=pcid_vector_store,
@@ -473,7 +1142,10 @@ def run_alfabeta(
         variant_id=variant_id,
     )
 
+    checkpoint: Optional[RunCheckpointStore] = None
+    fleet_account_keys: List[str] = []
     try:
+        checkpoint = ctx.checkpoint = _open_checkpoint(source, run_id, source_config, resume=resume)
         ensure_logged_in(
             driver,
             selectors,
@@ -482,13 +1154,28 @@ def run_alfabeta(
             account_password=password,
         )
 
-        listings = fetch_listings(ctx)
-        details = fetch_details(ctx, listings)
-        parsed = parse_raw(ctx, details)
-        normalized = normalize_records(ctx, parsed)
-        matched = match_pcid(ctx, normalized)
-        qc_passed = run_qc(ctx, matched)
-        out_path = export_records(ctx, qc_passed)
+        fleet_size = _resolve_session_count(source, source_config, sessions)
+        ctx.delta = _open_delta(
+            source, run_id, run_type, source_config, version_info, parallelism=fleet_size
+        )
+        if fleet_size > 1:
+            ctx.browser_pool, fleet_account_keys = open_browser_fleet(
+                active_resource_manager, source, base_url, selectors, source_config, fleet_size
+            )
+
+        if _resolve_streaming(source_config, streaming):
+            out_path = stream_records(ctx)
+        else:
+            listings = fetch_listings(ctx)
+            details = fetch_details(ctx, listings)
+            parsed = parse_raw(ctx, details)
+            normalized = normalize_records(ctx, parsed)
+            matched = match_pcid(ctx, normalized)
+            qc_passed = run_qc(ctx, matched)
+            out_path = export_records(ctx, qc_passed)
+        if checkpoint is not None:
+            _close_checkpoint(checkpoint, source_config, succeeded=True)
+            checkpoint = None
         return out_path
     except Exception as exc:
         run_recorder.finish_run(
@@ -501,13 +1188,56 @@ def run_alfabeta(
         )
         raise
     finally:
+        if checkpoint is not None:
+            _close_checkpoint(checkpoint, source_config, succeeded=False)
+        if ctx.delta is not None:
+            ctx.delta.close()
+        if ctx.browser_pool is not None:
+            ctx.browser_pool.close()
+        for fleet_account_key in fleet_account_keys:
+            active_resource_manager.account_router.release_account(fleet_account_key)
         browser_session.quit()
         active_resource_manager.account_router.release_account(account_key)
 
 
-def main():
+def main(argv: Optional[List[str]] = None):
     """CLI entry point."""
-    out_path = run_alfabeta()
+    parser = argparse.ArgumentParser(description="Run the AlfaBeta pipeline")
+    parser.add_argument(
+        "--env", default=None, help="Optional environment overlay (dev/staging/prod)"
+    )
+    parser.add_argument(
+        "--sessions",
+        type=int,
+        default=None,
+        help="Number of browser sessions used for concurrent detail-page extraction",
+    )
+    parser.add_argument(
+        "--streaming",
+        action=argparse.BooleanOptionalAction,
+        default=None,
+        help="Chain stages as generators and export records as they are extracted",
+    )
+    parser.add_argument(
+        "--resume",
+        metavar="RUN_ID",
+        default=None,
+        help="Continue a crashed run from its checkpoint, skipping completed pages",
+    )
+    parser.add_argument(
+        "--run-type",
+        choices=["FULL_REFRESH", "DELTA"],
+        default="FULL_REFRESH",
+        help="DELTA re-extracts only product pages whose listing entry changed since the last run",
+    )
+    args = parser.parse_args(argv)
+    out_path = run_alfabeta(
+        env=args.env,
+        sessions=args.sessions,
+        streaming=args.streaming,
+        resume=args.resume,
+        run_type=args.run_type,
+    )
     log.info("Completed AlfaBeta run. Output: %s", out_path)
 
 
@@ -1,11 +1,13 @@
 from pathlib import Path
-from typing import Dict, List, Optional
+from typing import Any, Dict, List, Optional, Tuple
 
-from bs4 import BeautifulSoup
+import lxml.html
 from selenium.webdriver.remote.webdriver import WebDriver
 from urllib.parse import urljoin
 
 from src.common.logging_utils import get_logger, sanitize_for_log, safe_log
+from src.processors.parse.extraction import Field, compile_plan, parse_document
+from src.run_tracking.fingerprints import dom_fingerprint
 
 log = get_logger("alfabeta-product-index")
 
@@ -21,14 +23,36 @@ def _load_html(driver: WebDriver) -> str:
     return ""
 
 
-def fetch_product_urls(
+def _entry_nodes(links: List[Any]) -> List[Any]:
+    """For each product link, the largest ancestor holding no other product link.
+
+    For table or card layouts this is the product's row/card (name, price and
+    presentation shown on the listing); for flat link lists it is the link.
+    """
+
+    # Keyed by the elements themselves: holding them keeps lxml's proxies (and identities) stable.
+    links_below: Dict[Any, int] = {}
+    for link in links:
+        for parent in link.iterancestors():
+            links_below[parent] = links_below.get(parent, 0) + 1
+
+    entries = []
+    for link in links:
+        node = link
+        for parent in link.iterancestors():
+            if parent.tag in ("body", "html") or links_below[parent] > 1:
+                break
+            node = parent
+        entries.append(node)
+    return entries
+
+
+def _select_products(
     driver: WebDriver,
     company_url: str,
-    selectors: Optional[Dict[str, str]] = None,
-    run_id: Optional[str] = None,
-) -> List[str]:
-    """Fetch list of product URLs for a given company."""
-
+    selectors: Optional[Dict[str, str]],
+    run_id: Optional[str],
+) -> List[Tuple[str, Any]]:
     selectors = selectors or {}
     product_selector = selectors.get("product_link_selector", "a.product-link")
     safe_log(
@@ -40,15 +64,46 @@ def fetch_product_urls(
         ),
     )
 
-    html = _load_html(driver)
-    soup = BeautifulSoup(html, "lxml")
+    tree = parse_document(_load_html(driver))
+    plan = compile_plan({"links": Field(product_selector, many=True)})
     product_links = []
 
-    for a in soup.select(product_selector):
+    for a in plan.matches(tree, "links"):
         href = a.get("href")
         if not href:
             continue
-        product_links.append(urljoin(company_url, href))
+        product_links.append((urljoin(company_url, href), a))
 
     log.info("Found %d product URLs for company", len(product_links))
     return product_links
+
+
+def fetch_product_urls(
+    driver: WebDriver,
+    company_url: str,
+    selectors: Optional[Dict[str, str]] = None,
+    run_id: Optional[str] = None,
+) -> List[str]:
+    """Fetch list of product URLs for a given company."""
+
+    return [url for url, _ in _select_products(driver, company_url, selectors, run_id)]
+
+
+def fetch_product_entries(
+    driver: WebDriver,
+    company_url: str,
+    selectors: Optional[Dict[str, str]] = None,
+    run_id: Optional[str] = None,
+) -> List[Tuple[str, str]]:
+    """Fetch ``(product_url, listing_fingerprint)`` pairs for a given company.
+
+    The fingerprint is the normalized DOM hash of the product's listing entry,
+    used by delta runs to tell which detail pages may have changed.
+    """
+
+    product_links = _select_products(driver, company_url, selectors, run_id)
+    entries = _entry_nodes([link for _, link in product_links])
+    return [
+        (url, dom_fingerprint(lxml.html.tostring(entry, encoding="unicode", with_tail=False)))
+        for (url, _), entry in zip(product_links, entries)
+    ]
@@ -14,6 +14,7 @@ from src.engines import (
     get_engine_type_for_source,
     get_http_engine,
 )
+from src.engines.http_cache import get_http_cache
 
 
 DEFAULT_SOURCE = "template"
@@ -60,7 +61,7 @@ def run_sample_http_pipeline(source_name: str = DEFAULT_SOURCE, url_override: Op
         proxy=None,
     )
 
-    result = send_request(req_cfg, rate_limiter=rate_limiter)
+    result = send_request(req_cfg, rate_limiter=rate_limiter, cache=get_http_cache(source_name))
     return result.text
 
 
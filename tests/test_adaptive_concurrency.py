@@ -0,0 +1,106 @@
+import threading
+import time
+
+import pytest
+
+from src.resource_manager import account_router as account_router_module
+from src.resource_manager.account_router import AccountRouter
+from src.resource_manager.adaptive_concurrency import AdaptiveConcurrency, LimitStore
+from src.resource_manager.rate_limiter import ConcurrencyGate, RateLimiter
+
+
+def _window(controller, latency=0.2, count=None):
+    for _ in range(count or max(controller.concurrency, controller.min_window)):
+        controller.observe(latency)
+
+
+def test_aimd_probes_up_and_cuts_once_per_burst_of_throttles():
+    controller = AdaptiveConcurrency("shop", initial=4, max_limit=10)
+
+    for _ in range(3):
+        _window(controller)
+    assert controller.concurrency == 7
+
+    for _ in range(7):  # every in-flight request comes back 429
+        controller.observe(status_code=429)
+    assert controller.limit == pytest.approx(3.5)  # one cut, the stragglers are ignored
+    controller.observe(0.2)  # the last request issued under the old limit
+    controller.observe(status_code=503)
+    assert controller.limit == pytest.approx(1.75)  # a fresh signal after the old fleet drained
+
+    for _ in range(20):
+        _window(controller)
+    assert controller.limit == 10  # capped at max_limit
+    assert controller.decisions["throttle"] == 8
+
+
+def test_latency_gradient_and_errors_shrink_or_hold_the_limit():
+    controller = AdaptiveConcurrency("shop", initial=8, latency_tolerance=2.0)
+    _window(controller, latency=0.1)  # establishes the no-load baseline
+    assert controller.limit == 9
+
+    _window(controller, latency=0.45)  # 4.5x baseline, tolerance 2x -> scale by 2/4.5
+    assert controller.limit == pytest.approx(9 * 0.5)  # never below one backoff step
+    _window(controller, latency=0.3)
+    assert controller.limit == pytest.approx(4.5 * (2 * controller.baseline / 0.3))
+
+    held = controller.limit
+    for _ in range(controller.min_window):
+        controller.observe(status_code=500)
+    assert controller.limit == held and controller.decisions["errors"] == 1
+
+
+def test_learned_limits_persist_between_runs(tmp_path):
+    store = LimitStore(tmp_path / "limits.json")
+    first = AdaptiveConcurrency("shop", initial=4, store=store, save_interval=0)
+    for _ in range(5):
+        _window(first)
+    first.flush()
+
+    second = AdaptiveConcurrency("shop", initial=4, store=store)
+    other = AdaptiveConcurrency("other", initial=4, store=store)
+    assert second.limit == first.limit == 9
+    assert second.baseline == pytest.approx(0.2)
+    assert other.limit == 4
+
+
+def test_controller_retunes_rate_limiter_and_account_gates(monkeypatch):
+    controller = AdaptiveConcurrency("shop", initial=2, qps_per_slot=1.5)
+    limiter = RateLimiter("shop", max_qps=3, max_concurrent=2)
+    limiter.follow(controller)
+    monkeypatch.setattr(
+        account_router_module, "get_concurrency_controller", lambda source: controller
+    )
+    router = AccountRouter({"accounts": {"shop": {"acc1": ("user", "pw")}}})
+
+    keys = [router.acquire_account("shop")[0] for _ in range(2)]
+    waiter = threading.Thread(target=router.acquire_account, args=("shop",))
+    waiter.start()
+    time.sleep(0.05)
+    assert waiter.is_alive()  # both account slots are taken
+
+    _window(controller)
+    waiter.join(timeout=1)
+    assert not waiter.is_alive()  # the gate grew to 3 slots and let it through
+    assert limiter.max_concurrent == 3
+    assert (limiter.max_qps, limiter.burst) == (pytest.approx(4.5), pytest.approx(4.5))
+
+    for key in keys:
+        router.release_account(key)
+    for _ in range(3):
+        controller.observe(status_code=429)
+    assert limiter.max_concurrent == 1 and limiter._sem.limit == 1
+
+
+def test_concurrency_gate_shrinks_without_revoking_held_slots():
+    gate = ConcurrencyGate(3)
+    assert all(gate.acquire(blocking=False) for _ in range(3))
+    gate.resize(1)
+    gate.release()
+    assert not gate.acquire(blocking=False)  # still 2 held against a limit of 1
+    gate.release()
+    gate.release()
+    assert gate.acquire(timeout=0.01) and gate.held == 1
+    gate.release()
+    with pytest.raises(ValueError):
+        gate.release()
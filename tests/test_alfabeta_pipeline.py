@@ -1,7 +1,10 @@
 import os
 import sys
+from functools import partial
 from pathlib import Path
 
+import pytest
+
 PROJECT_ROOT = Path(__file__).resolve().parents[1]
 if str(PROJECT_ROOT) not in sys.path:
     sys.path.insert(0, str(PROJECT_ROOT))
@@ -9,6 +12,7 @@ if str(PROJECT_ROOT) not in sys.path:
 from src.engines.selenium_engine import FakeDriver
 from src.scrapers.alfabeta.alfabeta_full_impl import extract_product
 from src.scrapers.alfabeta.company_index import fetch_company_urls
+from src.scrapers.alfabeta import pipeline
 from src.scrapers.alfabeta.pipeline import run_alfabeta
 from src.scrapers.alfabeta.product_index import fetch_product_urls
 
@@ -44,12 +48,42 @@ def test_run_alfabeta_end_to_end(monkeypatch, tmp_path):
 
     # Isolate output directory
     monkeypatch.setenv("SCRAPER_PLATFORM_VERSION", "4.9.0-test")
+    fingerprints = tmp_path / "fingerprints"
+    monkeypatch.setattr(pipeline, "_open_delta", partial(pipeline._open_delta, root=fingerprints))
 
     output_path = run_alfabeta()
     assert output_path.exists()
 
     content = output_path.read_text(encoding="utf-8").strip().splitlines()
     assert len(content) >= 2  # header + at least one row
+    assert (fingerprints / "alfabeta.sqlite").exists()
 
     # Clean up after test to keep workspace tidy
     output_path.unlink(missing_ok=True)
+
+
+@pytest.mark.parametrize("failing", ["_prepare_pcid_resources", "ensure_logged_in"])
+def test_run_alfabeta_closes_its_checkpoint_when_setup_fails(monkeypatch, failing):
+    monkeypatch.setenv("SCRAPER_PLATFORM_FAKE_BROWSER", "1")
+    monkeypatch.setenv("ALFABETA_USER_1", "demo")
+    monkeypatch.setenv("ALFABETA_PASS_1", "demo-pass")
+    monkeypatch.setenv("SCRAPER_SECRET_KEY", "cJJS2KEJeyfjovwfsMboxchO5s-uWq-XzXjt6Uh85fU=")
+    opened, closed = [], []
+    monkeypatch.setattr(
+        pipeline, "_open_checkpoint", lambda *args, **kwargs: opened.append(object()) or opened[-1]
+    )
+    monkeypatch.setattr(
+        pipeline,
+        "_close_checkpoint",
+        lambda checkpoint, config, succeeded: closed.append((checkpoint, succeeded)),
+    )
+
+    def _fail(*args, **kwargs):
+        raise RuntimeError("setup failed")
+
+    monkeypatch.setattr(pipeline, failing, _fail)
+
+    with pytest.raises(RuntimeError, match="setup failed"):
+        run_alfabeta()
+
+    assert closed == [(checkpoint, False) for checkpoint in opened]
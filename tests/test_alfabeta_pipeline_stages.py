@@ -1,3 +1,4 @@
+import csv
 import sys
 from datetime import datetime
 from pathlib import Path
@@ -8,7 +9,11 @@ PROJECT_ROOT = Path(__file__).resolve().parents[1]
 if str(PROJECT_ROOT) not in sys.path:
     sys.path.insert(0, str(PROJECT_ROOT))
 
-from src.engines.selenium_engine import FakeDriver
+from src.engines.selenium_engine import BrowserSession, FakeDriver, LoadProfile
+from src.resource_manager.browser_pool import BrowserPool
+from src.resource_manager.rate_limiter import RateLimiter
+from src.run_tracking.checkpoints import RunCheckpointStore
+from src.run_tracking.fingerprints import DeltaTracker, FingerprintStore
 from src.scrapers.alfabeta.pipeline import (
     PipelineContext,
     export_records,
@@ -18,6 +23,7 @@ from src.scrapers.alfabeta.pipeline import (
     normalize_records,
     parse_raw,
     run_qc,
+    stream_records,
 )
 from src.versioning.version_manager import build_version_info
 
@@ -123,3 +129,207 @@ def test_export_records_writes_csv(pipeline_ctx):
     assert out_path.exists()
     content = out_path.read_text(encoding="utf-8").splitlines()
     assert content[0].startswith("product_url,name,price")
+
+
+class _FlakyDriver(FakeDriver):
+    def get(self, url: str):
+        if url.endswith("/broken"):
+            raise RuntimeError("navigation failed")
+        super().get(url)
+
+
+def test_parse_raw_concurrent_preserves_order_and_isolates_errors(pipeline_ctx):
+    pipeline_ctx.browser_pool = BrowserPool(lambda: BrowserSession(_FlakyDriver()), size=3)
+    pipeline_ctx.rate_limiter = RateLimiter("test", max_qps=None, max_concurrent=None)
+    urls = [f"https://example.com/company/acme/product/{idx}" for idx in range(6)]
+    urls.insert(2, "https://example.com/company/acme/product/broken")
+
+    parsed = parse_raw(pipeline_ctx, urls)
+
+    assert [rec["product_url"] for rec in parsed] == [
+        url for url in urls if not url.endswith("/broken")
+    ]
+    assert all(rec["name"] == "Alpha Med" for rec in parsed)
+
+
+def test_fetch_details_concurrent_matches_serial(pipeline_ctx):
+    listings = fetch_listings(pipeline_ctx)
+    serial = fetch_details(pipeline_ctx, listings)
+
+    pipeline_ctx.browser_pool = BrowserPool(lambda: BrowserSession(FakeDriver()), size=2)
+    pipeline_ctx.rate_limiter = RateLimiter("test", max_qps=None, max_concurrent=None)
+    assert fetch_details(pipeline_ctx, listings) == serial
+
+
+def test_serial_pages_wait_for_the_load_profile_ready_selector(pipeline_ctx, monkeypatch):
+    waited = []
+    monkeypatch.setattr(
+        BrowserSession, "_wait_until_ready", lambda self, selector: waited.append(selector) or True
+    )
+    profile = LoadProfile(name="lite", page_load_strategy="eager", ready_selector="h1", wait=0.0)
+    pipeline_ctx.browser_session = BrowserSession(pipeline_ctx.driver, profile=profile)
+
+    listings = fetch_listings(pipeline_ctx)
+    details = fetch_details(pipeline_ctx, listings)
+    parsed = parse_raw(pipeline_ctx, details[:2])
+
+    assert [rec["name"] for rec in parsed] == ["Alpha Med", "Alpha Med"]
+    assert waited == ["h1"] * (1 + len(listings) + 2)
+
+
+def test_stream_records_matches_batch_export(pipeline_ctx, tmp_path):
+    batch_path = export_records(
+        pipeline_ctx,
+        run_qc(
+            pipeline_ctx,
+            match_pcid(
+                pipeline_ctx,
+                normalize_records(
+                    pipeline_ctx,
+                    parse_raw(
+                        pipeline_ctx, fetch_details(pipeline_ctx, fetch_listings(pipeline_ctx))
+                    ),
+                ),
+            ),
+        ),
+    )
+    batch_rows = batch_path.read_text(encoding="utf-8")
+
+    pipeline_ctx.output_dir = tmp_path / "streaming"
+    pipeline_ctx.stream_batch_size = 1
+    stream_path = stream_records(pipeline_ctx)
+    assert stream_path.read_text(encoding="utf-8") == batch_rows
+
+
+def test_stream_records_flushes_partial_output_on_crash(pipeline_ctx, monkeypatch):
+    from src.scrapers.alfabeta import pipeline as pipeline_module
+
+    real_extract = pipeline_module.extract_product
+    calls = {"count": 0}
+
+    def _flaky_extract(driver, url, selectors, run_id):
+        calls["count"] += 1
+        if calls["count"] == 3:
+            raise RuntimeError("browser crashed")
+        return {**real_extract(driver, url, selectors, run_id), "product_url": url}
+
+    monkeypatch.setattr(pipeline_module, "extract_product", _flaky_extract)
+    pipeline_ctx.stream_batch_size = 1
+
+    with pytest.raises(RuntimeError, match="browser crashed"):
+        stream_records(pipeline_ctx)
+
+    out_path = next((pipeline_ctx.output_dir / "alfabeta" / "daily").glob("*.csv"))
+    lines = out_path.read_text(encoding="utf-8").splitlines()
+    assert len(lines) == 3  # header + the two records extracted before the crash
+
+
+class _CountingDriver(FakeDriver):
+    def __init__(self):
+        super().__init__()
+        self.visited = []
+
+    def get(self, url: str):
+        self.visited.append(url)
+        super().get(url)
+
+
+def test_resume_from_checkpoint_skips_completed_pages(pipeline_ctx, monkeypatch, tmp_path):
+    from src.scrapers.alfabeta import pipeline as pipeline_module
+
+    real_extract = pipeline_module.extract_product
+    calls = {"count": 0}
+
+    def _crashing_extract(driver, url, selectors, run_id):
+        calls["count"] += 1
+        if calls["count"] == 4:
+            raise RuntimeError("browser crashed")
+        return real_extract(driver, url, selectors, run_id)
+
+    urls = [f"https://example.com/company/acme/product/{idx}" for idx in range(6)]
+    expected = parse_raw(pipeline_ctx, urls)
+
+    monkeypatch.setattr(pipeline_module, "extract_product", _crashing_extract)
+    pipeline_ctx.checkpoint = RunCheckpointStore.open(
+        "alfabeta", "run-1", root=tmp_path / "checkpoints"
+    )
+    listings = fetch_listings(pipeline_ctx)
+    with pytest.raises(RuntimeError):
+        parse_raw(pipeline_ctx, urls)
+    pipeline_ctx.checkpoint.close()
+
+    monkeypatch.setattr(pipeline_module, "extract_product", real_extract)
+    pipeline_ctx.checkpoint = RunCheckpointStore.open(
+        "alfabeta", "run-1", root=tmp_path / "checkpoints"
+    )
+    pipeline_ctx.driver = _CountingDriver()
+
+    assert fetch_listings(pipeline_ctx) == listings
+    assert parse_raw(pipeline_ctx, urls) == expected
+    # Only the crashed page and the pages after it are fetched again.
+    assert pipeline_ctx.driver.visited == urls[3:]
+
+
+class _SiteDriver(_CountingDriver):
+    def __init__(self, pages):
+        super().__init__()
+        self.pages = pages
+
+    @property
+    def page_source(self):
+        return self.pages.get(self.current_url, "")
+
+
+def _catalog(prices):
+    rows = "".join(
+        f'<tr><td><a class="product-link" href="/p/{name}">{name}</a></td><td>{price}</td></tr>'
+        for name, price in prices.items()
+    )
+    pages = {
+        "https://example.com/companies": '<a class="company-link" href="/c/acme">Acme</a>',
+        "https://example.com/c/acme": f"<table>{rows}</table>",
+    }
+    for name, price in prices.items():
+        pages[f"https://example.com/p/{name}"] = (
+            f'<h1 class="product-name">{name}</h1><div class="lab-name">Acme</div>'
+            f'<div class="price">{price}</div>'
+        )
+    return pages
+
+
+def test_delta_run_only_extracts_changed_pages(pipeline_ctx, tmp_path, monkeypatch):
+    from src.scrapers.alfabeta import pipeline as pipeline_module
+
+    finished = {}
+    monkeypatch.setattr(
+        pipeline_module.run_recorder,
+        "finish_run",
+        lambda run_id, **kwargs: finished.update(kwargs["stats"]),
+    )
+
+    def _run(run_id, run_type, prices):
+        pipeline_ctx.run_id = run_id
+        pipeline_ctx.output_dir = tmp_path / run_id
+        pipeline_ctx.driver = _SiteDriver(_catalog(prices))
+        pipeline_ctx.delta = DeltaTracker(
+            FingerprintStore.open("alfabeta", generation="v1", root=tmp_path / "fp"),
+            run_id=run_id,
+            run_type=run_type,
+        )
+        out_path = stream_records(pipeline_ctx)
+        pipeline_ctx.delta.close()
+        with out_path.open(newline="", encoding="utf-8") as handle:
+            return {row["name"]: row for row in csv.DictReader(handle)}, pipeline_ctx.driver.visited
+
+    prices = {f"prod{idx}": f"{10 + idx}.0" for idx in range(5)}
+    full_rows, _ = _run("run-1", "FULL_REFRESH", prices)
+    assert finished["change_ratio"] == 1.0 and finished["pages_skipped"] == 0
+
+    delta_rows, visited = _run("run-2", "DELTA", {**prices, "prod3": "99.0"})
+
+    assert [url for url in visited if "/p/" in url] == ["https://example.com/p/prod3"]
+    assert delta_rows["prod3"]["price"] == "99.0"
+    assert delta_rows["prod1"]["price"] == full_rows["prod1"]["price"]
+    assert {row["run_id"] for row in delta_rows.values()} == {"run-2"}
+    assert (finished["pages_skipped"], finished["pages_extracted"]) == (4, 1)
+    assert finished["change_ratio"] == 0.2
@@ -0,0 +1,170 @@
+import asyncio
+
+import httpx
+from aiohttp import web
+
+from src.engines import AsyncHttpEngine, EngineConfig, EngineError, RateLimitError, create_engine
+
+
+def _config(**overrides):
+    return EngineConfig(
+        **{"max_retries": 2, "retry_backoff": 0.0, "retry_jitter": 0.0, **overrides}
+    )
+
+
+class _RecordingPool:
+    def __init__(self, proxies):
+        self.proxies = list(proxies)
+        self.events = []
+
+    def choose_proxy(self, source, site=None):
+        proxy = self.proxies.pop(0)
+        self.proxies.append(proxy)
+        return proxy
+
+    def mark_success(self, source, proxy, latency=None, site=None):
+        self.events.append(("ok", source, proxy))
+
+    def mark_failure(self, source, proxy, ban=False):
+        self.events.append(("fail", source, proxy))
+
+
+async def _collect(engine, urls, **kwargs):
+    results = [outcome async for outcome in engine.fetch_many(urls, **kwargs)]
+    await engine.aclose()
+    return results
+
+
+def test_fetch_many_streams_results_within_per_host_limit():
+    in_flight = {"now": 0, "peak": 0}
+
+    async def handler(request):
+        in_flight["now"] += 1
+        in_flight["peak"] = max(in_flight["peak"], in_flight["now"])
+        await asyncio.sleep(0.01)
+        in_flight["now"] -= 1
+        return httpx.Response(200, text=request.url.path)
+
+    engine = AsyncHttpEngine(
+        _config(), max_connections_per_host=3, transport=httpx.MockTransport(handler)
+    )
+    urls = (f"http://shop.test/p/{idx}" for idx in range(20))
+    results = asyncio.run(_collect(engine, urls, concurrency=8))
+
+    assert sorted(result.content for result in results) == sorted(f"/p/{idx}" for idx in range(20))
+    assert in_flight["peak"] == 3
+
+
+def test_aiohttp_backend_shares_pool_with_per_host_limit():
+    state = {"now": 0, "peak": 0, "calls": 0}
+
+    async def page(request):
+        state["calls"] += 1
+        if request.match_info["n"] == "0" and state["calls"] == 1:
+            return web.Response(status=429)
+        state["now"] += 1
+        state["peak"] = max(state["peak"], state["now"])
+        await asyncio.sleep(0.01)
+        state["now"] -= 1
+        return web.Response(text=request.match_info["n"])
+
+    async def scenario():
+        app = web.Application()
+        app.router.add_get("/p/{n}", page)
+        runner = web.AppRunner(app, access_log=None)
+        await runner.setup()
+        site = web.TCPSite(runner, "127.0.0.1", 0)
+        await site.start()
+        port = runner.addresses[0][1]
+        try:
+            engine = AsyncHttpEngine(_config(), max_connections_per_host=2)
+            assert engine.backend == "aiohttp"
+            return await _collect(engine, [f"http://127.0.0.1:{port}/p/{idx}" for idx in range(10)])
+        finally:
+            await runner.cleanup()
+
+    results = asyncio.run(scenario())
+
+    assert sorted(result.content for result in results) == [str(idx) for idx in range(10)]
+    assert all(result.metadata["backend"] == "aiohttp" for result in results)
+    assert state["peak"] == 2
+    assert state["calls"] == 11
+
+
+def test_retries_rate_limits_and_transport_errors_but_not_server_errors():
+    calls = {}
+
+    def handler(request):
+        path = request.url.path
+        calls[path] = calls.get(path, 0) + 1
+        if path == "/throttled" and calls[path] == 1:
+            return httpx.Response(429)
+        if path == "/flaky" and calls[path] == 1:
+            raise httpx.ConnectError("connection refused", request=request)
+        if path == "/broken":
+            return httpx.Response(503)
+        return httpx.Response(200, text="ok")
+
+    engine = AsyncHttpEngine(_config(), transport=httpx.MockTransport(handler))
+    urls = ["http://site.test/throttled", "http://site.test/flaky", "http://site.test/broken"]
+    outcomes = engine.fetch_all(urls)
+    engine.cleanup()
+
+    assert [getattr(outcome, "content", None) for outcome in outcomes[:2]] == ["ok", "ok"]
+    assert isinstance(outcomes[2], EngineError) and outcomes[2].retries_exhausted
+    assert outcomes[2].url == "http://site.test/broken"
+    assert calls == {"/throttled": 2, "/flaky": 2, "/broken": 1}
+    assert engine.is_closed()
+
+
+def test_single_fetch_keeps_base_engine_contract():
+    engine = AsyncHttpEngine(
+        _config(), transport=httpx.MockTransport(lambda request: httpx.Response(429))
+    )
+    try:
+        engine.fetch("http://site.test/")
+    except RateLimitError as exc:
+        assert exc.status_code == 429
+    else:  # pragma: no cover
+        raise AssertionError("429 should raise RateLimitError")
+    finally:
+        engine.cleanup()
+
+
+def test_proxy_pool_rotation_reports_outcomes():
+    def handler(request):
+        return httpx.Response(500 if request.url.path == "/bad" else 200)
+
+    pool = _RecordingPool(["http://p1:8080", "http://p2:8080"])
+    engine = AsyncHttpEngine(
+        _config(max_retries=0),
+        source="alfabeta",
+        proxy_pool=pool,
+        transport=httpx.MockTransport(handler),
+    )
+    outcomes = engine.fetch_all(["http://site.test/good", "http://site.test/bad"], concurrency=1)
+    engine.cleanup()
+
+    assert outcomes[0].metadata["proxy"] == "http://p1:8080"
+    assert pool.events == [
+        ("ok", "alfabeta", "http://p1:8080"),
+        ("fail", "alfabeta", "http://p2:8080"),
+    ]
+
+
+def test_factory_builds_async_http_engine():
+    engine = create_engine(
+        "async_http",
+        {
+            "source": "alfabeta",
+            "engine": {"max_connections": 32, "max_connections_per_host": 4, "http2": False},
+        },
+    )
+    try:
+        assert isinstance(engine, AsyncHttpEngine)
+        assert engine.max_connections == 32
+        assert engine.max_connections_per_host == 4
+        assert engine.limiter is not None and engine.limiter.key == "alfabeta"
+        assert engine.proxy_pool is None
+    finally:
+        engine.cleanup()
@@ -0,0 +1,183 @@
+import threading
+import time
+
+import pytest
+
+from src.engines.selenium_engine import LOAD_PROFILES, BrowserSession, FakeDriver
+from src.observability import metrics
+from src.resource_manager.browser_pool import BrowserPool, DriverPool
+
+
+class _Driver(FakeDriver):
+    def __init__(self, proxy=None, profile=None):
+        super().__init__()
+        self.proxy = proxy
+        self.profile = profile
+        self.alive = True
+        self.quit_called = False
+
+    @property
+    def current_url(self):
+        if not self.alive:
+            raise ConnectionRefusedError("chrome is gone")
+        return self._url
+
+    @current_url.setter
+    def current_url(self, value):
+        self._url = value
+
+    def quit(self):
+        self.quit_called = True
+
+
+class _Factory:
+    def __init__(self, delay=0.0):
+        self.delay = delay
+        self.created = []
+        self.lock = threading.Lock()
+
+    def __call__(self, proxy, profile):
+        time.sleep(self.delay)
+        driver = _Driver(proxy, profile)
+        with self.lock:
+            self.created.append(driver)
+        return driver
+
+
+@pytest.fixture()
+def factory():
+    return _Factory()
+
+
+@pytest.fixture()
+def make_pool(factory):
+    pools = []
+
+    def _make(**kwargs):
+        kwargs.setdefault("maintenance_interval", 60)
+        pool = DriverPool(factory, **kwargs)
+        pools.append(pool)
+        return pool
+
+    yield _make
+    for pool in pools:
+        pool.close()
+
+
+def test_drivers_are_reused_per_key_and_reset_between_leases(factory, make_pool):
+    pool = make_pool(max_size=4, name="reuse")
+
+    first = pool.checkout("10.0.0.1:8080", "lite")
+    first.add_cookie({"name": "sid", "value": "a"})
+    pool.release(first)
+    again = pool.checkout("10.0.0.1:8080", "lite")
+    other = pool.checkout("10.0.0.2:8080", "lite")
+
+    assert again is first and again.get_cookies() == [] and again.current_url == "about:blank"
+    assert other is not first and (other.proxy, other.profile) == ("10.0.0.2:8080", "lite")
+    stats = pool.stats()
+    assert (stats["acquires"], stats["hits"], stats["misses"], stats["leased"]) == (3, 1, 2, 2)
+    assert stats["hit_rate"] == pytest.approx(1 / 3)
+    assert any(sample.name == "driver_pool_hits" and sample.labels == {"pool": "reuse"}
+               for sample in metrics.dump_metrics()["counters"])
+
+
+def test_dead_and_worn_out_drivers_are_recycled(factory, make_pool):
+    memory = {}
+    pool = make_pool(
+        max_pages=3,
+        max_rss_mb=500,
+        rss_check_every=1,
+        rss_probe=lambda driver: memory.get(driver, 100),
+    )
+
+    dead = pool.checkout()
+    pool.release(dead)
+    dead.alive = False
+    fresh = pool.checkout()
+    assert fresh is not dead and dead.quit_called
+
+    assert [pool.note_page(fresh) for _ in range(3)] == [False, False, True]
+    pool.release(fresh)
+    bloated = pool.checkout()
+    assert bloated is not fresh and fresh.quit_called
+    memory[bloated] = 900
+    assert pool.note_page(bloated) is True
+    pool.release(bloated)
+
+    assert pool.stats()["recycled"] == {"dead": 1, "pages": 1, "rss": 1}
+    assert len(factory.created) == 3
+
+
+def test_prewarm_runs_in_background_and_capacity_is_shared():
+    slow = _Factory(delay=0.2)
+    pool = DriverPool(slow, max_size=1, maintenance_interval=60)
+    try:
+        started = time.monotonic()
+        pool.prewarm("10.0.0.1:8080", "lite", 1)
+        assert time.monotonic() - started < 0.1
+
+        # Waits for the in-flight driver, no second launch.
+        warm = pool.checkout("10.0.0.1:8080", "lite")
+        assert len(slow.created) == 1 and pool.stats()["misses"] == 0
+        with pytest.raises(TimeoutError):
+            pool.checkout("10.0.0.2:8080", "lite", timeout=0.05)
+
+        pool.release(warm)
+        other = pool.checkout("10.0.0.2:8080", "lite")  # evicts the idle driver of the other key
+        assert warm.quit_called and other.proxy == "10.0.0.2:8080"
+        assert pool.stats()["recycled"] == {"evicted": 1}
+    finally:
+        pool.close()
+
+
+def test_idle_drivers_are_evicted_beyond_the_standing_target(factory, make_pool):
+    pool = make_pool(idle_seconds=30)
+    pool.prewarm(None, "full", 1, keep=True)
+    extra = [pool.checkout(None, "lite") for _ in range(2)]
+    for driver in extra:
+        pool.release(driver)
+    deadline = time.monotonic() + 2
+    while pool.stats()["idle"] < 3 and time.monotonic() < deadline:
+        time.sleep(0.01)
+
+    assert pool.evict_idle(now=time.monotonic() + 31) == 2
+    assert pool.stats()["idle"] == 1  # the standing "full" driver stays warm
+    assert all(driver.quit_called for driver in extra)
+
+
+def test_browser_session_leases_failover_and_recycled_drivers_from_the_pool(factory, make_pool):
+    pool = make_pool(max_pages=2)
+    profile = LOAD_PROFILES["lite"]
+    driver = pool.checkout("10.0.0.1:8080", profile)
+    session = BrowserSession(driver, proxy="10.0.0.1:8080", profile=profile, pool=pool)
+
+    first = session.driver
+    session.load("https://shop.test/a")
+    session.load("https://shop.test/b")
+    assert session.driver is first  # recycling waits for the next page
+    session.load("https://shop.test/c")
+    assert session.driver is not first and first.quit_called
+    assert session.driver.current_url == "https://shop.test/c"
+
+    session._recreate_driver(proxy=None)  # proxy failover
+    assert session.driver.proxy is None and pool.stats()["idle"] == 1
+
+    direct = session.driver
+    session.quit()
+    assert not direct.quit_called and pool.stats()["idle"] == 2
+
+
+def test_browser_pool_quits_opened_members_when_a_later_one_fails():
+    opened = []
+
+    def factory():
+        if len(opened) == 2:
+            raise RuntimeError("login failed")
+        opened.append(_Driver())
+        return opened[-1]
+
+    with pytest.raises(RuntimeError):
+        BrowserPool(factory, size=3)
+
+    assert [driver.quit_called for driver in opened] == [True, True]
@@ -116,7 +116,7 @@ def test_execution_engine_honors_dependencies_and_runs_ready_steps_in_parallel()
     assert results == {"step_a": "A", "step_b": "B", "step_c": "C"}
 
 
-def test_side_effecting_steps_run_deterministically():
+def test_dependent_side_effecting_steps_run_in_order():
     registry = ComponentRegistry()
     export_one_finished = threading.Event()
 
@@ -151,7 +151,7 @@ def test_side_effecting_steps_run_deterministically():
                 id="export_two",
                 component=registry.get("export_two"),
                 params={},
-                depends_on=[],
+                depends_on=["export_one"],
                 step_type="export",
             ),
         ],
@@ -165,5 +165,192 @@ def test_side_effecting_steps_run_deterministically():
     assert results == {"export_one": "first", "export_two": "second"}
 
 
+def test_independent_side_effect_chains_run_concurrently():
+    registry = ComponentRegistry()
+    barrier = threading.Barrier(2, timeout=2)
+
+    def export_left():
+        barrier.wait()
+        return "left"
+
+    def export_right():
+        barrier.wait()
+        return "right"
+
+    current_module = sys.modules[__name__]
+    setattr(current_module, "export_left", export_left)
+    setattr(current_module, "export_right", export_right)
+    registry.register("export_left", __name__, "export_left", type="export")
+    registry.register("export_right", __name__, "export_right", type="export")
+
+    pipeline = CompiledPipeline(
+        name="exports",
+        description="",
+        steps=[
+            CompiledStep(
+                id=name, component=registry.get(name), params={}, depends_on=[], step_type="export"
+            )
+            for name in ("export_left", "export_right")
+        ],
+        variants=[],
+    )
+
+    # Both exports must be in flight at once for the barrier to release.
+    results = ExecutionEngine(registry).execute(pipeline)
+    assert results == {"export_left": "left", "export_right": "right"}
+
+
+def test_executor_hints_route_steps_to_process_and_asyncio():
+    import asyncio
+    import os
+
+    registry = ComponentRegistry()
+
+    async def async_step():
+        await asyncio.sleep(0)
+        return "async"
+
+    setattr(sys.modules[__name__], "async_step", async_step)
+    registry.register("pid", "os", "getpid")
+    registry.register("async_step", __name__, "async_step")
+
+    pipeline = CompiledPipeline(
+        name="executors",
+        description="",
+        steps=[
+            CompiledStep(
+                id="pid",
+                component=registry.get("pid"),
+                params={},
+                depends_on=[],
+                step_type="cpu",
+                executor="process",
+            ),
+            CompiledStep(
+                id="async_step",
+                component=registry.get("async_step"),
+                params={},
+                depends_on=["pid"],
+                step_type="io",
+            ),
+        ],
+        variants=[],
+    )
+
+    results = ExecutionEngine(registry).execute(pipeline)
+    assert results["pid"] != os.getpid()
+    assert results["async_step"] == "async"
+
+
+def test_execution_engine_rejects_cycles_and_unknown_executors():
+    registry = ComponentRegistry()
+    registry.register("pid", "os", "getpid")
+    component = registry.get("pid")
+
+    cyclic = CompiledPipeline(
+        name="cyclic",
+        description="",
+        steps=[
+            CompiledStep(id="a", component=component, params={}, depends_on=["b"], step_type="x"),
+            CompiledStep(id="b", component=component, params={}, depends_on=["a"], step_type="x"),
+        ],
+        variants=[],
+    )
+    with pytest.raises(RuntimeError, match="stuck"):
+        ExecutionEngine(registry).execute(cyclic)
+
+    bad = CompiledPipeline(
+        name="bad",
+        description="",
+        steps=[
+            CompiledStep(
+                id="a", component=component, params={}, depends_on=[], step_type="x", executor="gpu"
+            )
+        ],
+        variants=[],
+    )
+    with pytest.raises(ValueError, match="unknown executor"):
+        ExecutionEngine(registry).execute(bad)
+
+
+def test_parallel_step_shards_input_and_preserves_order():
+    from src.processors.qc import run_qc_batch
+
+    registry = ComponentRegistry()
+    registry.register("unify", "src.processors.unify_fields", "unify_record", type="normalize")
+    registry.register("qc_batch", "src.processors.qc", "run_qc_batch", type="qc")
+
+    records = [
+        {"product_url": f"https://example.com/p/{idx}", "name": f"Item {idx}", "price": idx + 1.0}
+        for idx in range(23)
+    ]
+    pipeline = CompiledPipeline(
+        name="parallel-map",
+        description="",
+        steps=[
+            CompiledStep(
+                id="unify",
+                component=registry.get("unify"),
+                params={"raw": None},
+                depends_on=[],
+                step_type="normalize",
+                parallel={
+                    "mode": "process",
+                    "chunk_size": 5,
+                    "workers": 2,
+                    "input": "raw",
+                    "apply": "each",
+                },
+            ),
+            CompiledStep(
+                id="qc",
+                component=registry.get("qc_batch"),
+                params={"records": records},
+                depends_on=[],
+                step_type="qc",
+                parallel={"mode": "thread", "chunk_size": 4, "workers": 3},
+            ),
+        ],
+        variants=[],
+    )
+    pipeline.steps[0].params["raw"] = records
+
+    results = ExecutionEngine(registry).execute(pipeline)
+
+    urls = [rec["product_url"] for rec in records]
+    assert [rec["product_url"] for rec in results["unify"]] == urls
+    passed, failed, per_record = results["qc"]
+    serial_passed, serial_failed, serial_results = run_qc_batch(records)
+    assert (passed, failed) == (serial_passed, serial_failed)
+    assert len(per_record) == len(serial_results) == len(records)
+
+
+def test_pipeline_compiler_accepts_parallel_options(tmp_path):
+    registry = ComponentRegistry.from_yaml(DSL_ROOT / "components.yaml")
+    pipeline_path = tmp_path / "parallel.yaml"
+    pipeline_path.write_text(
+        """
+pipeline:
+  name: parallel
+  steps:
+    - id: detail
+      component: alfabeta.product_detail
+      executor: thread
+      parallel: {mode: process, chunk_size: 1000, workers: 4}
+""",
+        encoding="utf-8",
+    )
+    step = PipelineCompiler(registry).compile_from_file(pipeline_path).steps[0]
+    assert step.executor == "thread"
+    assert step.parallel == {"mode": "process", "chunk_size": 1000, "workers": 4}
+
+    pipeline_path.write_text(
+        pipeline_path.read_text(encoding="utf-8").replace("mode: process", "mode: gpu"),
+        encoding="utf-8",
+    )
+    with pytest.raises(ValueError, match="Invalid DSL pipeline"):
+        PipelineCompiler(registry).compile_from_file(pipeline_path)
+
+
 if __name__ == "__main__":  # pragma: no cover
     pytest.main([__file__])
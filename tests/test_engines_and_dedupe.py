@@ -40,7 +40,7 @@ class _FlakyDriver:
 def test_selenium_navigate_retries_and_proxy_failover(monkeypatch):
     created = []
 
-    def _fake_create_driver(proxy=None):
+    def _fake_create_driver(proxy=None, profile=None):
         created.append(proxy)
         # Fail only while a proxy is provided; succeed once fallback happens.
         return _FlakyDriver(fail_times=1 if proxy else 0)
@@ -0,0 +1,69 @@
+import pickle
+from pathlib import Path
+
+from bs4 import BeautifulSoup
+
+from src.processors.parse.extraction import (
+    Field,
+    compile_plan,
+    extract_many,
+    parse_document,
+    plan_from_selectors,
+)
+from src.scrapers.alfabeta.alfabeta_full_impl import PRODUCT_FIELDS
+
+SAMPLES = Path(__file__).resolve().parents[1] / "src" / "scrapers" / "alfabeta" / "samples"
+
+
+def test_plan_matches_beautifulsoup_text_on_samples():
+    html = (SAMPLES / "details_sample.html").read_text(encoding="utf-8")
+    soup = BeautifulSoup(html, "lxml")
+    expected = {
+        name: soup.select_one(field.selector).get_text(strip=True)
+        for name, field in PRODUCT_FIELDS.items()
+    }
+
+    assert compile_plan(PRODUCT_FIELDS).extract(html) == expected
+    noisy = '<div class="price"> ARS <b>1</b><script>x=1</script><!-- c --> 2 </div>'
+    bs4_price = BeautifulSoup(noisy, "lxml").select_one("div.price").get_text(strip=True)
+    assert compile_plan({"price": "div.price"}).extract(noisy) == {"price": bs4_price}
+
+
+def test_selector_overrides_many_and_attr_fields():
+    html = (SAMPLES / "product_list_sample.html").read_text(encoding="utf-8")
+    plan = compile_plan(
+        {
+            "links": Field("a.product-link", attr="href", many=True),
+            "first": Field("a.missing", key="first_selector"),
+            "absent": "span.nothing",
+        },
+        {"first_selector": "div.products a"},
+    )
+
+    assert plan.extract(html) == {
+        "links": ["/company/acme-pharma/product/alpha", "/company/acme-pharma/product/beta"],
+        "first": "Alpha Med",
+        "absent": None,
+    }
+    # ``key`` is not part of the plan.
+    assert compile_plan({"a": Field("h1", key="x")}) is compile_plan({"a": "h1"})
+    plan = plan_from_selectors({"name_selector": "h1", "timeout": 5})
+    assert plan.extract("<h1>N</h1>") == {"name": "N"}
+
+
+def test_empty_and_unparseable_documents_yield_empty_fields():
+    plan = compile_plan({"name": "h1", "links": Field("a", many=True)})
+    for html in ("", "   ", "<!-- only a comment -->"):
+        assert plan.extract(html) == {"name": None, "links": []}
+    assert parse_document('<?xml version="1.0" encoding="utf-8"?><p>x</p>') is not None
+
+
+def test_extract_many_in_a_process_pool_keeps_page_order():
+    plan = compile_plan(PRODUCT_FIELDS)
+    assert pickle.loads(pickle.dumps(plan)) is plan  # recompiled through the cache
+
+    pages = [f'<h1 class="product-name">P{i}</h1><div class="price">{i}</div>' for i in range(40)]
+    records = extract_many(plan, pages, workers=2, chunksize=8)
+    assert [(record["name"], record["price"], record["lab"]) for record in records] == [
+        (f"P{i}", str(i), None) for i in range(40)
+    ]
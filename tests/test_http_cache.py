@@ -0,0 +1,181 @@
+import random
+import string
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from src.agents import http_agent
+from src.agents.base import AgentContext
+from src.agents.db_export_agent import DbExportAgent
+from src.agents.html_parse_agent import HtmlParseAgent
+from src.engines import EngineConfig
+from src.engines import http_cache as http_cache_module
+from src.engines.http_cache import HttpCache, get_http_cache
+from src.engines.http_client import HttpRequestConfig, send_request
+from src.engines.http_engine import HttpEngine
+from src.observability import metrics
+
+
+class _Site:
+    """Pages keyed by path; ``etag=False`` pages never send validators."""
+
+    def __init__(self):
+        self.pages = {"/tagged": ("<p>v1</p>", True), "/plain": ("<p>plain</p>", False)}
+        self.requests = []
+
+
+@pytest.fixture()
+def site():
+    state = _Site()
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self):  # noqa: N802
+            body, tagged = state.pages.get(self.path, ("<p>missing</p>", True))
+            state.requests.append((self.path, self.headers.get("If-None-Match")))
+            etag = f'"{hash(body) & 0xFFFF:x}"'
+            if tagged and self.headers.get("If-None-Match") == etag:
+                self.send_response(304)
+                self.end_headers()
+                return
+            payload = body.encode("utf-8")
+            self.send_response(200 if self.path in state.pages else 404)
+            self.send_header("Content-Type", "text/html; charset=utf-8")
+            self.send_header("Content-Length", str(len(payload)))
+            if tagged:
+                self.send_header("ETag", etag)
+            self.end_headers()
+            self.wfile.write(payload)
+
+        def log_message(self, *_args):
+            return None
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    state.base = f"http://127.0.0.1:{server.server_address[1]}"
+    yield state
+    server.shutdown()
+
+
+def _counter(name, source):
+    return sum(
+        sample.value
+        for sample in metrics.dump_metrics()["counters"]
+        if sample.name == name and sample.labels.get("source") == source
+    )
+
+
+def test_send_request_revalidates_with_etag(site, tmp_path):
+    cache = HttpCache(tmp_path / "c.sqlite", source="etag-src")
+    cfg = HttpRequestConfig(url=f"{site.base}/tagged", max_retries=0)
+
+    first = send_request(cfg, cache=cache)
+    second = send_request(cfg, cache=cache)
+
+    assert (first.cache_status, first.not_modified) == ("miss", False)
+    assert (second.cache_status, second.not_modified) == ("revalidated", True)
+    assert second.text == first.text == "<p>v1</p>"
+    assert site.requests[1][1] is not None  # If-None-Match was sent
+    assert _counter("http_cache_bytes_saved", "etag-src") == len("<p>v1</p>")
+
+    site.pages["/tagged"] = ("<p>v2</p>", True)
+    third = send_request(cfg, cache=cache)
+    assert (third.cache_status, third.text) == ("miss", "<p>v2</p>")
+
+
+def test_send_request_caches_only_200_responses(site, tmp_path):
+    cache = HttpCache(tmp_path / "c.sqlite", source="status-src")
+    cfg = HttpRequestConfig(url=f"{site.base}/gone", max_retries=0, allowed_statuses=(200, 404))
+
+    first = send_request(cfg, cache=cache)
+    second = send_request(cfg, cache=cache)
+
+    assert (first.status_code, first.cache_status, second.cache_status) == (404, None, None)
+    assert len(cache) == 0
+    assert site.requests[1] == ("/gone", None)  # nothing to revalidate
+
+
+def test_http_engine_flags_identical_bodies_and_serves_fresh_entries(site, tmp_path):
+    cache = HttpCache(tmp_path / "c.sqlite", source="plain-src")
+    with HttpEngine(EngineConfig(), cache=cache) as engine:
+        first = engine.fetch(f"{site.base}/plain")
+        second = engine.fetch(f"{site.base}/plain")
+        site.pages["/plain"] = ("<p>changed</p>", False)
+        third = engine.fetch(f"{site.base}/plain")
+
+    assert first.metadata["cache"] == "miss" and not first.metadata["not_modified"]
+    assert second.metadata["cache"] == "unchanged" and second.metadata["not_modified"]
+    assert third.metadata["cache"] == "miss" and third.content == "<p>changed</p>"
+    assert _counter("http_cache_hits", "plain-src") == 1
+    assert _counter("http_cache_misses", "plain-src") == 2
+
+    fresh_cache = HttpCache(tmp_path / "fresh.sqlite", source="fresh-src", ttl_seconds=3600)
+    with HttpEngine(EngineConfig(), cache=fresh_cache) as engine:
+        engine.fetch(f"{site.base}/plain")
+        served = engine.fetch(f"{site.base}/plain")
+    assert served.metadata["cache"] == "fresh"
+    assert served.content == "<p>changed</p>"
+    assert len(site.requests) == 4  # the fresh hit made no request
+
+
+def test_agents_skip_parsing_and_export_of_unchanged_pages(site, tmp_path, monkeypatch):
+    cache = HttpCache(tmp_path / "c.sqlite", source="agent-src")
+    monkeypatch.setattr(http_agent, "get_http_cache", lambda source: cache)
+
+    def run():
+        context = AgentContext(
+            {"url": f"{site.base}/tagged"},
+            metadata={"source_config": {"source": "agent-src"}, "table": "products"},
+        )
+        for agent in (http_agent.HttpFetchAgent(), HtmlParseAgent()):
+            context = agent.run(context)
+        return context
+
+    first, second = run(), run()
+
+    assert "parsed_html" in first and not first.page_unchanged()
+    assert second.page_unchanged() and "parsed_html" not in second
+    assert second.metadata["page"] == {"skipped": "not_modified"}
+    assert DbExportAgent().run(second).metadata["db_export"] == {"rows": 0}
+
+
+def test_lru_eviction_keeps_recently_used_entries(tmp_path):
+    rng = random.Random(7)
+    pages = {
+        f"http://x.test/{idx}": "".join(rng.choices(string.ascii_letters, k=2_000))
+        for idx in range(3)
+    }
+    cache = HttpCache(tmp_path / "c.sqlite", source="lru-src")
+    for url, body in list(pages.items())[:2]:
+        cache.store(url, 200, {}, body)
+    # The eviction target (90% of max_bytes) fits two entries, not three.
+    cache.max_bytes = int(cache.total_bytes / 0.85)
+    assert cache.lookup("http://x.test/0") is not None  # 0 is now the most recently used
+
+    cache.store("http://x.test/2", 200, {}, pages["http://x.test/2"])
+
+    assert cache.total_bytes <= cache.max_bytes
+    assert cache.lookup("http://x.test/1") is None
+    assert cache.lookup("http://x.test/0").text == pages["http://x.test/0"]
+    assert _counter("http_cache_evictions", "lru-src") == 1
+
+    reopened = HttpCache(tmp_path / "c.sqlite", source="lru-src")
+    assert reopened.total_bytes == cache.total_bytes
+    assert len(reopened) == 2
+
+
+def test_get_http_cache_follows_source_policy(tmp_path, monkeypatch):
+    policies = {
+        "on": {"enabled": True, "ttl_seconds": 60, "max_bytes": 1024},
+        "off": {"enabled": False},
+    }
+    monkeypatch.setattr(
+        http_cache_module, "get_http_cache_settings", lambda source: policies[source]
+    )
+    monkeypatch.setattr(http_cache_module, "_default_caches", {})
+
+    cache = get_http_cache("on", root=tmp_path)
+    assert cache is get_http_cache("on", root=tmp_path)
+    assert (cache.ttl_seconds, cache.max_bytes, cache.path) == (60.0, 1024, tmp_path / "on.sqlite")
+    assert get_http_cache("off", root=tmp_path) is None
@@ -0,0 +1,175 @@
+import json
+import re
+import threading
+from types import SimpleNamespace
+
+import pytest
+
+from src.processors.llm.llm_batch import LLMBatcher, ProviderLimits, get_llm_batcher
+from src.processors.llm.llm_cache import LLMCache
+from src.processors.llm.llm_client import LLMClient, get_llm_client_from_config
+from src.processors.qc import llm_qc
+
+
+class _Throttled(Exception):
+    status_code = 429
+    response = SimpleNamespace(status_code=429, headers={"retry-after": "0.01"})
+
+
+class _PackedCompletions:
+    """Answers packed prompts item by item; can skip ids and throttle the first calls."""
+
+    def __init__(self, answer, skip=(), throttle=0):
+        self.answer = answer
+        self.skip = set(skip)
+        self.throttle = throttle
+        self.prompts = []
+        self._lock = threading.Lock()
+
+    def create(self, messages, **kwargs):
+        with self._lock:
+            if self.throttle:
+                self.throttle -= 1
+                raise _Throttled()
+            prompt = messages[-1]["content"]
+            self.prompts.append(prompt)
+        reply = [
+            {"id": idx, "result": self.answer(value)}
+            for idx, value in reversed(list(enumerate(_inputs(prompt))))  # order must not matter
+            if value not in self.skip or self.skip.discard(value)
+        ]
+        return SimpleNamespace(
+            choices=[SimpleNamespace(message=SimpleNamespace(content=json.dumps(reply)))]
+        )
+
+
+def _inputs(prompt):
+    return [
+        item["input"]
+        for item in json.loads(re.search(r"<items>\n(.*)\n</items>", prompt, re.S).group(1))
+    ]
+
+
+def _client(completions, tmp_path=None, temperature=0.5):
+    cache = LLMCache(tmp_path / "c.sqlite") if tmp_path else None
+    client = LLMClient(api_key="k", temperature=temperature, cache=cache)
+    client._get_client = lambda: SimpleNamespace(chat=SimpleNamespace(completions=completions))
+    return client
+
+
+def _limits(**kwargs):
+    return ProviderLimits("test", max_concurrent=4, **kwargs)
+
+
+def test_packed_results_map_back_to_inputs_with_retries_and_dedupe():
+    completions = _PackedCompletions(str.upper, skip={"c"})
+    with LLMBatcher(_client(completions), size=2, workers=2, limits=_limits()) as batcher:
+        results = batcher.extract_json_batched(["a", "b", "a", "c", "d"], "Upper-case each input.")
+
+    assert results == ["A", "B", "A", "C", "D"]
+    # "a" is sent once: [a, b] and [c, d], then "c" again after the model skipped it
+    assert sorted(_inputs(prompt) for prompt in completions.prompts) == [
+        ["a", "b"],
+        ["c"],
+        ["c", "d"],
+    ]
+
+
+def test_item_results_are_cached_across_batches(tmp_path):
+    completions = _PackedCompletions(len)
+    client = _client(completions, tmp_path, temperature=0.0)
+    with LLMBatcher(client, size=10, workers=1, limits=_limits()) as batcher:
+        assert batcher.extract_json_batched(["ab", "abc"], "Count characters.") == [2, 3]
+        assert batcher.extract_json_batched(["abc", "abcd", "ab"], "Count characters.") == [3, 4, 2]
+        # another instruction, another key
+        assert batcher.extract_json_batched(["abc"], "Count words.") == [3]
+
+    assert [_inputs(prompt) for prompt in completions.prompts] == [["ab", "abc"], ["abcd"], ["abc"]]
+
+
+def test_packed_replies_without_results_are_not_cached(tmp_path):
+    completions = _PackedCompletions(str.upper, skip={"a"})
+    client = _client(completions, tmp_path, temperature=0.0)
+    with LLMBatcher(client, size=4, workers=1, limits=_limits()) as batcher:
+        # the retry sends the same one-item prompt again instead of reading back "[]"
+        assert batcher.extract_json_batched(["a"], "Upper-case each input.") == ["A"]
+
+    assert len(completions.prompts) == 2
+
+
+def test_throttled_requests_back_off_and_shrink_the_gate():
+    completions = _PackedCompletions(str.upper, throttle=2)
+    limits = _limits()
+    with LLMBatcher(
+        _client(completions), size=5, workers=4, max_retries=3, limits=limits
+    ) as batcher:
+        assert batcher.extract_json_batched(["x"], "Upper-case each input.") == ["X"]
+        assert limits.controller.decisions["throttle"] == 2 and limits.gate.limit < 4
+
+    failing = _PackedCompletions(str.upper, throttle=10)
+    with LLMBatcher(_client(failing), max_retries=1, limits=_limits()) as batcher:
+        assert batcher.extract_json_batched(["x"], "Upper-case each input.") == [None]
+        [error] = batcher.map(
+            lambda item: batcher.call(lambda: failing.create([{"content": item}])), ["x"]
+        )
+    assert isinstance(error, _Throttled)
+
+
+def test_config_built_clients_leave_throttle_retries_to_the_batcher(monkeypatch):
+    built = []
+
+    class _SDKClient:
+        def __init__(self, **kwargs):
+            built.append(kwargs["max_retries"])
+
+        def close(self):
+            pass
+
+    llm_config = {"enabled": True, "cache": {"enabled": False}, "batch": {"workers": 2}}
+    monkeypatch.setattr(
+        LLMClient,
+        "_build_client",
+        lambda self, asynchronous=False: _SDKClient(max_retries=self.max_retries),
+    )
+    client = get_llm_client_from_config({"llm": llm_config})
+    sdk_client = client._get_client()
+
+    with get_llm_batcher(client, llm_config) as batcher:
+        batcher.client._get_client()
+
+    assert built == [2, 0]
+    # the caller's client keeps its retries and its open SDK client
+    assert batcher.client is not client and client.max_retries == 2
+    assert client._get_client() is sdk_client
+
+
+def test_provider_limits_pace_requests_and_tokens():
+    now = [0.0]
+    limits = ProviderLimits(
+        "paced", requests_per_minute=120, tokens_per_minute=6000, clock=lambda: now[0]
+    )
+    assert [limits._reserve("requests", 120, 1) for _ in range(4)] == [0.0, 0.0, 0.5, 1.0]
+    # 100 tokens/s, one second of burst
+    assert limits._reserve("tokens", 6000, 150) == pytest.approx(0.5)
+
+
+def test_process_llm_qc_validates_records_in_batches(monkeypatch):
+    completions = _PackedCompletions(
+        lambda text: {
+            "valid": "price: -1" not in text,
+            "issues": ["negative price"] * ("price: -1" in text),
+        }
+    )
+    monkeypatch.setattr(llm_qc, "get_llm_client_from_config", lambda config: _client(completions))
+    config = {
+        "llm": {"enabled": True, "batch": {"size": 3, "workers": 2}},
+        "quality": {"required_fields": ["name"]},
+    }
+    records = [{"name": f"p{i}", "price": -1 if i == 4 else i} for i in range(7)] + [{"price": 1}]
+
+    out = list(llm_qc.process_llm_qc(records, config))
+
+    assert [record["_qc_valid"] for record in out] == [True] * 4 + [False] + [True] * 2 + [False]
+    assert out[4]["_qc_issues"] == ["negative price"]
+    assert out[7]["_qc_issues"] == ["Missing required fields: name"]
+    assert len(completions.prompts) == 3  # 7 records to check, 3 per request
@@ -0,0 +1,115 @@
+import json
+import time
+from types import SimpleNamespace
+
+import pytest
+
+from src.observability import cost_tracking
+from src.processors.llm import llm_cache as llm_cache_module
+from src.processors.llm.llm_cache import LLMCache, cache_key
+from src.processors.llm.llm_client import LLMClient
+
+
+class _FakeCompletions:
+    def __init__(self):
+        self.calls = []
+
+    def create(self, **kwargs):
+        self.calls.append(kwargs)
+        text = f"answer {len(self.calls)}"
+        return SimpleNamespace(
+            choices=[SimpleNamespace(message=SimpleNamespace(content=text))],
+            usage=SimpleNamespace(prompt_tokens=1000, completion_tokens=500),
+        )
+
+
+@pytest.fixture
+def ledger(tmp_path, monkeypatch):
+    ledger = cost_tracking.LLMCostLedger(tmp_path / "llm_calls.jsonl")
+    monkeypatch.setattr("src.processors.llm.llm_client.llm_ledger", ledger)
+    return ledger
+
+
+def _client(tmp_path, monkeypatch, **kwargs):
+    completions = _FakeCompletions()
+    client = LLMClient(api_key="k", cache=LLMCache(tmp_path / "llm.sqlite"), **kwargs)
+    sdk = SimpleNamespace(chat=SimpleNamespace(completions=completions))
+    monkeypatch.setattr(client, "_get_client", lambda: sdk)
+    return client, completions
+
+
+def test_deterministic_calls_are_answered_from_cache_and_accounted(tmp_path, monkeypatch, ledger):
+    client, completions = _client(tmp_path, monkeypatch)
+
+    first = client.complete("Translate:\n  Acme Pharma", system_prompt="be brief")
+    # Only whitespace differs.
+    again = client.complete("Translate: Acme   Pharma", system_prompt="be brief")
+    other_model = LLMClient(api_key="k", model="gpt-4o", cache=client.cache)
+    monkeypatch.setattr(other_model, "_get_client", client._get_client)
+    other_model.complete("Translate: Acme Pharma", system_prompt="be brief")
+    creative = client.complete("Translate: Acme Pharma", system_prompt="be brief", temperature=0.7)
+
+    assert first == again == "answer 1" and creative == "answer 3"
+    assert len(completions.calls) == 3
+    call_cost = (1000 * 0.15 + 500 * 0.60) / 1e6  # gpt-4o-mini list price
+    summary = ledger.drain(run_id="run-1")
+    assert (summary["calls"], summary["hits"], summary["misses"]) == (4, 1, 2)
+    assert summary["hit_rate"] == pytest.approx(1 / 3)  # bypassed calls are not cacheable
+    assert summary["saved_usd"] == pytest.approx(call_cost)
+    assert summary["cost_usd"] == pytest.approx(2 * call_cost + (1000 * 2.5 + 500 * 10) / 1e6)
+    lines = [json.loads(line) for line in (tmp_path / "llm_calls.jsonl").read_text().splitlines()]
+    assert [line["outcome"] for line in lines] == ["miss", "hit", "miss", "bypass"]
+    assert {line["run_id"] for line in lines} == {"run-1"}
+    assert ledger.summary()["calls"] == 0
+
+
+def test_cached_answers_need_no_api_key_and_can_be_disabled(tmp_path, monkeypatch, ledger):
+    client, completions = _client(tmp_path, monkeypatch)
+    client.complete("q")
+    client.api_key = ""
+    assert client.complete("q") == "answer 1"
+
+    uncached, uncached_calls = _client(tmp_path, monkeypatch, use_cache=False)
+    uncached.complete("q")
+    assert len(uncached_calls.calls) == 1
+
+
+def test_json_replies_are_cached_only_once_they_parse(tmp_path, monkeypatch):
+    client, completions = _client(tmp_path, monkeypatch)
+
+    for _ in range(2):
+        with pytest.raises(ValueError):
+            client.extract_json("q")  # "answer N" is not JSON
+
+    assert len(completions.calls) == 2 and len(client.cache) == 0
+
+
+def test_cache_expires_entries_and_evicts_least_recently_used(tmp_path, monkeypatch):
+    cache = LLMCache(tmp_path / "llm.sqlite", ttl_seconds=60, max_bytes=10_000)
+    keys = [cache_key("openai", "m", 0.0, 16, None, f"prompt {i}") for i in range(4)]
+    for key in keys[:3]:
+        cache.store(key, provider="openai", model="m", text="x" * 3000, cost_usd=0.01)
+    assert cache.lookup(keys[0]).cost_usd == 0.01  # keys[0] is now the most recently used
+    cache.store(keys[3], provider="openai", model="m", text="x" * 3000)
+
+    assert cache.lookup(keys[1]) is None  # evicted
+    assert cache.lookup(keys[0]) is not None and cache.total_bytes <= 10_000
+
+    later = time.time() + 61
+    monkeypatch.setattr(llm_cache_module.time, "time", lambda: later)
+    assert cache.lookup(keys[0]) is None
+    assert len(cache) == 1  # keys[3]; keys[2] went too, eviction stops at 90% of max_bytes
+
+
+def test_run_cost_includes_llm_usage(tmp_path, monkeypatch):
+    monkeypatch.setattr(cost_tracking, "COST_LOG_PATH", tmp_path / "cost.jsonl")
+    record = cost_tracking.record_run_cost(
+        source="alfabeta",
+        run_id="run-3",
+        proxy_cost_usd=1.0,
+        llm_usage={"calls": 10, "hits": 6, "cost_usd": 0.25, "saved_usd": 0.4},
+    )
+
+    assert record.total_usd == pytest.approx(1.25)
+    stored = json.loads((tmp_path / "cost.jsonl").read_text())
+    assert (stored["llm_calls"], stored["llm_cache_hits"], stored["llm_saved_usd"]) == (10, 6, 0.4)
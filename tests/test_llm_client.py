@@ -0,0 +1,129 @@
+import asyncio
+import json
+import threading
+from types import SimpleNamespace
+
+import httpx
+import pytest
+
+from src.observability import metrics
+from src.observability.metrics import MetricsRegistry
+from src.processors.llm.llm_cache import LLMCache
+from src.processors.llm.llm_client import LLMClient
+
+
+def _response(messages):
+    text = json.dumps({"echo": messages[-1]["content"].split("\n")[0]})
+    return SimpleNamespace(
+        choices=[SimpleNamespace(message=SimpleNamespace(content=text))], usage=None
+    )
+
+
+class _FakeSDK:
+    """Stands in for the ``openai`` package: records every client and HTTP pool it builds."""
+
+    def __init__(self):
+        self.clients = []
+        self.http_clients = []
+        self.requests = []
+        self._lock = threading.Lock()
+        sdk = self
+
+        class DefaultHttpxClient(httpx.Client):
+            def __init__(self, **kwargs):
+                sdk.http_clients.append(kwargs)
+                super().__init__(**kwargs)
+
+        class DefaultAsyncHttpxClient(httpx.AsyncClient):
+            def __init__(self, **kwargs):
+                sdk.http_clients.append(kwargs)
+                super().__init__(**kwargs)
+
+        class OpenAI:
+            def __init__(self, **kwargs):
+                self.kwargs = kwargs
+                sdk.clients.append(self)
+                self.chat = SimpleNamespace(completions=SimpleNamespace(create=self.create))
+
+            def create(self, messages, **kwargs):
+                with sdk._lock:
+                    sdk.requests.append(messages[-1]["content"])
+                return _response(messages)
+
+            def close(self):
+                self.kwargs["http_client"].close()
+
+        class AsyncOpenAI(OpenAI):
+            async def create(self, messages, **kwargs):
+                await asyncio.sleep(0)
+                return OpenAI.create(self, messages, **kwargs)
+
+            async def close(self):
+                await self.kwargs["http_client"].aclose()
+
+        self.DefaultHttpxClient = DefaultHttpxClient
+        self.DefaultAsyncHttpxClient = DefaultAsyncHttpxClient
+        self.OpenAI = OpenAI
+        self.AsyncOpenAI = AsyncOpenAI
+
+
+def _client(monkeypatch, **kwargs):
+    sdk = _FakeSDK()
+    client = LLMClient(api_key="k", **kwargs)
+    monkeypatch.setattr(client, "_sdk", lambda: (sdk, sdk.OpenAI, sdk.AsyncOpenAI))
+    return client, sdk
+
+
+def test_one_pooled_client_serves_every_call_and_thread(monkeypatch):
+    client, sdk = _client(
+        monkeypatch, model="pool-test", temperature=0.5, pool={"max_connections": 4}
+    )
+
+    threads = [threading.Thread(target=client.complete, args=(f"p{i}",)) for i in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert len(sdk.clients) == 1 and len(sdk.requests) == 8
+    limits = sdk.http_clients[0]["limits"]
+    assert (limits.max_connections, limits.max_keepalive_connections) == (4, 16)
+    assert sdk.http_clients[0]["timeout"] == (10.0, 60.0, 60.0, 60.0)
+    histograms = metrics.dump_metrics()["histograms"]
+    [histogram] = [h for h in histograms if h.labels.get("model") == "pool-test"]
+    assert histogram.name == "llm_request_seconds" and histogram.labels["provider"] == "openai"
+    assert histogram.count == 8
+
+    client.close()
+    client.complete("after close")
+    assert len(sdk.clients) == 2
+
+
+def test_async_calls_share_one_client_per_event_loop_and_the_cache(monkeypatch, tmp_path):
+    client, sdk = _client(monkeypatch, cache=LLMCache(tmp_path / "llm.sqlite"))
+
+    async def run(*prompts):
+        results = await asyncio.gather(*(client.aextract_json(prompt) for prompt in prompts))
+        return [result["echo"] for result in results]
+
+    assert asyncio.run(run("a", "b")) == ["a", "b"]
+    assert asyncio.run(run("a", "c", "c")) == ["a", "c", "c"]
+
+    assert len(sdk.clients) == 2  # one per event loop, shared by the calls made on it
+    json_a = "a\n\nReturn only valid JSON, no markdown, no explanation."
+    assert sdk.requests.count(json_a) == 1  # cached
+    assert len(sdk.requests) == 4  # the concurrent "c" calls both miss the cache
+
+
+def test_histogram_percentiles_interpolate_within_buckets():
+    registry = MetricsRegistry()
+    for value in [0.02] * 90 + [0.2] * 10:
+        registry.observe("latency", value, buckets=(0.01, 0.05, 0.1, 0.5), provider="x")
+    registry.observe("latency", 3.0, buckets=(0.01, 0.05, 0.1, 0.5), provider="x")
+
+    [sample] = registry.snapshot()["histograms"]
+    assert sample.counts == [0, 90, 90, 100] and sample.count == 101
+    assert sample.sum == pytest.approx(0.02 * 90 + 0.2 * 10 + 3.0)
+    assert 0.01 < sample.percentile(0.5) < 0.05
+    assert sample.percentile(1.0) == 0.5  # open-ended bucket reports its lower bound
+    assert MetricsRegistry().snapshot()["histograms"] == []
@@ -0,0 +1,180 @@
+import json
+import os
+
+import numpy as np
+
+from src.processors import pcid_index as pcid_index_module
+from src.processors.pcid_index import load_or_build_pcid_index, open_pcid_index
+from src.processors.pcid_matcher import build_pcid_index, load_pcid_master, match_pcid_batch
+from src.processors.vector_store import (
+    IVFPCIDVectorBackend,
+    MatrixPCIDVectorStore,
+    MatrixVectorBackend,
+    get_pcid_backend,
+)
+
+MASTER_ROWS = [
+    {"pcid": "PCID-XYZ", "name": "Widget", "company": "ACME", "currency": "USD", "source": "alpha"},
+    {"pcid": "PCID-ABC", "name": "Gadget", "company": "Beta Labs", "currency": "USD"},
+    {"name": "No PCID", "company": "Nobody", "currency": "USD"},
+]
+
+
+def _write_master(path, rows):
+    path.write_text("\n".join(json.dumps(row) for row in rows), encoding="utf-8")
+
+
+def _count_embeddings(monkeypatch):
+    calls = {"count": 0}
+    original = pcid_index_module.embed_pcid_records
+
+    def counting(records, dims=48):
+        calls["count"] += len(records)
+        return original(records, dims=dims)
+
+    monkeypatch.setattr(pcid_index_module, "embed_pcid_records", counting)
+    return calls
+
+
+def test_compiled_index_matches_in_memory_build(tmp_path):
+    master_path = tmp_path / "pcid_master.jsonl"
+    _write_master(master_path, MASTER_ROWS)
+
+    compiled = load_or_build_pcid_index(master_path, tmp_path / "index", dims=8)
+
+    assert compiled.rows == 2
+    assert compiled.pcid_index == build_pcid_index(load_pcid_master(master_path))
+    assert isinstance(compiled.store.matrix, np.memmap)
+    [top] = compiled.store.query(compiled.store.matrix[0].tolist(), top_k=1)
+    assert top["metadata"] == {"source": "alpha"}
+
+    backend = get_pcid_backend(
+        {"pcid": {"backend": "matrix", "hash": {"dims": 8}}}, vector_store=compiled.store
+    )
+    assert isinstance(backend, MatrixVectorBackend)
+    # The default hash backend queries the memmap in place instead of copying it.
+    hashed = get_pcid_backend({"pcid": {"hash": {"dims": 8}}}, vector_store=compiled.store)
+    assert hashed.store is compiled.store
+    records = [
+        {"name": "widget", "company": "acme", "currency": "usd"},
+        {"name": "Gadget Kit", "company": "Beta Labs", "currency": "USD"},
+    ]
+    decisions = match_pcid_batch(records, compiled.pcid_index, backend, min_similarity=0.1)
+    assert decisions[0] == ("PCID-XYZ", 1.0)
+    assert decisions[1][0] == "PCID-ABC"
+
+
+def test_unchanged_master_reopens_without_rebuild(tmp_path, monkeypatch):
+    master_path = tmp_path / "pcid_master.jsonl"
+    index_dir = tmp_path / "index"
+    _write_master(master_path, MASTER_ROWS)
+    load_or_build_pcid_index(master_path, index_dir, dims=8)
+
+    calls = _count_embeddings(monkeypatch)
+    reopened = load_or_build_pcid_index(master_path, index_dir, dims=8)
+    assert reopened.rows == 2
+    # No master rows are re-embedded.
+    assert calls["count"] == 0
+
+    # Touching the file without changing content refreshes the stamp only.
+    os.utime(master_path, ns=(0, 1_000_000_000))
+    calls["count"] = 0
+    load_or_build_pcid_index(master_path, index_dir, dims=8)
+    assert calls["count"] == 0
+    assert open_pcid_index(index_dir).manifest["master"]["mtime_ns"] == 1_000_000_000
+
+
+def test_changed_master_rebuilds_incrementally(tmp_path, monkeypatch):
+    master_path = tmp_path / "pcid_master.jsonl"
+    index_dir = tmp_path / "index"
+    _write_master(master_path, MASTER_ROWS)
+    first = load_or_build_pcid_index(master_path, index_dir, dims=8)
+    widget_vector = np.array(first.store.matrix[0])
+    old_files = set(first.manifest["files"].values())
+
+    calls = _count_embeddings(monkeypatch)
+    _write_master(
+        master_path,
+        MASTER_ROWS
+        + [{"pcid": "PCID-NEW", "name": "Gizmo", "company": "Gamma", "currency": "ARS"}],
+    )
+    rebuilt = load_or_build_pcid_index(master_path, index_dir, dims=8)
+
+    assert rebuilt.rows == 3
+    assert rebuilt.pcid_index[("gizmo", "gamma", "ars")] == "PCID-NEW"
+    np.testing.assert_array_equal(np.array(rebuilt.store.matrix[0]), widget_vector)
+    # Only the single new row is embedded.
+    assert calls["count"] == 1
+    remaining = {path.name for path in index_dir.iterdir()}
+    assert not old_files & remaining
+
+
+def test_reused_and_fresh_rows_get_the_same_key(tmp_path):
+    master_path = tmp_path / "pcid_master.jsonl"
+    index_dir = tmp_path / "index"
+    rows = [
+        {"pcid": "PCID-1", "name": " Widget ", "company": "ACME", "currency": None, "price": "12.5"}
+    ]
+    _write_master(master_path, rows)
+    fresh = load_or_build_pcid_index(master_path, index_dir, dims=8)
+
+    _write_master(master_path, rows + [{"pcid": "PCID-2", "name": "Gizmo", "company": "Gamma"}])
+    rebuilt = load_or_build_pcid_index(master_path, index_dir, dims=8)
+
+    assert fresh.pcid_index == {("widget", "acme", "ars"): "PCID-1"}
+    assert rebuilt.pcid_index == {
+        ("widget", "acme", "ars"): "PCID-1",
+        ("gizmo", "gamma", "ars"): "PCID-2",
+    }
+
+
+def _random_store(rows=500, width=20, seed=3):
+    rng = np.random.default_rng(seed)
+    return MatrixPCIDVectorStore.from_arrays(
+        [f"PCID-{idx}" for idx in range(rows)],
+        MatrixPCIDVectorStore._normalize_rows(rng.normal(size=(rows, width)).astype(np.float32)),
+        [{} for _ in range(rows)],
+        dims=8,
+        generation="gen-1",
+    )
+
+
+def test_ivf_backend_full_probe_equals_exact_search():
+    store = _random_store()
+    queries = np.asarray(store.matrix[:25]) + 0.05
+    ivf = IVFPCIDVectorBackend(store, nlist=16, nprobe=16).train()
+
+    exact = store.query_many(queries, top_k=3, threshold=0.0)
+    approx = ivf.query_many(queries, top_k=3, threshold=0.0)
+    assert [[row["pcid"] for row in rows] for rows in approx] == [
+        [row["pcid"] for row in rows] for rows in exact
+    ]
+
+    narrow = IVFPCIDVectorBackend(store, nlist=16, nprobe=2).train()
+    assert all(len(rows) <= 3 for rows in narrow.query_many(queries, top_k=3, threshold=0.0))
+    assert narrow.query(queries[0], top_k=1, threshold=2.0) == []
+
+
+def test_ivf_backend_persists_per_generation(tmp_path):
+    store = _random_store()
+    trained = IVFPCIDVectorBackend(store, nlist=8, nprobe=4).train()
+    path = tmp_path / "ivf.npz"
+    trained.save(path)
+
+    reloaded = IVFPCIDVectorBackend.load(path, store, nprobe=4)
+    assert reloaded is not None
+    np.testing.assert_array_equal(reloaded.list_rows, trained.list_rows)
+    query = np.asarray(store.matrix[5])
+    assert reloaded.query(query, top_k=1)[0]["pcid"] == "PCID-5"
+
+    store.generation = "gen-2"
+    assert IVFPCIDVectorBackend.load(path, store) is None
+
+
+def test_get_pcid_backend_builds_and_caches_ivf(tmp_path):
+    store = _random_store()
+    settings = {"pcid": {"backend": "ivf", "ivf": {"nlist": 8, "nprobe": 8}}}
+    backend = get_pcid_backend(settings, vector_store=store, index_dir=tmp_path)
+    assert isinstance(backend, IVFPCIDVectorBackend)
+    assert (tmp_path / "ivf-8.npz").exists()
+    assert get_pcid_backend(settings, vector_store=store, index_dir=tmp_path).is_trained
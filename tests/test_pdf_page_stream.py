@@ -0,0 +1,93 @@
+import pytest
+
+from src.processors.pdf import pdf_text_extractor
+from src.processors.pdf.pdf_page_cache import PdfPageCache
+from src.processors.pdf.pdf_text_extractor import (
+    PdfPageStream,
+    chunk_pdf_text,
+    extract_pdf_text_classic,
+    iter_pdf_chunks,
+    pdf_sha256,
+)
+
+
+def _write_pdf(path, pages):
+    pymupdf = pytest.importorskip("pymupdf")
+    doc = pymupdf.open()
+    for page_num in range(1, pages + 1):
+        page = doc.new_page()
+        for row in range(4):
+            page.draw_line((50, 100 + row * 20), (350, 100 + row * 20))
+        for x in (50, 200, 350):
+            page.draw_line((x, 100), (x, 160))
+        cells = [("drug", "mrp"), (f"Product {page_num}", "10.5"), ("Other", "3")]
+        for row, (name, price) in enumerate(cells):
+            page.insert_text((55, 114 + row * 20), name)
+            page.insert_text((205, 114 + row * 20), price)
+    doc.save(str(path))
+    doc.close()
+
+
+def test_known_documents_stream_from_the_cache_without_a_pdf_library(tmp_path, monkeypatch):
+    pdf_path = tmp_path / "list.pdf"
+    pdf_path.write_bytes(b"%PDF-1.4 not really parsed")
+    cache = PdfPageCache(tmp_path / "pages.sqlite")
+    sha256 = pdf_sha256(pdf_path)
+    cache.store_document(sha256, 3, "pymupdf")
+    pages = [{"page": n, "text": f"page {n}", "tables": [[["a", n]]]} for n in (1, 2, 3)]
+    cache.store(sha256, pages)
+
+    def no_extraction(*args):
+        raise AssertionError("cached pages must not be extracted")
+
+    monkeypatch.setattr(pdf_text_extractor, "_pdf_backend", no_extraction)
+    monkeypatch.setattr(pdf_text_extractor, "_iter_page_range", no_extraction)
+
+    stream = PdfPageStream(pdf_path, workers=1, pages_per_task=2, cache=cache)
+    assert (stream.page_count, stream.method) == (3, "pymupdf")
+    assert [page["text"] for page in stream] == ["page 1", "page 2", "page 3"]
+    extracted = extract_pdf_text_classic(pdf_path, {"cache": {"path": tmp_path / "pages.sqlite"}})
+    assert extracted["raw_tables"][2] == {"page": 3, "rows": [["a", 3]]}
+
+
+def test_pages_of_another_extraction_method_are_dropped(tmp_path):
+    cache = PdfPageCache(tmp_path / "pages.sqlite")
+    cache.store_document("abc", 2, "pdfplumber")
+    cache.store("abc", [{"page": n, "text": f"page {n}", "tables": []} for n in (1, 2)])
+
+    cache.store_document("abc", 2, "pdfplumber")
+    assert len(cache.pages("abc", 1, 2)) == 2
+
+    cache.store_document("abc", 2, "pymupdf")
+    assert cache.document("abc") == (2, "pymupdf")
+    assert cache.pages("abc", 1, 2) == {} and cache.total_bytes == 0
+
+
+def test_parallel_ranges_match_the_serial_walk_and_fill_the_cache(tmp_path):
+    pdf_path = tmp_path / "list.pdf"
+    _write_pdf(pdf_path, 7)
+    cache = PdfPageCache(tmp_path / "pages.sqlite")
+
+    serial = list(PdfPageStream(pdf_path, workers=1))
+    parallel = list(
+        PdfPageStream(pdf_path, workers=2, pages_per_task=2, parallel_min_pages=1, cache=cache)
+    )
+
+    assert [page["page"] for page in parallel] == list(range(1, 8))
+    assert parallel == serial
+    assert "Product 5" in serial[4]["text"] and serial[4]["tables"]
+    assert len(cache) == 7
+    assert list(PdfPageStream(pdf_path, workers=2, pages_per_task=2, cache=cache)) == serial
+
+
+def test_chunks_stream_from_pages_like_the_list_version():
+    pages = ["a" * 400, "b" * 300, "c" * 900, "d" * 50]
+
+    def page_generator():
+        yield from pages
+
+    chunks = list(iter_pdf_chunks(page_generator(), chunk_size_chars=500, overlap_chars=50))
+
+    assert chunks == chunk_pdf_text(pages, chunk_size_chars=500, overlap_chars=50)
+    assert [chunk["chunk_id"] for chunk in chunks] == list(range(1, len(chunks) + 1))
+    assert chunks[-1]["page_end"] == 4
@@ -0,0 +1,252 @@
+import asyncio
+
+from cryptography.fernet import Fernet
+
+from src.engines import EngineConfig, EngineError, PlaywrightEngine, create_engine
+from src.engines import playwright_engine
+from src.engines.playwright_engine import playwright_proxy
+from src.security import crypto_utils
+from src.sessions import session_manager
+
+
+class _Request:
+    def __init__(self, url, resource_type):
+        self.url = url
+        self.resource_type = resource_type
+
+
+class _Route:
+    def __init__(self, request, log):
+        self.request = request
+        self.log = log
+
+    async def abort(self):
+        self.log.append(("abort", self.request.url))
+
+    async def continue_(self):
+        self.log.append(("continue", self.request.url))
+
+
+class _Response:
+    def __init__(self, status):
+        self.status = status
+        self.headers = {"content-type": "text/html"}
+
+
+class _Page:
+    def __init__(self, context):
+        self.context = context
+        self.url = ""
+
+    async def goto(self, url, wait_until=None):
+        browser = self.context.browser
+        browser.active += 1
+        browser.peak = max(browser.peak, browser.active)
+        self.context.active += 1
+        self.context.peak = max(self.context.peak, self.context.active)
+        try:
+            # The page's subresources go through the context's route handler.
+            for sub_url, kind in (
+                (f"{url}/logo.png", "image"),
+                ("https://www.google-analytics.com/c.js", "script"),
+            ):
+                await self.context.handler(_Route(_Request(sub_url, kind), self.context.routed))
+            await asyncio.sleep(0.01)
+            self.url = url
+            return _Response(browser.statuses.pop(url, 200))
+        finally:
+            browser.active -= 1
+            self.context.active -= 1
+
+    async def content(self):
+        return f"<html>{self.url}</html>"
+
+    async def close(self):
+        self.context.pages_closed += 1
+
+
+class _Context:
+    def __init__(self, browser, options):
+        self.browser = browser
+        self.options = options
+        self.cookies_added = []
+        self.routed = []
+        self.handler = None
+        self.active = self.peak = self.pages_closed = 0
+        self.closed = False
+
+    def set_default_navigation_timeout(self, _ms):
+        return None
+
+    async def route(self, _pattern, handler):
+        self.handler = handler
+
+    async def add_cookies(self, cookies):
+        self.cookies_added.extend(cookies)
+
+    async def cookies(self):
+        cookie = {"name": "sid", "value": "new", "domain": "shop.test", "path": "/"}
+        return [{**cookie, "expires": 2_000_000_000}]
+
+    async def new_page(self):
+        return _Page(self)
+
+    async def close(self):
+        self.closed = True
+
+
+class _Browser:
+    def __init__(self, statuses=None):
+        self.contexts = []
+        self.statuses = dict(statuses or {})
+        self.active = self.peak = 0
+        self.closed = False
+
+    async def new_context(self, **options):
+        context = _Context(self, options)
+        self.contexts.append(context)
+        return context
+
+    async def close(self):
+        self.closed = True
+
+
+def _engine(browser, **kwargs):
+    async def launcher():
+        return browser
+
+    config = EngineConfig(max_retries=1, retry_backoff=0.0, retry_jitter=0.0)
+    return PlaywrightEngine(config, source="pw-test", launcher=launcher, **kwargs)
+
+
+def test_fetch_many_spreads_pages_over_a_bounded_context_pool():
+    browser = _Browser()
+    engine = _engine(browser, contexts=2, pages_per_context=3)
+
+    async def scenario():
+        async with engine:
+            urls = (f"https://shop.test/p/{i}" for i in range(20))
+            return [outcome async for outcome in engine.fetch_many(urls)]
+
+    results = asyncio.run(scenario())
+
+    expected = sorted(f"<html>https://shop.test/p/{i}</html>" for i in range(20))
+    assert sorted(result.content for result in results) == expected
+    assert len(browser.contexts) == 2
+    assert browser.peak == 6
+    assert all(context.peak <= 3 for context in browser.contexts)
+    assert all(context.closed for context in browser.contexts) and browser.closed
+    # Interception aborted the image and the analytics script on every page.
+    routed = [entry for context in browser.contexts for entry in context.routed]
+    assert routed and all(action == "abort" for action, _ in routed)
+
+
+def test_contexts_get_their_own_proxy_and_session_cookies(tmp_path, monkeypatch):
+    monkeypatch.setenv("SCRAPER_SECRET_KEY", Fernet.generate_key().decode())
+    monkeypatch.setattr(crypto_utils, "_FERNET", None)
+    monkeypatch.setattr(session_manager, "COOKIES_DIR", tmp_path)
+    session_manager.save_session_cookies(
+        "pw-test",
+        "acct-1",
+        "user:secret@10.0.0.1:8080",
+        [{"name": "sid", "value": "old", "domain": "shop.test"}],
+    )
+    records = [
+        session_manager.create_session_record("pw-test", "acct-1", "user:secret@10.0.0.1:8080"),
+        session_manager.create_session_record("pw-test", "acct-2", "10.0.0.2:8080"),
+    ]
+    browser = _Browser()
+    engine = _engine(browser, contexts=2, pages_per_context=1, session_records=records)
+
+    outcomes = engine.fetch_all(["https://shop.test/a", "https://shop.test/b"], concurrency=2)
+    engine.cleanup()
+
+    assert {outcome.metadata["account_id"] for outcome in outcomes} == {"acct-1", "acct-2"}
+    proxies = [context.options["proxy"] for context in browser.contexts]
+    assert proxies == [
+        {"server": "http://10.0.0.1:8080", "username": "user", "password": "secret"},
+        {"server": "http://10.0.0.2:8080"},
+    ]
+    assert browser.contexts[0].cookies_added == [
+        {"name": "sid", "value": "old", "domain": "shop.test", "path": "/"}
+    ]
+    saved = session_manager.load_session_cookies("pw-test", "acct-1", "user:secret@10.0.0.1:8080")
+    assert saved == [
+        {"name": "sid", "value": "new", "domain": "shop.test", "path": "/", "expiry": 2_000_000_000}
+    ]
+
+
+class _Playwright:
+    """Stands in for ``async_playwright()``, recording how Chromium is launched."""
+
+    def __init__(self, browser):
+        self.chromium = self
+        self.browser = browser
+        self.launches = []
+
+    def __call__(self):
+        return self
+
+    async def start(self):
+        return self
+
+    async def launch(self, **options):
+        self.launches.append(options)
+        return self.browser
+
+    async def stop(self):
+        return None
+
+
+class _EmptyProxyPool:
+    def choose_proxy(self, source, site=None):
+        return None
+
+
+def test_chromium_gets_a_placeholder_proxy_only_when_contexts_use_proxies(monkeypatch):
+    config = EngineConfig(max_retries=0)
+    for proxy_pool, launch_proxy, context_options in (
+        (None, None, {}),
+        (_EmptyProxyPool(), {"server": "http://per-context"}, {"proxy": {"server": "direct://"}}),
+    ):
+        browser = _Browser()
+        playwright = _Playwright(browser)
+        monkeypatch.setattr(playwright_engine, "async_playwright", playwright)
+        engine = PlaywrightEngine(config, source="pw-test", proxy_pool=proxy_pool)
+
+        assert engine.fetch("https://shop.test/a").status_code == 200
+        engine.cleanup()
+
+        assert playwright.launches == [{"headless": True, "proxy": launch_proxy}]
+        assert browser.contexts[0].options == context_options
+
+
+def test_rate_limits_are_retried_and_server_errors_surface():
+    browser = _Browser(statuses={"https://shop.test/throttled": 429, "https://shop.test/down": 503})
+    engine = _engine(browser, contexts=1, pages_per_context=2)
+
+    outcomes = engine.fetch_all(["https://shop.test/throttled", "https://shop.test/down"])
+    engine.cleanup()
+
+    assert outcomes[0].status_code == 200
+    assert isinstance(outcomes[1], EngineError) and outcomes[1].retries_exhausted
+    assert engine.is_closed()
+
+
+def test_factory_builds_playwright_engine():
+    engine = create_engine(
+        "playwright",
+        {
+            "source": "alfabeta",
+            "engine": {"contexts": 3, "pages_per_context": 5, "block_resources": ["image"]},
+        },
+        proxy="10.0.0.9:3128",
+    )
+    try:
+        assert isinstance(engine, PlaywrightEngine)
+        assert (engine.contexts, engine.pages_per_context) == (3, 5)
+        assert engine.block_resources == frozenset({"image"})
+        assert engine.limiter is not None and engine.limiter.key == "alfabeta"
+        assert playwright_proxy(engine.config.proxy) == {"server": "http://10.0.0.9:3128"}
+    finally:
+        engine.cleanup()
@@ -1,4 +1,11 @@
-from src.observability.prometheus_exporter import CollectorRegistry, create_metrics, dump_metrics
+from src.observability.prometheus_exporter import (
+    PROMETHEUS_AVAILABLE,
+    CollectorRegistry,
+    create_metrics,
+    dump_metrics,
+)
+from src.observability import metrics as registry_metrics
+from src.resource_manager import proxy_health, proxy_site_health
 
 
 def test_metrics_emission():
@@ -8,3 +15,31 @@ def test_metrics_emission():
     metrics["runs_failed"].inc()
     payload = dump_metrics(metrics)
     assert b"scraper_runs_total" in payload or payload == b""
+
+
+def test_proxy_latency_percentiles_are_exported(monkeypatch):
+    monkeypatch.setattr(proxy_site_health, "_STATUS", {})
+    monkeypatch.setattr(proxy_health, "_HEALTH", {})
+    for _ in range(20):
+        proxy_site_health.record_latency("user:secret@10.0.0.1:8080", "shop.test", 0.4)
+
+    payload = dump_metrics(create_metrics(registry=CollectorRegistry()))
+
+    if PROMETHEUS_AVAILABLE:
+        assert b'scraper_proxy_latency_seconds{proxy="10.0.0.1:8080#' in payload
+        assert (
+            b'quantile="0.95",site="shop.test"' in payload
+            or b'site="shop.test",quantile="0.95"' in payload
+        )
+        assert b"secret" not in payload
+
+
+def test_registry_histograms_are_exported_with_the_proxy_latencies():
+    for value in (0.02, 0.3, 90.0):
+        registry_metrics.observe("exporter_test_seconds", value, provider="x")
+
+    payload = dump_metrics(create_metrics(registry=CollectorRegistry()))
+
+    if PROMETHEUS_AVAILABLE:
+        assert b'scraper_exporter_test_seconds_bucket{le="0.025",provider="x"} 1.0' in payload
+        assert b'scraper_exporter_test_seconds_count{provider="x"} 3.0' in payload
@@ -0,0 +1,150 @@
+import threading
+from collections import Counter
+
+import pytest
+
+from src.resource_manager import proxy_health, proxy_site_health
+from src.resource_manager import proxy_pool as proxy_pool_module
+from src.resource_manager.proxy_health import LatencyHistogram
+from src.resource_manager.proxy_pool import ProxyPool, _FenwickTree
+
+_SETTINGS = {"max_errors_before_ban": 2, "ban_window_minutes": 1}
+
+
+class _Clock:
+    def __init__(self):
+        self.now = 1_000.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture(autouse=True)
+def isolated_health(monkeypatch):
+    monkeypatch.setattr(proxy_health, "_HEALTH", {})
+    monkeypatch.setattr(proxy_site_health, "_STATUS", {})
+    monkeypatch.setattr(proxy_site_health, "_PROXY_LATENCY", {})
+
+
+@pytest.fixture()
+def settings_calls(monkeypatch):
+    calls = []
+
+    def _settings(source):
+        calls.append(source)
+        return dict(_SETTINGS)
+
+    monkeypatch.setattr(proxy_pool_module, "get_proxy_settings", _settings)
+    return calls
+
+
+def _pool(count, clock=None):
+    proxies = [f"10.0.{idx // 256}.{idx % 256}:8080" for idx in range(count)]
+    return ProxyPool({"proxies": {"shop": proxies}}, clock=clock or _Clock()), proxies
+
+
+def test_fenwick_tree_samples_by_prefix_sum():
+    tree = _FenwickTree([1.0, 0.0, 3.0, 2.0, 0.0])
+
+    assert tree.total == 6.0
+    assert [tree.find(target) for target in (0.0, 0.99, 1.0, 3.99, 4.0, 5.99)] == [0, 0, 2, 2, 3, 3]
+    tree.set(2, 0.0)
+    tree.set(4, 5.0)
+    assert tree.total == 8.0
+    assert [tree.find(target) for target in (0.5, 1.0, 2.99, 3.0, 7.99)] == [0, 3, 3, 4, 4]
+
+
+def test_decayed_scores_steer_traffic_to_healthy_fast_proxies(settings_calls):
+    pool, (good, slow, flaky) = _pool(3)
+    for _ in range(20):
+        pool.mark_success("shop", good, latency=0.2)
+        pool.mark_success("shop", slow, latency=3.0)
+    pool._get_pool("shop").max_errors_before_ban = 0  # keep the flaky proxy in rotation
+    for _ in range(3):
+        pool.mark_failure("shop", flaky)
+
+    picks = Counter(pool.choose_proxy("shop") for _ in range(6_000))
+
+    assert picks[good] > 2 * picks[slow] > 0
+    assert picks[good] > picks[flaky] > 0
+    # The failure fades as later successes are folded in.
+    before = next(ps for ps in pool.stats("shop") if ps.proxy == flaky).weight
+    pool.mark_success("shop", flaky)
+    assert next(ps for ps in pool.stats("shop") if ps.proxy == flaky).weight > before
+    assert settings_calls == ["shop"]  # settings are resolved once per source
+
+
+def test_bans_expire_from_the_heap_and_all_banned_falls_back(settings_calls):
+    clock = _Clock()
+    pool, proxies = _pool(2, clock)
+    banned, healthy = proxies
+
+    pool.mark_failure("shop", banned)
+    pool.mark_failure("shop", banned)
+    assert {pool.choose_proxy("shop") for _ in range(200)} == {healthy}
+
+    pool.mark_failure("shop", healthy, ban=True)
+    assert {pool.choose_proxy("shop") for _ in range(200)} == set(proxies)  # everything banned
+
+    clock.now += 61
+    pool.mark_failure("shop", healthy, ban=True)  # renewed ban outlives the first heap entry
+    assert {pool.choose_proxy("shop") for _ in range(200)} == {banned}
+    assert not pool.stats("shop")[0].banned
+
+
+def test_concurrent_picks_and_updates_keep_the_tree_consistent(settings_calls):
+    pool, proxies = _pool(500)
+    errors = []
+
+    def _worker(seed):
+        try:
+            for step in range(2_000):
+                proxy = pool.choose_proxy("shop")
+                if (seed + step) % 7:
+                    pool.mark_success("shop", proxy, latency=0.1 * (seed % 5))
+                else:
+                    pool.mark_failure("shop", proxy)
+        except Exception as exc:  # pragma: no cover - surfaced below
+            errors.append(exc)
+
+    threads = [threading.Thread(target=_worker, args=(seed,)) for seed in range(16)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    source_pool = pool._get_pool("shop")
+    assert not errors
+    assert source_pool.tree.values == pytest.approx([ps.weight for ps in source_pool.stats])
+    total_weight = sum(ps.weight for ps in source_pool.stats)
+    assert source_pool.tree.total == pytest.approx(total_weight, abs=1e-6)
+    assert sum(ps.success_count + ps.failure_count for ps in source_pool.stats) == 16 * 2_000
+
+
+def test_latency_histogram_interpolates_and_decays():
+    histogram = LatencyHistogram(buckets=(0.1, 1.0, 10.0), decay_every=100)
+    for _ in range(90):
+        histogram.observe(0.05)
+    for _ in range(10):
+        histogram.observe(5.0)
+
+    assert histogram.percentile(0.5) == pytest.approx(0.1 * 50 / 90)
+    assert 1.0 < histogram.percentile(0.95) <= 10.0
+    assert histogram.total == 50  # halved after 100 observations
+    assert LatencyHistogram().percentile(0.95) is None
+
+
+def test_power_of_two_choices_prefers_low_p95_for_the_site(settings_calls):
+    pool, (fast, slow) = _pool(2)
+    for _ in range(10):
+        pool.mark_success("shop", fast, latency=0.3, site="shop.test")
+        pool.mark_success("shop", slow, latency=0.3, site="other.test")
+        # Equally healthy overall, but slow is slow on shop.test only.
+        proxy_site_health.record_latency(slow, "shop.test", 12.0)
+
+    picks = Counter(pool.choose_proxy("shop", site="shop.test") for _ in range(2_000))
+
+    # Both draws pick the same proxy a quarter of the time; otherwise fast wins.
+    assert picks[slow] < 700 < 1_300 < picks[fast]
+    assert proxy_site_health.latency_percentile(slow, "shop.test") > 8.0
+    assert 0.25 < proxy_health.latency_percentile("shop", fast) <= 0.5  # within the 0.3s bucket
@@ -0,0 +1,32 @@
+from src.run_tracking.checkpoints import RunCheckpointStore, checkpoint_path
+
+
+def test_checkpoint_buffers_writes_and_survives_reopen(tmp_path):
+    store = RunCheckpointStore.open(
+        "alfabeta", "run/1", root=tmp_path, batch_size=3, flush_interval=3600
+    )
+    store.record_children(
+        "https://example.com/companies", ["https://example.com/company/a"], kind="companies"
+    )
+    store.record_raw("https://example.com/company/a/product/1", {"name": "Alpha", "price": 1.5})
+
+    # Reads see buffered pages before they are committed.
+    alpha = store.raw_record("https://example.com/company/a/product/1")
+    assert alpha == {"name": "Alpha", "price": 1.5}
+    assert store._conn.execute("SELECT COUNT(*) FROM pages").fetchone()[0] == 0
+
+    store.record_raw("https://example.com/company/a/product/2", {"name": "Beta"})
+    assert store._conn.execute("SELECT COUNT(*) FROM pages").fetchone()[0] == 3
+    store.close()
+
+    path = checkpoint_path("alfabeta", "run/1", root=tmp_path)
+    assert path.name == "run_1.sqlite"
+    reopened = RunCheckpointStore.open("alfabeta", "run/1", root=tmp_path)
+    assert reopened.children("https://example.com/companies") == ["https://example.com/company/a"]
+    assert reopened.children("https://example.com/company/b") is None
+    assert reopened.raw_record("https://example.com/company/a/product/3") is None
+    assert reopened.counts() == {"companies": 1, "product": 2}
+    assert reopened.get_meta("run_id") == "run/1"
+
+    reopened.delete()
+    assert not path.exists()
@@ -0,0 +1,91 @@
+from src.run_tracking.fingerprints import (
+    DeltaTracker,
+    FingerprintStore,
+    dom_fingerprint,
+    record_fingerprint,
+)
+from src.scrapers.alfabeta.product_index import fetch_product_entries
+
+
+class _PageDriver:
+    def __init__(self, page_source):
+        self.page_source = page_source
+
+
+LISTING = """
+<table>
+  <tr data-row="{nonce}">
+    <td><a class="product-link" href="/p/alpha">Alpha</a></td><td>ARS {alpha}</td>
+  </tr>
+  <tr data-row="{nonce}">
+    <td><a class="product-link" href="/p/beta">Beta</a></td><td>ARS 20</td>
+  </tr>
+</table>
+<script>window.token = "{nonce}";</script>
+"""
+
+
+def test_dom_fingerprint_ignores_volatile_markup():
+    base = dom_fingerprint('<div class="a" id="x1"><a href="/p">Alpha  Med</a><!-- c1 --></div>')
+    noisy = dom_fingerprint(
+        '<div class="b" id="x2" style="color:red">\n'
+        '  <a href="/p">Alpha Med</a><script>t=1</script></div>'
+    )
+    assert base == noisy
+    assert dom_fingerprint('<div><a href="/q">Alpha Med</a></div>') != base
+    assert dom_fingerprint("<div><a href=\"/p\">Alpha Mod</a></div>") != base
+
+
+def test_listing_entries_fingerprint_each_product_row():
+    def entries(nonce, alpha):
+        driver = _PageDriver(LISTING.format(nonce=nonce, alpha=alpha))
+        return fetch_product_entries(driver, "https://x.test/c")
+
+    before = entries("n1", 10)
+    rerender = entries("n2", 10)
+    repriced = entries("n3", 11)
+
+    assert [url for url, _ in before] == ["https://x.test/p/alpha", "https://x.test/p/beta"]
+    assert before == rerender
+    assert repriced[0][1] != before[0][1]  # the price in alpha's row changed
+    assert repriced[1] == before[1]
+
+
+def test_delta_tracker_carries_unchanged_records_and_reports_changes(tmp_path):
+    first = DeltaTracker(FingerprintStore.open("src", generation="v1", root=tmp_path), run_id="r1")
+    for url, listing_hash, price in (("u1", "h1", 1.0), ("u2", "h2", 2.0)):
+        first.observe(url, listing_hash)
+        assert first.carried(url) is None  # full refreshes never skip
+        first.page_visited(0.5)
+        first.record({"product_url": url, "price": price, "run_id": "r1"})
+    assert first.finish().change_ratio == 1.0
+    first.close()
+
+    delta = DeltaTracker(
+        FingerprintStore.open("src", generation="v1", root=tmp_path),
+        run_id="r2",
+        run_type="delta",
+        parallelism=2,
+    )
+    delta.observe("u1", "h1")
+    delta.observe("u2", "h2-new")
+    carried = delta.carried("u1")
+    assert carried == {"product_url": "u1", "price": 1.0, "run_id": "r1"}
+    assert delta.carried("u2") is None
+    delta.record({**carried, "run_id": "r2"})
+    delta.record({"product_url": "u2", "price": 2.5, "run_id": "r2"})
+    summary = delta.finish()
+
+    assert (summary.pages_skipped, summary.pages_extracted, summary.records_changed) == (1, 0, 1)
+    assert summary.change_ratio == 0.5
+    assert summary.seconds_saved == 0.25  # one page at the previous run's 0.5s mean, two at a time
+    run_a, run_b = {"price": 1.0, "run_id": "a"}, {"price": 1.0, "run_id": "b"}
+    assert record_fingerprint(run_a) == record_fingerprint(run_b)
+    delta.close()
+
+    upgraded = DeltaTracker(
+        FingerprintStore.open("src", generation="v2", root=tmp_path), run_id="r3", run_type="DELTA"
+    )
+    upgraded.observe("u1", "h1")
+    assert upgraded.carried("u1") is None  # records from another scraper version are not reused
+    upgraded.close()
@@ -0,0 +1,129 @@
+import pytest
+from selenium.common.exceptions import NoSuchElementException
+
+from src.engines import selenium_engine
+from src.engines.selenium_engine import (
+    LOAD_PROFILES,
+    BrowserSession,
+    FakeDriver,
+    LoadProfile,
+    resolve_load_profile,
+)
+from src.observability import metrics
+from src.resource_manager import settings
+
+
+class _ChromeDriver(FakeDriver):
+    """FakeDriver with the CDP, element lookup and script hooks a Chrome driver has."""
+
+    def __init__(self, ready_after=0, page_bytes=1_000):
+        super().__init__()
+        self.cdp = []
+        self.ready_after = ready_after
+        self.page_bytes = page_bytes
+        self.lookups = 0
+
+    def execute_cdp_cmd(self, cmd, params):
+        self.cdp.append((cmd, params))
+        return {}
+
+    def find_element(self, by, value):
+        self.lookups += 1
+        if self.lookups <= self.ready_after:
+            raise NoSuchElementException(value)
+        return object()
+
+    def execute_script(self, _script):
+        return self.page_bytes
+
+
+def _counter(name, profile):
+    return sum(
+        sample.value
+        for sample in metrics.dump_metrics()["counters"]
+        if sample.name == name and sample.labels.get("profile") == profile
+    )
+
+
+def test_resolve_load_profile_applies_source_overrides(monkeypatch):
+    configured = {
+        "lean": {
+            "load_profile": {
+                "name": "lite",
+                "ready_selector": "#product",
+                "blocked_urls": ["*ads.test*"],
+            }
+        },
+        "plain": {"load_profile": "minimal"},
+    }
+    monkeypatch.setattr(settings, "get_source_config", lambda source: configured[source])
+
+    lean = resolve_load_profile("lean")
+    assert lean.name == "lite"
+    assert (lean.page_load_strategy, lean.ready_selector) == ("eager", "#product")
+    assert "*.woff2" in lean.blocked_patterns() and "*ads.test*" in lean.blocked_patterns()
+    assert "*.css" not in lean.blocked_patterns()
+    assert resolve_load_profile("plain") == LOAD_PROFILES["minimal"]
+    assert resolve_load_profile(None) == LOAD_PROFILES["full"]
+    with pytest.raises(ValueError):
+        resolve_load_profile(None, name="turbo")
+    with pytest.raises(ValueError):
+        resolve_load_profile(None, blocked_resources=["video"])
+
+
+def test_create_driver_sets_strategy_and_blocks_urls(monkeypatch):
+    created = []
+
+    class _Chrome(_ChromeDriver):
+        def __init__(self, service=None, options=None):
+            super().__init__()
+            self.options = options
+            created.append(self)
+
+    monkeypatch.delenv(selenium_engine.FAKE_BROWSER_ENV, raising=False)
+    monkeypatch.setenv(selenium_engine.CHROMEDRIVER_PATH_ENV, "/usr/bin/true")
+    monkeypatch.setattr(selenium_engine.webdriver, "Chrome", _Chrome)
+
+    selenium_engine.create_driver("10.0.0.1:3128", LOAD_PROFILES["minimal"])
+    driver = created[0]
+
+    assert driver.options.page_load_strategy == "eager"
+    assert "--proxy-server=http://10.0.0.1:3128" in driver.options.arguments
+    assert driver.cdp[0] == ("Network.enable", {})
+    blocked = driver.cdp[1][1]["urls"]
+    assert driver.cdp[1][0] == "Network.setBlockedURLs"
+    assert "*.png" in blocked and "*.css" in blocked and "*google-analytics.com*" in blocked
+
+
+def test_navigate_waits_for_ready_selector_and_records_page_stats(monkeypatch):
+    sleeps = []
+    monkeypatch.setattr(
+        selenium_engine, "_sleep_with_jitter", lambda delay, jitter: sleeps.append(delay)
+    )
+    profile = LoadProfile(name="probe", ready_selector="#ready", ready_timeout=2.0)
+    session = BrowserSession(_ChromeDriver(ready_after=2, page_bytes=4_096), profile=profile)
+
+    session.navigate("https://shop.test/p/1")
+
+    assert session.driver.lookups == 3  # polled until the element appeared
+    assert sleeps == []  # readiness replaced the settle sleep
+    stats = session.last_page_stats
+    assert stats.url == "https://shop.test/p/1"
+    assert (stats.profile, stats.bytes_transferred) == ("probe", 4_096)
+    assert stats.ready
+    assert _counter("selenium_pages", "probe") == 1
+    assert _counter("selenium_page_bytes_total", "probe") == 4_096
+
+    # Without a selector the profile's settle wait applies.
+    BrowserSession(_ChromeDriver(), profile=LOAD_PROFILES["full"]).navigate("https://shop.test/p/2")
+    assert sleeps == [LOAD_PROFILES["full"].wait]
+
+
+def test_ready_timeout_is_reported_but_not_fatal():
+    profile = LoadProfile(name="impatient", ready_selector="#never", ready_timeout=0.05)
+    session = BrowserSession(_ChromeDriver(ready_after=10**6), profile=profile)
+
+    stats = session.load("https://shop.test/slow")
+
+    assert stats.ready is False
+    assert _counter("selenium_ready_timeouts", "impatient") == 1
@@ -1,17 +1,34 @@
 import json
 import math
+import os
+import subprocess
+import sys
 
+import pytest
+from pydantic import ValidationError
+
+from src.core_kernel.models import NormalizedRecord, RawRecord
 from src.governance.openfeature import override_flags
 from src.processors import vector_store as vector_store_module
 from src.processors.pcid_matcher import (
+    _fast_key_and_payload,
+    _make_key,
     build_pcid_index,
     build_vector_store,
     load_pcid_master,
     match_pcid,
+    match_pcid_batch,
     match_pcid_with_confidence,
     persist_pcid_mappings,
 )
-from src.processors.vector_store import PCIDVectorStore
+from src.processors.vector_store import (
+    MatrixPCIDVectorStore,
+    MatrixVectorBackend,
+    PCIDVectorStore,
+    embed_pcid_record,
+    embed_pcid_records,
+    get_pcid_backend,
+)
 
 
 def test_vector_store_similarity_and_threshold():
@@ -155,3 +172,175 @@ def test_pcid_master_load_index_and_persist(tmp_path):
     persisted = mappings_path.read_text(encoding="utf-8").strip().splitlines()
     assert len(persisted) == 1
     assert "PCID-XYZ" in persisted[0]
+
+
+def test_matrix_store_matches_python_store():
+    records = [
+        {
+            "pcid": f"PCID-{idx}",
+            "name": f"Widget {idx % 7} Plus",
+            "company": f"Lab {idx % 3}",
+            "currency": "USD",
+        }
+        for idx in range(40)
+    ]
+    store = PCIDVectorStore(dims=8)
+    store.populate_from_records(records)
+    matrix_store = MatrixPCIDVectorStore.from_store(store, batch_size=4)
+
+    queries = [
+        store.embed_record({"name": f"Widget {idx}", "company": "Lab 1", "currency": "USD"})
+        for idx in range(7)
+    ]
+    batched = matrix_store.query_many(queries, top_k=3, threshold=0.5)
+    for query, matrix_rows in zip(queries, batched):
+        expected = store.query(query, top_k=3, threshold=0.5)
+        assert [round(row["score"], 5) for row in matrix_rows] == [
+            round(row["score"], 5) for row in expected
+        ]
+
+
+def test_matrix_store_threshold_semantics():
+    store = MatrixPCIDVectorStore(dims=16)
+    store.add("PCID-1", [1.0] * 16, metadata={"source": "alpha"})
+    store.add("PCID-2", [0.0] * 15 + [math.sqrt(2)], metadata={"source": "beta"})
+
+    results = store.query([1.0] * 16, top_k=2, threshold=0.1)
+    assert [row["pcid"] for row in results] == ["PCID-1", "PCID-2"]
+    assert results[0]["metadata"] == {"source": "alpha"}
+
+    assert store.query([0.0] * 16, threshold=0.9) == []
+    # Low thresholds fall back to the best candidate even when nothing clears it.
+    assert len(store.query([0.0] * 16, threshold=0.05)) == 1
+
+
+def test_get_pcid_backend_selects_matrix():
+    store = PCIDVectorStore(dims=8)
+    store.populate_from_records(
+        [{"pcid": "PCID-A", "name": "Widget", "company": "ACME", "currency": "USD"}]
+    )
+    backend = get_pcid_backend(
+        {"pcid": {"backend": "matrix", "hash": {"dims": 8}}}, vector_store=store
+    )
+    assert isinstance(backend, MatrixVectorBackend)
+
+    record = {"name": "Widget", "company": "ACME", "currency": "USD"}
+    pcid, score = match_pcid_with_confidence(record, {}, vector_store=backend, min_similarity=0.9)
+    assert pcid == "PCID-A"
+    assert math.isclose(score, 1.0, rel_tol=1e-5)
+
+
+def test_match_pcid_batch_matches_single_record_path():
+    master = [
+        {"pcid": "PCID-A", "name": "Widget", "company": "ACME", "currency": "USD"},
+        {"pcid": "PCID-B", "name": "Gadget", "company": "Beta Labs", "currency": "USD"},
+        {"pcid": "PCID-C", "name": "Gizmo", "company": "Gamma", "currency": "ARS"},
+    ]
+    index = build_pcid_index(master)
+    store = build_vector_store(master, dims=8)
+    records = [
+        {"name": "Widget", "company": "ACME", "currency": "USD"},
+        {"name": "Gadget Kit", "company": "Beta Labs", "currency": "USD"},
+        {"name": " GIZMO ", "company": "gamma"},
+        {"name": "Unrelated", "company": "Nobody", "currency": "EUR"},
+    ]
+
+    expected = [
+        match_pcid_with_confidence(rec, index, vector_store=store, min_similarity=0.5)
+        for rec in records
+    ]
+    assert match_pcid_batch(records, index, store, min_similarity=0.5) == expected
+    assert expected[0] == ("PCID-A", 1.0)
+    assert expected[2] == ("PCID-C", 1.0)
+
+
+@pytest.mark.parametrize(
+    "record",
+    [
+        {"name": "a", "company": "b"},
+        {"name": "a", "company": "b", "currency": ""},
+        {"name": "a", "company": "b", "currency": None},
+        {"name": "a", "company": "b", "currency": 5},
+        {"name": 7, "company": "b", "currency": "USD"},
+        {"name": "a", "price": "abc"},
+        {"name": " A ", "price": "12.5", "currency": "usd"},
+        RawRecord(name="a", company="b"),
+        RawRecord(name="a", company="b", currency="EUR"),
+        NormalizedRecord(name="a", currency=""),
+    ],
+)
+def test_fast_key_matches_make_key(record):
+    try:
+        expected = _make_key(record)
+    except ValidationError:
+        with pytest.raises(ValidationError):
+            _fast_key_and_payload(record)
+    else:
+        assert _fast_key_and_payload(record)[0] == expected
+
+
+def test_match_pcid_batch_sends_misses_as_one_query():
+    class RecordingBackend:
+        dims = 8
+
+        def __init__(self):
+            self.batches = []
+
+        def query(self, vector, top_k=3, threshold=0.75):  # pragma: no cover - must not be used
+            raise AssertionError("query_many should be preferred")
+
+        def query_many(self, vectors, top_k=3, threshold=0.75):
+            self.batches.append(len(vectors))
+            return [[{"pcid": "PCID-V", "score": 0.9}] for _ in vectors]
+
+    backend = RecordingBackend()
+    index = {("widget", "acme", "usd"): "PCID-A"}
+    records = [
+        {"name": "Widget", "company": "ACME", "currency": "USD"},
+        {"name": "Other", "company": "ACME", "currency": "USD"},
+        {"name": "Third", "company": "ACME", "currency": "USD"},
+    ]
+
+    decisions = match_pcid_batch(records, index, backend)
+    assert decisions == [("PCID-A", 1.0), ("PCID-V", 0.9), ("PCID-V", 0.9)]
+    assert backend.batches == [2]
+
+
+def test_embedding_is_stable_across_processes():
+    script = (
+        "import json; from src.processors.vector_store import embed_pcid_record; "
+        "record = {'name': 'Amoxicilina 500', 'company': 'Bago', 'currency': 'ARS'}; "
+        "print(json.dumps(embed_pcid_record(record, 16)))"
+    )
+    outputs = set()
+    for seed in ("1", "2"):
+        env = {**os.environ, "PYTHONHASHSEED": seed}
+        proc = subprocess.run(
+            [sys.executable, "-c", script], env=env, capture_output=True, text=True, check=True
+        )
+        outputs.add(proc.stdout.strip())
+    assert len(outputs) == 1
+    assert json.loads(outputs.pop()) == embed_pcid_record(
+        {"name": "Amoxicilina 500", "company": "Bago", "currency": "ARS"}, dims=16
+    )
+
+
+def test_batch_embedding_matches_single_record_and_tolerates_typos():
+    records = [
+        {"name": "Amoxicilina 500 mg", "company": "Bago", "currency": "ARS"},
+        {"name": "Ibuprofeno forte", "company": "Roemmers", "currency": "ARS"},
+        {"name": "Amoxicilina 500 mg", "company": "Bago", "currency": "ARS"},
+    ]
+    batch = embed_pcid_records(records, dims=16)
+    assert batch.shape == (3, 40)
+    for row, record in zip(batch, records):
+        assert row.tolist() == pytest.approx(embed_pcid_record(record, dims=16), abs=1e-6)
+
+    store = MatrixPCIDVectorStore(dims=16)
+    store.populate_from_records(
+        [{**record, "pcid": f"PCID-{idx}"} for idx, record in enumerate(records[:2])]
+    )
+    typo = embed_pcid_record(
+        {"name": "Amoxicilin 500mg", "company": "Bago", "currency": "ARS"}, dims=16
+    )
+    assert store.query(typo, top_k=1, threshold=0.5)[0]["pcid"] == "PCID-0"
@@ -0,0 +1,110 @@
+"""Benchmark concurrent AlfaBeta detail-page extraction across a browser fleet.
+
+Each simulated browser is a ``FakeDriver`` whose ``get`` sleeps for a
+synthetic page latency, so the numbers reflect how well the fan-out hides
+navigation latency rather than real Chrome behaviour.
+
+Example:
+    python tools/bench_alfabeta_fleet.py --pages 200 --latency 0.05 --sessions 1 2 4 8
+"""
+from __future__ import annotations
+
+import argparse
+import os
+import sys
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import List, Optional
+
+REPO_ROOT = Path(__file__).resolve().parents[1]
+if str(REPO_ROOT) not in sys.path:
+    sys.path.insert(0, str(REPO_ROOT))
+
+os.environ.setdefault("SCRAPER_PLATFORM_DISABLE_DB", "1")
+
+from src.common.logging_utils import get_logger  # noqa: E402
+from src.engines.selenium_engine import BrowserSession, FakeDriver  # noqa: E402
+from src.resource_manager.browser_pool import BrowserPool  # noqa: E402
+from src.resource_manager.rate_limiter import RateLimiter  # noqa: E402
+from src.scrapers.alfabeta.pipeline import PipelineContext, parse_raw  # noqa: E402
+from src.versioning.version_manager import build_version_info  # noqa: E402
+
+log = get_logger("bench-alfabeta-fleet")
+
+
+class LatencyFakeDriver(FakeDriver):
+    """FakeDriver that simulates network/page-load latency on navigation."""
+
+    def __init__(self, latency: float):
+        super().__init__()
+        self.latency = latency
+
+    def get(self, url: str):
+        time.sleep(self.latency)
+        super().get(url)
+
+
+def _build_context(sessions: int, latency: float, max_qps: Optional[float]) -> PipelineContext:
+    ctx = PipelineContext(
+        source="alfabeta",
+        platform_config={},
+        source_config={},
+        selectors={},
+        run_id="bench",
+        version_info=build_version_info("alfabeta"),
+        driver=LatencyFakeDriver(latency),
+        base_url="https://example.com/companies",
+        pcid_index={},
+        pcid_vector_store=None,
+        pcid_min_similarity=0.8,
+        baseline_rows=0,
+        run_started_at=datetime.utcnow(),
+        rate_limiter=RateLimiter("bench", max_qps=max_qps, max_concurrent=None),
+    )
+    if sessions > 1:
+        ctx.browser_pool = BrowserPool(
+            lambda: BrowserSession(LatencyFakeDriver(latency)), size=sessions
+        )
+    return ctx
+
+
+def run_benchmark(
+    pages: int, latency: float, sessions: List[int], max_qps: Optional[float]
+) -> List[float]:
+    urls = [f"https://example.com/company/acme/product/{idx}" for idx in range(pages)]
+    timings: List[float] = []
+    for count in sessions:
+        ctx = _build_context(count, latency, max_qps)
+        start = time.perf_counter()
+        records = parse_raw(ctx, urls)
+        elapsed = time.perf_counter() - start
+        if ctx.browser_pool is not None:
+            ctx.browser_pool.close()
+        assert [r["product_url"] for r in records] == urls, "output order must match input order"
+        timings.append(elapsed)
+
+    baseline = timings[0] if timings else 0.0
+    print(f"{'sessions':>8} {'seconds':>9} {'pages/s':>9} {'speedup':>8}")
+    for count, elapsed in zip(sessions, timings):
+        speedup = baseline / elapsed if elapsed else 0.0
+        print(f"{count:>8} {elapsed:>9.2f} {pages / elapsed:>9.1f} {speedup:>7.2f}x")
+    return timings
+
+
+def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Benchmark AlfaBeta browser fleet extraction")
+    parser.add_argument("--pages", type=int, default=200, help="Number of detail pages to extract")
+    parser.add_argument(
+        "--latency", type=float, default=0.05, help="Synthetic seconds per page load"
+    )
+    parser.add_argument(
+        "--sessions", type=int, nargs="+", default=[1, 2, 4, 8], help="Fleet sizes to compare"
+    )
+    parser.add_argument("--max-qps", type=float, default=None, help="Optional per-source QPS cap")
+    return parser.parse_args(argv)
+
+
+if __name__ == "__main__":  # pragma: no cover
+    args = parse_args()
+    run_benchmark(args.pages, args.latency, args.sessions, args.max_qps)
@@ -0,0 +1,151 @@
+"""Compare peak RSS of batch vs streaming AlfaBeta pipeline runs.
+
+Navigation and extraction are replaced with synthetic stand-ins (no HTML
+parsing) so the measurement isolates how many records each mode keeps alive
+between stages. Each mode runs in a fresh subprocess and reports its
+``ru_maxrss``; the baseline RSS after imports is printed alongside.
+
+Example:
+    python tools/bench_alfabeta_streaming.py --records 200000
+"""
+from __future__ import annotations
+
+import argparse
+import os
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+REPO_ROOT = Path(__file__).resolve().parents[1]
+if str(REPO_ROOT) not in sys.path:
+    sys.path.insert(0, str(REPO_ROOT))
+
+os.environ.setdefault("SCRAPER_PLATFORM_DISABLE_DB", "1")
+
+_PER_COMPANY = 100
+
+
+def _peak_rss_mb() -> float:
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports KiB, macOS bytes.
+    return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+
+
+class _NullDriver:
+    def get(self, url: str) -> None:
+        return None
+
+
+def _run_mode(mode: str, records: int, output_dir: Path) -> None:
+    from src.scrapers.alfabeta import pipeline
+    from src.versioning.version_manager import build_version_info
+
+    companies = max(records // _PER_COMPANY, 1)
+
+    def _companies(driver, base_url, selectors, run_id=None) -> List[str]:
+        return [f"https://example.com/company/{idx}" for idx in range(companies)]
+
+    def _products(driver, company_url, selectors, run_id=None) -> List[str]:
+        return [f"{company_url}/product/{idx}" for idx in range(_PER_COMPANY)]
+
+    def _extract(driver, url, selectors, run_id) -> Dict[str, Any]:
+        return {
+            "product_url": url,
+            "name": f"Amoxicilina 500 mg x {url.rsplit('/', 1)[-1]}",
+            "lab_name": "Laboratorio Bago",
+            "presentation_raw": "Comprimidos recubiertos x 30 unidades",
+            "price": 1234.5,
+            "currency": "ARS",
+            "company": "Laboratorio Bago",
+            "scrape_run_id": run_id,
+        }
+
+    pipeline.fetch_company_urls = _companies
+    pipeline.fetch_product_urls = _products
+    pipeline.extract_product = _extract
+    pipeline.run_recorder.record_step = lambda *args, **kwargs: None
+    pipeline.run_recorder.finish_run = lambda *args, **kwargs: None
+    pipeline.record_run_cost = lambda *args, **kwargs: None
+
+    ctx = pipeline.PipelineContext(
+        source="alfabeta",
+        platform_config={},
+        source_config={},
+        selectors={},
+        run_id="bench",
+        version_info=build_version_info("alfabeta"),
+        driver=_NullDriver(),
+        base_url="https://example.com/companies",
+        pcid_index={},
+        pcid_vector_store=None,
+        pcid_min_similarity=0.8,
+        baseline_rows=0,
+        run_started_at=datetime.utcnow(),
+        output_dir=output_dir,
+    )
+
+    baseline = _peak_rss_mb()
+    start = time.perf_counter()
+    if mode == "stream":
+        out_path = pipeline.stream_records(ctx)
+    else:
+        listings = pipeline.fetch_listings(ctx)
+        details = pipeline.fetch_details(ctx, listings)
+        parsed = pipeline.parse_raw(ctx, details)
+        normalized = pipeline.normalize_records(ctx, parsed)
+        matched = pipeline.match_pcid(ctx, normalized)
+        final = pipeline.run_qc(ctx, matched)
+        out_path = pipeline.export_records(ctx, final)
+    elapsed = time.perf_counter() - start
+    rows = sum(1 for _ in out_path.open(encoding="utf-8")) - 1
+    print(f"{mode},{rows},{elapsed:.2f},{baseline:.1f},{_peak_rss_mb():.1f}")
+
+
+def run_benchmark(records: int, modes: List[str]) -> None:
+    print(f"records={records}")
+    print(f"{'mode':>8} {'rows':>8} {'seconds':>8} {'base MB':>8} {'peak MB':>8}")
+    for mode in modes:
+        with tempfile.TemporaryDirectory() as tmp:
+            proc = subprocess.run(
+                [
+                    sys.executable,
+                    __file__,
+                    "--child",
+                    mode,
+                    "--records",
+                    str(records),
+                    "--output-dir",
+                    tmp,
+                ],
+                capture_output=True,
+                text=True,
+                check=True,
+            )
+        name, rows, seconds, base, peak = proc.stdout.strip().splitlines()[-1].split(",")
+        print(f"{name:>8} {rows:>8} {seconds:>8} {base:>8} {peak:>8}")
+
+
+def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        description="Benchmark AlfaBeta batch vs streaming peak memory"
+    )
+    parser.add_argument("--records", type=int, default=200_000, help="Synthetic product records")
+    parser.add_argument(
+        "--modes", nargs="+", default=["batch", "stream"], choices=["batch", "stream"]
+    )
+    parser.add_argument("--child", choices=["batch", "stream"], help=argparse.SUPPRESS)
+    parser.add_argument("--output-dir", type=Path, help=argparse.SUPPRESS)
+    return parser.parse_args(argv)
+
+
+if __name__ == "__main__":  # pragma: no cover
+    args = parse_args()
+    if args.child:
+        _run_mode(args.child, args.records, args.output_dir)
+    else:
+        run_benchmark(args.records, args.modes)
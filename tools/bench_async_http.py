@@ -0,0 +1,177 @@
+"""Pages/sec of AsyncHttpEngine vs the blocking HttpEngine against a local server.
+
+A local aiohttp app stands in for a source site: every page sleeps
+``--latency-ms`` before returning ``--page-kb`` of HTML, which is what makes
+the fetch I/O-bound. ``HttpEngine`` is measured both sequentially and from a
+thread pool of ``--threads`` workers (how fleets run it today);
+``AsyncHttpEngine.fetch_many`` runs on a single thread with ``--concurrency``
+requests in flight, once per backend. The server runs in a child process so
+it does not compete for the client's GIL.
+
+Example:
+    python tools/bench_async_http.py --pages 2000 --latency-ms 50 --concurrency 200
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import logging
+import multiprocessing
+import socket
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import List, Optional
+
+REPO_ROOT = Path(__file__).resolve().parents[1]
+if str(REPO_ROOT) not in sys.path:
+    sys.path.insert(0, str(REPO_ROOT))
+
+from src.engines.async_http_engine import BACKENDS, AsyncHttpEngine  # noqa: E402
+from src.engines.base_engine import EngineConfig  # noqa: E402
+from src.engines.http_engine import HttpEngine  # noqa: E402
+
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def _serve(port: int, latency_s: float, page_kb: int) -> None:
+    from aiohttp import web
+
+    body = "<html><body>" + "x" * (page_kb * 1024) + "</body></html>"
+
+    async def page(_request):
+        await asyncio.sleep(latency_s)
+        return web.Response(text=body, content_type="text/html")
+
+    app = web.Application()
+    app.router.add_get("/p/{n}", page)
+    web.run_app(app, host="127.0.0.1", port=port, access_log=None, print=None, backlog=4096)
+
+
+def start_stand_in_server(port: int, latency_s: float, page_kb: int) -> multiprocessing.Process:
+    """Start the stand-in server in a child process and wait until it accepts."""
+
+    try:
+        import aiohttp  # noqa: F401
+    except ModuleNotFoundError as exc:  # pragma: no cover - bench-only dependency
+        raise SystemExit(
+            "bench_async_http needs aiohttp for the stand-in server: pip install aiohttp"
+        ) from exc
+
+    server = multiprocessing.Process(target=_serve, args=(port, latency_s, page_kb), daemon=True)
+    server.start()
+    deadline = time.monotonic() + 10
+    while time.monotonic() < deadline:
+        try:
+            socket.create_connection(("127.0.0.1", port), timeout=0.2).close()
+            return server
+        except OSError:
+            time.sleep(0.05)
+    server.terminate()
+    raise SystemExit("stand-in server did not start")
+
+
+def _report(label: str, pages: int, failures: int, elapsed: float) -> None:
+    print(f"{label:<34} {pages / elapsed:>10.1f} {elapsed:>9.2f} {failures:>9}")
+
+
+def bench_sync(urls: List[str], threads: int) -> None:
+    config = EngineConfig(max_retries=0)
+    with HttpEngine(config) as engine:
+        start = time.perf_counter()
+        failures = 0
+        for url in urls[: max(len(urls) // 10, 1)]:
+            failures += engine.fetch(url).status_code != 200
+        _report(
+            "HttpEngine sequential", max(len(urls) // 10, 1), failures, time.perf_counter() - start
+        )
+
+    # One engine (session) per worker: requests.Session is not thread-safe.
+    local = threading.local()
+    engines: List[HttpEngine] = []
+
+    def _fetch(url: str) -> int:
+        engine = getattr(local, "engine", None)
+        if engine is None:
+            engine = local.engine = HttpEngine(config)
+            engines.append(engine)
+        return engine.fetch(url).status_code
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=threads) as pool:
+        statuses = list(pool.map(_fetch, urls))
+    _report(
+        f"HttpEngine x{threads} threads",
+        len(urls),
+        sum(s != 200 for s in statuses),
+        time.perf_counter() - start,
+    )
+    for engine in engines:
+        engine.cleanup()
+
+
+def bench_async(urls: List[str], concurrency: int, per_host: int, backend: str) -> None:
+    async def _run() -> int:
+        engine = AsyncHttpEngine(
+            EngineConfig(max_retries=0),
+            max_connections=concurrency,
+            max_connections_per_host=per_host,
+            backend=backend,
+        )
+        async with engine:
+            failures = 0
+            async for outcome in engine.fetch_many(urls):
+                failures += getattr(outcome, "status_code", None) != 200
+        return failures
+
+    start = time.perf_counter()
+    failures = asyncio.run(_run())
+    _report(
+        f"AsyncHttpEngine {backend} c={concurrency}",
+        len(urls),
+        failures,
+        time.perf_counter() - start,
+    )
+
+
+def run_benchmark(
+    pages: int, latency_ms: float, page_kb: int, threads: int, concurrency: int, backends: List[str]
+) -> None:
+    # httpx logs every request at INFO, which would dominate the async timing.
+    logging.getLogger("httpx").setLevel(logging.WARNING)
+    port = _free_port()
+    server = start_stand_in_server(port, latency_ms / 1000.0, page_kb)
+    urls = [f"http://127.0.0.1:{port}/p/{idx}" for idx in range(pages)]
+
+    print(f"pages={pages} latency={latency_ms}ms page={page_kb}KB")
+    print(f"{'engine':<34} {'pages/s':>10} {'seconds':>9} {'failures':>9}")
+    bench_sync(urls, threads)
+    for backend in backends:
+        bench_async(urls, concurrency, per_host=concurrency, backend=backend)
+    server.terminate()
+
+
+def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Benchmark AsyncHttpEngine against HttpEngine")
+    parser.add_argument("--pages", type=int, default=2_000)
+    parser.add_argument("--latency-ms", type=float, default=50.0, help="Server-side delay per page")
+    parser.add_argument("--page-kb", type=int, default=20, help="Response body size")
+    parser.add_argument("--threads", type=int, default=16, help="Thread pool size for HttpEngine")
+    parser.add_argument(
+        "--concurrency", type=int, default=200, help="In-flight requests for fetch_many"
+    )
+    parser.add_argument("--backend", nargs="+", default=list(BACKENDS), choices=BACKENDS)
+    return parser.parse_args(argv)
+
+
+if __name__ == "__main__":  # pragma: no cover
+    args = parse_args()
+    run_benchmark(
+        args.pages, args.latency_ms, args.page_kb, args.threads, args.concurrency, args.backend
+    )
@@ -0,0 +1,150 @@
+"""Benchmark the DSL ExecutionEngine on wide synthetic DAGs.
+
+Scenarios (each built from the synthetic components below):
+
+- ``overhead``: ``--width`` x ``--depth`` layers of no-op steps, each
+  depending on one step of the previous layer; reports scheduling cost/step.
+- ``side_effects``: ``--width`` independent fetch -> export chains whose
+  steps sleep ``--latency`` seconds. Exports used to run inline and one at a
+  time, so the serial export time is printed as the old lower bound.
+- ``cpu``: ``--cpu-steps`` CPU-bound steps on the thread vs process executor.
+- ``asyncio``: ``--width`` awaitable sleep steps on the thread vs asyncio
+  executor with a small thread pool.
+
+Example:
+    python tools/bench_dag_executor.py --width 200 --depth 5 --latency 0.02
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import os
+import sys
+import time
+from pathlib import Path
+from typing import List, Optional
+
+REPO_ROOT = Path(__file__).resolve().parents[1]
+if str(REPO_ROOT) not in sys.path:
+    sys.path.insert(0, str(REPO_ROOT))
+
+from src.core_kernel import ComponentRegistry, ExecutionEngine  # noqa: E402
+from src.core_kernel.pipeline_compiler import CompiledPipeline, CompiledStep  # noqa: E402
+
+_MODULE = "tools.bench_dag_executor"
+
+
+def noop() -> None:
+    return None
+
+
+def sleep_step(seconds: float = 0.0) -> float:
+    time.sleep(seconds)
+    return seconds
+
+
+async def async_sleep_step(seconds: float = 0.0) -> float:
+    await asyncio.sleep(seconds)
+    return seconds
+
+
+def cpu_step(rounds: int = 2_000_000) -> int:
+    total = 0
+    for value in range(rounds):
+        total = (total + value * value) % 1_000_003
+    return total
+
+
+def _registry() -> ComponentRegistry:
+    registry = ComponentRegistry()
+    registry.register("noop", _MODULE, "noop", type="transform")
+    registry.register("fetch", _MODULE, "sleep_step", type="fetch")
+    registry.register("export", _MODULE, "sleep_step", type="export")
+    registry.register("cpu", _MODULE, "cpu_step", type="transform")
+    registry.register("async_sleep", _MODULE, "async_sleep_step", type="fetch")
+    return registry
+
+
+def _step(registry, step_id, component, depends_on=(), params=None, executor=None) -> CompiledStep:
+    comp = registry.get(component)
+    return CompiledStep(
+        id=step_id,
+        component=comp,
+        params=params or {},
+        depends_on=list(depends_on),
+        step_type=comp.type,
+        executor=executor,
+    )
+
+
+def _timed(engine: ExecutionEngine, steps: List[CompiledStep]) -> float:
+    pipeline = CompiledPipeline(name="bench", description="", steps=steps, variants=[])
+    start = time.perf_counter()
+    engine.execute(pipeline)
+    return time.perf_counter() - start
+
+
+def run_benchmark(width: int, depth: int, latency: float, cpu_steps: int, cpu_rounds: int) -> None:
+    registry = _registry()
+    engine = ExecutionEngine(registry)
+
+    steps = []
+    for layer in range(depth):
+        for col in range(width):
+            deps = [f"n{layer - 1}_{col}"] if layer else []
+            steps.append(_step(registry, f"n{layer}_{col}", "noop", deps))
+    elapsed = _timed(engine, steps)
+    print(
+        f"overhead: {len(steps)} no-op steps in {elapsed:.3f}s "
+        f"({elapsed / len(steps) * 1e6:.0f} us/step)"
+    )
+
+    steps = []
+    for col in range(width):
+        params = {"seconds": latency}
+        steps.append(_step(registry, f"fetch_{col}", "fetch", params=params))
+        steps.append(_step(registry, f"export_{col}", "export", [f"fetch_{col}"], params=params))
+    elapsed = _timed(engine, steps)
+    print(
+        f"side_effects: {len(steps)} steps in {elapsed:.2f}s "
+        f"(serial exports alone would take >= {width * latency:.2f}s)"
+    )
+
+    for executor in ("thread", "process"):
+        steps = [
+            _step(registry, f"cpu_{idx}", "cpu", params={"rounds": cpu_rounds}, executor=executor)
+            for idx in range(cpu_steps)
+        ]
+        elapsed = _timed(engine, steps)
+        print(f"cpu[{executor}]: {cpu_steps} steps in {elapsed:.2f}s on {os.cpu_count()} cores")
+
+    small = ExecutionEngine(registry, max_workers=8)
+    for executor in ("thread", "asyncio"):
+        component = "fetch" if executor == "thread" else "async_sleep"
+        steps = [
+            _step(registry, f"io_{idx}", component, params={"seconds": latency}, executor=executor)
+            for idx in range(width)
+        ]
+        elapsed = _timed(small, steps)
+        print(f"io[{executor}, 8 threads]: {width} sleep steps in {elapsed:.2f}s")
+
+
+def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Benchmark the DSL execution engine on wide DAGs")
+    parser.add_argument(
+        "--width", type=int, default=200, help="Steps per DAG layer / independent chains"
+    )
+    parser.add_argument("--depth", type=int, default=5, help="Layers in the no-op overhead DAG")
+    parser.add_argument(
+        "--latency", type=float, default=0.02, help="Seconds slept by I/O-style steps"
+    )
+    parser.add_argument("--cpu-steps", type=int, default=8, help="CPU-bound steps to run")
+    parser.add_argument(
+        "--cpu-rounds", type=int, default=2_000_000, help="Loop iterations per CPU step"
+    )
+    return parser.parse_args(argv)
+
+
+if __name__ == "__main__":  # pragma: no cover
+    args = parse_args()
+    run_benchmark(args.width, args.depth, args.latency, args.cpu_steps, args.cpu_rounds)
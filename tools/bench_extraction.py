@@ -0,0 +1,110 @@
+"""Field extraction throughput: BeautifulSoup per-field selects vs a compiled lxml plan.
+
+The corpus is every ``src/scrapers/alfabeta/samples/*.html`` page plus a
+synthetic listing of ``--rows`` product rows (the samples are tiny; real
+listing pages carry hundreds of rows), repeated to ``--pages`` pages. Each page
+is asked for the product detail fields and every product link, the way
+``extract_product`` and ``fetch_product_urls`` do:
+
+- ``bs4``: ``BeautifulSoup(html, "lxml")`` and one ``select_one``/``select`` per
+  field (the previous implementation);
+- ``plan``: :func:`compile_plan` once, then one ``lxml.html`` parse and a
+  precompiled XPath per field;
+- ``plan-pool``: the same plan through :func:`extract_many` with ``--workers``
+  processes.
+
+Results are checked against each other before timings are printed.
+
+Example:
+    python tools/bench_extraction.py --pages 2000 --rows 200 --workers 4
+"""
+from __future__ import annotations
+
+import argparse
+import os
+import sys
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+REPO_ROOT = Path(__file__).resolve().parents[1]
+if str(REPO_ROOT) not in sys.path:
+    sys.path.insert(0, str(REPO_ROOT))
+
+from bs4 import BeautifulSoup  # noqa: E402
+
+from src.processors.parse.extraction import Field, compile_plan, extract_many  # noqa: E402
+from src.scrapers.alfabeta.alfabeta_full_impl import PRODUCT_FIELDS  # noqa: E402
+
+SAMPLES_DIR = REPO_ROOT / "src" / "scrapers" / "alfabeta" / "samples"
+LINK_SELECTOR = "a.product-link"
+FIELDS = {**PRODUCT_FIELDS, "links": Field(LINK_SELECTOR, attr="href", many=True)}
+
+
+def synthetic_listing(rows: int) -> str:
+    body = "\n".join(
+        f'<tr data-row="{i}">'
+        f'<td><a class="product-link" href="/company/acme/product/p{i}">Product {i}</a></td>'
+        f'<td class="lab">Lab {i % 17}</td><td class="price">ARS {i * 3.5:.2f}</td></tr>'
+        for i in range(rows)
+    )
+    return (
+        "<!doctype html><html><head><script>window.t=1</script></head>"
+        f"<body><table>{body}</table></body></html>"
+    )
+
+
+def build_corpus(pages: int, rows: int) -> List[str]:
+    templates = [path.read_text(encoding="utf-8") for path in sorted(SAMPLES_DIR.glob("*.html"))]
+    templates.append(synthetic_listing(rows))
+    return [templates[i % len(templates)] for i in range(pages)]
+
+
+def extract_bs4(html: str) -> Dict[str, Any]:
+    soup = BeautifulSoup(html, "lxml")
+    record: Dict[str, Any] = {}
+    for name, field in PRODUCT_FIELDS.items():
+        node = soup.select_one(field.selector)
+        record[name] = node.get_text(strip=True) if node else None
+    record["links"] = [a.get("href") for a in soup.select(LINK_SELECTOR) if a.get("href")]
+    return record
+
+
+def _timed(label: str, pages: int, func) -> List[Dict[str, Any]]:
+    started = time.perf_counter()
+    records = func()
+    elapsed = time.perf_counter() - started
+    print(f"{label:<10} {pages:>7} {elapsed:>9.2f} {pages / elapsed:>11.0f}")
+    return records
+
+
+def run_benchmark(pages: int, rows: int, workers: int) -> None:
+    corpus = build_corpus(pages, rows)
+    plan = compile_plan(FIELDS)
+    size_mb = sum(len(html) for html in corpus) / 1e6
+    print(f"pages={pages} listing_rows={rows} corpus={size_mb:.1f}MB workers={workers}")
+    print(f"{'extractor':<10} {'pages':>7} {'seconds':>9} {'pages/s':>11}")
+    baseline = _timed("bs4", pages, lambda: [extract_bs4(html) for html in corpus])
+    compiled = _timed("plan", pages, lambda: [plan.extract(html) for html in corpus])
+    pooled = _timed("plan-pool", pages, lambda: extract_many(plan, corpus, workers=workers))
+    if not baseline == compiled == pooled:
+        raise SystemExit("extractors disagree")
+
+
+def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        description="Benchmark compiled lxml extraction against BeautifulSoup"
+    )
+    parser.add_argument("--pages", type=int, default=2000)
+    parser.add_argument(
+        "--rows", type=int, default=200, help="Product rows on the synthetic listing page"
+    )
+    parser.add_argument(
+        "--workers", type=int, default=os.cpu_count() or 2, help="Processes for plan-pool"
+    )
+    return parser.parse_args(argv)
+
+
+if __name__ == "__main__":  # pragma: no cover
+    args = parse_args()
+    run_benchmark(args.pages, args.rows, args.workers)
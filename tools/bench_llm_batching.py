@@ -0,0 +1,121 @@
+"""LLM QC throughput: one request per record vs packed, concurrent batches.
+
+Runs ``--records`` synthetic product records through LLM QC against a local
+OpenAI-compatible stand-in (:class:`LocalOpenAIServer`) that answers after
+``--latency`` seconds plus ``--per-item-latency`` per packed item, and
+refuses with 429 beyond ``--server-concurrency`` in-flight requests or
+``--server-rps`` requests/second. Strategies:
+
+- ``serial``: :func:`validate_record_with_llm` per record (the previous path);
+- ``concurrent``: :class:`LLMBatcher` with batches of one record, ``--workers`` threads;
+- ``batched``: batches of ``--batch-size`` records, ``--workers`` threads.
+
+The response cache is off so every strategy pays for every request. Requires
+the ``openai`` package.
+
+Example:
+    python tools/bench_llm_batching.py --records 400 --latency 0.1 --workers 8 --batch-size 20
+"""
+from __future__ import annotations
+
+import argparse
+import sys
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+REPO_ROOT = Path(__file__).resolve().parents[1]
+if str(REPO_ROOT) not in sys.path:
+    sys.path.insert(0, str(REPO_ROOT))
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+from openai_standin import LocalOpenAIServer  # noqa: E402
+
+from src.processors.llm.llm_batch import LLMBatcher, ProviderLimits  # noqa: E402
+from src.processors.llm.llm_client import LLMClient  # noqa: E402
+from src.processors.qc.llm_qc import (  # noqa: E402
+    validate_record_with_llm,
+    validate_records_with_llm,
+)
+
+STRATEGIES = ["serial", "concurrent", "batched"]
+REQUIRED_FIELDS = ["name", "price"]
+
+
+def synthetic_records(count: int) -> List[Dict[str, Any]]:
+    return [
+        {
+            "name": f"Product {i}",
+            "company": f"Lab {i % 37}",
+            "presentation": "Box of 20 tablets",
+            "price": 10 + i,
+        }
+        for i in range(count)
+    ]
+
+
+def run_strategy(name: str, args: argparse.Namespace, base_url: str) -> Dict[str, float]:
+    client = LLMClient(
+        api_key="standin", base_url=base_url, temperature=0.0, use_cache=False, max_retries=0
+    )
+    records = synthetic_records(args.records)
+    started = time.perf_counter()
+    if name == "serial":
+        results = [validate_record_with_llm(record, REQUIRED_FIELDS, client) for record in records]
+    else:
+        size = 1 if name == "concurrent" else args.batch_size
+        limits = ProviderLimits(f"bench-{name}", max_concurrent=args.workers)
+        with LLMBatcher(client, size=size, workers=args.workers, limits=limits) as batcher:
+            results = validate_records_with_llm(records, REQUIRED_FIELDS, client, batcher=batcher)
+    return {"seconds": time.perf_counter() - started, "records": len(results)}
+
+
+def run_benchmark(args: argparse.Namespace) -> None:
+    print(
+        f"records={args.records} latency={args.latency}s per_item={args.per_item_latency}s "
+        f"workers={args.workers} batch_size={args.batch_size} "
+        f"server_concurrency={args.server_concurrency} server_rps={args.server_rps}"
+    )
+    print(
+        f"{'strategy':<11} {'requests':>8} {'429s':>6} {'seconds':>8} "
+        f"{'records/s':>10} {'20k records':>12}"
+    )
+    for name in args.strategies:
+        with LocalOpenAIServer(
+            latency=args.latency,
+            per_item_latency=args.per_item_latency,
+            max_concurrent=args.server_concurrency,
+            requests_per_second=args.server_rps,
+        ) as server:
+            result = run_strategy(name, args, server.base_url)
+            stats = server.stats
+        rate = result["records"] / result["seconds"]
+        print(
+            f"{name:<11} {stats['requests'] - stats['throttled']:>8} {stats['throttled']:>6} "
+            f"{result['seconds']:>8.2f} {rate:>10.1f} {20000 / rate / 3600:>10.2f} h"
+        )
+
+
+def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        description="Benchmark batched/concurrent LLM QC against a local stand-in"
+    )
+    parser.add_argument("--records", type=int, default=200)
+    parser.add_argument("--latency", type=float, default=0.1, help="Stand-in seconds per request")
+    parser.add_argument(
+        "--per-item-latency", type=float, default=0.005, help="Extra seconds per packed item"
+    )
+    parser.add_argument("--workers", type=int, default=8)
+    parser.add_argument("--batch-size", type=int, default=20)
+    parser.add_argument(
+        "--server-concurrency", type=int, default=6, help="In-flight requests before 429s"
+    )
+    parser.add_argument(
+        "--server-rps", type=float, default=None, help="Stand-in requests/second before 429s"
+    )
+    parser.add_argument("--strategies", nargs="+", choices=STRATEGIES, default=STRATEGIES)
+    return parser.parse_args(argv)
+
+
+if __name__ == "__main__":  # pragma: no cover
+    run_benchmark(parse_args())
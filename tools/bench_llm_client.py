@@ -0,0 +1,110 @@
+"""LLMClient per-call overhead: a new SDK client per request vs the pooled client.
+
+Sends ``--calls`` completions to a local OpenAI-compatible stand-in
+(:class:`LocalOpenAIServer`) that answers after ``--latency`` seconds, so with
+the default of 0 the time per call is client overhead. Strategies:
+
+- ``per-call``: the previous behaviour, a fresh SDK client and connection per call;
+- ``pooled``: one long-lived client on a keep-alive pool, sequential calls;
+- ``threads``: the pooled client shared by ``--concurrency`` threads;
+- ``async``: :meth:`LLMClient.acomplete`, ``--concurrency`` calls in flight.
+
+The response cache is off. Requires the ``openai`` package.
+
+Example:
+    python tools/bench_llm_client.py --calls 300 --concurrency 8
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import logging
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import List, Optional
+
+REPO_ROOT = Path(__file__).resolve().parents[1]
+if str(REPO_ROOT) not in sys.path:
+    sys.path.insert(0, str(REPO_ROOT))
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+from openai_standin import LocalOpenAIServer  # noqa: E402
+
+from src.observability import metrics  # noqa: E402
+from src.processors.llm.llm_client import LLMClient  # noqa: E402
+
+STRATEGIES = ["per-call", "pooled", "threads", "async"]
+
+
+def run_strategy(name: str, args: argparse.Namespace, base_url: str) -> float:
+    client = LLMClient(
+        api_key="standin", model=f"bench-{name}", base_url=base_url, use_cache=False, max_retries=0
+    )
+    prompts = [f"Check record {i}" for i in range(args.calls)]
+    started = time.perf_counter()
+    if name == "per-call":
+        for prompt in prompts:
+            client.complete(prompt)
+            client.close()  # the next call builds a new client, as _get_client() used to
+    elif name == "pooled":
+        for prompt in prompts:
+            client.complete(prompt)
+    elif name == "threads":
+        with ThreadPoolExecutor(args.concurrency) as pool:
+            list(pool.map(client.complete, prompts))
+    else:
+        async def run() -> None:
+            gate = asyncio.Semaphore(args.concurrency)
+
+            async def one(prompt: str) -> str:
+                async with gate:
+                    return await client.acomplete(prompt)
+
+            await asyncio.gather(*(one(prompt) for prompt in prompts))
+            await client.aclose()
+
+        asyncio.run(run())
+    seconds = time.perf_counter() - started
+    client.close()
+    return seconds
+
+
+def run_benchmark(args: argparse.Namespace) -> None:
+    logging.getLogger("httpx").setLevel(logging.WARNING)
+    logging.getLogger("httpx2").setLevel(logging.WARNING)
+    print(f"calls={args.calls} latency={args.latency}s concurrency={args.concurrency}")
+    print(
+        f"{'strategy':<9} {'seconds':>8} {'calls/s':>8} {'ms/call':>8} "
+        f"{'overhead ms':>12} {'p95 request ms':>15}"
+    )
+    for name in args.strategies:
+        with LocalOpenAIServer(latency=args.latency) as server:
+            seconds = run_strategy(name, args, server.base_url)
+        histograms = metrics.dump_metrics()["histograms"]
+        [histogram] = [h for h in histograms if h.labels.get("model") == f"bench-{name}"]
+        per_call = seconds / args.calls * 1000
+        overhead = per_call - args.latency * 1000
+        p95 = (histogram.percentile(0.95) or 0.0) * 1000
+        print(
+            f"{name:<9} {seconds:>8.2f} {args.calls / seconds:>8.1f} {per_call:>8.2f} "
+            f"{overhead:>12.2f} {p95:>15.1f}"
+        )
+
+
+def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        description="Benchmark LLMClient connection reuse against a local stand-in"
+    )
+    parser.add_argument("--calls", type=int, default=200)
+    parser.add_argument("--latency", type=float, default=0.0, help="Stand-in seconds per request")
+    parser.add_argument(
+        "--concurrency", type=int, default=8, help="Threads / in-flight async calls"
+    )
+    parser.add_argument("--strategies", nargs="+", choices=STRATEGIES, default=STRATEGIES)
+    return parser.parse_args(argv)
+
+
+if __name__ == "__main__":  # pragma: no cover
+    run_benchmark(parse_args())
@@ -0,0 +1,105 @@
+"""Benchmark ``parallel:`` DSL steps for unify_record and run_qc_batch.
+
+Each component runs as a single-process step and then as a ``parallel``
+process-pool step at several worker counts over the same synthetic records,
+so the table shows how the step scales with cores (pickling the shards to
+and from workers is included in the timings).
+
+Example:
+    python tools/bench_parallel_steps.py --records 1000000 --workers 1 2 4 8
+"""
+from __future__ import annotations
+
+import argparse
+import os
+import sys
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+REPO_ROOT = Path(__file__).resolve().parents[1]
+if str(REPO_ROOT) not in sys.path:
+    sys.path.insert(0, str(REPO_ROOT))
+
+from src.core_kernel import ComponentRegistry, ExecutionEngine  # noqa: E402
+from src.core_kernel.pipeline_compiler import CompiledPipeline, CompiledStep  # noqa: E402
+
+
+def _records(count: int) -> List[Dict[str, Any]]:
+    return [
+        {
+            "product_url": f"https://example.com/company/{idx % 500}/product/{idx}",
+            "name": f"Amoxicilina {idx % 1000} mg",
+            "company": "Laboratorio Bago",
+            "price": 100.0 + idx % 997,
+            "currency": "ARS",
+        }
+        for idx in range(count)
+    ]
+
+
+def _run(
+    engine: ExecutionEngine, registry: ComponentRegistry, component: str, records, parallel, apply
+) -> float:
+    input_param = "raw" if apply == "each" else "records"
+    step = CompiledStep(
+        id=component,
+        component=registry.get(component),
+        params={input_param: records},
+        depends_on=[],
+        step_type="transform",
+        parallel={**parallel, "input": input_param, "apply": apply} if parallel else None,
+    )
+    if not parallel and apply == "each":
+        # A plain step is a single call; emulate today's one-core map directly.
+        func = registry.resolve_callable(component)
+        start = time.perf_counter()
+        [func(record) for record in records]
+        return time.perf_counter() - start
+    pipeline = CompiledPipeline(name="bench", description="", steps=[step], variants=[])
+    start = time.perf_counter()
+    engine.execute(pipeline)
+    return time.perf_counter() - start
+
+
+def run_benchmark(records: int, workers: List[int], chunk_size: int) -> None:
+    registry = ComponentRegistry()
+    registry.register(
+        "unify_record", "src.processors.unify_fields", "unify_record", type="normalize"
+    )
+    registry.register("run_qc_batch", "src.processors.qc", "run_qc_batch", type="qc")
+    engine = ExecutionEngine(registry)
+    data = _records(records)
+
+    print(f"records={records} chunk_size={chunk_size} cores={os.cpu_count()}")
+    print(f"{'component':>14} {'workers':>8} {'seconds':>8} {'records/s':>11} {'speedup':>8}")
+    for component, apply in (("unify_record", "each"), ("run_qc_batch", "chunk")):
+        baseline = _run(engine, registry, component, data, None, apply)
+        print(
+            f"{component:>14} {'serial':>8} {baseline:>8.2f} {records / baseline:>11,.0f} "
+            f"{1.0:>7.2f}x"
+        )
+        for count in workers:
+            parallel = {"mode": "process", "chunk_size": chunk_size, "workers": count}
+            elapsed = _run(engine, registry, component, data, parallel, apply)
+            print(
+                f"{component:>14} {count:>8} {elapsed:>8.2f} {records / elapsed:>11,.0f} "
+                f"{baseline / elapsed:>7.2f}x"
+            )
+
+
+def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Benchmark parallel DSL steps")
+    parser.add_argument(
+        "--records", type=int, default=1_000_000, help="Number of synthetic records"
+    )
+    parser.add_argument(
+        "--workers", type=int, nargs="+", default=[1, 2, 4, 8], help="Worker counts to compare"
+    )
+    parser.add_argument("--chunk-size", type=int, default=10_000, help="Records per shard")
+    return parser.parse_args(argv)
+
+
+if __name__ == "__main__":  # pragma: no cover
+    args = parse_args()
+    run_benchmark(args.records, args.workers, args.chunk_size)
@@ -0,0 +1,125 @@
+"""Recall@1 vs latency for the IVF PCID backend against exact matrix search.
+
+Queries are perturbed copies of master rows (extra/missing tokens), matched
+once with exact search and then with IVF at several ``nprobe`` settings.
+``recall@1`` counts queries whose IVF top hit scores as high as the exact top
+hit (ties between equally similar rows count as hits);
+``recall@thr`` restricts that to queries whose exact best clears
+``--threshold`` (the ``pcid_min_similarity`` operating point).
+
+Example:
+    python tools/bench_pcid_ann.py --master 1000000 --queries 2000 --nprobe 1 4 16 64
+"""
+from __future__ import annotations
+
+import argparse
+import random
+import sys
+import time
+from pathlib import Path
+from typing import Dict, List, Optional
+
+REPO_ROOT = Path(__file__).resolve().parents[1]
+if str(REPO_ROOT) not in sys.path:
+    sys.path.insert(0, str(REPO_ROOT))
+
+from src.processors.vector_store import (  # noqa: E402
+    IVFPCIDVectorBackend,
+    MatrixPCIDVectorStore,
+    embed_pcid_record,
+)
+
+_WORDS = [
+    "amoxicilina", "ibuprofeno", "paracetamol", "omeprazol", "losartan", "metformina",
+    "atorvastatina", "enalapril", "clonazepam", "levotiroxina", "tabletas", "capsulas",
+    "jarabe", "forte", "retard", "plus", "mg", "ml", "x10", "x20", "x30", "500", "250",
+]
+_LABS = ["Bago", "Roemmers", "Elea", "Gador", "Bayer", "Pfizer", "Sanofi", "Raffo", "Casasco"]
+
+
+def _record(rng: random.Random, idx: int) -> Dict[str, str]:
+    name = " ".join(rng.choice(_WORDS) for _ in range(rng.randint(2, 5)))
+    return {
+        "pcid": f"PCID-{idx:07d}",
+        "name": f"{name} {idx}",
+        "company": rng.choice(_LABS),
+        "currency": "ARS",
+    }
+
+
+def _perturb(rng: random.Random, record: Dict[str, str]) -> Dict[str, str]:
+    tokens = record["name"].split()
+    if len(tokens) > 2 and rng.random() < 0.5:
+        tokens.pop(rng.randrange(len(tokens) - 1))
+    if rng.random() < 0.5:
+        tokens.append(rng.choice(_WORDS))
+    return {**record, "name": " ".join(tokens)}
+
+
+def run_benchmark(
+    master: int,
+    queries: int,
+    dims: int,
+    nlist: Optional[int],
+    nprobes: List[int],
+    threshold: float,
+    seed: int,
+) -> None:
+    rng = random.Random(seed)
+    records = [_record(rng, idx) for idx in range(master)]
+    store = MatrixPCIDVectorStore(dims=dims)
+    store.add_many(
+        [rec["pcid"] for rec in records],
+        [embed_pcid_record(rec, dims=dims) for rec in records],
+    )
+    query_vectors = [
+        embed_pcid_record(_perturb(rng, rng.choice(records)), dims=dims) for _ in range(queries)
+    ]
+
+    start = time.perf_counter()
+    exact = store.query_many(query_vectors, top_k=1, threshold=0.0)
+    exact_ms = (time.perf_counter() - start) / queries * 1000
+    exact_top = [rows[0]["score"] if rows else None for rows in exact]
+    above = [bool(rows) and rows[0]["score"] >= threshold for rows in exact]
+
+    start = time.perf_counter()
+    ivf = IVFPCIDVectorBackend(store, nlist=nlist, nprobe=1).train()
+    train_s = time.perf_counter() - start
+
+    print(f"master={master} queries={queries} dims={dims} nlist={ivf.nlist} train={train_s:.1f}s")
+    print(f"{'nprobe':>7} {'ms/query':>9} {'recall@1':>9} {'recall@thr':>11}")
+    print(f"{'exact':>7} {exact_ms:>9.3f} {1.0:>9.3f} {1.0:>11.3f}")
+    for nprobe in nprobes:
+        ivf.nprobe = nprobe
+        start = time.perf_counter()
+        approx = ivf.query_many(query_vectors, top_k=1, threshold=0.0)
+        approx_ms = (time.perf_counter() - start) / queries * 1000
+        approx_top = [rows[0]["score"] if rows else None for rows in approx]
+        hits = [
+            a is not None and e is not None and a >= e - 1e-6 for a, e in zip(approx_top, exact_top)
+        ]
+        recall = sum(hits) / max(len(hits), 1)
+        thr_hits = [hit for hit, ok in zip(hits, above) if ok]
+        recall_thr = sum(thr_hits) / max(len(thr_hits), 1)
+        print(f"{nprobe:>7} {approx_ms:>9.3f} {recall:>9.3f} {recall_thr:>11.3f}")
+
+
+def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Benchmark IVF PCID recall vs latency")
+    parser.add_argument("--master", type=int, default=200_000, help="Number of PCID master rows")
+    parser.add_argument("--queries", type=int, default=2_000, help="Number of similarity queries")
+    parser.add_argument("--dims", type=int, default=48, help="Hash embedding dims per field")
+    parser.add_argument("--nlist", type=int, default=None, help="IVF cells (default ~4*sqrt(rows))")
+    parser.add_argument("--nprobe", type=int, nargs="+", default=[1, 2, 4, 8, 16, 32, 64])
+    parser.add_argument(
+        "--threshold", type=float, default=0.8, help="pcid_min_similarity operating point"
+    )
+    parser.add_argument("--seed", type=int, default=5)
+    return parser.parse_args(argv)
+
+
+if __name__ == "__main__":  # pragma: no cover
+    args = parse_args()
+    run_benchmark(
+        args.master, args.queries, args.dims, args.nlist, args.nprobe, args.threshold, args.seed
+    )
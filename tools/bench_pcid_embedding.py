@@ -0,0 +1,138 @@
+"""Benchmark PCID embedding throughput and typo-tolerant matching quality.
+
+Compares the previous word-only embedding (builtin ``hash`` per token, salted
+per process) against the current stable word + character n-gram embedding:
+
+- throughput of ``embed_pcid_record`` cold and with a warm string cache, and of
+  the batched ``embed_pcid_records``;
+- top-1 accuracy when matching typo'd / re-spaced copies of master rows.
+
+Example:
+    python tools/bench_pcid_embedding.py --master 50000 --queries 5000
+"""
+from __future__ import annotations
+
+import argparse
+import random
+import sys
+import time
+from pathlib import Path
+from typing import Callable, Dict, List, Mapping, Optional
+
+REPO_ROOT = Path(__file__).resolve().parents[1]
+if str(REPO_ROOT) not in sys.path:
+    sys.path.insert(0, str(REPO_ROOT))
+
+from src.processors import vector_store as vector_store_module  # noqa: E402
+from src.processors.vector_store import (  # noqa: E402
+    MatrixPCIDVectorStore,
+    _normalize,
+    embed_pcid_record,
+    embed_pcid_records,
+)
+
+_WORDS = [
+    "amoxicilina", "ibuprofeno", "paracetamol", "omeprazol", "losartan", "metformina",
+    "atorvastatina", "enalapril", "clonazepam", "levotiroxina", "tabletas", "capsulas",
+    "jarabe", "forte", "retard", "plus", "mg", "ml", "x10", "x20", "x30", "500", "250",
+]
+_LABS = ["Bago", "Roemmers", "Elea", "Gador", "Bayer", "Pfizer", "Sanofi", "Raffo", "Casasco"]
+
+
+def _legacy_text_vector(text: str, dims: int) -> List[float]:
+    vec = [0.0] * dims
+    for token in text.lower().split():
+        vec[hash(token) % dims] += 1.0
+    return vec
+
+
+def _legacy_embedding(record: Mapping[str, str], dims: int) -> List[float]:
+    return _normalize(
+        _legacy_text_vector(record.get("name") or "", dims)
+        + _legacy_text_vector(record.get("company") or "", dims)
+        + _legacy_text_vector(record.get("currency") or "", dims // 2)
+    )
+
+
+def _record(rng: random.Random, idx: int) -> Dict[str, str]:
+    name = " ".join(rng.choice(_WORDS) for _ in range(rng.randint(2, 4)))
+    return {
+        "pcid": f"PCID-{idx:07d}",
+        "name": f"{name} {idx}",
+        "company": rng.choice(_LABS),
+        "currency": "ARS",
+    }
+
+
+def _typo(rng: random.Random, record: Dict[str, str]) -> Dict[str, str]:
+    tokens = record["name"].split()
+    victim = rng.randrange(len(tokens) - 1)
+    word = tokens[victim]
+    if len(word) > 3:
+        cut = rng.randrange(1, len(word) - 1)
+        tokens[victim] = word[:cut] + word[cut + 1 :]
+    if rng.random() < 0.5 and len(tokens) > 2:
+        tokens[0:2] = [tokens[0] + tokens[1]]
+    return {**record, "name": " ".join(tokens)}
+
+
+def _throughput(label: str, fn: Callable[[], object], count: int) -> None:
+    start = time.perf_counter()
+    fn()
+    elapsed = time.perf_counter() - start
+    print(f"{label:<22} {count / max(elapsed, 1e-9):>12,.0f} records/s")
+
+
+def _top1_accuracy(
+    embed: Callable[[Mapping[str, str], int], List[float]], master, queries, dims: int
+) -> float:
+    store = MatrixPCIDVectorStore(dims=dims)
+    store.add_many([rec["pcid"] for rec in master], [embed(rec, dims) for rec in master])
+    results = store.query_many(
+        [embed(query, dims) for query, _pcid in queries], top_k=1, threshold=0.0
+    )
+    hits = sum(
+        1 for rows, (_query, pcid) in zip(results, queries) if rows and rows[0]["pcid"] == pcid
+    )
+    return hits / max(len(queries), 1)
+
+
+def run_benchmark(master: int, queries: int, dims: int, seed: int) -> None:
+    rng = random.Random(seed)
+    records = [_record(rng, idx) for idx in range(master)]
+    typo_queries = [
+        (_typo(rng, row), row["pcid"]) for row in (rng.choice(records) for _ in range(queries))
+    ]
+
+    print(f"master={master} queries={queries} dims={dims}")
+    _throughput(
+        "legacy word-hash", lambda: [_legacy_embedding(rec, dims) for rec in records], master
+    )
+    vector_store_module._text_vector_cached.cache_clear()
+    vector_store_module._record_embedding_cached.cache_clear()
+    _throughput(
+        "n-gram (cold cache)", lambda: [embed_pcid_record(rec, dims) for rec in records], master
+    )
+    _throughput(
+        "n-gram (warm cache)", lambda: [embed_pcid_record(rec, dims) for rec in records], master
+    )
+    vector_store_module._text_vector_cached.cache_clear()
+    _throughput("n-gram batch (cold)", lambda: embed_pcid_records(records, dims), master)
+
+    legacy = _top1_accuracy(_legacy_embedding, records, typo_queries, dims)
+    current = _top1_accuracy(embed_pcid_record, records, typo_queries, dims)
+    print(f"top-1 on typo'd queries: legacy={legacy:.3f} n-gram={current:.3f}")
+
+
+def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Benchmark PCID embedding throughput and quality")
+    parser.add_argument("--master", type=int, default=50_000, help="Number of PCID master rows")
+    parser.add_argument("--queries", type=int, default=5_000, help="Number of typo'd queries")
+    parser.add_argument("--dims", type=int, default=48, help="Hash embedding dims per field")
+    parser.add_argument("--seed", type=int, default=13)
+    return parser.parse_args(argv)
+
+
+if __name__ == "__main__":  # pragma: no cover
+    args = parse_args()
+    run_benchmark(args.master, args.queries, args.dims, args.seed)
@@ -0,0 +1,120 @@
+"""Profile per-record PCID matching cost: per-record API vs ``match_pcid_batch``.
+
+Builds a synthetic master, then matches a record set where ``--hit-ratio`` of
+records are exact hits and the rest fall through to the vector backend.
+Pass ``--profile`` to print the top cProfile entries for each path.
+
+Example:
+    python tools/bench_pcid_matching.py --master 20000 --records 20000 --backend matrix
+"""
+from __future__ import annotations
+
+import argparse
+import cProfile
+import pstats
+import random
+import sys
+import time
+from pathlib import Path
+from typing import Callable, Dict, List, Optional
+
+REPO_ROOT = Path(__file__).resolve().parents[1]
+if str(REPO_ROOT) not in sys.path:
+    sys.path.insert(0, str(REPO_ROOT))
+
+from src.processors.pcid_matcher import (  # noqa: E402
+    build_pcid_index,
+    build_vector_store,
+    match_pcid_batch,
+    match_pcid_with_confidence,
+)
+from src.processors.vector_store import get_pcid_backend  # noqa: E402
+
+_WORDS = [
+    "amoxicilina",
+    "ibuprofeno",
+    "paracetamol",
+    "omeprazol",
+    "losartan",
+    "forte",
+    "plus",
+    "mg",
+]
+_LABS = ["Bago", "Roemmers", "Elea", "Gador", "Bayer", "Raffo"]
+
+
+def _build_records(rng: random.Random, master: int, count: int, hit_ratio: float):
+    master_rows = [
+        {
+            "pcid": f"PCID-{idx:07d}",
+            "name": f"{rng.choice(_WORDS)} {rng.choice(_WORDS)} {idx}",
+            "company": rng.choice(_LABS),
+            "currency": "ARS",
+        }
+        for idx in range(master)
+    ]
+    records: List[Dict[str, object]] = []
+    for idx in range(count):
+        row = rng.choice(master_rows)
+        name = row["name"].upper() if rng.random() < hit_ratio else f"{row['name']} x30"
+        records.append({"name": name, "company": row["company"], "currency": "ARS", "price": 1.0})
+    return master_rows, records
+
+
+def _timed(label: str, fn: Callable[[], object], count: int, profile: bool) -> float:
+    profiler = cProfile.Profile() if profile else None
+    start = time.perf_counter()
+    if profiler:
+        profiler.enable()
+    fn()
+    if profiler:
+        profiler.disable()
+    elapsed = time.perf_counter() - start
+    print(f"{label:<12} total={elapsed:.3f}s per_record={elapsed / max(count, 1) * 1e6:.1f}us")
+    if profiler:
+        pstats.Stats(profiler).sort_stats("cumulative").print_stats(12)
+    return elapsed
+
+
+def run_benchmark(
+    master: int, count: int, hit_ratio: float, backend_name: str, profile: bool, seed: int
+) -> None:
+    rng = random.Random(seed)
+    master_rows, records = _build_records(rng, master, count, hit_ratio)
+    index = build_pcid_index(master_rows)
+    backend = get_pcid_backend(
+        {"pcid": {"backend": backend_name}}, vector_store=build_vector_store(master_rows)
+    )
+
+    def _per_record():
+        return [
+            match_pcid_with_confidence(record, index, vector_store=backend, min_similarity=0.8)
+            for record in records
+        ]
+
+    def _batched():
+        return match_pcid_batch(records, index, backend, min_similarity=0.8)
+
+    print(f"master={master} records={count} hit_ratio={hit_ratio} backend={backend_name}")
+    before = _timed("per-record", _per_record, count, profile)
+    after = _timed("batch", _batched, count, profile)
+    if after:
+        print(f"speedup: {before / after:.1f}x")
+
+
+def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Profile PCID matching per-record cost")
+    parser.add_argument("--master", type=int, default=20_000, help="Number of PCID master rows")
+    parser.add_argument("--records", type=int, default=20_000, help="Number of records to match")
+    parser.add_argument("--hit-ratio", type=float, default=0.8, help="Fraction of exact-key hits")
+    parser.add_argument(
+        "--backend", default="matrix", help="pcid.backend to benchmark (hash | matrix)"
+    )
+    parser.add_argument("--profile", action="store_true", help="Print cProfile stats for each path")
+    parser.add_argument("--seed", type=int, default=11)
+    return parser.parse_args(argv)
+
+
+if __name__ == "__main__":  # pragma: no cover
+    args = parse_args()
+    run_benchmark(args.master, args.records, args.hit_ratio, args.backend, args.profile, args.seed)
@@ -0,0 +1,105 @@
+"""Benchmark PCID similarity search: pure-Python store vs NumPy matrix store.
+
+The pure-Python ``PCIDVectorStore`` is far too slow to run the full query set
+against a large master, so it is timed on ``--python-sample`` queries and the
+per-query cost is extrapolated. The matrix store runs every query.
+
+Example:
+    python tools/bench_pcid_vector_store.py --master 100000 --queries 50000
+"""
+from __future__ import annotations
+
+import argparse
+import random
+import sys
+import time
+from pathlib import Path
+from typing import Dict, List, Optional
+
+REPO_ROOT = Path(__file__).resolve().parents[1]
+if str(REPO_ROOT) not in sys.path:
+    sys.path.insert(0, str(REPO_ROOT))
+
+from src.processors.vector_store import (  # noqa: E402
+    MatrixPCIDVectorStore,
+    PCIDVectorStore,
+    embed_pcid_record,
+)
+
+_WORDS = [
+    "amoxicilina", "ibuprofeno", "paracetamol", "omeprazol", "losartan", "metformina",
+    "atorvastatina", "enalapril", "clonazepam", "levotiroxina", "tabletas", "capsulas",
+    "jarabe", "forte", "retard", "plus", "mg", "ml", "x10", "x20", "x30",
+]
+_LABS = ["Bago", "Roemmers", "Elea", "Gador", "Bayer", "Pfizer", "Sanofi", "Raffo", "Casasco"]
+
+
+def _synthetic_record(rng: random.Random, idx: int) -> Dict[str, str]:
+    name = " ".join(rng.choice(_WORDS) for _ in range(rng.randint(2, 5)))
+    return {
+        "pcid": f"PCID-{idx:07d}",
+        "name": f"{name} {idx % 997}",
+        "company": rng.choice(_LABS),
+        "currency": "ARS",
+    }
+
+
+def run_benchmark(master: int, queries: int, dims: int, python_sample: int, seed: int) -> None:
+    rng = random.Random(seed)
+    records = [_synthetic_record(rng, idx) for idx in range(master)]
+    query_vectors: List[List[float]] = [
+        embed_pcid_record(rng.choice(records), dims=dims) for _ in range(queries)
+    ]
+
+    start = time.perf_counter()
+    python_store = PCIDVectorStore(dims=dims)
+    python_store.populate_from_records(records)
+    build_python = time.perf_counter() - start
+
+    start = time.perf_counter()
+    matrix_store = MatrixPCIDVectorStore.from_store(python_store)
+    _ = matrix_store.matrix
+    build_matrix = time.perf_counter() - start
+
+    sample = query_vectors[: max(python_sample, 1)]
+    start = time.perf_counter()
+    for vector in sample:
+        python_store.query(vector, top_k=1, threshold=0.8)
+    python_per_query = (time.perf_counter() - start) / len(sample)
+
+    start = time.perf_counter()
+    matrix_store.query_many(query_vectors, top_k=1, threshold=0.8)
+    matrix_total = time.perf_counter() - start
+    matrix_per_query = matrix_total / max(queries, 1)
+
+    print(f"master rows={master} queries={queries} dims={dims}")
+    print(f"build: python={build_python:.2f}s matrix pack={build_matrix:.2f}s")
+    print(
+        f"python store: {python_per_query * 1000:.2f} ms/query "
+        f"(sampled {len(sample)}; extrapolated total {python_per_query * queries:.0f}s)"
+    )
+    print(
+        f"matrix store: {matrix_per_query * 1000:.4f} ms/query (measured total {matrix_total:.2f}s)"
+    )
+    if matrix_per_query:
+        print(f"speedup: {python_per_query / matrix_per_query:.0f}x")
+
+
+def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Benchmark PCID vector store backends")
+    parser.add_argument("--master", type=int, default=100_000, help="Number of PCID master rows")
+    parser.add_argument("--queries", type=int, default=50_000, help="Number of similarity queries")
+    parser.add_argument("--dims", type=int, default=48, help="Hash embedding dims per field")
+    parser.add_argument(
+        "--python-sample",
+        type=int,
+        default=20,
+        help="Queries timed on the pure-Python store before extrapolating",
+    )
+    parser.add_argument("--seed", type=int, default=7)
+    return parser.parse_args(argv)
+
+
+if __name__ == "__main__":  # pragma: no cover
+    args = parse_args()
+    run_benchmark(args.master, args.queries, args.dims, args.python_sample, args.seed)
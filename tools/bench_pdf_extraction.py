@@ -0,0 +1,129 @@
+"""Classic PDF extraction: serial page walk vs process-pool page ranges vs page cache.
+
+Generates a ``--pages``-page price-list PDF (a ruled table of ``--rows`` rows
+per page, so ``find_tables`` has real work) and streams it through
+:class:`PdfPageStream`. Strategies:
+
+- ``serial``: one process, no cache (the previous ``extract_pdf_text_classic`` walk);
+- ``parallel``: ``--workers`` processes, ``--pages-per-task`` pages per task;
+- ``cold``: parallel, filling an empty page cache;
+- ``warm``: the same document again, answered from the page cache.
+
+Requires PyMuPDF.
+
+Example:
+    python tools/bench_pdf_extraction.py --pages 500 --workers 4
+"""
+from __future__ import annotations
+
+import argparse
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import List, Optional
+
+REPO_ROOT = Path(__file__).resolve().parents[1]
+if str(REPO_ROOT) not in sys.path:
+    sys.path.insert(0, str(REPO_ROOT))
+
+from src.processors.pdf.pdf_page_cache import PdfPageCache  # noqa: E402
+from src.processors.pdf.pdf_text_extractor import PdfPageStream, _pymupdf  # noqa: E402
+
+STRATEGIES = ["serial", "parallel", "cold", "warm"]
+COLUMNS = ["drug_name", "strength", "pack", "mrp", "manufacturer"]
+WIDTHS = [170, 70, 90, 70, 130]
+
+
+def write_price_list(path: Path, pages: int, rows: int) -> None:
+    pymupdf = _pymupdf()
+    if pymupdf is None:
+        raise SystemExit("PyMuPDF is required: pip install pymupdf")
+    doc = pymupdf.open()
+    row_height = 700 / (rows + 1)
+    for page_num in range(pages):
+        page = doc.new_page(width=595, height=842)
+        top, left = 60.0, 32.0
+        right = left + sum(WIDTHS)
+        bottom = top + row_height * (rows + 1)
+        for row in range(rows + 2):
+            y = top + row * row_height
+            page.draw_line((left, y), (right, y))
+        x = left
+        for width in [0] + WIDTHS:
+            x += width
+            page.draw_line((x, top), (x, bottom))
+        for row in range(rows + 1):
+            item = page_num * rows + row
+            cells = COLUMNS if row == 0 else [
+                f"Product {item}", f"{(item % 9 + 1) * 50} mg", f"Box x {item % 4 * 10 + 10}",
+                f"{100 + item * 0.37:.2f}", f"Laboratorio {item % 53}",
+            ]
+            x, y = left, top + (row + 0.7) * row_height
+            for width, cell in zip(WIDTHS, cells):
+                page.insert_text((x + 3, y), cell, fontsize=7)
+                x += width
+    doc.save(str(path))
+    doc.close()
+
+
+def run_strategy(name: str, args: argparse.Namespace, pdf_path: Path, cache: PdfPageCache) -> dict:
+    started = time.perf_counter()
+    stream = PdfPageStream(
+        pdf_path,
+        workers=1 if name == "serial" else args.workers,
+        pages_per_task=args.pages_per_task,
+        parallel_min_pages=1,
+        cache=cache if name in ("cold", "warm") else None,
+    )
+    first_page = None
+    tables = chars = 0
+    for page in stream:
+        if first_page is None:
+            first_page = time.perf_counter() - started
+        tables += len(page["tables"])
+        chars += len(page["text"])
+    return {
+        "seconds": time.perf_counter() - started,
+        "first_page": first_page or 0.0,
+        "tables": tables,
+        "chars": chars,
+    }
+
+
+def run_benchmark(args: argparse.Namespace) -> None:
+    with tempfile.TemporaryDirectory() as tmp:
+        pdf_path = Path(tmp) / "price_list.pdf"
+        write_price_list(pdf_path, args.pages, args.rows)
+        cache = PdfPageCache(Path(tmp) / "pages.sqlite")
+        print(
+            f"pages={args.pages} rows/page={args.rows} size={pdf_path.stat().st_size / 1e6:.1f} MB "
+            f"workers={args.workers} pages_per_task={args.pages_per_task}"
+        )
+        print(
+            f"{'strategy':<9} {'seconds':>8} {'pages/s':>8} {'first page s':>13} "
+            f"{'tables':>7} {'chars':>9}"
+        )
+        for name in args.strategies:
+            result = run_strategy(name, args, pdf_path, cache)
+            print(
+                f"{name:<9} {result['seconds']:>8.2f} {args.pages / result['seconds']:>8.1f} "
+                f"{result['first_page']:>13.3f} {result['tables']:>7} {result['chars']:>9}"
+            )
+        cache.close()
+
+
+def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        description="Benchmark parallel, cached classic PDF extraction"
+    )
+    parser.add_argument("--pages", type=int, default=500)
+    parser.add_argument("--rows", type=int, default=40, help="Table rows per page")
+    parser.add_argument("--workers", type=int, default=4)
+    parser.add_argument("--pages-per-task", type=int, default=25)
+    parser.add_argument("--strategies", nargs="+", choices=STRATEGIES, default=STRATEGIES)
+    return parser.parse_args(argv)
+
+
+if __name__ == "__main__":  # pragma: no cover
+    run_benchmark(parse_args())
@@ -0,0 +1,228 @@
+"""Pages/sec and memory per concurrent page: PlaywrightEngine vs Selenium drivers.
+
+Both engines render the same local stand-in site (see ``bench_async_http``):
+every page sleeps ``--latency-ms`` server-side before returning ``--page-kb``
+of HTML. Selenium runs ``--concurrency`` drivers from
+``selenium_engine.create_driver`` (one Chrome each) on a thread pool, which is
+how fleets scale it today; ``PlaywrightEngine.fetch_many`` drives the same
+number of pages from one browser spread over ``--contexts`` contexts.
+
+Memory is the peak resident set of the browser process trees (sampled from
+``/proc``, so Linux only) divided by the number of concurrent pages.
+
+Needs Chrome + chromedriver for Selenium and ``pip install playwright &&
+playwright install chromium`` for Playwright; a missing engine is skipped.
+
+Example:
+    python tools/bench_playwright.py --pages 400 --concurrency 16 --contexts 4
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import os
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Callable, Dict, List, Optional
+
+REPO_ROOT = Path(__file__).resolve().parents[1]
+if str(REPO_ROOT) not in sys.path:
+    sys.path.insert(0, str(REPO_ROOT))
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+os.environ.setdefault("SCRAPER_PLATFORM_DISABLE_DB", "1")
+
+from bench_async_http import _free_port, start_stand_in_server  # noqa: E402
+
+from src.engines.base_engine import EngineConfig  # noqa: E402
+from src.engines.playwright_engine import PlaywrightEngine  # noqa: E402
+
+
+def _children() -> Dict[int, List[int]]:
+    tree: Dict[int, List[int]] = {}
+    for entry in os.listdir("/proc"):
+        if not entry.isdigit():
+            continue
+        try:
+            with open(f"/proc/{entry}/stat", encoding="utf-8") as handle:
+                ppid = int(handle.read().rsplit(")", 1)[1].split()[1])
+        except (OSError, IndexError, ValueError):
+            continue
+        tree.setdefault(ppid, []).append(int(entry))
+    return tree
+
+
+def tree_rss_mb(root: int = os.getpid()) -> float:
+    """Resident memory of ``root``'s descendants (browsers, drivers, renderers)."""
+
+    tree = _children()
+    total_kb = 0
+    stack = list(tree.get(root, []))
+    while stack:
+        pid = stack.pop()
+        stack.extend(tree.get(pid, []))
+        try:
+            with open(f"/proc/{pid}/status", encoding="utf-8") as handle:
+                for line in handle:
+                    if line.startswith("VmRSS:"):
+                        total_kb += int(line.split()[1])
+                        break
+        except OSError:
+            continue
+    return total_kb / 1024.0
+
+
+class _PeakSampler:
+    """Samples :func:`tree_rss_mb` in the background and keeps the peak."""
+
+    def __init__(self, interval: float = 0.2) -> None:
+        self.interval = interval
+        self.peak = 0.0
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+
+    def _run(self) -> None:
+        while not self._stop.is_set():
+            self.peak = max(self.peak, tree_rss_mb())
+            self._stop.wait(self.interval)
+
+    def __enter__(self) -> "_PeakSampler":
+        self._thread.start()
+        return self
+
+    def __exit__(self, *_exc) -> None:
+        self._stop.set()
+        self._thread.join()
+
+
+def _report(
+    label: str, pages: int, elapsed: float, concurrency: int, peak_mb: float, failures: int
+) -> None:
+    print(
+        f"{label:<30} {pages / elapsed:>9.1f} {elapsed:>9.2f} {peak_mb:>10.0f} "
+        f"{peak_mb / max(concurrency, 1):>12.1f} {failures:>9}"
+    )
+
+
+def bench_selenium(urls: List[str], concurrency: int) -> None:
+    from src.engines.selenium_engine import create_driver
+
+    local = threading.local()
+    drivers: List[object] = []
+    lock = threading.Lock()
+
+    def _fetch(url: str) -> bool:
+        driver = getattr(local, "driver", None)
+        if driver is None:
+            driver = local.driver = create_driver()
+            with lock:
+                drivers.append(driver)
+        try:
+            driver.get(url)
+            return bool(driver.page_source)
+        except Exception:
+            return False
+
+    with _PeakSampler() as sampler:
+        start = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=concurrency) as pool:
+            ok = list(pool.map(_fetch, urls))
+        elapsed = time.perf_counter() - start
+    for driver in drivers:
+        driver.quit()
+    _report(
+        f"selenium x{concurrency} drivers",
+        len(urls),
+        elapsed,
+        concurrency,
+        sampler.peak,
+        ok.count(False),
+    )
+
+
+def bench_playwright(urls: List[str], concurrency: int, contexts: int) -> None:
+    engine = PlaywrightEngine(
+        EngineConfig(max_retries=0),
+        contexts=contexts,
+        pages_per_context=max(concurrency // contexts, 1),
+    )
+
+    async def _run() -> int:
+        failures = 0
+        async with engine:
+            async for outcome in engine.fetch_many(urls):
+                failures += getattr(outcome, "status_code", None) != 200
+        return failures
+
+    with _PeakSampler() as sampler:
+        start = time.perf_counter()
+        failures = asyncio.run(_run())
+        elapsed = time.perf_counter() - start
+    _report(
+        f"playwright {contexts} ctx x{concurrency} pages",
+        len(urls),
+        elapsed,
+        concurrency,
+        sampler.peak,
+        failures,
+    )
+
+
+def run_benchmark(
+    pages: int, latency_ms: float, page_kb: int, concurrency: int, contexts: int, engines: List[str]
+) -> None:
+    port = _free_port()
+    server = start_stand_in_server(port, latency_ms / 1000.0, page_kb)
+    urls = [f"http://127.0.0.1:{port}/p/{idx}" for idx in range(pages)]
+    runners: Dict[str, Callable[[], None]] = {
+        "selenium": lambda: bench_selenium(urls, concurrency),
+        "playwright": lambda: bench_playwright(urls, concurrency, contexts),
+    }
+
+    print(f"pages={pages} latency={latency_ms}ms page={page_kb}KB concurrency={concurrency}")
+    print(
+        f"{'engine':<30} {'pages/s':>9} {'seconds':>9} {'peak MB':>10} "
+        f"{'MB per page':>12} {'failures':>9}"
+    )
+    try:
+        for name in engines:
+            try:
+                runners[name]()
+            except Exception as exc:  # pragma: no cover - missing browser binaries
+                print(f"{name:<30} skipped: {type(exc).__name__}: {exc}")
+    finally:
+        server.terminate()
+
+
+def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        description="Benchmark PlaywrightEngine against Selenium drivers"
+    )
+    parser.add_argument("--pages", type=int, default=400)
+    parser.add_argument(
+        "--latency-ms", type=float, default=100.0, help="Server-side delay per page"
+    )
+    parser.add_argument("--page-kb", type=int, default=50, help="Response body size")
+    parser.add_argument(
+        "--concurrency", type=int, default=16, help="Concurrent pages (Selenium drivers)"
+    )
+    parser.add_argument(
+        "--contexts", type=int, default=4, help="Playwright contexts sharing the pages"
+    )
+    parser.add_argument(
+        "--engine",
+        nargs="+",
+        default=["selenium", "playwright"],
+        choices=["selenium", "playwright"],
+    )
+    return parser.parse_args(argv)
+
+
+if __name__ == "__main__":  # pragma: no cover
+    args = parse_args()
+    run_benchmark(
+        args.pages, args.latency_ms, args.page_kb, args.concurrency, args.contexts, args.engine
+    )
@@ -0,0 +1,124 @@
+"""Proxy picks/sec under contention: Fenwick-tree ``ProxyPool`` vs the old linear scan.
+
+Each of ``--threads`` workers loops ``choose_proxy`` followed by
+``mark_success`` (or ``mark_failure`` every ``--failure-every`` picks) for
+``--seconds``. The baseline reproduces the previous implementation: every pick
+rescans the pool for expired bans, rebuilds the active list and weights, and
+re-reads the proxy settings.
+
+Example:
+    python tools/bench_proxy_pool.py --proxies 10000 --threads 32 --seconds 5
+"""
+from __future__ import annotations
+
+import argparse
+import logging
+import random
+import sys
+import threading
+import time
+from pathlib import Path
+from typing import Callable, Dict, List, Optional
+
+REPO_ROOT = Path(__file__).resolve().parents[1]
+if str(REPO_ROOT) not in sys.path:
+    sys.path.insert(0, str(REPO_ROOT))
+
+from src.resource_manager import proxy_pool as proxy_pool_module  # noqa: E402
+from src.resource_manager.proxy_pool import ProxyPool, ProxyStats  # noqa: E402
+
+SOURCE = "bench"
+_SETTINGS = {"max_errors_before_ban": 3, "ban_window_minutes": 30}
+
+
+class LinearScanPool:
+    """The selection loop ``ProxyPool.choose_proxy`` used before the Fenwick tree."""
+
+    def __init__(self, proxies: List[str]) -> None:
+        self.pool: Dict[str, ProxyStats] = {proxy: ProxyStats(proxy=proxy) for proxy in proxies}
+
+    def choose_proxy(self, source: str) -> Optional[str]:
+        settings = dict(_SETTINGS)
+        ban_window_seconds = max(settings.get("ban_window_minutes", 30), 0) * 60
+        now = time.time()
+        for stats in self.pool.values():
+            if stats.banned and stats.banned_at and (now - stats.banned_at) > ban_window_seconds:
+                stats.banned = False
+                stats.banned_at = 0.0
+        active = [stats for stats in self.pool.values() if not stats.banned]
+        active = active or list(self.pool.values())
+        scores = [stats.success_count - 2 * stats.failure_count for stats in active]
+        if max(scores) <= 0:
+            return random.choice(active).proxy
+        return random.choices(active, weights=[max(score, 0) for score in scores], k=1)[0].proxy
+
+    def mark_success(self, source: str, proxy: str, latency: Optional[float] = None) -> None:
+        self.pool[proxy].success_count += 1
+
+    def mark_failure(self, source: str, proxy: str, ban: bool = False) -> None:
+        self.pool[proxy].failure_count += 1
+
+
+def _drive(pool, threads: int, seconds: float, failure_every: int) -> int:
+    stop = threading.Event()
+    counts = [0] * threads
+
+    def _worker(slot: int) -> None:
+        rng = random.Random(slot)
+        picks = 0
+        while not stop.is_set():
+            proxy = pool.choose_proxy(SOURCE)
+            if picks % failure_every == 0:
+                pool.mark_failure(SOURCE, proxy)
+            else:
+                pool.mark_success(SOURCE, proxy, latency=rng.uniform(0.05, 2.0))
+            picks += 1
+        counts[slot] = picks
+
+    workers = [threading.Thread(target=_worker, args=(slot,)) for slot in range(threads)]
+    for worker in workers:
+        worker.start()
+    time.sleep(seconds)
+    stop.set()
+    for worker in workers:
+        worker.join()
+    return sum(counts)
+
+
+def run_benchmark(
+    proxies: int, threads: int, seconds: float, failure_every: int, pools: List[str]
+) -> None:
+    addresses = [f"10.{idx // 65536}.{idx // 256 % 256}.{idx % 256}:8080" for idx in range(proxies)]
+    proxy_pool_module.get_proxy_settings = lambda source: dict(_SETTINGS)
+    proxy_pool_module.log.setLevel(logging.ERROR)  # ban warnings would dominate the timing
+    builders: Dict[str, Callable[[], object]] = {
+        "fenwick": lambda: ProxyPool({"proxies": {SOURCE: addresses}}),
+        "linear": lambda: LinearScanPool(addresses),
+    }
+
+    print(f"proxies={proxies} threads={threads} seconds={seconds} failure_every={failure_every}")
+    print(f"{'pool':<10} {'picks':>12} {'picks/s':>12}")
+    for name in pools:
+        picks = _drive(builders[name](), threads, seconds, failure_every)
+        print(f"{name:<10} {picks:>12} {picks / seconds:>12.0f}")
+
+
+def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        description="Benchmark proxy selection under thread contention"
+    )
+    parser.add_argument("--proxies", type=int, default=10_000)
+    parser.add_argument("--threads", type=int, default=32)
+    parser.add_argument("--seconds", type=float, default=5.0)
+    parser.add_argument(
+        "--failure-every", type=int, default=20, help="Report a failure every N picks per thread"
+    )
+    parser.add_argument(
+        "--pool", nargs="+", default=["fenwick", "linear"], choices=["fenwick", "linear"]
+    )
+    return parser.parse_args(argv)
+
+
+if __name__ == "__main__":  # pragma: no cover
+    args = parse_args()
+    run_benchmark(args.proxies, args.threads, args.seconds, args.failure_every, args.pool)
@@ -0,0 +1,168 @@
+"""Rate limiter contention: token-bucket backends vs the old sliding-window limiter.
+
+``--threads`` workers call ``RateLimiter.wait()`` in a loop for ``--seconds``.
+Two scenarios run for every limiter:
+
+- ``overhead``: ``max_qps`` far above what the workers can reach, so nothing
+  ever waits and the numbers are pure bookkeeping/lock cost per call;
+- ``paced``: ``max_qps=--qps``, showing how close the achieved rate gets to the
+  limit and how long callers queue (p50/p99 per call).
+
+``legacy`` reproduces the previous implementation (a deque of timestamps,
+sleeping while holding its lock). ``redis`` uses ``--redis-url`` or, by
+default, an in-process :class:`LocalRedisServer` stand-in.
+
+Example:
+    python tools/bench_rate_limiter.py --threads 64 --seconds 3 --qps 200
+"""
+from __future__ import annotations
+
+import argparse
+import sys
+import tempfile
+import threading
+import time
+from collections import deque
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Tuple
+
+REPO_ROOT = Path(__file__).resolve().parents[1]
+if str(REPO_ROOT) not in sys.path:
+    sys.path.insert(0, str(REPO_ROOT))
+
+from src.resource_manager.rate_limit_backends import (  # noqa: E402
+    InProcessBackend,
+    RedisBackend,
+    SQLiteBackend,
+)
+from src.resource_manager.rate_limiter import RateLimiter  # noqa: E402
+from src.resource_manager.redis_standin import LocalRedisServer  # noqa: E402
+
+LIMITERS = ["legacy", "memory", "sqlite", "redis"]
+UNLIMITED_QPS = 1e9
+
+
+class LegacyRateLimiter:
+    """The sliding-window QPS check ``RateLimiter`` used before the token bucket."""
+
+    def __init__(self, max_qps: float) -> None:
+        self.max_qps = max_qps
+        self._timestamps: deque = deque()
+        self._lock = threading.Lock()
+
+    def wait(self) -> None:
+        with self._lock:
+            now = time.time()
+            while self._timestamps and self._timestamps[0] < now - 1.0:
+                self._timestamps.popleft()
+            if len(self._timestamps) >= self.max_qps:
+                sleep_for = self._timestamps[0] + 1.0 - now
+                if sleep_for > 0:
+                    time.sleep(sleep_for)
+                now = time.time()
+                while self._timestamps and self._timestamps[0] < now - 1.0:
+                    self._timestamps.popleft()
+            self._timestamps.append(time.time())
+
+    def close(self) -> None:
+        return None
+
+
+def _percentile(samples: List[float], q: float) -> float:
+    if not samples:
+        return 0.0
+    ordered = sorted(samples)
+    return ordered[min(int(q * len(ordered)), len(ordered) - 1)]
+
+
+def _drive(limiter, threads: int, seconds: float) -> Tuple[int, List[float]]:
+    go, stop = threading.Event(), threading.Event()
+    latencies: List[List[float]] = [[] for _ in range(threads)]
+    deadline = [float("inf")]
+
+    def _worker(slot: int) -> None:
+        samples = latencies[slot]
+        # A contended limiter can starve the main thread while it is still starting workers.
+        go.wait()
+        while not stop.is_set():
+            started = time.perf_counter()
+            limiter.wait()
+            finished = time.perf_counter()
+            if finished <= deadline[0]:  # calls still queued at the end do not count
+                samples.append(finished - started)
+
+    workers = [threading.Thread(target=_worker, args=(slot,)) for slot in range(threads)]
+    for worker in workers:
+        worker.start()
+    deadline[0] = time.perf_counter() + seconds
+    go.set()
+    time.sleep(seconds)
+    stop.set()
+    for worker in workers:
+        worker.join()
+    merged = [sample for samples in latencies for sample in samples]
+    return len(merged), merged
+
+
+def run_benchmark(
+    threads: int, seconds: float, qps: float, limiters: List[str], redis_url: Optional[str]
+) -> None:
+    server = None
+    if "redis" in limiters and not redis_url:
+        server = LocalRedisServer().start()
+        redis_url = server.url
+    tmp = tempfile.TemporaryDirectory()
+
+    def _bucket(backend_factory: Callable[[], object]) -> Callable[[float, str], object]:
+        def _build(max_qps: float, key: str):
+            backend = backend_factory()
+            limiter = RateLimiter(key, max_qps=max_qps, max_concurrent=None, backend=backend)
+            limiter.close = backend.close
+            return limiter
+        return _build
+
+    builders: Dict[str, Callable[[float, str], object]] = {
+        "legacy": lambda max_qps, key: LegacyRateLimiter(max_qps),
+        "memory": _bucket(InProcessBackend),
+        "sqlite": _bucket(lambda: SQLiteBackend(Path(tmp.name) / "limits.sqlite3")),
+        "redis": _bucket(lambda: RedisBackend(redis_url)),
+    }
+
+    print(f"threads={threads} seconds={seconds} paced_qps={qps} redis={redis_url or '-'}")
+    print(
+        f"{'limiter':<8} {'scenario':<9} {'calls':>9} {'calls/s':>10} {'p50 ms':>9} {'p99 ms':>9}"
+    )
+    try:
+        for name in limiters:
+            for scenario, max_qps in (("overhead", UNLIMITED_QPS), ("paced", qps)):
+                limiter = builders[name](max_qps, f"bench-{scenario}")
+                calls, samples = _drive(limiter, threads, seconds)
+                limiter.close()
+                print(
+                    f"{name:<8} {scenario:<9} {calls:>9} {calls / seconds:>10.0f} "
+                    f"{_percentile(samples, 0.5) * 1000:>9.3f} "
+                    f"{_percentile(samples, 0.99) * 1000:>9.3f}"
+                )
+    finally:
+        tmp.cleanup()
+        if server is not None:
+            server.stop()
+
+
+def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        description="Benchmark rate limiter backends under thread contention"
+    )
+    parser.add_argument("--threads", type=int, default=64)
+    parser.add_argument("--seconds", type=float, default=3.0)
+    parser.add_argument("--qps", type=float, default=200.0, help="Limit for the paced scenario")
+    parser.add_argument("--limiter", nargs="+", default=LIMITERS, choices=LIMITERS)
+    parser.add_argument(
+        "--redis-url", default=None, help="Real Redis to use instead of the in-process stand-in"
+    )
+    return parser.parse_args(argv)
+
+
+if __name__ == "__main__":  # pragma: no cover
+    args = parse_args()
+    run_benchmark(args.threads, args.seconds, args.qps, args.limiter, args.redis_url)
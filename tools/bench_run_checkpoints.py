@@ -0,0 +1,84 @@
+"""Measure checkpoint write/replay overhead per 1,000 pages.
+
+Simulates a run that records ``--pages`` extracted product pages (plus one
+company page per 100 products) in a ``RunCheckpointStore`` at several write
+batch sizes, then times replaying every page as a resumed run would.
+``batch=1`` approximates committing every page individually.
+
+Example:
+    python tools/bench_run_checkpoints.py --pages 50000 --batch-sizes 1 100 500 2000
+"""
+from __future__ import annotations
+
+import argparse
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+REPO_ROOT = Path(__file__).resolve().parents[1]
+if str(REPO_ROOT) not in sys.path:
+    sys.path.insert(0, str(REPO_ROOT))
+
+from src.run_tracking.checkpoints import RunCheckpointStore  # noqa: E402
+
+
+def _record(url: str) -> Dict[str, Any]:
+    return {
+        "product_url": url,
+        "name": "Amoxicilina 500 mg comprimidos",
+        "lab_name": "Laboratorio Bago",
+        "presentation_raw": "Comprimidos recubiertos x 30 unidades",
+        "price": 1234.5,
+        "currency": "ARS",
+        "company": "Laboratorio Bago",
+        "scrape_run_id": "bench",
+    }
+
+
+def run_benchmark(pages: int, batch_sizes: List[int]) -> None:
+    urls = [f"https://example.com/company/{idx // 100}/product/{idx}" for idx in range(pages)]
+    records = [_record(url) for url in urls]
+
+    print(f"pages={pages}")
+    print(f"{'batch':>6} {'write ms/1k':>12} {'replay ms/1k':>13} {'file MB':>8}")
+    for batch_size in batch_sizes:
+        with tempfile.TemporaryDirectory() as tmp:
+            store = RunCheckpointStore.open(
+                "bench", "run", root=Path(tmp), batch_size=batch_size, flush_interval=3600
+            )
+            start = time.perf_counter()
+            for idx, (url, record) in enumerate(zip(urls, records)):
+                if idx % 100 == 0:
+                    store.record_children(
+                        f"https://example.com/company/{idx // 100}", urls[idx : idx + 100]
+                    )
+                store.record_raw(url, record)
+            store.close()
+            write_s = time.perf_counter() - start
+
+            store = RunCheckpointStore.open("bench", "run", root=Path(tmp))
+            start = time.perf_counter()
+            replayed = sum(1 for url in urls if store.raw_record(url) is not None)
+            replay_s = time.perf_counter() - start
+            size_mb = store.path.stat().st_size / 1e6
+            store.close()
+            assert replayed == pages
+
+        per_k = 1000 / max(pages, 1) * 1000
+        print(f"{batch_size:>6} {write_s * per_k:>12.2f} {replay_s * per_k:>13.2f} {size_mb:>8.1f}")
+
+
+def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Benchmark run checkpoint overhead")
+    parser.add_argument(
+        "--pages", type=int, default=50_000, help="Number of product pages to checkpoint"
+    )
+    parser.add_argument("--batch-sizes", type=int, nargs="+", default=[1, 100, 500, 2000])
+    return parser.parse_args(argv)
+
+
+if __name__ == "__main__":  # pragma: no cover
+    args = parse_args()
+    run_benchmark(args.pages, args.batch_sizes)
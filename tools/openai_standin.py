@@ -0,0 +1,205 @@
+"""In-process stand-in for an OpenAI-compatible chat completions endpoint.
+
+Answers ``POST .../chat/completions`` after a configurable delay so the LLM
+benchmarks (``bench_llm_batching.py``, ``bench_llm_client.py``) can measure
+batching and client reuse without a provider account. Not a model: packed
+prompts (the ``<items>`` block of :mod:`~src.processors.llm.llm_batch`) get
+one ``{"id", "result"}`` per item from ``answer``, any other prompt gets
+``answer`` of the whole prompt.
+
+Like real providers it refuses with ``429`` and a ``Retry-After`` header once
+more than ``max_concurrent`` requests are in flight or its
+``requests_per_second`` bucket is empty.
+"""
+
+from __future__ import annotations
+
+import json
+import re
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Callable, Dict, Optional
+
+_ITEMS = re.compile(r"<items>\n(.*)\n</items>", re.S)
+
+
+def _default_answer(text: Any) -> Any:
+    return {"valid": True, "issues": [], "score": 1.0, "chars": len(str(text))}
+
+
+class _Handler(BaseHTTPRequestHandler):
+    server: "_Server"
+    protocol_version = "HTTP/1.1"  # keep-alive, as provider endpoints do
+    disable_nagle_algorithm = True  # headers and body go out in separate writes
+
+    def log_message(self, format: str, *args: Any) -> None:  # noqa: A002 - quiet
+        return None
+
+    def _send(
+        self, status: int, payload: Dict[str, Any], headers: Optional[Dict[str, str]] = None
+    ) -> None:
+        body = json.dumps(payload).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_POST(self) -> None:  # noqa: N802 - http.server naming
+        request = json.loads(self.rfile.read(int(self.headers.get("Content-Length", 0))) or b"{}")
+        if not self.path.rstrip("/").endswith("/chat/completions"):
+            self._send(404, {"error": {"message": f"unknown path {self.path}"}})
+            return
+        server = self.server
+        if not server.admit():
+            self._send(
+                429,
+                {"error": {"message": "rate limited", "type": "rate_limit"}},
+                {"Retry-After": f"{server.retry_after:g}"},
+            )
+            return
+        try:
+            messages = request.get("messages") or []
+            prompt = messages[-1]["content"] if messages else ""
+            match = _ITEMS.search(prompt)
+            if match:
+                items = json.loads(match.group(1))
+                content = json.dumps(
+                    [{"id": item["id"], "result": server.answer(item["input"])} for item in items]
+                )
+                delay = server.latency + server.per_item_latency * len(items)
+            else:
+                content = json.dumps(server.answer(prompt))
+                delay = server.latency
+            time.sleep(delay)
+        finally:
+            server.release()
+        prompt_tokens = sum(len(str(message.get("content", ""))) for message in messages) // 4
+        self._send(
+            200,
+            {
+                "id": f"chatcmpl-{server.next_id()}",
+                "object": "chat.completion",
+                "created": int(time.time()),
+                "model": request.get("model", "standin"),
+                "choices": [
+                    {
+                        "index": 0,
+                        "message": {"role": "assistant", "content": content},
+                        "finish_reason": "stop",
+                    }
+                ],
+                "usage": {
+                    "prompt_tokens": prompt_tokens,
+                    "completion_tokens": len(content) // 4,
+                    "total_tokens": prompt_tokens + len(content) // 4,
+                },
+            },
+        )
+
+
+class _Server(ThreadingHTTPServer):
+    daemon_threads = True
+    allow_reuse_address = True
+
+    def __init__(
+        self, address, *, latency, per_item_latency, max_concurrent, requests_per_second, answer
+    ):
+        super().__init__(address, _Handler)
+        self.latency = latency
+        self.per_item_latency = per_item_latency
+        self.max_concurrent = max_concurrent
+        self.requests_per_second = requests_per_second
+        self.retry_after = 0.05
+        self.answer = answer
+        self.stats = {"requests": 0, "throttled": 0}
+        self._lock = threading.Lock()
+        self._in_flight = 0
+        self._tokens = float(requests_per_second or 0)
+        self._stamp = time.monotonic()
+
+    def admit(self) -> bool:
+        with self._lock:
+            self.stats["requests"] += 1
+            if self.requests_per_second:
+                now = time.monotonic()
+                rate = self.requests_per_second
+                self._tokens = min(rate, self._tokens + (now - self._stamp) * rate)
+                self._stamp = now
+            throttled = (self.max_concurrent and self._in_flight >= self.max_concurrent) or (
+                self.requests_per_second and self._tokens < 1
+            )
+            if throttled:
+                self.stats["throttled"] += 1
+                return False
+            if self.requests_per_second:
+                self._tokens -= 1
+            self._in_flight += 1
+            return True
+
+    def release(self) -> None:
+        with self._lock:
+            self._in_flight -= 1
+
+    def next_id(self) -> int:
+        with self._lock:
+            return self.stats["requests"]
+
+
+class LocalOpenAIServer:
+    """Threaded OpenAI-compatible server on ``host:port`` (``port=0`` picks a free one)."""
+
+    def __init__(
+        self,
+        host: str = "127.0.0.1",
+        port: int = 0,
+        *,
+        latency: float = 0.2,
+        per_item_latency: float = 0.01,
+        max_concurrent: Optional[int] = None,
+        requests_per_second: Optional[float] = None,
+        answer: Callable[[Any], Any] = _default_answer,
+    ) -> None:
+        self._server = _Server(
+            (host, port),
+            latency=latency,
+            per_item_latency=per_item_latency,
+            max_concurrent=max_concurrent,
+            requests_per_second=requests_per_second,
+            answer=answer,
+        )
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def base_url(self) -> str:
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}/v1"
+
+    @property
+    def stats(self) -> Dict[str, int]:
+        return dict(self._server.stats)
+
+    def start(self) -> "LocalOpenAIServer":
+        self._thread = threading.Thread(
+            target=self._server.serve_forever, name="local-openai", daemon=True
+        )
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self._server.shutdown()
+        self._server.server_close()
+        if self._thread is not None:
+            self._thread.join()
+
+    def __enter__(self) -> "LocalOpenAIServer":
+        return self.start()
+
+    def __exit__(self, *exc_info) -> None:
+        self.stop()
+
+
+__all__ = ["LocalOpenAIServer"]
@@ -0,0 +1,183 @@
+"""Simulate adaptive vs static concurrency against a synthetic rate-limiting site.
+
+Discrete-event simulation (virtual clock, runs in well under a second). The
+synthetic server:
+
+- answers in ``--latency`` seconds while at most ``--capacity`` requests are
+  in flight, and proportionally slower beyond that (the site is saturating);
+- refuses with 429 (after 20 ms) once its own token bucket of ``--site-qps``
+  requests/second is empty, and with 503 past ``--hard-cap`` in-flight requests.
+
+Halfway through, ``--site-qps`` changes to ``--site-qps-after`` (a site that
+tightens, or loosens, its limit). The client keeps ``limit`` requests in flight
+from an endless backlog; refused requests are retried. For each strategy and
+phase we report successful requests/s, the 429/503 share, the limit at the
+end of the phase and how long it took to first sustain 90% of the phase's best
+possible throughput (``min(site_qps, capacity / latency)``) over a 10 s window.
+
+Example:
+    python tools/sim_adaptive_concurrency.py --site-qps 40 --site-qps-after 10 --seconds 600
+"""
+from __future__ import annotations
+
+import argparse
+import heapq
+import sys
+from collections import Counter
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import List, Optional, Tuple
+
+REPO_ROOT = Path(__file__).resolve().parents[1]
+if str(REPO_ROOT) not in sys.path:
+    sys.path.insert(0, str(REPO_ROOT))
+
+from src.resource_manager.adaptive_concurrency import AdaptiveConcurrency  # noqa: E402
+
+REJECT_LATENCY = 0.02
+CONVERGENCE_WINDOW = 10
+
+
+@dataclass
+class SyntheticSite:
+    latency: float
+    capacity: int
+    qps: float
+    hard_cap: int
+    tokens: float = field(init=False)
+    stamp: float = 0.0
+    in_flight: int = 0
+
+    def __post_init__(self) -> None:
+        self.tokens = self.qps
+
+    def request(self, now: float) -> Tuple[float, int]:
+        """``(seconds until the response, status code)`` for a request sent at ``now``."""
+
+        self.tokens = min(self.qps, self.tokens + (now - self.stamp) * self.qps)
+        self.stamp = now
+        if self.in_flight >= self.hard_cap:
+            return REJECT_LATENCY, 503
+        if self.tokens < 1:
+            return REJECT_LATENCY, 429
+        self.tokens -= 1
+        self.in_flight += 1
+        return self.latency * max(1.0, self.in_flight / self.capacity), 200
+
+
+@dataclass
+class PhaseStats:
+    ok: int = 0
+    refused: int = 0
+    final_limit: float = 0.0
+    ok_per_second: Counter = field(default_factory=Counter)
+
+    def converged_after(self, start: float, best_qps: float) -> Optional[float]:
+        """Seconds from ``start`` until a 10 s window first averaged 90% of ``best_qps``."""
+
+        for second in sorted(self.ok_per_second):
+            window = sum(
+                self.ok_per_second[second + offset] for offset in range(CONVERGENCE_WINDOW)
+            )
+            if window >= 0.9 * best_qps * CONVERGENCE_WINDOW:
+                return second - start
+        return None
+
+
+def simulate(strategy: str, args: argparse.Namespace) -> List[PhaseStats]:
+    now = 0.0
+    site = SyntheticSite(args.latency, args.capacity, args.site_qps, args.hard_cap)
+    controller: Optional[AdaptiveConcurrency] = None
+    if strategy == "adaptive":
+        controller = AdaptiveConcurrency(
+            "sim", initial=args.initial, max_limit=args.max_limit, clock=lambda: now
+        )
+    static_limit = 0 if controller else int(strategy.split("=")[1])
+
+    phases = [PhaseStats(), PhaseStats()]
+    half = args.seconds / 2
+    events: List[Tuple[float, int, float, int]] = []  # (finish time, sequence, latency, status)
+    in_flight = seq = 0
+
+    def _limit() -> int:
+        return controller.concurrency if controller else static_limit
+
+    while now < args.seconds:
+        while in_flight < _limit():
+            delay, status = site.request(now)
+            heapq.heappush(events, (now + delay, seq, delay, status))
+            seq += 1
+            in_flight += 1
+        finished_at, _, latency, status = heapq.heappop(events)
+        previous, now = now, finished_at
+        phase_idx = 0 if now < half else 1
+        if previous < half <= now:
+            site.qps = args.site_qps_after
+        in_flight -= 1
+        phase = phases[phase_idx]
+        if status == 200:
+            site.in_flight -= 1
+            phase.ok += 1
+            phase.ok_per_second[int(now)] += 1
+        else:
+            phase.refused += 1
+        if controller is not None:
+            controller.observe(latency, status_code=status)
+        phase.final_limit = controller.limit if controller else static_limit
+    return phases
+
+
+def run_simulation(args: argparse.Namespace) -> None:
+    strategies = [f"static={limit}" for limit in args.static] + ["adaptive"]
+    half = args.seconds / 2
+    print(
+        f"site: latency={args.latency}s capacity={args.capacity} "
+        f"qps={args.site_qps}->{args.site_qps_after} hard_cap={args.hard_cap}; "
+        f"{args.seconds:.0f}s simulated, phase change at {half:.0f}s"
+    )
+    print(
+        f"{'strategy':<12} {'phase':>5} {'ok/s':>8} {'refused%':>9} "
+        f"{'final limit':>12} {'90% after':>10}"
+    )
+    for strategy in strategies:
+        for idx, phase in enumerate(simulate(strategy, args)):
+            total = phase.ok + phase.refused
+            site_qps = args.site_qps if idx == 0 else args.site_qps_after
+            best_qps = min(site_qps, args.capacity / args.latency)
+            converged = phase.converged_after(idx * half, best_qps)
+            settled = "never" if converged is None else f"{converged:.0f}s"
+            refused = 100 * phase.refused / max(total, 1)
+            print(
+                f"{strategy:<12} {idx + 1:>5} {phase.ok / half:>8.1f} {refused:>8.1f}% "
+                f"{phase.final_limit:>12.1f} {settled:>10}"
+            )
+
+
+def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        description="Simulate adaptive concurrency against a rate-limiting site"
+    )
+    parser.add_argument(
+        "--seconds", type=float, default=600.0, help="Simulated seconds (two equal phases)"
+    )
+    parser.add_argument(
+        "--latency", type=float, default=0.5, help="Unloaded response time of the site"
+    )
+    parser.add_argument(
+        "--capacity", type=int, default=32, help="In-flight requests before latency grows"
+    )
+    parser.add_argument("--site-qps", type=float, default=40.0)
+    parser.add_argument("--site-qps-after", type=float, default=10.0)
+    parser.add_argument("--hard-cap", type=int, default=200, help="In-flight requests before 503s")
+    parser.add_argument(
+        "--static", type=int, nargs="+", default=[2, 5, 16, 64], help="Static limits to compare"
+    )
+    parser.add_argument(
+        "--initial", type=float, default=5.0, help="Adaptive controller's starting limit"
+    )
+    parser.add_argument("--max-limit", type=float, default=64.0)
+    return parser.parse_args(argv)
+
+
+if __name__ == "__main__":  # pragma: no cover
+    run_simulation(parse_args())